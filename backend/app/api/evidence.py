@@ -8,12 +8,26 @@ ensuring proper chain of custody and forensic integrity of collected data.
 from typing import Optional
 
 from app.core.dependencies import get_current_user
+from app.core.exceptions import AuthorizationException, ResourceNotFoundException
 from app.database import models
 from app.database.connection import get_db
 from app.schemas import evidence_schema as schemas
 from app.services.evidence_service import EvidenceService
 from app.services.exiftool_service import ExifToolService
-from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
+from app.services.search_service import SearchService
+from app.services.upload_service import UploadService
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 from sqlmodel import Session
 
 router = APIRouter()
@@ -67,6 +81,143 @@ async def create_evidence(
     return results
 
 
+@router.post(
+    "/bulk",
+    response_model=schemas.BulkUploadResult,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_evidence_bulk(
+    response: Response,
+    case_id: int = Form(...),
+    category: str = Form("Other"),
+    description: Optional[str] = Form(None),
+    folder_path: Optional[str] = Form(None),
+    parent_folder_id: Optional[int] = Form(None),
+    files: list[UploadFile] = File(...),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """
+    Upload many files in one request, with a result for each file.
+    Responds 201 if any evidence was created, otherwise 400.
+    """
+    evidence_service = EvidenceService(db)
+    try:
+        results = await evidence_service.create_evidence_bulk(
+            case_id=case_id,
+            category=category,
+            files=files,
+            current_user=current_user,
+            description=description,
+            folder_path=folder_path,
+            parent_folder_id=parent_folder_id,
+        )
+    except ResourceNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except AuthorizationException as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    created = sum(1 for result in results if result["status"] == "created")
+    if not created:
+        response.status_code = status.HTTP_400_BAD_REQUEST
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+
+@router.post(
+    "/uploads",
+    response_model=schemas.UploadSession,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_upload(
+    upload: schemas.UploadSessionCreate,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Start a resumable upload for a file too large to send in one request"""
+    upload_service = UploadService(db)
+    try:
+        return await upload_service.create_upload(
+            upload=upload, current_user=current_user
+        )
+    except ResourceNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except AuthorizationException as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+
+@router.get("/uploads/{upload_id}", response_model=schemas.UploadSession)
+async def read_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Report how much of an upload has been received, to resume from there"""
+    upload_service = UploadService(db)
+    return await upload_service.get_upload(
+        upload_id=upload_id, current_user=current_user
+    )
+
+
+@router.put("/uploads/{upload_id}", response_model=schemas.UploadSession)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Write the raw request body at the given byte offset"""
+    upload_service = UploadService(db)
+    return await upload_service.upload_chunk(
+        upload_id=upload_id,
+        offset=offset,
+        chunks=request.stream(),
+        current_user=current_user,
+    )
+
+
+@router.post(
+    "/uploads/{upload_id}/complete",
+    response_model=schemas.Evidence,
+    status_code=status.HTTP_201_CREATED,
+)
+async def complete_upload(
+    upload_id: str,
+    completion: schemas.UploadSessionComplete,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    upload_service = UploadService(db)
+    return await upload_service.complete_upload(
+        upload_id=upload_id, sha256=completion.sha256, current_user=current_user
+    )
+
+
+@router.delete("/uploads/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    upload_service = UploadService(db)
+    await upload_service.abort_upload(upload_id=upload_id, current_user=current_user)
+
+
+@router.get("/search", response_model=list[schemas.EvidenceSearchResult])
+async def search_evidence(
+    q: str = Query(..., min_length=1, max_length=500),
+    case_id: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    search_service = SearchService(db)
+    return await search_service.search(
+        q, current_user=current_user, case_id=case_id, skip=skip, limit=limit
+    )
+
+
 @router.get("/case/{case_id}", response_model=list[schemas.Evidence])
 async def read_case_evidence(
     case_id: int,
@@ -81,6 +232,45 @@ async def read_case_evidence(
     )
 
 
+@router.get("/case/{case_id}/thumbnails", response_model=list[schemas.EvidenceThumbnail])
+async def read_case_thumbnails(
+    case_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    evidence_service = EvidenceService(db)
+    return await evidence_service.list_image_thumbnails(
+        case_id=case_id, current_user=current_user, skip=skip, limit=limit
+    )
+
+
+@router.get("/case/{case_id}/export")
+async def export_case_evidence(
+    case_id: int,
+    archive_format: str = Query("zip", alias="format"),
+    folder_id: Optional[int] = None,
+    category: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    """Download a case's evidence tree as one zip or tar archive"""
+    evidence_service = EvidenceService(db)
+    try:
+        return await evidence_service.export_case_evidence(
+            case_id=case_id,
+            current_user=current_user,
+            archive_format=archive_format,
+            folder_id=folder_id,
+            category=category,
+        )
+    except ResourceNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except AuthorizationException as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+
 @router.get("/{evidence_id}", response_model=schemas.Evidence)
 async def read_evidence(
     evidence_id: int,
@@ -96,6 +286,7 @@ async def read_evidence(
 @router.get("/{evidence_id}/download")
 async def download_evidence(
     evidence_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -103,6 +294,20 @@ async def download_evidence(
     return await evidence_service.download_evidence(
         evidence_id=evidence_id,
         current_user=current_user,
+        request_headers=request.headers,
+    )
+
+
+@router.get("/{evidence_id}/download-url", response_model=schemas.EvidenceDownloadUrl)
+async def get_evidence_download_url(
+    evidence_id: int,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    evidence_service = EvidenceService(db)
+    return await evidence_service.get_download_url(
+        evidence_id=evidence_id,
+        current_user=current_user,
     )
 
 
@@ -119,9 +324,31 @@ async def get_evidence_content(
     )
 
 
+@router.get("/{evidence_id}/content/page")
+async def get_evidence_text_page(
+    evidence_id: int,
+    line: Optional[int] = Query(None, ge=0),
+    offset: Optional[int] = Query(None, ge=0),
+    lines: int = Query(500, ge=1, le=5000),
+    max_bytes: int = Query(1024 * 1024, ge=1, le=1024 * 1024),
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    evidence_service = EvidenceService(db)
+    return await evidence_service.get_evidence_text_page(
+        evidence_id=evidence_id,
+        current_user=current_user,
+        line=line,
+        offset=offset,
+        lines=lines,
+        max_bytes=max_bytes,
+    )
+
+
 @router.get("/{evidence_id}/image")
 async def get_evidence_image(
     evidence_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user),
 ):
@@ -129,6 +356,24 @@ async def get_evidence_image(
     return await evidence_service.get_evidence_image(
         evidence_id=evidence_id,
         current_user=current_user,
+        request_headers=request.headers,
+    )
+
+
+@router.get("/{evidence_id}/derivatives/{size}")
+async def get_evidence_derivative(
+    evidence_id: int,
+    size: str,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_user),
+):
+    evidence_service = EvidenceService(db)
+    return await evidence_service.get_evidence_derivative(
+        evidence_id=evidence_id,
+        size=size,
+        current_user=current_user,
+        request_headers=request.headers,
     )
 
 
@@ -234,23 +479,48 @@ async def extract_evidence_metadata(
             detail="Cannot extract metadata from folders or evidence without files",
         )
 
-    from app.core.file_storage import UPLOAD_DIR
-
-    full_file_path = UPLOAD_DIR / evidence.content
+    from app.core.config import storage_settings
+    from app.core.file_storage import evidence_file_location, named_evidence_file
+    from fastapi.concurrency import run_in_threadpool
 
-    if not exiftool_service.is_supported_file(str(full_file_path)):
+    # Checked before a remote file is copied to local disk for exiftool
+    if not exiftool_service.supports_extension(evidence.content):
         return {
             "success": False,
             "error": "Unsupported file type for metadata extraction",
             "supported_file": False,
             "file_extension": (
-                evidence.content.split(".")[-1]
-                if "." in evidence.content
-                else "unknown"
+                evidence.content.split(".")[-1] if "." in evidence.content else "unknown"
             ),
         }
 
-    metadata_result = await exiftool_service.extract_metadata(str(full_file_path))
+    storage, key, info = location = await run_in_threadpool(
+        evidence_file_location, evidence
+    )
+    max_size = storage_settings.STORAGE_MAX_LOCAL_COPY_MB * 1024 * 1024
+    if info is not None and storage.local_path(key) is None and info.size > max_size:
+        return {
+            "success": False,
+            "error": "File too large for metadata extraction",
+            "supported_file": True,
+        }
+
+    async with named_evidence_file(evidence, location) as full_file_path:
+        if not exiftool_service.is_supported_file(str(full_file_path)):
+            return {
+                "success": False,
+                "error": "Unsupported file type for metadata extraction",
+                "supported_file": False,
+                "file_extension": (
+                    evidence.content.split(".")[-1]
+                    if "." in evidence.content
+                    else "unknown"
+                ),
+            }
+
+        metadata_result = await exiftool_service.extract_metadata(
+            str(full_file_path)
+        )
 
     if "error" in metadata_result:
         return {
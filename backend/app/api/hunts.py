@@ -7,10 +7,11 @@ enabling complex multi-step investigations with real-time monitoring and results
 
 from typing import List
 
-from app.core.dependencies import get_current_user, get_db, no_analyst
+from app.core.dependencies import admin_only, get_current_user, get_db, no_analyst
 from app.core.websocket_manager import websocket_manager
 from app.database import models
 from app.schemas import hunt_schema as schemas
+from app.services.hunt_schedule_service import HuntScheduleService
 from app.services.hunt_service import HuntService
 from fastapi import (
 	APIRouter,
@@ -47,6 +48,22 @@ async def list_hunts(
     return response
 
 
+@router.post("/reload")
+@admin_only()
+async def reload_hunts(
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Re-discover hunt definitions and sync any changes to the database"""
+    service = HuntService(db)
+    result = service.reload_hunts(rediscover=True)
+    return {
+        "message": "Hunt definitions reloaded",
+        "hunt_count": len(result["loaded"]),
+        "invalid_hunts": result["invalid"],
+    }
+
+
 @router.get("/{hunt_id}", response_model=schemas.HuntResponse)
 async def get_hunt(
     hunt_id: int,
@@ -117,6 +134,106 @@ async def execute_hunt(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/{hunt_id}/schedules", response_model=schemas.HuntScheduleResponse)
+@no_analyst()
+async def create_schedule(
+    hunt_id: int,
+    request: schemas.HuntScheduleCreate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Schedule a hunt to re-run against a case
+
+    Runs start on the cron expression (UTC). Each run only saves results that
+    are new since the previous successful run of the hunt on that case.
+    """
+    service = HuntScheduleService(db)
+
+    try:
+        schedule = await service.create_schedule(
+            hunt_id=hunt_id,
+            case_id=request.case_id,
+            cron_expression=request.cron_expression,
+            initial_parameters=request.parameters,
+            current_user=current_user,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    hunt = db.get(models.Hunt, schedule.hunt_id)
+    return schemas.HuntScheduleResponse(
+        **schedule.__dict__, hunt_display_name=hunt.display_name if hunt else None
+    )
+
+
+@router.get(
+    "/cases/{case_id}/schedules",
+    response_model=List[schemas.HuntScheduleResponse],
+)
+async def list_case_schedules(
+    case_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """List the hunt schedules for a specific case"""
+    service = HuntScheduleService(db)
+    schedules = await service.list_case_schedules(case_id, current_user=current_user)
+
+    response = []
+    for schedule in schedules:
+        hunt = db.get(models.Hunt, schedule.hunt_id)
+        response.append(
+            schemas.HuntScheduleResponse(
+                **schedule.__dict__,
+                hunt_display_name=hunt.display_name if hunt else None,
+            )
+        )
+
+    return response
+
+
+@router.patch("/schedules/{schedule_id}", response_model=schemas.HuntScheduleResponse)
+@no_analyst()
+async def update_schedule(
+    schedule_id: int,
+    request: schemas.HuntScheduleUpdate,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Change a hunt schedule's timing or parameters, or pause and resume it"""
+    service = HuntScheduleService(db)
+
+    try:
+        schedule = await service.update_schedule(
+            schedule_id, request, current_user=current_user
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    hunt = db.get(models.Hunt, schedule.hunt_id)
+    return schemas.HuntScheduleResponse(
+        **schedule.__dict__, hunt_display_name=hunt.display_name if hunt else None
+    )
+
+
+@router.delete("/schedules/{schedule_id}")
+@no_analyst()
+async def delete_schedule(
+    schedule_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Delete a hunt schedule; past executions are kept"""
+    service = HuntScheduleService(db)
+
+    try:
+        await service.delete_schedule(schedule_id, current_user=current_user)
+        return {"message": "Hunt schedule deleted", "schedule_id": schedule_id}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/executions/{execution_id}", response_model=schemas.HuntExecutionResponse)
 async def get_execution_status(
     execution_id: int,
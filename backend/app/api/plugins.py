@@ -5,17 +5,32 @@ This module provides the core plugin system interface for executing OSINT tools
 enabling extensible investigation capabilities through a standardized plugin architecture.
 """
 
-import json
-from typing import Any, Dict
+from typing import Any, Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from ..core.dependencies import get_current_user, get_db, no_analyst
-from ..core.exceptions import ResourceNotFoundException
+from ..core.exceptions import (
+    AuthorizationException,
+    ResourceNotFoundException,
+    ValidationException,
+)
+from ..core.streaming import (
+    MEDIA_TYPES,
+    NDJSON,
+    STREAM_HEADERS,
+    format_frame,
+    stream_results,
+)
 from ..database.models import User
-from ..schemas.plugin_schema import PluginMetadata
+from ..schemas.plugin_schema import (
+    PluginMetadata,
+    PluginRunResponse,
+    PluginRunResultsPage,
+)
+from ..services.plugin_run_service import PluginRunService
 from ..services.plugin_service import PluginService
 
 router = APIRouter(tags=["plugins"])
@@ -40,31 +55,181 @@ async def stream_generator(
     params: Dict[str, Any] = None,
     current_user: User = None,
     db: Session = None,
+    request: Optional[Request] = None,
+    transport: str = NDJSON,
 ):
     try:
         plugin_svc = PluginService(db)
         result = await plugin_svc.execute_plugin(
             plugin_name, params, current_user=current_user
         )
-        async for line in result:
-            yield json.dumps(line) + "\n"
+        async for chunk in stream_results(
+            result,
+            transport=transport,
+            is_disconnected=request.is_disconnected if request else None,
+        ):
+            yield chunk
     except ResourceNotFoundException as e:
-        yield json.dumps({"type": "error", "data": {"message": str(e)}}) + "\n"
+        yield format_frame({"type": "error", "data": {"message": str(e)}}, transport)
     except Exception as e:
-        yield json.dumps(
-            {"type": "error", "data": {"message": f"Plugin execution error: {str(e)}"}}
-        ) + "\n"
+        yield format_frame(
+            {"type": "error", "data": {"message": f"Plugin execution error: {str(e)}"}},
+            transport,
+        )
 
 
 @router.post("/{plugin_name}/execute")
 @no_analyst()
 async def execute_plugin(
+    plugin_name: str,
+    request: Request,
+    params: Dict[str, Any] = None,
+    transport: Literal["ndjson", "sse"] = Query(
+        NDJSON, description="Stream as newline-delimited JSON or server-sent events"
+    ),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Run a plugin and stream its results
+
+    Results close together are sent in one chunk, idle streams receive
+    heartbeat frames, and the plugin is cancelled if the client disconnects.
+    """
+    return StreamingResponse(
+        stream_generator(plugin_name, params, current_user, db, request, transport),
+        media_type=MEDIA_TYPES[transport],
+        headers=STREAM_HEADERS,
+    )
+
+
+@router.post("/{plugin_name}/runs", response_model=PluginRunResponse)
+@no_analyst()
+async def start_plugin_run(
     plugin_name: str,
     params: Dict[str, Any] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    """
+    Start a detached plugin run
+
+    The run continues after the client disconnects. Its results are stored and
+    can be streamed from any offset or read page by page.
+    """
+    service = PluginRunService(db)
+    try:
+        return await service.start_run(plugin_name, params, current_user=current_user)
+    except ResourceNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=str(e))
+
+
+@router.get("/runs", response_model=List[PluginRunResponse])
+async def list_plugin_runs(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """List the current user's detached plugin runs, newest first"""
+    service = PluginRunService(db)
+    return await service.list_runs(skip, limit, current_user=current_user)
+
+
+@router.get("/runs/{run_id}", response_model=PluginRunResponse)
+async def get_plugin_run(
+    run_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    service = PluginRunService(db)
+    try:
+        return await service.get_run(run_id, current_user=current_user)
+    except ResourceNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except AuthorizationException as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+
+@router.get("/runs/{run_id}/results", response_model=PluginRunResultsPage)
+async def get_plugin_run_results(
+    run_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Read a page of a run's stored results"""
+    service = PluginRunService(db)
+    try:
+        run = await service.get_run(run_id, current_user=current_user)
+        results = await service.get_results(
+            run_id, offset, limit, current_user=current_user
+        )
+    except ResourceNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except AuthorizationException as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+    return PluginRunResultsPage(
+        run_id=run.id,
+        status=run.status,
+        offset=offset,
+        next_offset=results[-1].seq + 1 if results else offset,
+        total=run.result_count,
+        results=[{"type": result.type, "data": result.data} for result in results],
+    )
+
+
+@router.get("/runs/{run_id}/stream")
+async def stream_plugin_run(
+    run_id: int,
+    request: Request,
+    offset: int = Query(0, ge=0),
+    transport: Literal["ndjson", "sse"] = Query(NDJSON),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream a run's results from the given offset, following it until it ends
+
+    Every frame carries its offset, so a dropped client can re-attach where it
+    left off. The last frame has type "run_complete".
+    """
+    service = PluginRunService(db)
+    try:
+        await service.get_run(run_id, current_user=current_user)
+    except ResourceNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except AuthorizationException as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
     return StreamingResponse(
-        stream_generator(plugin_name, params, current_user, db),
-        media_type="application/json",
+        stream_results(
+            service.follow_results(run_id, offset, current_user=current_user),
+            transport=transport,
+            is_disconnected=request.is_disconnected,
+        ),
+        media_type=MEDIA_TYPES[transport],
+        headers=STREAM_HEADERS,
     )
+
+
+@router.delete("/runs/{run_id}", response_model=PluginRunResponse)
+@no_analyst()
+async def cancel_plugin_run(
+    run_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    service = PluginRunService(db)
+    try:
+        return await service.cancel_run(run_id, current_user=current_user)
+    except ResourceNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except AuthorizationException as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
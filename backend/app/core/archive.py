@@ -0,0 +1,185 @@
+"""
+Streaming zip and tar archives for evidence exports.
+
+Entries are written to the response as they are read from storage, so an
+archive of any size is built without temp files and with about one storage
+chunk in memory. Each file is hashed as it is written; its SHA-256 is set on
+the entry once written, for a manifest at the end of the archive.
+"""
+
+import hashlib
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import PurePosixPath
+from typing import Callable, Iterable, Iterator, List, Optional
+
+ARCHIVE_MEDIA_TYPES = {
+    "zip": "application/zip",
+    "tar": "application/x-tar",
+}
+
+# Formats that are compressed already and gain nothing from deflate
+PRECOMPRESSED_EXTENSIONS = {
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".webp",
+    ".mp3",
+    ".mp4",
+    ".mov",
+    ".mkv",
+    ".webm",
+    ".zip",
+    ".gz",
+    ".7z",
+    ".rar",
+    ".docx",
+    ".xlsx",
+    ".pptx",
+}
+
+
+class ArchiveError(Exception):
+    """An entry could not be written as described"""
+
+
+@dataclass
+class ArchiveEntry:
+    """A file or, without chunks, a directory to write to an archive"""
+
+    path: str
+    modified: datetime
+    size: int = 0
+    chunks: Optional[Callable[[], Iterable[bytes]]] = None
+    sha256: Optional[str] = None
+
+    @property
+    def is_dir(self) -> bool:
+        return self.chunks is None
+
+
+def _utc(moment: datetime) -> datetime:
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+class _StreamSink:
+    """Unseekable file object that collects what is written until drained"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _zip_date_time(moment: datetime) -> tuple:
+    # Zip timestamps start in 1980
+    return max(_utc(moment).timetuple()[:6], (1980, 1, 1, 0, 0, 0))
+
+
+def _write_zip(entries: Iterable[ArchiveEntry]) -> Iterator[bytes]:
+    sink = _StreamSink()
+    # Without seek, zipfile writes sizes and CRCs after each entry's data
+    with zipfile.ZipFile(sink, "w") as archive:
+        for entry in entries:
+            if entry.is_dir:
+                info = zipfile.ZipInfo(
+                    entry.path.rstrip("/") + "/", _zip_date_time(entry.modified)
+                )
+                info.external_attr = (0o40755 << 16) | 0x10
+                archive.writestr(info, b"")
+            else:
+                info = zipfile.ZipInfo(entry.path, _zip_date_time(entry.modified))
+                info.external_attr = 0o644 << 16
+                # Lets zipfile pick Zip64 up front for files over 4GB
+                info.file_size = entry.size
+                extension = PurePosixPath(entry.path).suffix.lower()
+                if extension in PRECOMPRESSED_EXTENSIONS:
+                    info.compress_type = zipfile.ZIP_STORED
+                else:
+                    info.compress_type = zipfile.ZIP_DEFLATED
+
+                hasher = hashlib.sha256()
+                with archive.open(info, "w") as dest:
+                    for chunk in entry.chunks():
+                        hasher.update(chunk)
+                        dest.write(chunk)
+                        data = sink.drain()
+                        if data:
+                            yield data
+                entry.sha256 = hasher.hexdigest()
+
+            data = sink.drain()
+            if data:
+                yield data
+    yield sink.drain()
+
+
+def _write_tar(entries: Iterable[ArchiveEntry]) -> Iterator[bytes]:
+    written = 0
+    for entry in entries:
+        info = tarfile.TarInfo(entry.path.rstrip("/"))
+        info.mtime = int(_utc(entry.modified).timestamp())
+        if entry.is_dir:
+            info.type = tarfile.DIRTYPE
+            info.mode = 0o755
+        else:
+            info.size = entry.size
+            info.mode = 0o644
+        # PAX headers carry long names and sizes past 8GB
+        header = info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+        yield header
+        written += len(header)
+        if entry.is_dir:
+            continue
+
+        # Tar headers come first, so the data must match the size given
+        hasher = hashlib.sha256()
+        length = 0
+        for chunk in entry.chunks():
+            length += len(chunk)
+            if length > entry.size:
+                raise ArchiveError(f"{entry.path} is larger than {entry.size} bytes")
+            hasher.update(chunk)
+            yield chunk
+        if length != entry.size:
+            raise ArchiveError(f"{entry.path} is smaller than {entry.size} bytes")
+        entry.sha256 = hasher.hexdigest()
+
+        padding = -length % tarfile.BLOCKSIZE
+        if padding:
+            yield tarfile.NUL * padding
+        written += length + padding
+
+    end = tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+    written += len(end)
+    yield end + tarfile.NUL * (-written % tarfile.RECORDSIZE)
+
+
+def stream_archive(
+    entries: Iterable[ArchiveEntry], archive_format: str
+) -> Iterator[bytes]:
+    """
+    The bytes of an archive of entries, as they are produced.
+    Entries are consumed lazily, one at a time, so a generator of entries
+    sees the hashes of everything it yielded before.
+    """
+    if archive_format == "zip":
+        return _write_zip(entries)
+    if archive_format == "tar":
+        return _write_tar(entries)
+    raise ValueError(f"Unknown archive format: {archive_format}")
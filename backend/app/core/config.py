@@ -22,6 +22,160 @@ class LoggingSettings(BaseSettings):
     LOG_RETENTION: str = os.environ.get("OWLCULUS_LOG_RETENTION", "30 days")
 
 
+class DnsSettings(BaseSettings):
+    DNS_NAMESERVERS: str = os.environ.get("OWLCULUS_DNS_NAMESERVERS", "")
+    DNS_CACHE_SIZE: int = int(os.environ.get("OWLCULUS_DNS_CACHE_SIZE", "10000"))
+    DNS_CACHE_MAX_TTL: int = int(os.environ.get("OWLCULUS_DNS_CACHE_MAX_TTL", "3600"))
+    DNS_NEGATIVE_TTL: int = int(os.environ.get("OWLCULUS_DNS_NEGATIVE_TTL", "300"))
+    DNS_TIMEOUT: float = float(os.environ.get("OWLCULUS_DNS_TIMEOUT", "5.0"))
+    DNS_MAX_CONCURRENCY_PER_NAMESERVER: int = int(
+        os.environ.get("OWLCULUS_DNS_MAX_CONCURRENCY_PER_NAMESERVER", "50")
+    )
+
+
+class WhoisSettings(BaseSettings):
+    WHOIS_CACHE_TTL_DAYS: int = int(os.environ.get("OWLCULUS_WHOIS_CACHE_TTL_DAYS", "7"))
+    WHOIS_MAX_WORKERS: int = int(os.environ.get("OWLCULUS_WHOIS_MAX_WORKERS", "8"))
+    WHOIS_MAX_CONCURRENCY_PER_TLD: int = int(
+        os.environ.get("OWLCULUS_WHOIS_MAX_CONCURRENCY_PER_TLD", "2")
+    )
+
+
+class VirusTotalSettings(BaseSettings):
+    VIRUSTOTAL_CACHE_TTL: int = int(os.environ.get("OWLCULUS_VIRUSTOTAL_CACHE_TTL", "3600"))
+    VIRUSTOTAL_CACHE_SIZE: int = int(os.environ.get("OWLCULUS_VIRUSTOTAL_CACHE_SIZE", "5000"))
+    # Request budget per API key: 4 for free keys, higher for premium ones
+    VIRUSTOTAL_REQUESTS_PER_MINUTE: float = float(
+        os.environ.get("OWLCULUS_VIRUSTOTAL_REQUESTS_PER_MINUTE", "4")
+    )
+
+
+class StreamingSettings(BaseSettings):
+    STREAM_BATCH_WINDOW_MS: int = int(
+        os.environ.get("OWLCULUS_STREAM_BATCH_WINDOW_MS", "50")
+    )
+    STREAM_BATCH_MAX_ITEMS: int = int(
+        os.environ.get("OWLCULUS_STREAM_BATCH_MAX_ITEMS", "100")
+    )
+    STREAM_HEARTBEAT_SECONDS: float = float(
+        os.environ.get("OWLCULUS_STREAM_HEARTBEAT_SECONDS", "15")
+    )
+    STREAM_QUEUE_SIZE: int = int(os.environ.get("OWLCULUS_STREAM_QUEUE_SIZE", "256"))
+
+
+class PluginRunSettings(BaseSettings):
+    PLUGIN_RUN_FLUSH_ITEMS: int = int(
+        os.environ.get("OWLCULUS_PLUGIN_RUN_FLUSH_ITEMS", "50")
+    )
+    PLUGIN_RUN_FLUSH_SECONDS: float = float(
+        os.environ.get("OWLCULUS_PLUGIN_RUN_FLUSH_SECONDS", "1.0")
+    )
+    PLUGIN_RUN_MAX_ACTIVE_PER_USER: int = int(
+        os.environ.get("OWLCULUS_PLUGIN_RUN_MAX_ACTIVE_PER_USER", "5")
+    )
+    PLUGIN_RUN_PAGE_SIZE: int = int(os.environ.get("OWLCULUS_PLUGIN_RUN_PAGE_SIZE", "500"))
+
+
+class HuntSchedulerSettings(BaseSettings):
+    HUNT_SCHEDULER_ENABLED: bool = (
+        os.environ.get("OWLCULUS_HUNT_SCHEDULER_ENABLED", "true").lower() == "true"
+    )
+    HUNT_SCHEDULER_POLL_SECONDS: int = int(
+        os.environ.get("OWLCULUS_HUNT_SCHEDULER_POLL_SECONDS", "60")
+    )
+
+
+class UploadSettings(BaseSettings):
+    # Limits for resumable chunked uploads; single-request uploads keep theirs
+    UPLOAD_MAX_FILE_SIZE_MB: int = int(
+        os.environ.get("OWLCULUS_UPLOAD_MAX_FILE_SIZE_MB", "10240")
+    )
+    UPLOAD_MAX_CHUNK_SIZE_MB: int = int(
+        os.environ.get("OWLCULUS_UPLOAD_MAX_CHUNK_SIZE_MB", "64")
+    )
+    # Total bytes of evidence files per case, 0 for no quota
+    UPLOAD_CASE_QUOTA_MB: int = int(os.environ.get("OWLCULUS_UPLOAD_CASE_QUOTA_MB", "0"))
+    UPLOAD_SESSION_TTL_HOURS: int = int(
+        os.environ.get("OWLCULUS_UPLOAD_SESSION_TTL_HOURS", "24")
+    )
+    # Files one bulk upload may carry, and how many are stored at a time
+    UPLOAD_BULK_MAX_FILES: int = int(
+        os.environ.get("OWLCULUS_UPLOAD_BULK_MAX_FILES", "100")
+    )
+    UPLOAD_BULK_CONCURRENCY: int = int(
+        os.environ.get("OWLCULUS_UPLOAD_BULK_CONCURRENCY", "4")
+    )
+
+
+class StorageSettings(BaseSettings):
+    # Where evidence content is kept: "local" (the uploads volume) or "s3"
+    STORAGE_BACKEND: str = os.environ.get("OWLCULUS_STORAGE_BACKEND", "local").lower()
+    STORAGE_S3_BUCKET: str = os.environ.get("OWLCULUS_STORAGE_S3_BUCKET", "")
+    # Set for S3-compatible services such as MinIO, e.g. http://minio:9000
+    STORAGE_S3_ENDPOINT_URL: str = os.environ.get("OWLCULUS_STORAGE_S3_ENDPOINT_URL", "")
+    STORAGE_S3_REGION: str = os.environ.get("OWLCULUS_STORAGE_S3_REGION", "")
+    STORAGE_S3_ACCESS_KEY_ID: str = os.environ.get("OWLCULUS_STORAGE_S3_ACCESS_KEY_ID", "")
+    STORAGE_S3_SECRET_ACCESS_KEY: str = os.environ.get(
+        "OWLCULUS_STORAGE_S3_SECRET_ACCESS_KEY", ""
+    )
+    STORAGE_S3_PREFIX: str = os.environ.get("OWLCULUS_STORAGE_S3_PREFIX", "")
+    STORAGE_PRESIGNED_URL_SECONDS: int = int(
+        os.environ.get("OWLCULUS_STORAGE_PRESIGNED_URL_SECONDS", "300")
+    )
+    # Largest remote file copied to local disk for tools that need a file path
+    STORAGE_MAX_LOCAL_COPY_MB: int = int(
+        os.environ.get("OWLCULUS_STORAGE_MAX_LOCAL_COPY_MB", "1024")
+    )
+
+
+class DerivativeSettings(BaseSettings):
+    # Thumbnails and previews of image evidence, rendered in a process pool
+    DERIVATIVE_WORKERS: int = int(os.environ.get("OWLCULUS_DERIVATIVE_WORKERS", "2"))
+    # "webp" or "jpeg"
+    DERIVATIVE_FORMAT: str = os.environ.get("OWLCULUS_DERIVATIVE_FORMAT", "webp").lower()
+    DERIVATIVE_QUALITY: int = int(os.environ.get("OWLCULUS_DERIVATIVE_QUALITY", "80"))
+
+
+class TextViewerSettings(BaseSettings):
+    # Bytes sampled from the start of a file to detect its encoding
+    TEXT_ENCODING_SAMPLE_BYTES: int = int(
+        os.environ.get("OWLCULUS_TEXT_ENCODING_SAMPLE_BYTES", "65536")
+    )
+    # Every Nth line's byte offset is kept in the line index of a text file
+    TEXT_INDEX_LINE_INTERVAL: int = int(
+        os.environ.get("OWLCULUS_TEXT_INDEX_LINE_INTERVAL", "1000")
+    )
+    TEXT_INDEX_CACHE_SIZE: int = int(
+        os.environ.get("OWLCULUS_TEXT_INDEX_CACHE_SIZE", "256")
+    )
+
+
+class SearchSettings(BaseSettings):
+    # Background worker that extracts the text of new evidence for search
+    SEARCH_INDEXER_ENABLED: bool = (
+        os.environ.get("OWLCULUS_SEARCH_INDEXER_ENABLED", "true").lower() == "true"
+    )
+    SEARCH_INDEXER_POLL_SECONDS: int = int(
+        os.environ.get("OWLCULUS_SEARCH_INDEXER_POLL_SECONDS", "30")
+    )
+    SEARCH_INDEXER_BATCH_SIZE: int = int(
+        os.environ.get("OWLCULUS_SEARCH_INDEXER_BATCH_SIZE", "20")
+    )
+    # Text indexed per evidence; PostgreSQL caps a tsvector at 1MB
+    SEARCH_MAX_TEXT_CHARS: int = int(
+        os.environ.get("OWLCULUS_SEARCH_MAX_TEXT_CHARS", "262144")
+    )
+    # PostgreSQL text search configuration; "simple" keeps emails and handles whole
+    SEARCH_TEXT_CONFIG: str = os.environ.get("OWLCULUS_SEARCH_TEXT_CONFIG", "simple")
+
+
+class ConfigCacheSettings(BaseSettings):
+    # How stale another worker's view of the system configuration may get
+    CONFIG_CACHE_CHECK_SECONDS: float = float(
+        os.environ.get("OWLCULUS_CONFIG_CACHE_CHECK_SECONDS", "5")
+    )
+
+
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Owlculus"
     DESCRIPTION: str = "An OSINT case management platform and toolkit"
@@ -54,3 +208,15 @@ class Settings(BaseSettings):
 
 settings = Settings()
 logging_settings = LoggingSettings()
+dns_settings = DnsSettings()
+whois_settings = WhoisSettings()
+virustotal_settings = VirusTotalSettings()
+streaming_settings = StreamingSettings()
+plugin_run_settings = PluginRunSettings()
+hunt_scheduler_settings = HuntSchedulerSettings()
+config_cache_settings = ConfigCacheSettings()
+upload_settings = UploadSettings()
+storage_settings = StorageSettings()
+derivative_settings = DerivativeSettings()
+text_viewer_settings = TextViewerSettings()
+search_settings = SearchSettings()
@@ -0,0 +1,125 @@
+"""
+Minimal cron expression parsing for scheduled jobs
+
+Supports the standard five fields (minute hour day-of-month month day-of-week)
+with "*", lists, ranges and steps, plus the @hourly, @daily, @weekly and
+@monthly shortcuts. Day-of-week uses 0-6 starting on Sunday (7 is also Sunday).
+As in cron, when both day fields are restricted a day matching either runs.
+"""
+
+from datetime import datetime, timedelta
+from typing import FrozenSet, Tuple
+
+ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+FIELD_RANGES: Tuple[Tuple[str, int, int], ...] = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day of month", 1, 31),
+    ("month", 1, 12),
+    ("day of week", 0, 7),
+)
+
+# Give up on expressions that never match, such as "0 0 31 2 *"
+MAX_SEARCH_YEARS = 5
+
+
+def _parse_field(text: str, name: str, low: int, high: int) -> FrozenSet[int]:
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError(f"Invalid step '{step_text}' in cron {name} field")
+            step = int(step_text)
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            if not start_text.isdigit() or not end_text.isdigit():
+                raise ValueError(f"Invalid range '{part}' in cron {name} field")
+            start, end = int(start_text), int(end_text)
+        elif part.isdigit():
+            start = int(part)
+            # "5/15" means every 15 starting at 5
+            end = high if step > 1 else start
+        else:
+            raise ValueError(f"Invalid value '{part}' in cron {name} field")
+
+        if start < low or end > high or start > end:
+            raise ValueError(
+                f"Cron {name} field value '{part}' is outside {low}-{high}"
+            )
+        values.update(range(start, end + 1, step))
+
+    return frozenset(values)
+
+
+class CronSchedule:
+    """A parsed cron expression that can compute its next run time"""
+
+    def __init__(self, expression: str):
+        self.expression = expression.strip()
+        fields = ALIASES.get(self.expression.lower(), self.expression).split()
+        if len(fields) != 5:
+            raise ValueError(
+                "Cron expression must have five fields: minute hour day month weekday"
+            )
+
+        parsed = [
+            _parse_field(text, name, low, high)
+            for text, (name, low, high) in zip(fields, FIELD_RANGES)
+        ]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Sunday can be written as 0 or 7
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_match = moment.day in self.days
+        # Python counts weekdays from Monday, cron from Sunday
+        weekday_match = (moment.weekday() + 1) % 7 in self.weekdays
+
+        if self._any_day:
+            return weekday_match
+        if self._any_weekday:
+            return day_match
+        return day_match or weekday_match
+
+    def next_run(self, after: datetime) -> datetime:
+        """
+        Return the first matching minute strictly after the given time
+
+        Raises:
+            ValueError: If the expression never matches
+        """
+        candidate = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit_year = after.year + MAX_SEARCH_YEARS
+
+        while candidate.year <= limit_year:
+            if candidate.month not in self.months:
+                # Jump to the start of the next month
+                year = candidate.year + candidate.month // 12
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(
+                    year=year, month=month, day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+
+        raise ValueError(f"Cron expression '{self.expression}' never matches")
@@ -0,0 +1,197 @@
+"""
+Thumbnails and previews of image evidence.
+
+Derivatives are downscaled copies of an image, rendered once on first request
+in a process pool so decoding large images never blocks the API. They are kept
+in the storage backend next to the blobs, keyed by the original's SHA-256 and
+the derivative size, so identical images share them and they can be served
+with the same long-lived caching as the originals.
+"""
+
+import asyncio
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import derivative_settings
+from .file_storage import (
+    StoredFile,
+    blob_key,
+    evidence_file_location,
+    get_storage,
+    staging_dir,
+)
+from .logging import get_security_logger
+from .storage import StorageBackend
+
+DERIVATIVE_DIR_NAME = "derivatives"
+
+# Longest edge in pixels for each derivative size
+DERIVATIVE_SIZES = {"thumbnail": 256, "preview": 1280}
+
+# Formats the renderer can decode; vector images are served as they are
+RASTER_IMAGE_EXTENSIONS = {
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".bmp",
+    ".webp",
+    ".tif",
+    ".tiff",
+}
+
+DERIVATIVE_MEDIA_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+
+_executor: Optional[ProcessPoolExecutor] = None
+# Renders in progress in this process, so concurrent requests share one
+_pending: Dict[str, asyncio.Task] = {}
+
+
+class DerivativeError(Exception):
+    """The image could not be decoded or rendered"""
+
+
+def _derivative_format() -> str:
+    if derivative_settings.DERIVATIVE_FORMAT in DERIVATIVE_MEDIA_TYPES:
+        return derivative_settings.DERIVATIVE_FORMAT
+    return "webp"
+
+
+def derivative_media_type() -> str:
+    return DERIVATIVE_MEDIA_TYPES[_derivative_format()]
+
+
+def supports_derivatives(filename: str) -> bool:
+    return Path(filename).suffix.lower() in RASTER_IMAGE_EXTENSIONS
+
+
+def derivative_key(
+    file_hash: str, size: str, image_format: Optional[str] = None
+) -> str:
+    """Storage key of a derivative, e.g. derivatives/ab/cd/abcd...-thumbnail.webp"""
+    blob_key(file_hash)  # Validates the hash
+    name = f"{file_hash}-{size}.{image_format or _derivative_format()}"
+    return f"{DERIVATIVE_DIR_NAME}/{file_hash[:2]}/{file_hash[2:4]}/{name}"
+
+
+def render_derivative(
+    source: str, target: str, max_edge: int, image_format: str, quality: int
+) -> None:
+    """
+    Downscale an image to fit max_edge. Runs in a worker process.
+    Metadata such as EXIF location data is not copied into the derivative.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(source) as image:
+        # Animated images are previewed by their first frame
+        image.seek(0)
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_edge, max_edge))
+
+        if image_format == "jpeg":
+            if image.mode in ("RGBA", "LA", "P"):
+                image = image.convert("RGBA")
+                background = Image.new("RGB", image.size, (255, 255, 255))
+                background.paste(image, mask=image.getchannel("A"))
+                image = background
+            elif image.mode != "RGB":
+                image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        image.save(target, format=image_format.upper(), quality=quality)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=max(1, derivative_settings.DERIVATIVE_WORKERS)
+        )
+    return _executor
+
+
+def _download(storage: StorageBackend, key: str, target: Path) -> None:
+    with open(target, "wb") as buffer:
+        for chunk in storage.open_read(key):
+            buffer.write(chunk)
+
+
+async def _create_derivative(evidence, size: str, key: str) -> None:
+    loop = asyncio.get_running_loop()
+    source_storage, source_key, source_info = await loop.run_in_executor(
+        None, evidence_file_location, evidence
+    )
+    if source_info is None:
+        raise FileNotFoundError(source_key)
+
+    with tempfile.TemporaryDirectory(dir=staging_dir()) as temp_dir:
+        source = source_storage.local_path(source_key)
+        if source is None:
+            source = Path(temp_dir) / "source"
+            await loop.run_in_executor(
+                None, _download, source_storage, source_key, source
+            )
+
+        target = Path(temp_dir) / Path(key).name
+        try:
+            await loop.run_in_executor(
+                _get_executor(),
+                render_derivative,
+                str(source),
+                str(target),
+                DERIVATIVE_SIZES[size],
+                _derivative_format(),
+                derivative_settings.DERIVATIVE_QUALITY,
+            )
+        except ImportError:
+            # Pillow is not installed, which says nothing about the image
+            raise
+        except Exception as e:
+            raise DerivativeError(str(e)) from e
+
+        await loop.run_in_executor(None, get_storage().put_file, target, key)
+
+    get_security_logger(
+        event="derivative_created",
+        evidence_id=evidence.id,
+        file_hash=evidence.file_hash,
+        size=size,
+    ).info(f"Rendered {size} for evidence {evidence.id}")
+
+
+async def get_derivative(evidence, size: str) -> StoredFile:
+    """
+    The stored derivative of an image evidence, rendered first if needed.
+    Raises FileNotFoundError if the original is missing, DerivativeError if it
+    cannot be rendered, and ImportError if Pillow is not installed.
+    """
+    loop = asyncio.get_running_loop()
+    storage = get_storage()
+    key = derivative_key(evidence.file_hash, size)
+    info = await loop.run_in_executor(None, storage.stat, key)
+    if info is not None:
+        return StoredFile(storage, key, info)
+
+    task = _pending.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_create_derivative(evidence, size, key))
+        _pending[key] = task
+        task.add_done_callback(lambda _: _pending.pop(key, None))
+    await asyncio.shield(task)
+
+    info = await loop.run_in_executor(None, storage.stat, key)
+    if info is None:
+        raise FileNotFoundError(key)
+    return StoredFile(storage, key, info)
+
+
+def delete_derivatives(file_hash: str) -> None:
+    """Delete every derivative of a blob, when the blob itself is reclaimed"""
+    storage = get_storage()
+    for image_format in DERIVATIVE_MEDIA_TYPES:
+        for size in DERIVATIVE_SIZES:
+            storage.delete(derivative_key(file_hash, size, image_format))
@@ -0,0 +1,294 @@
+"""
+Shared asynchronous DNS resolver with a TTL-aware response cache.
+
+This module provides a process-wide resolver used by DNS-heavy plugins. Answers are
+cached in an LRU keyed by name, record type and nameserver set, honouring the record
+TTL, and NXDOMAIN/NoAnswer responses are cached for a configurable negative TTL.
+Identical queries in flight at the same time share one upstream request, and
+concurrent queries are bounded per nameserver set so bulk lookups cannot flood a
+single upstream server.
+"""
+
+import asyncio
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+import dns.asyncresolver
+import dns.name
+import dns.rdatatype
+import dns.resolver
+
+from .config import dns_settings
+
+SYSTEM_NAMESERVERS: Tuple[str, ...] = ()
+
+CacheKey = Tuple[str, str, Tuple[str, ...]]
+
+
+class _Failure(NamedTuple):
+    """
+    A failed query, kept so every caller can be given an exception of its own.
+    Re-raising one shared instance would chain each caller's traceback onto it.
+    """
+
+    error_type: Type[BaseException]
+    args: tuple
+    kwargs: Dict[str, Any]
+
+    @classmethod
+    def of(cls, error: BaseException) -> "_Failure":
+        return cls(type(error), error.args, dict(getattr(error, "kwargs", None) or {}))
+
+    def exception(self) -> BaseException:
+        # dnspython exceptions take either keyword details or a message
+        if self.kwargs:
+            return self.error_type(**self.kwargs)
+        return self.error_type(*self.args)
+
+
+class DnsResolver:
+    """Resolves DNS queries through cached, concurrency-limited resolvers"""
+
+    def __init__(
+        self,
+        max_entries: int = dns_settings.DNS_CACHE_SIZE,
+        max_ttl: int = dns_settings.DNS_CACHE_MAX_TTL,
+        negative_ttl: int = dns_settings.DNS_NEGATIVE_TTL,
+        timeout: float = dns_settings.DNS_TIMEOUT,
+        max_concurrency_per_nameserver: int = dns_settings.DNS_MAX_CONCURRENCY_PER_NAMESERVER,
+        default_nameservers: Optional[Sequence[str]] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self.max_concurrency_per_nameserver = max_concurrency_per_nameserver
+        self.default_nameservers = self._normalize_nameservers(
+            default_nameservers
+            if default_nameservers is not None
+            else dns_settings.DNS_NAMESERVERS.split(",")
+        )
+
+        # Cache entries map a query key to (expires_at, answer or negative _Failure)
+        self._cache: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._resolvers: Dict[Tuple[str, ...], dns.asyncresolver.Resolver] = {}
+        # Semaphores and futures are bound to an event loop, so keep them per loop
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, Dict[Tuple[str, ...], asyncio.Semaphore]
+        ] = weakref.WeakKeyDictionary()
+        self._in_flight: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, Dict[CacheKey, asyncio.Future]
+        ] = weakref.WeakKeyDictionary()
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "negative_hits": 0,
+            "coalesced": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+    @staticmethod
+    def _normalize_nameservers(nameservers: Optional[Sequence[str]]) -> Tuple[str, ...]:
+        """Strip blanks and return nameservers as a hashable tuple"""
+        if not nameservers:
+            return SYSTEM_NAMESERVERS
+        return tuple(ns.strip() for ns in nameservers if ns and ns.strip())
+
+    def _nameserver_key(self, nameservers: Optional[Sequence[str]]) -> Tuple[str, ...]:
+        """Get the nameserver set used for a query, falling back to the defaults"""
+        normalized = self._normalize_nameservers(nameservers)
+        return normalized or self.default_nameservers
+
+    def _get_resolver(self, ns_key: Tuple[str, ...]) -> dns.asyncresolver.Resolver:
+        """Get or create the resolver for a nameserver set"""
+        resolver = self._resolvers.get(ns_key)
+        if resolver is None:
+            if ns_key:
+                resolver = dns.asyncresolver.Resolver(configure=False)
+                resolver.nameservers = list(ns_key)
+            else:
+                resolver = dns.asyncresolver.Resolver()
+            resolver.timeout = self.timeout
+            resolver.lifetime = self.timeout * 2
+            # Caching is handled here so that negative answers are covered too
+            resolver.cache = None
+            self._resolvers[ns_key] = resolver
+        return resolver
+
+    def _get_semaphore(self, ns_key: Tuple[str, ...]) -> asyncio.Semaphore:
+        """Get the concurrency limiter for a nameserver set on the running loop"""
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.get(loop)
+        if semaphores is None:
+            semaphores = {}
+            self._semaphores[loop] = semaphores
+        if ns_key not in semaphores:
+            semaphores[ns_key] = asyncio.Semaphore(self.max_concurrency_per_nameserver)
+        return semaphores[ns_key]
+
+    def _get_in_flight(self) -> Dict[CacheKey, asyncio.Future]:
+        """Get the queries in flight on the running loop"""
+        loop = asyncio.get_running_loop()
+        in_flight = self._in_flight.get(loop)
+        if in_flight is None:
+            in_flight = {}
+            self._in_flight[loop] = in_flight
+        return in_flight
+
+    def _get_cached(self, key: CacheKey) -> Optional[Any]:
+        """Return a live cache entry, dropping it if expired"""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+
+        self._cache.move_to_end(key)
+        return value
+
+    def _store(self, key: CacheKey, value: Any, ttl: float) -> None:
+        """Store a cache entry and evict least recently used entries"""
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        self._cache[key] = (time.monotonic() + ttl, value)
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    async def resolve(
+        self,
+        qname: Union[str, dns.name.Name],
+        rdtype: Union[str, dns.rdatatype.RdataType] = "A",
+        nameservers: Optional[Sequence[str]] = None,
+        lifetime: Optional[float] = None,
+    ) -> dns.resolver.Answer:
+        """
+        Resolve a DNS query, serving repeated queries from the cache
+
+        Args:
+            qname: Name to query
+            rdtype: Record type (e.g. "A", "MX" or an RdataType)
+            nameservers: Optional custom nameservers, defaults to the configured ones
+            lifetime: Optional total time limit for the query in seconds
+
+        Returns:
+            The dnspython answer for the query
+
+        Raises:
+            dns.exception.DNSException: If the query fails; NXDOMAIN and NoAnswer
+            results are cached and raised again on later lookups
+        """
+        rdata_type = dns.rdatatype.RdataType.make(rdtype)
+        ns_key = self._nameserver_key(nameservers)
+        key = (
+            str(qname).lower().rstrip("."),
+            dns.rdatatype.to_text(rdata_type),
+            ns_key,
+        )
+
+        while True:
+            cached = self._get_cached(key)
+            if cached is not None:
+                if isinstance(cached, _Failure):
+                    self._stats["negative_hits"] += 1
+                    raise cached.exception()
+                self._stats["hits"] += 1
+                return cached
+
+            pending = self._get_in_flight().get(key)
+            if pending is None:
+                break
+            # Shielded so a waiter giving up does not cancel the shared query
+            outcome = await asyncio.shield(pending)
+            if outcome is None:
+                # The query was cancelled before it finished; try again
+                continue
+            self._stats["coalesced"] += 1
+            if isinstance(outcome, _Failure):
+                raise outcome.exception()
+            return outcome
+
+        self._stats["misses"] += 1
+        in_flight = self._get_in_flight()
+        future = asyncio.get_running_loop().create_future()
+        in_flight[key] = future
+        outcome = None
+        try:
+            async with self._get_semaphore(ns_key):
+                try:
+                    answer = await self._get_resolver(ns_key).resolve(
+                        qname, rdata_type, lifetime=lifetime
+                    )
+                except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer) as e:
+                    outcome = _Failure.of(e)
+                    self._store(key, outcome, self.negative_ttl)
+                    raise
+                except Exception as e:
+                    outcome = _Failure.of(e)
+                    raise
+            ttl = answer.rrset.ttl if answer.rrset is not None else self.negative_ttl
+            self._store(key, answer, min(ttl, self.max_ttl))
+            outcome = answer
+        finally:
+            del in_flight[key]
+            future.set_result(outcome)
+
+        return answer
+
+    async def resolve_ips(
+        self,
+        hostname: str,
+        record_types: Sequence[str] = ("A", "AAAA"),
+        nameservers: Optional[Sequence[str]] = None,
+        lifetime: Optional[float] = None,
+    ) -> List[str]:
+        """Resolve a hostname to its IP addresses, ignoring failed record types"""
+        results = await asyncio.gather(
+            *(
+                self.resolve(hostname, record_type, nameservers, lifetime)
+                for record_type in record_types
+            ),
+            return_exceptions=True,
+        )
+
+        ips = []
+        for answer in results:
+            if isinstance(answer, BaseException):
+                continue
+            for rdata in answer:
+                ip = rdata.to_text()
+                if ip not in ips:
+                    ips.append(ip)
+        return ips
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache metrics including the overall hit rate"""
+        hits = (
+            self._stats["hits"]
+            + self._stats["negative_hits"]
+            + self._stats["coalesced"]
+        )
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "entries": len(self._cache),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Drop all cached answers and reset metrics"""
+        self._cache.clear()
+        for stat in self._stats:
+            self._stats[stat] = 0
+
+
+# Global DNS resolver instance
+dns_resolver = DnsResolver()
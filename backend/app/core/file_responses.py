@@ -0,0 +1,170 @@
+"""
+HTTP responses for stored evidence files.
+
+File evidence never changes once uploaded and is identified by its SHA-256, so
+responses carry a strong ETag derived from the hash and may be cached for a
+long time. Clients revalidate with If-None-Match or If-Modified-Since and get
+a bodiless 304, and can request a byte range (206) to seek in large media.
+Everything is streamed from the storage backend, local or remote.
+"""
+
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, Iterator, Mapping, Optional, Tuple
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from starlette.datastructures import Headers
+
+from .storage import StorageBackend
+
+# Evidence responses depend on who is asking, so only private caches may keep them
+IMMUTABLE_CACHE_CONTROL = "private, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def _etag_matches(header: str, etag: Optional[str]) -> bool:
+    """Weak comparison against an If-None-Match list, as RFC 9110 asks for"""
+    if etag is None:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+def _not_modified_since(header: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a Range header into (start, end), with end exclusive.
+    Returns None for headers to ignore, such as other units, malformed values
+    or multiple ranges, in which case the whole file is served.
+    Raises RangeNotSatisfiable if the range lies outside the file.
+    """
+    unit, _, ranges = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+
+    first, sep, last = ranges.strip().partition("-")
+    first, last = first.strip(), last.strip()
+    if (
+        not sep
+        or (first and not first.isdigit())
+        or (last and not last.isdigit())
+        or not (first or last)
+    ):
+        return None
+
+    if not first:
+        # A suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    end = min(int(last) + 1, size) if last else size
+    return start, end
+
+
+def _stream(
+    storage: StorageBackend, key: str, start: int = 0, end: Optional[int] = None
+) -> Iterator[bytes]:
+    """
+    Open the object only once the body is iterated. Starlette iterates sync
+    bodies in a worker thread, so remote requests stay off the event loop.
+    """
+    yield from storage.open_read(key, start, end)
+
+
+def stored_file_response(
+    request_headers: Optional[Mapping[str, str]],
+    storage: StorageBackend,
+    key: str,
+    *,
+    media_type: str,
+    file_hash: Optional[str],
+    last_modified: datetime,
+    headers: Optional[Dict[str, str]] = None,
+    size: Optional[int] = None,
+) -> Response:
+    """
+    Serve a stored file, honouring conditional and range request headers.
+    Pass the size when it is already known to spare the backend a lookup.
+    Reads from the backend happen as the body is streamed, in a worker thread.
+    """
+    request_headers = Headers(headers=dict(request_headers or {}))
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+
+    etag = f'"{file_hash}"' if file_hash else None
+    last_modified_value = formatdate(last_modified.timestamp(), usegmt=True)
+    response_headers = {
+        "Accept-Ranges": "bytes",
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if etag else REVALIDATE_CACHE_CONTROL,
+        "Last-Modified": last_modified_value,
+        **(headers or {}),
+    }
+    if etag:
+        response_headers["ETag"] = etag
+
+    # If-Modified-Since only applies when there is no If-None-Match
+    if_none_match = request_headers.get("if-none-match")
+    if_modified_since = request_headers.get("if-modified-since")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=response_headers)
+    elif if_modified_since and _not_modified_since(if_modified_since, last_modified):
+        return Response(status_code=304, headers=response_headers)
+
+    if size is None:
+        size = storage.size(key)
+    range_header = request_headers.get("range")
+    if_range = request_headers.get("if-range")
+    # A stale If-Range means the client's partial copy is outdated: send it all
+    if range_header and (if_range is None or if_range in (etag, last_modified_value)):
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=416,
+                headers={**response_headers, "Content-Range": f"bytes */{size}"},
+            )
+        if byte_range:
+            start, end = byte_range
+            return StreamingResponse(
+                _stream(storage, key, start, end),
+                status_code=206,
+                media_type=media_type,
+                headers={
+                    **response_headers,
+                    "Content-Range": f"bytes {start}-{end - 1}/{size}",
+                    "Content-Length": str(end - start),
+                },
+            )
+
+    return StreamingResponse(
+        _stream(storage, key),
+        media_type=media_type,
+        headers={**response_headers, "Content-Length": str(size)},
+    )
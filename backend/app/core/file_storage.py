@@ -3,19 +3,37 @@ File storage utilities for handling evidence uploads
 """
 
 import hashlib
+import os
+import tempfile
 import urllib.parse
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import AsyncIterator, Container, NamedTuple, Optional, Tuple
 
 from fastapi import HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
 
+from .config import storage_settings
 from .logging import get_security_logger
-from .security import secure_filename_with_path, validate_file_security
+from .security import (
+    UPLOAD_CHUNK_SIZE,
+    FileSecurityValidator,
+    secure_filename_with_path,
+)
+from .storage import (
+    LocalStorageBackend,
+    ObjectInfo,
+    StorageBackend,
+    get_s3_backend,
+)
 
 UPLOAD_DIR = Path("uploads")
 if not UPLOAD_DIR.exists():
     UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
+# Content-addressed file storage, shared by every case
+BLOB_DIR_NAME = "blobs"
+
 
 def calculate_file_hash(content: bytes) -> str:
     """
@@ -118,12 +136,167 @@ def delete_folder(case_id: int, folder_path: str) -> None:
         parent = parent.parent
 
 
+def get_storage() -> StorageBackend:
+    """The backend evidence blobs are stored in"""
+    if storage_settings.STORAGE_BACKEND == "s3":
+        return get_s3_backend()
+    if storage_settings.STORAGE_BACKEND != "local":
+        raise RuntimeError(
+            f"Unknown storage backend: {storage_settings.STORAGE_BACKEND}"
+        )
+    return LocalStorageBackend(UPLOAD_DIR)
+
+
+def blob_key(file_hash: str) -> str:
+    """
+    Storage key of the content with the given SHA-256.
+    Blobs are fanned out by hash prefix, e.g. blobs/ab/cd/abcd...
+    """
+    if len(file_hash) != 64 or not all(c in "0123456789abcdef" for c in file_hash):
+        raise HTTPException(status_code=400, detail="Invalid file hash")
+    return f"{BLOB_DIR_NAME}/{file_hash[:2]}/{file_hash[2:4]}/{file_hash}"
+
+
+def staging_dir() -> Path:
+    """
+    Local directory to stage new content in before it is put into storage.
+    It is on the same filesystem as local blobs, for atomic renames.
+    """
+    temp_dir = UPLOAD_DIR / BLOB_DIR_NAME / ".tmp"
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    return temp_dir
+
+
+def _blob_temp_file() -> Tuple[int, Path]:
+    """Open a local temp file to stage new content in"""
+    fd, temp_name = tempfile.mkstemp(
+        dir=staging_dir(), prefix=".upload-", suffix=".part"
+    )
+    return fd, Path(temp_name)
+
+
+def store_blob(temp_path: Path, file_hash: str) -> bool:
+    """
+    Move freshly written content into the blob store.
+    Content that is already stored is not rewritten; the temp file is dropped.
+    Returns True if a new blob was created.
+    """
+    storage = get_storage()
+    key = blob_key(file_hash)
+    if storage.exists(key):
+        temp_path.unlink(missing_ok=True)
+        return False
+
+    storage.put_file(temp_path, key)
+    return True
+
+
+def delete_blob(file_hash: str) -> None:
+    """Delete a blob from the blob store"""
+    get_storage().delete(blob_key(file_hash))
+
+
+class StoredFile(NamedTuple):
+    """Where some content is stored, and what one lookup found there"""
+
+    storage: StorageBackend
+    key: str
+    # None if the content is missing
+    info: Optional[ObjectInfo]
+
+
+def evidence_file_location(evidence) -> StoredFile:
+    """
+    Where a file evidence's content is stored.
+    Evidence.content is the logical case path; the bytes live in the blob store,
+    except for files uploaded before it existed, which are still at that path
+    on the local uploads volume. Blocking: remote backends make a request, so
+    async callers run it in a worker thread.
+    """
+    if evidence.file_hash:
+        try:
+            key = blob_key(evidence.file_hash)
+        except HTTPException:
+            key = None
+        if key is not None:
+            storage = get_storage()
+            info = storage.stat(key)
+            if info is not None:
+                return StoredFile(storage, key, info)
+    storage = LocalStorageBackend(UPLOAD_DIR)
+    return StoredFile(storage, evidence.content, storage.stat(evidence.content))
+
+
+def _download(storage: StorageBackend, key: str, target: Path) -> None:
+    with open(target, "wb") as buffer:
+        for chunk in storage.open_read(key):
+            buffer.write(chunk)
+
+
+@asynccontextmanager
+async def named_evidence_file(
+    evidence, location: Optional[StoredFile] = None
+) -> AsyncIterator[Path]:
+    """
+    A local path to a file evidence's content that carries its original file
+    name, for tools that need a file and go by the extension. Local blobs are
+    linked into a temp directory; remote ones are downloaded there, so callers
+    check the type and size from the location before asking for the file.
+    """
+    if location is None:
+        location = await run_in_threadpool(evidence_file_location, evidence)
+    storage, key, info = location
+    name = Path(evidence.content).name
+    path = storage.local_path(key)
+    if path is not None and (path.name == name or info is None):
+        yield path
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        named_path = Path(temp_dir) / name
+        if path is not None:
+            named_path.symlink_to(path.resolve())
+        elif info is not None:
+            await run_in_threadpool(_download, storage, key, named_path)
+        yield named_path
+
+
+def logical_file_path(
+    case_id: int,
+    folder_path: Optional[str],
+    filename: str,
+    taken_paths: Container[str] = (),
+) -> str:
+    """
+    The case-relative path a new file is listed under.
+    Duplicate names get a counter, as they did when paths were physical.
+    """
+    case_dir = UPLOAD_DIR / str(case_id)
+    if folder_path:
+        case_dir = case_dir / normalize_folder_path(folder_path)
+
+    relative_dir = case_dir.relative_to(UPLOAD_DIR)
+    safe_filename = secure_filename_with_path(filename, case_dir)
+    name, ext = os.path.splitext(safe_filename)
+
+    candidate = safe_filename
+    counter = 1
+    while str(relative_dir / candidate) in taken_paths:
+        candidate = f"{name}_{counter}{ext}"
+        counter += 1
+    return str(relative_dir / candidate)
+
+
 async def save_upload_file(
-    upload_file: UploadFile, case_id: int, folder_path: Optional[str] = None
+    upload_file: UploadFile,
+    case_id: int,
+    folder_path: Optional[str] = None,
+    taken_paths: Container[str] = (),
 ) -> Tuple[str, str]:
     """
-    Save an uploaded file to the uploads directory.
-    Returns a tuple of (relative_path, file_hash).
+    Save an uploaded file to the blob store.
+    Returns a tuple of (relative_path, file_hash), where relative_path is the
+    logical case path, unique among taken_paths.
     """
     if case_id is None:
         raise HTTPException(
@@ -143,39 +316,37 @@ async def save_upload_file(
             detail="No file was provided for upload",
         )
 
-    await validate_file_security(upload_file)
-
-    security_logger = get_security_logger(
-        event="file_upload_validated",
-        filename=upload_file.filename,
-        case_id=case_id,
-        file_size=upload_file.size if hasattr(upload_file, "size") else None,
-    )
-    security_logger.info(f"File upload validated: {upload_file.filename}")
+    validator = FileSecurityValidator(upload_file.filename, upload_file.content_type)
 
     try:
-        case_dir = UPLOAD_DIR / str(case_id)
-        if folder_path:
-            normalized_path = normalize_folder_path(folder_path)
-            case_dir = case_dir / normalized_path
-        case_dir.mkdir(parents=True, exist_ok=True)
-
-        safe_filename = secure_filename_with_path(upload_file.filename, case_dir)
-        file_path = case_dir / safe_filename
-
-        content = await upload_file.read()
-
-        if len(content) > 15 * 1024 * 1024:  # 15MB limit
-            raise HTTPException(
-                status_code=400, detail="File too large. Maximum size is 15MB"
-            )
-
-        file_hash = calculate_file_hash(content)
+        # One pass validates, hashes and writes, so memory stays at one chunk.
+        # The data lands in a temp file and is renamed into the blob store, so
+        # a rejected or failed upload never leaves a partial file.
+        hasher = hashlib.sha256()
+        fd, temp_path = _blob_temp_file()
+        with os.fdopen(fd, "wb") as buffer:
+            while True:
+                chunk = await upload_file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                validator.update(chunk)
+                hasher.update(chunk)
+                buffer.write(chunk)
+        validator.finish()
 
-        with open(file_path, "wb") as buffer:
-            buffer.write(content)
+        security_logger = get_security_logger(
+            event="file_upload_validated",
+            filename=upload_file.filename,
+            case_id=case_id,
+            file_size=validator.size,
+        )
+        security_logger.info(f"File upload validated: {upload_file.filename}")
 
-        relative_path = str(file_path.relative_to(UPLOAD_DIR))
+        file_hash = hasher.hexdigest()
+        relative_path = logical_file_path(
+            case_id, folder_path, upload_file.filename, taken_paths
+        )
+        is_new_blob = await run_in_threadpool(store_blob, temp_path, file_hash)
 
         security_logger = get_security_logger(
             event="file_upload_complete",
@@ -183,24 +354,17 @@ async def save_upload_file(
             case_id=case_id,
             relative_path=relative_path,
             file_hash=file_hash,
+            deduplicated=not is_new_blob,
         )
         security_logger.info(
             f"File uploaded successfully: {upload_file.filename} to {relative_path}"
         )
 
         return relative_path, file_hash
-    except HTTPException:
-        raise
     except Exception as e:
         try:
-            if "file_path" in locals() and file_path.exists():
-                file_path.unlink()
-            if (
-                "case_dir" in locals()
-                and case_dir.exists()
-                and not any(case_dir.iterdir())
-            ):
-                case_dir.rmdir()
+            if "temp_path" in locals() and temp_path.exists():
+                temp_path.unlink()
         except Exception as cleanup_error:
             security_logger = get_security_logger(
                 event="file_cleanup_error", case_id=case_id
@@ -208,6 +372,8 @@ async def save_upload_file(
             security_logger.warning(
                 f"Failed to cleanup after file save error: {cleanup_error}"
             )
+        if isinstance(e, HTTPException):
+            raise
         security_logger = get_security_logger(
             event="file_upload_error", filename=upload_file.filename, case_id=case_id
         )
@@ -219,6 +385,142 @@ async def save_upload_file(
         )
 
 
+def upload_file_size(upload_file: UploadFile) -> int:
+    """Size in bytes of a received upload, measured if the client did not say"""
+    if upload_file.size is not None:
+        return upload_file.size
+    position = upload_file.file.tell()
+    size = upload_file.file.seek(0, os.SEEK_END)
+    upload_file.file.seek(position)
+    return size
+
+
+def store_upload_blob(upload_file: UploadFile) -> str:
+    """
+    Validate, hash and store an uploaded file in the blob store.
+    Blocking, so several files can be stored at once in worker threads;
+    the caller picks the logical path. Returns the file's hash.
+    """
+    validator = FileSecurityValidator(upload_file.filename, upload_file.content_type)
+    hasher = hashlib.sha256()
+    upload_file.file.seek(0)
+    fd, temp_path = _blob_temp_file()
+    try:
+        with os.fdopen(fd, "wb") as buffer:
+            while True:
+                chunk = upload_file.file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                validator.update(chunk)
+                hasher.update(chunk)
+                buffer.write(chunk)
+        validator.finish()
+
+        file_hash = hasher.hexdigest()
+        is_new_blob = store_blob(temp_path, file_hash)
+    except Exception as e:
+        temp_path.unlink(missing_ok=True)
+        if isinstance(e, HTTPException):
+            raise
+        get_security_logger(
+            event="file_upload_error", filename=upload_file.filename
+        ).error(f"Failed to save file {upload_file.filename}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Could not save file. Please try again or contact support.",
+        )
+
+    get_security_logger(
+        event="file_upload_complete",
+        filename=upload_file.filename,
+        file_size=validator.size,
+        file_hash=file_hash,
+        deduplicated=not is_new_blob,
+    ).info(f"File stored: {upload_file.filename}")
+    return file_hash
+
+
+def _partial_upload_path(upload_id: str) -> Path:
+    """Where the bytes received so far for a chunked upload are kept"""
+    if not upload_id or not upload_id.isalnum():
+        raise HTTPException(status_code=400, detail="Invalid upload ID")
+    return UPLOAD_DIR / ".incoming" / f"{upload_id}.part"
+
+
+async def write_upload_chunk(
+    upload_id: str, offset: int, chunks: AsyncIterator[bytes], max_size: int
+) -> int:
+    """
+    Write a chunk of a resumable upload at the given offset, streaming to disk.
+    Anything previously stored past the offset is discarded first, so a client
+    can safely resend a chunk that was interrupted. Returns the new size.
+    """
+    part_path = _partial_upload_path(upload_id)
+
+    def open_part():
+        part_path.parent.mkdir(parents=True, exist_ok=True)
+        buffer = open(part_path, "ab")
+        buffer.truncate(offset)
+        return buffer
+
+    # Disk writes run in worker threads so a slow disk never stalls the loop
+    buffer = await run_in_threadpool(open_part)
+    try:
+        size = offset
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_size:
+                await run_in_threadpool(buffer.truncate, offset)
+                raise HTTPException(
+                    status_code=413, detail="Chunk exceeds the declared upload size"
+                )
+            await run_in_threadpool(buffer.write, chunk)
+    finally:
+        await run_in_threadpool(buffer.close)
+
+    return size
+
+
+def inspect_partial_upload(
+    upload_id: str, filename: str, content_type: Optional[str], max_size: int
+) -> Tuple[str, int]:
+    """
+    Validate a fully received chunked upload and hash it in one streaming pass.
+    Returns a tuple of (file_hash, size).
+    """
+    validator = FileSecurityValidator(filename, content_type, max_size=max_size)
+    hasher = hashlib.sha256()
+
+    with open(_partial_upload_path(upload_id), "rb") as part:
+        while chunk := part.read(UPLOAD_CHUNK_SIZE):
+            validator.update(chunk)
+            hasher.update(chunk)
+    validator.finish()
+
+    return hasher.hexdigest(), validator.size
+
+
+def store_partial_upload(upload_id: str, file_hash: str) -> bool:
+    """
+    Move a completed and verified chunked upload into the blob store.
+    Returns True if a new blob was created.
+    """
+    return store_blob(_partial_upload_path(upload_id), file_hash)
+
+
+def discard_partial_upload(upload_id: str) -> None:
+    """Delete whatever has been received for a chunked upload"""
+    _partial_upload_path(upload_id).unlink(missing_ok=True)
+
+
+def get_case_storage_usage(case_id: int) -> int:
+    """Total size in bytes of the files stored at a case's own path"""
+    case_dir = UPLOAD_DIR / str(case_id)
+    if not case_dir.exists():
+        return 0
+    return sum(path.stat().st_size for path in case_dir.rglob("*") if path.is_file())
+
+
 def create_case_directory(case_id: int) -> Path:
     """
     Create the directory structure for a new case.
@@ -7,6 +7,7 @@ and ephemeral token management for WebSocket authentication.
 """
 
 import base64
+import codecs
 import os
 import secrets
 import time
@@ -87,50 +88,95 @@ ALLOWED_MIME_TYPES = {
 }
 
 
-async def validate_file_security(file: UploadFile) -> None:
+# filetype only inspects this many leading bytes
+FILETYPE_HEAD_SIZE = 8192
+TEXT_CONTENT_TYPES = ("text/plain", "text/html")
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB chunks
+
+
+class FileSecurityValidator:
     """
-    Validate file security including size, type, and content.
-    Uses filetype for proper file type detection, with special handling for text files.
+    Incremental file security validation, one chunk at a time.
+    Feed every chunk to update() and call finish() once the upload is read.
+    Only the leading bytes needed for type detection are kept in memory.
     """
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="No file name provided")
 
-    file_size = 0
-    chunk_size = 1024 * 1024  # 1MB chunks
-    content = b""
-    await file.seek(0)
-
-    while True:
-        chunk = await file.read(chunk_size)
-        if not chunk:
-            break
-        content += chunk
-        file_size += len(chunk)
-        if file_size > MAX_FILE_SIZE:
-            await file.seek(0)
+    def __init__(
+        self,
+        filename: Optional[str],
+        content_type: Optional[str],
+        max_size: int = MAX_FILE_SIZE,
+    ):
+        if not filename:
+            raise HTTPException(status_code=400, detail="No file name provided")
+
+        self.max_size = max_size
+        self.size = 0
+        self._head = bytearray()
+        self._type_allowed: Optional[bool] = None
+        self._may_be_text = content_type in TEXT_CONTENT_TYPES
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def _check_type(self) -> None:
+        kind = filetype.guess(bytes(self._head))
+        self._type_allowed = bool(kind and kind.mime in ALLOWED_MIME_TYPES)
+        self._head = bytearray()
+        if not self._type_allowed and not self._may_be_text:
+            raise HTTPException(status_code=400, detail="File type not allowed")
+
+    def update(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_size:
             raise HTTPException(
                 status_code=400,
-                detail=f"File too large. Maximum size is {MAX_FILE_SIZE / (1024 * 1024)}MB",
+                detail=f"File too large. Maximum size is {self.max_size / (1024 * 1024)}MB",
             )
 
-    await file.seek(0)
+        if self._type_allowed is None:
+            self._head += chunk[: FILETYPE_HEAD_SIZE - len(self._head)]
+            if len(self._head) >= FILETYPE_HEAD_SIZE:
+                self._check_type()
+
+        # Files claiming to be text are accepted if they are valid UTF-8 throughout
+        if not self._type_allowed and self._may_be_text:
+            try:
+                self._text_decoder.decode(chunk)
+            except UnicodeDecodeError:
+                self._may_be_text = False
+
+    def finish(self) -> None:
+        if self._type_allowed is None:
+            self._check_type()
+        if self._type_allowed:
+            return
 
-    kind = filetype.guess(content)
+        if self._may_be_text:
+            try:
+                self._text_decoder.decode(b"", final=True)
+                return
+            except UnicodeDecodeError:
+                pass
 
-    if kind and kind.mime in ALLOWED_MIME_TYPES:
-        return
+        raise HTTPException(status_code=400, detail="File type not allowed")
 
-    # If filetype couldn't detect the type or it's not in allowed types,
-    # check if it might be a text file (including HTML)
-    if file.content_type in ["text/plain", "text/html"]:
-        try:
-            content.decode("utf-8")
-            # If we got here, it's valid UTF-8 text
-            return
-        except UnicodeDecodeError:
-            pass
 
-    raise HTTPException(status_code=400, detail="File type not allowed")
+async def validate_file_security(file: UploadFile) -> None:
+    """
+    Validate file security including size, type, and content.
+    Uses filetype for proper file type detection, with special handling for text files.
+    """
+    validator = FileSecurityValidator(file.filename, file.content_type)
+    await file.seek(0)
+
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            validator.update(chunk)
+        validator.finish()
+    finally:
+        await file.seek(0)
 
 
 def secure_filename_with_path(filename: str, base_path: Path) -> str:
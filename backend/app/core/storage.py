@@ -0,0 +1,289 @@
+"""
+Storage backends for evidence file content.
+
+Evidence content is read and written through a StorageBackend, so it can live
+on a local volume or in an S3-compatible object store (AWS S3, MinIO, ...).
+With object storage, API nodes no longer need a shared disk to serve evidence.
+Keys are relative, slash-separated paths such as blobs/ab/cd/<sha256>.
+"""
+
+import os
+import urllib.parse
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Iterator, NamedTuple, Optional
+
+from .config import storage_settings
+
+STORAGE_CHUNK_SIZE = 1024 * 1024
+
+
+def content_disposition(filename: str) -> str:
+    """An attachment Content-Disposition header value for any file name"""
+    quoted = urllib.parse.quote(filename)
+    if quoted == filename:
+        return f'attachment; filename="{filename}"'
+    return f"attachment; filename*=utf-8''{quoted}"
+
+
+class ObjectInfo(NamedTuple):
+    """What a single metadata lookup tells about a stored object"""
+
+    size: int
+    etag: Optional[str] = None
+
+
+class StorageBackend(ABC):
+    """Where evidence content is kept"""
+
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
+
+    @abstractmethod
+    def stat(self, key: str) -> Optional[ObjectInfo]:
+        """Size and ETag of an object, or None if it is missing"""
+        ...
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        """Size of an object in bytes; raises FileNotFoundError if missing"""
+        ...
+
+    @abstractmethod
+    def open_read(
+        self, key: str, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """
+        Stream the bytes of an object from start up to, not including, end.
+        Raises FileNotFoundError if the object is missing.
+        """
+        ...
+
+    @abstractmethod
+    def put_file(self, local_path: Path, key: str) -> None:
+        """Move a local file into storage; the local file is consumed"""
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Delete an object, if it exists"""
+        ...
+
+    def local_path(self, key: str) -> Optional[Path]:
+        """The object's path on this node's filesystem, if it has one"""
+        return None
+
+    def presigned_url(self, key: str, filename: str, expires_in: int) -> Optional[str]:
+        """A time-limited URL clients can download from directly, if supported"""
+        return None
+
+    def read_bytes(self, key: str) -> bytes:
+        return b"".join(self.open_read(key))
+
+
+class LocalStorageBackend(StorageBackend):
+    """Objects stored as files under a root directory"""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = self.root / key
+        if ".." in Path(key).parts or not path.resolve().is_relative_to(
+            self.root.resolve()
+        ):
+            raise ValueError(f"Invalid storage key: {key}")
+        return path
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def stat(self, key: str) -> Optional[ObjectInfo]:
+        path = self._path(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        if not path.is_file():
+            return None
+        return ObjectInfo(size=stat.st_size)
+
+    def size(self, key: str) -> int:
+        return self._path(key).stat().st_size
+
+    def open_read(
+        self, key: str, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[bytes]:
+        # Opened eagerly so a missing file fails before any bytes are sent
+        handle = open(self._path(key), "rb")
+        return self._iter_file(handle, start, end)
+
+    @staticmethod
+    def _iter_file(handle, start: int, end: Optional[int]) -> Iterator[bytes]:
+        with handle:
+            handle.seek(start)
+            remaining = None if end is None else max(0, end - start)
+            while remaining is None or remaining > 0:
+                size = STORAGE_CHUNK_SIZE
+                if remaining is not None:
+                    size = min(size, remaining)
+                chunk = handle.read(size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def put_file(self, local_path: Path, key: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(local_path, path)
+
+    def delete(self, key: str) -> None:
+        path = self._path(key)
+        path.unlink(missing_ok=True)
+
+        # Prune directories the object leaves empty
+        root = self.root.resolve()
+        parent = path.parent
+        while (
+            parent.resolve() != root and parent.exists() and not any(parent.iterdir())
+        ):
+            parent.rmdir()
+            parent = parent.parent
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return self._path(key)
+
+
+def _is_not_found(error: Exception) -> bool:
+    response = getattr(error, "response", None) or {}
+    return response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
+
+class S3StorageBackend(StorageBackend):
+    """Objects stored in an S3-compatible bucket"""
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        prefix: str = "",
+        client: Any = None,
+    ):
+        if not bucket:
+            raise RuntimeError("An S3 bucket is required for S3 storage")
+        if client is None:
+            try:
+                import boto3
+                from botocore.config import Config
+            except ImportError:
+                raise RuntimeError("boto3 library not installed")
+
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url or None,
+                region_name=region or None,
+                aws_access_key_id=access_key_id or None,
+                aws_secret_access_key=secret_access_key or None,
+                # Custom endpoints such as MinIO rarely resolve bucket subdomains
+                config=Config(
+                    signature_version="s3v4",
+                    s3={"addressing_style": "path" if endpoint_url else "auto"},
+                ),
+            )
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self._client = client
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    def _head(self, key: str) -> dict:
+        try:
+            return self._client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except Exception as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(key) from e
+            raise
+
+    def exists(self, key: str) -> bool:
+        return self.stat(key) is not None
+
+    def stat(self, key: str) -> Optional[ObjectInfo]:
+        try:
+            head = self._head(key)
+        except FileNotFoundError:
+            return None
+        return ObjectInfo(
+            size=head["ContentLength"], etag=(head.get("ETag") or "").strip('"') or None
+        )
+
+    def size(self, key: str) -> int:
+        return self._head(key)["ContentLength"]
+
+    def open_read(
+        self, key: str, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[bytes]:
+        if end is not None and end <= start:
+            return iter(())
+
+        params = {"Bucket": self.bucket, "Key": self._key(key)}
+        if start or end is not None:
+            last = "" if end is None else end - 1
+            params["Range"] = f"bytes={start}-{last}"
+        try:
+            response = self._client.get_object(**params)
+        except Exception as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(key) from e
+            raise
+        return self._iter_body(response["Body"])
+
+    @staticmethod
+    def _iter_body(body) -> Iterator[bytes]:
+        try:
+            yield from body.iter_chunks(STORAGE_CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def put_file(self, local_path: Path, key: str) -> None:
+        # Large files are sent as a streamed multipart upload by boto3
+        self._client.upload_file(str(local_path), self.bucket, self._key(key))
+        Path(local_path).unlink(missing_ok=True)
+
+    def delete(self, key: str) -> None:
+        self._client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def presigned_url(self, key: str, filename: str, expires_in: int) -> Optional[str]:
+        return self._client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": self._key(key),
+                "ResponseContentDisposition": content_disposition(filename),
+            },
+            ExpiresIn=expires_in,
+        )
+
+
+_s3_backend: Optional[S3StorageBackend] = None
+
+
+def get_s3_backend() -> S3StorageBackend:
+    """The configured S3 backend, created once per process"""
+    global _s3_backend
+    if _s3_backend is None:
+        _s3_backend = S3StorageBackend(
+            bucket=storage_settings.STORAGE_S3_BUCKET,
+            endpoint_url=storage_settings.STORAGE_S3_ENDPOINT_URL,
+            region=storage_settings.STORAGE_S3_REGION,
+            access_key_id=storage_settings.STORAGE_S3_ACCESS_KEY_ID,
+            secret_access_key=storage_settings.STORAGE_S3_SECRET_ACCESS_KEY,
+            prefix=storage_settings.STORAGE_S3_PREFIX,
+        )
+    return _s3_backend
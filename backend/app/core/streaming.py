@@ -0,0 +1,143 @@
+"""
+Streaming of plugin results to HTTP clients.
+
+Results are read from the plugin into a bounded queue, so a slow client pauses
+the plugin instead of buffering without limit. Results arriving close together
+are written as one chunk, idle streams get keepalive frames so proxies do not
+drop them, and the plugin is cancelled as soon as the client goes away.
+"""
+
+import asyncio
+import json
+from contextlib import suppress
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from .config import streaming_settings
+
+NDJSON = "ndjson"
+SSE = "sse"
+
+MEDIA_TYPES = {
+    NDJSON: "application/x-ndjson",
+    SSE: "text/event-stream",
+}
+
+# Stops reverse proxies such as nginx from buffering the stream
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+_DONE = object()
+
+
+def format_frame(item: Dict[str, Any], transport: str = NDJSON) -> str:
+    """Serialize one result for the given transport"""
+    payload = json.dumps(item, default=str)
+    if transport == SSE:
+        return f"event: {item.get('type', 'message')}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+def heartbeat_frame(transport: str = NDJSON) -> str:
+    """Keepalive frame; SSE comments are ignored by EventSource clients"""
+    if transport == SSE:
+        return ": keepalive\n\n"
+    return format_frame({"type": "heartbeat"}, transport)
+
+
+async def stream_results(
+    results: AsyncIterator[Dict[str, Any]],
+    *,
+    transport: str = NDJSON,
+    is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None,
+    batch_window: Optional[float] = None,
+    batch_max_items: Optional[int] = None,
+    heartbeat_interval: Optional[float] = None,
+    queue_size: Optional[int] = None,
+) -> AsyncIterator[str]:
+    """
+    Yield formatted chunks of results, batching and adding keepalives
+
+    Args:
+        results: The plugin's result generator
+        transport: "ndjson" or "sse"
+        is_disconnected: Checked between chunks; the stream stops when it returns True
+        batch_window: Seconds to wait for more results before writing a chunk
+        batch_max_items: Most results written in one chunk
+        heartbeat_interval: Seconds without results before a keepalive frame
+        queue_size: Results read ahead of the client before the plugin is paused
+
+    Exceptions raised by the plugin are re-raised after the results before them
+    have been written. The plugin is always cancelled and closed on exit.
+    """
+    if batch_window is None:
+        batch_window = streaming_settings.STREAM_BATCH_WINDOW_MS / 1000
+    if batch_max_items is None:
+        batch_max_items = streaming_settings.STREAM_BATCH_MAX_ITEMS
+    if heartbeat_interval is None:
+        heartbeat_interval = streaming_settings.STREAM_HEARTBEAT_SECONDS
+    if queue_size is None:
+        queue_size = streaming_settings.STREAM_QUEUE_SIZE
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+    async def produce():
+        try:
+            async for item in results:
+                await queue.put((item, None))
+        except Exception as e:
+            await queue.put((_DONE, e))
+        else:
+            await queue.put((_DONE, None))
+
+    producer = asyncio.create_task(produce())
+    loop = asyncio.get_running_loop()
+
+    try:
+        while True:
+            try:
+                item, error = await asyncio.wait_for(queue.get(), heartbeat_interval)
+            except asyncio.TimeoutError:
+                if is_disconnected and await is_disconnected():
+                    return
+                yield heartbeat_frame(transport)
+                continue
+
+            # Gather whatever else arrives within the batch window
+            chunk = []
+            finished = False
+            deadline = loop.time() + batch_window
+            while True:
+                if item is _DONE:
+                    finished = True
+                    break
+                chunk.append(format_frame(item, transport))
+                if len(chunk) >= batch_max_items:
+                    break
+                try:
+                    item, error = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item, error = await asyncio.wait_for(queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+
+            if chunk:
+                yield "".join(chunk)
+            if finished:
+                if error:
+                    raise error
+                return
+            if is_disconnected and await is_disconnected():
+                return
+    finally:
+        # Stop the plugin when the client disconnects or the stream is abandoned
+        if not producer.done():
+            producer.cancel()
+            with suppress(asyncio.CancelledError):
+                await producer
+        aclose = getattr(results, "aclose", None)
+        if aclose:
+            with suppress(Exception):
+                await aclose()
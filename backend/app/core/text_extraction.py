@@ -0,0 +1,115 @@
+"""
+Plain text extraction from evidence files for the search index.
+
+Text files are decoded with the encoding detected from a sample of their first
+bytes, HTML is reduced to its visible text and PDFs to the text of their pages.
+Extraction stops once enough text has been gathered, so a huge log or report
+costs no more to index than the first part of it.
+"""
+
+import tempfile
+from pathlib import Path
+
+from .config import text_viewer_settings
+from .file_storage import evidence_file_location, staging_dir
+from .storage import StorageBackend
+from .text_index import detect_encoding
+
+PLAIN_TEXT_EXTENSIONS = {
+    ".txt",
+    ".log",
+    ".csv",
+    ".json",
+    ".md",
+    ".yaml",
+    ".yml",
+    ".xml",
+    ".sql",
+    ".conf",
+    ".ini",
+    ".cfg",
+}
+HTML_EXTENSIONS = {".html", ".htm"}
+PDF_EXTENSIONS = {".pdf"}
+
+# Markup makes up most of a typical page, so more of it is read
+HTML_BYTES_PER_CHAR = 8
+
+
+class UnsupportedFormat(Exception):
+    """The file's format holds no text that can be extracted"""
+
+
+def supports_extraction(filename: str) -> bool:
+    extension = Path(filename).suffix.lower()
+    return extension in PLAIN_TEXT_EXTENSIONS | HTML_EXTENSIONS | PDF_EXTENSIONS
+
+
+def _decode_head(storage: StorageBackend, key: str, size: int, max_bytes: int) -> str:
+    end = min(size, max_bytes)
+    data = b"".join(storage.open_read(key, 0, end)) if end else b""
+    sample = data[: text_viewer_settings.TEXT_ENCODING_SAMPLE_BYTES]
+    encoding, _, bom_length, _ = detect_encoding(sample)
+    return data[bom_length:].decode(encoding, errors="replace")
+
+
+def _extract_html(storage: StorageBackend, key: str, size: int, max_chars: int) -> str:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(
+        _decode_head(storage, key, size, max_chars * HTML_BYTES_PER_CHAR),
+        "html.parser",
+    )
+    for element in soup(["script", "style", "noscript", "template"]):
+        element.decompose()
+    return soup.get_text(" ", strip=True)
+
+
+def _extract_pdf(storage: StorageBackend, key: str, max_chars: int) -> str:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise UnsupportedFormat("PDF text extraction requires pypdf")
+
+    with tempfile.TemporaryDirectory(dir=staging_dir()) as temp_dir:
+        path = storage.local_path(key)
+        if path is None:
+            path = Path(temp_dir) / "source.pdf"
+            with open(path, "wb") as buffer:
+                for chunk in storage.open_read(key):
+                    buffer.write(chunk)
+
+        pages = []
+        length = 0
+        for page in PdfReader(path).pages:
+            text = page.extract_text() or ""
+            pages.append(text)
+            length += len(text)
+            if length >= max_chars:
+                break
+        return "\n".join(pages)
+
+
+def extract_text(evidence, max_chars: int) -> str:
+    """
+    The searchable text of a file evidence, at most max_chars long.
+    Raises UnsupportedFormat for files without extractable text and
+    FileNotFoundError if the file is missing from storage.
+    """
+    extension = Path(evidence.content).suffix.lower()
+    storage, key, info = evidence_file_location(evidence)
+    if info is None:
+        raise FileNotFoundError(key)
+
+    if extension in PLAIN_TEXT_EXTENSIONS:
+        # Enough bytes for max_chars characters in any supported encoding
+        text = _decode_head(storage, key, info.size, max_chars * 4)
+    elif extension in HTML_EXTENSIONS:
+        text = _extract_html(storage, key, info.size, max_chars)
+    elif extension in PDF_EXTENSIONS:
+        text = _extract_pdf(storage, key, max_chars)
+    else:
+        raise UnsupportedFormat(f"No text extraction for '{extension}' files")
+
+    # PostgreSQL text cannot hold NUL characters
+    return text[:max_chars].replace("\x00", "")
@@ -0,0 +1,396 @@
+"""
+Paged viewing of large text evidence.
+
+Rather than decoding a whole file to show it, the encoding is detected from a
+sample of its first bytes and a sparse line index is built in one pass: the
+byte offset of every Nth line. A page of lines is then read by jumping to the
+nearest indexed line and scanning fewer than N lines forward. Local files are
+memory-mapped, so neither pass copies the file into memory. Indexes are kept
+in the storage backend keyed by the file's SHA-256, and the most recent ones
+in memory, so each file is only scanned once.
+"""
+
+import codecs
+import json
+import mmap
+import os
+import tempfile
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from .config import text_viewer_settings
+from .file_storage import blob_key, get_storage, staging_dir
+from .logging import get_security_logger
+from .storage import StorageBackend
+
+TEXT_INDEX_DIR_NAME = "text-index"
+# Bump when the stored format changes, so older indexes are rebuilt
+TEXT_INDEX_VERSION = 1
+
+# A multiple of every code unit width, so chunks never split a newline
+READ_CHUNK_SIZE = 1024 * 1024
+MAX_PAGE_LINES = 5000
+MAX_PAGE_BYTES = 1024 * 1024
+
+# UTF-32-LE's mark starts with UTF-16-LE's, so it is checked first
+_BYTE_ORDER_MARKS = [
+    (codecs.BOM_UTF32_LE, "utf-32-le", 4),
+    (codecs.BOM_UTF32_BE, "utf-32-be", 4),
+    (codecs.BOM_UTF8, "utf-8", 1),
+    (codecs.BOM_UTF16_LE, "utf-16-le", 2),
+    (codecs.BOM_UTF16_BE, "utf-16-be", 2),
+]
+
+# Read from request worker threads, so every access holds the lock
+_cache: "OrderedDict[str, TextIndex]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+@dataclass
+class TextIndex:
+    # Codec to decode ranges of the file with; the byte order mark is skipped
+    encoding: str
+    confidence: float
+    bom_length: int
+    # Bytes per code unit: 2 for UTF-16, 4 for UTF-32, otherwise 1
+    unit: int
+    size: int
+    line_count: int
+    interval: int
+    # Byte offsets of lines 0, interval, 2 * interval, ...
+    checkpoints: List[int] = field(default_factory=list)
+
+    @property
+    def newline(self) -> bytes:
+        return "\n".encode(self.encoding)
+
+    def decode(self, data: bytes) -> str:
+        return data.decode(self.encoding, errors="replace")
+
+    def align(self, offset: int) -> int:
+        """Round an offset down to the start of a code unit"""
+        offset = min(max(offset, self.bom_length), self.size)
+        return offset - (offset - self.bom_length) % self.unit
+
+
+@dataclass
+class TextPage:
+    content: str
+    start_line: int
+    line_count: int
+    start_offset: int
+    end_offset: int
+    # The page ends inside a line that is longer than a page
+    truncated: bool = False
+
+
+def detect_encoding(sample: bytes) -> Tuple[str, float, int, int]:
+    """
+    Detect the encoding of a file from a sample of its first bytes.
+    Returns (codec, confidence, byte order mark length, code unit width).
+    """
+    for mark, codec, unit in _BYTE_ORDER_MARKS:
+        if sample.startswith(mark):
+            return codec, 1.0, len(mark), unit
+
+    import chardet
+
+    result = chardet.detect(sample)
+    encoding = result.get("encoding") or "utf-8"
+    confidence = result.get("confidence") or 0.0
+    try:
+        codec = codecs.lookup(encoding).name
+    except LookupError:
+        return "utf-8", 0.0, 0, 1
+
+    # A sample of plain ASCII may well be followed by UTF-8
+    if codec == "ascii":
+        codec = "utf-8"
+    elif codec in ("utf-16", "utf-32"):
+        codec = f"{codec}-le"
+    unit = {"utf-16": 2, "utf-32": 4}.get(codec[:6], 1)
+    return codec, confidence, 0, unit
+
+
+class _TextSource:
+    """Reads ranges of a stored file, through a memory map when it is local"""
+
+    def __init__(self, storage: StorageBackend, key: str, size: int):
+        self.storage = storage
+        self.key = key
+        self.size = size
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+
+    def __enter__(self) -> "_TextSource":
+        path = self.storage.local_path(self.key)
+        # Empty files cannot be mapped
+        if path is not None and self.size:
+            self._file = open(path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+
+    def read(self, start: int, end: int) -> bytes:
+        if self._map is not None:
+            return self._map[start:end]
+        return b"".join(self.storage.open_read(self.key, start, end))
+
+    def chunks(self, start: int) -> Iterator[Tuple[int, bytes]]:
+        """(offset, data) pairs from start to the end of the file"""
+        if self._map is not None:
+            for offset in range(start, self.size, READ_CHUNK_SIZE):
+                yield offset, self._map[offset : offset + READ_CHUNK_SIZE]
+            return
+
+        # Backends return chunks of any length; keep them code unit aligned
+        offset, pending = start, b""
+        for data in self.storage.open_read(self.key, start):
+            pending += data
+            usable = len(pending) - len(pending) % 4
+            if usable:
+                yield offset, pending[:usable]
+                offset, pending = offset + usable, pending[usable:]
+        if pending:
+            yield offset, pending
+
+
+def _line_ends(chunk: bytes, newline: bytes, unit: int) -> Iterator[int]:
+    """Offsets just past each newline in an aligned chunk"""
+    position = chunk.find(newline)
+    while position != -1:
+        if position % unit:
+            # A match straddling two code units is not a newline
+            position = chunk.find(newline, position + 1)
+            continue
+        yield position + unit
+        position = chunk.find(newline, position + unit)
+
+
+def _iter_line_ends(
+    source: _TextSource, start: int, index: "TextIndex"
+) -> Iterator[int]:
+    newline = index.newline
+    for offset, chunk in source.chunks(start):
+        for end in _line_ends(chunk, newline, index.unit):
+            yield offset + end
+
+
+def build_text_index(
+    storage: StorageBackend, key: str, interval: Optional[int] = None
+) -> TextIndex:
+    """Detect a stored file's encoding and record where every Nth line starts"""
+    interval = interval or text_viewer_settings.TEXT_INDEX_LINE_INTERVAL
+    size = storage.size(key)
+    sample_size = min(size, text_viewer_settings.TEXT_ENCODING_SAMPLE_BYTES)
+    sample = b"".join(storage.open_read(key, 0, sample_size)) if size else b""
+    encoding, confidence, bom_length, unit = detect_encoding(sample)
+
+    index = TextIndex(
+        encoding=encoding,
+        confidence=confidence,
+        bom_length=bom_length,
+        unit=unit,
+        size=size,
+        line_count=0,
+        interval=interval,
+        checkpoints=[bom_length],
+    )
+    newline = index.newline
+    newlines = 0
+    with _TextSource(storage, key, size) as source:
+        for offset, chunk in source.chunks(bom_length):
+            # Counting is done in C; most chunks hold no indexed line
+            if unit == 1:
+                count = chunk.count(newline)
+                if newlines % interval + count < interval:
+                    newlines += count
+                    continue
+            for end in _line_ends(chunk, newline, unit):
+                newlines += 1
+                if newlines % interval == 0:
+                    index.checkpoints.append(offset + end)
+
+        ends_with_newline = size - bom_length >= unit and (
+            source.read(size - unit, size) == newline
+        )
+
+    has_partial_line = size > bom_length and not ends_with_newline
+    index.line_count = newlines + (1 if has_partial_line else 0)
+    return index
+
+
+def read_lines(
+    storage: StorageBackend,
+    key: str,
+    index: TextIndex,
+    start_line: int,
+    max_lines: int = MAX_PAGE_LINES,
+) -> TextPage:
+    """Read up to max_lines lines from start_line, and at most MAX_PAGE_BYTES"""
+    max_lines = max(1, min(max_lines, MAX_PAGE_LINES))
+    if start_line >= index.line_count:
+        return TextPage("", index.line_count, 0, index.size, index.size)
+
+    checkpoint = min(start_line // index.interval, len(index.checkpoints) - 1)
+    start = index.checkpoints[checkpoint]
+    with _TextSource(storage, key, index.size) as source:
+        line_ends = _iter_line_ends(source, start, index)
+        for _ in range(start_line - checkpoint * index.interval):
+            start = next(line_ends)
+
+        end, count, truncated = start, 0, False
+        for line_end in line_ends:
+            if line_end - start > MAX_PAGE_BYTES:
+                break
+            end, count = line_end, count + 1
+            if count == max_lines:
+                break
+        else:
+            # The last line may have no newline
+            if end < index.size and index.size - start <= MAX_PAGE_BYTES:
+                end, count = index.size, count + 1
+
+        if count == 0:
+            end = index.align(start + MAX_PAGE_BYTES)
+            count, truncated = 1, True
+
+        data = source.read(start, end)
+
+    return TextPage(
+        content=index.decode(data),
+        start_line=start_line,
+        line_count=count,
+        start_offset=start,
+        end_offset=end,
+        truncated=truncated,
+    )
+
+
+def read_bytes(
+    storage: StorageBackend,
+    key: str,
+    index: TextIndex,
+    offset: int,
+    max_bytes: int = MAX_PAGE_BYTES,
+) -> TextPage:
+    """
+    Read a page of about max_bytes from a byte offset. The page ends after the
+    last whole line that fits, unless the page holds no line end at all.
+    """
+    start = index.align(offset)
+    end = index.align(start + max(index.unit, min(max_bytes, MAX_PAGE_BYTES)))
+
+    with _TextSource(storage, key, index.size) as source:
+        start_line = _line_at(source, index, start)
+        data = source.read(start, end)
+
+    truncated = False
+    if end < index.size:
+        cut = len(data)
+        for line_end in _line_ends(data, index.newline, index.unit):
+            cut = line_end
+        truncated = cut == len(data)
+        data, end = data[:cut], start + cut
+
+    newlines = sum(1 for _ in _line_ends(data, index.newline, index.unit))
+    has_partial_line = (
+        end == index.size and bool(data) and not data.endswith(index.newline)
+    )
+    return TextPage(
+        content=index.decode(data),
+        start_line=start_line,
+        line_count=newlines + (1 if has_partial_line or truncated else 0),
+        start_offset=start,
+        end_offset=end,
+        truncated=truncated,
+    )
+
+
+def _line_at(source: _TextSource, index: TextIndex, offset: int) -> int:
+    """Number of the line a byte offset falls in"""
+    checkpoint = bisect_right(index.checkpoints, offset) - 1
+    line = checkpoint * index.interval
+    for line_end in _iter_line_ends(source, index.checkpoints[checkpoint], index):
+        if line_end > offset:
+            break
+        line += 1
+    return line
+
+
+def text_index_key(file_hash: str) -> str:
+    """Storage key of a file's line index, e.g. text-index/ab/cd/abcd....json"""
+    blob_key(file_hash)  # Validates the hash
+    return f"{TEXT_INDEX_DIR_NAME}/{file_hash[:2]}/{file_hash[2:4]}/{file_hash}.json"
+
+
+def _load_index(storage: StorageBackend, key: str) -> Optional[TextIndex]:
+    try:
+        stored = json.loads(storage.read_bytes(key))
+        if stored.pop("version", None) != TEXT_INDEX_VERSION:
+            return None
+        return TextIndex(**stored)
+    except FileNotFoundError:
+        return None
+    except (AttributeError, TypeError, ValueError):
+        # A corrupt index is rebuilt
+        return None
+
+
+def _save_index(storage: StorageBackend, key: str, index: TextIndex) -> None:
+    fd, temp_name = tempfile.mkstemp(dir=staging_dir(), suffix=".json")
+    with os.fdopen(fd, "w") as buffer:
+        json.dump({"version": TEXT_INDEX_VERSION, **asdict(index)}, buffer)
+    storage.put_file(Path(temp_name), key)
+
+
+def get_text_index(
+    storage: StorageBackend, key: str, file_hash: Optional[str]
+) -> TextIndex:
+    """
+    The line index of a stored text file, built on first use. Files without
+    a hash, uploaded before hashing, are indexed on every call.
+    """
+    if not file_hash:
+        return build_text_index(storage, key)
+
+    with _cache_lock:
+        index = _cache.get(file_hash)
+        if index is not None:
+            _cache.move_to_end(file_hash)
+            return index
+
+    index_storage = get_storage()
+    index_key = text_index_key(file_hash)
+    index = _load_index(index_storage, index_key)
+    if index is None:
+        index = build_text_index(storage, key)
+        _save_index(index_storage, index_key, index)
+        get_security_logger(
+            event="text_index_created",
+            file_hash=file_hash,
+            line_count=index.line_count,
+            encoding=index.encoding,
+        ).info(f"Indexed {index.line_count} lines of {file_hash}")
+
+    with _cache_lock:
+        _cache[file_hash] = index
+        while len(_cache) > text_viewer_settings.TEXT_INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+
+def delete_text_index(file_hash: str) -> None:
+    """Delete a file's line index, when the blob itself is reclaimed"""
+    with _cache_lock:
+        _cache.pop(file_hash, None)
+    get_storage().delete(text_index_key(file_hash))
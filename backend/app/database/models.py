@@ -10,7 +10,8 @@ from datetime import datetime
 from typing import List, Optional
 
 from pydantic import EmailStr
-from sqlalchemy import JSON, Column
+from sqlalchemy import DDL, JSON, Column, Index, Text, UniqueConstraint, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import Field, Relationship, SQLModel
 
 from ..core.enums import TaskPriority, TaskStatus
@@ -87,6 +88,81 @@ class Evidence(SQLModel, table=True):
     subfolders: List["Evidence"] = Relationship(back_populates="parent_folder")
 
 
+class Blob(SQLModel, table=True):
+    sha256: str = Field(primary_key=True, max_length=64)
+    size: int
+    ref_count: int = Field(default=0)
+    created_at: datetime = Field(default_factory=get_utc_now)
+
+
+class EvidenceBlob(SQLModel, table=True):
+    evidence_id: int = Field(foreign_key="evidence.id", primary_key=True)
+    sha256: str = Field(foreign_key="blob.sha256", index=True, max_length=64)
+
+
+class EvidenceSearchDocument(SQLModel, table=True):
+    """Extracted text of an evidence item, and its place in the search queue"""
+
+    evidence_id: int = Field(foreign_key="evidence.id", primary_key=True)
+    case_id: int = Field(foreign_key="case.id", index=True)
+    # "pending", "indexed", "unsupported" or "failed"
+    status: str = Field(default="pending", index=True)
+    # Title and description, ranked above the content
+    title_text: str = Field(default="", sa_column=Column(Text, nullable=False))
+    content_text: Optional[str] = Field(default=None, sa_column=Column(Text))
+    # Only used on PostgreSQL; SQLite is searched through an FTS5 table
+    search_vector: Optional[str] = Field(
+        default=None,
+        sa_column=Column(Text().with_variant(TSVECTOR(), "postgresql")),
+    )
+    error: Optional[str] = None
+    indexed_at: Optional[datetime] = None
+
+    __table_args__ = (
+        Index(
+            "ix_evidencesearchdocument_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# Rows are keyed by evidence id; kept in step by the search service
+event.listen(
+    EvidenceSearchDocument.__table__,
+    "after_create",
+    DDL(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS evidence_search_fts "
+        "USING fts5(title_text, content_text)"
+    ).execute_if(dialect="sqlite"),
+)
+event.listen(
+    EvidenceSearchDocument.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS evidence_search_fts").execute_if(dialect="sqlite"),
+)
+
+
+class UploadSession(SQLModel, table=True):
+    id: str = Field(primary_key=True)
+    case_id: int = Field(foreign_key="case.id", index=True)
+    filename: str
+    content_type: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    category: str = Field(default="Other")
+    folder_path: Optional[str] = Field(default=None, max_length=500)
+    parent_folder_id: Optional[int] = Field(default=None, foreign_key="evidence.id")
+    total_size: int
+    received_size: int = Field(default=0)
+    status: str = Field(default="uploading")
+    evidence_id: Optional[int] = Field(default=None, foreign_key="evidence.id")
+    created_by_id: int = Field(foreign_key="user.id")
+    created_at: datetime = Field(default_factory=get_utc_now)
+    updated_at: datetime = Field(default_factory=get_utc_now)
+    expires_at: datetime
+
+
 class Entity(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     case_id: int = Field(foreign_key="case.id")
@@ -112,6 +188,12 @@ class SystemConfiguration(SQLModel, table=True):
     updated_at: datetime = Field(default_factory=get_utc_now)
 
 
+class WhoisRecord(SQLModel, table=True):
+    domain: str = Field(primary_key=True)
+    data: dict = Field(sa_column=Column(JSON))
+    fetched_at: datetime = Field(default_factory=get_utc_now)
+
+
 class Case(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     client_id: Optional[int] = Field(default=None, foreign_key="client.id")
@@ -179,6 +261,46 @@ class HuntStep(SQLModel, table=True):
     execution: HuntExecution = Relationship(back_populates="steps")
 
 
+class HuntSchedule(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    hunt_id: int = Field(foreign_key="hunt.id", index=True)
+    case_id: int = Field(foreign_key="case.id", index=True)
+    cron_expression: str
+    initial_parameters: dict = Field(sa_column=Column(JSON))
+    is_active: bool = Field(default=True)
+    next_run_at: Optional[datetime] = Field(default=None, index=True)
+    last_run_at: Optional[datetime] = None
+    last_execution_id: Optional[int] = Field(
+        default=None, foreign_key="huntexecution.id"
+    )
+    created_by_id: int = Field(foreign_key="user.id")
+    created_at: datetime = Field(default_factory=get_utc_now)
+    updated_at: datetime = Field(default_factory=get_utc_now)
+
+
+class PluginRun(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    plugin_name: str = Field(index=True)
+    parameters: dict = Field(sa_column=Column(JSON))
+    status: str = Field(default="pending")
+    result_count: int = Field(default=0)
+    error: Optional[str] = None
+    created_by_id: int = Field(foreign_key="user.id", index=True)
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=get_utc_now)
+
+
+class PluginRunResult(SQLModel, table=True):
+    __table_args__ = (UniqueConstraint("run_id", "seq"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    run_id: int = Field(foreign_key="pluginrun.id")
+    seq: int
+    type: str
+    data: dict = Field(sa_column=Column(JSON))
+
+
 class TaskTemplate(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(unique=True, index=True)
@@ -3,10 +3,12 @@ Base hunt class that all hunts must inherit from
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
+from .mapping import MappingExpressionError, compile_mapping
+
 
 class HuntStepDefinition(BaseModel):
     """Definition of a single step in a hunt workflow"""
@@ -22,6 +24,13 @@ class HuntStepDefinition(BaseModel):
     timeout_seconds: int = 300
     max_retries: int = 3
     save_to_case: bool = True
+    # Name of a mapped parameter whose list value runs the plugin once per item
+    for_each: Optional[str] = None
+    for_each_concurrency: int = 5
+    for_each_max_items: int = 50
+    # Result fields that change between runs without meaning anything changed,
+    # left out when scheduled runs compare results with the previous run
+    delta_ignore_fields: List[str] = []
 
 
 class BaseHunt(ABC):
@@ -56,6 +65,59 @@ class BaseHunt(ABC):
 
         return validated
 
+    def validate_definition(self) -> None:
+        """
+        Check step wiring and compile every parameter mapping
+
+        Raises:
+            ValueError: If any step references unknown steps or parameters, or
+            has a malformed mapping expression
+        """
+        steps = self.get_steps()
+        step_ids = [step.step_id for step in steps]
+        errors = []
+
+        duplicates = {step_id for step_id in step_ids if step_ids.count(step_id) > 1}
+        if duplicates:
+            errors.append(f"duplicate step ids: {', '.join(sorted(duplicates))}")
+
+        for step in steps:
+            for dependency in step.depends_on:
+                if dependency not in step_ids:
+                    errors.append(
+                        f"{step.step_id} depends on unknown step '{dependency}'"
+                    )
+
+            for param_name, mapping_expr in step.parameter_mapping.items():
+                try:
+                    mapping = compile_mapping(mapping_expr)
+                except MappingExpressionError as e:
+                    errors.append(f"{step.step_id}.{param_name}: {e}")
+                    continue
+
+                if mapping.root == "initial":
+                    if (
+                        mapping.first_key
+                        and mapping.first_key not in self.initial_parameters
+                    ):
+                        errors.append(
+                            f"{step.step_id}.{param_name} references unknown "
+                            f"initial parameter '{mapping.first_key}'"
+                        )
+                elif mapping.root not in step.depends_on:
+                    errors.append(
+                        f"{step.step_id}.{param_name} references step "
+                        f"'{mapping.root}' which is not in depends_on"
+                    )
+
+            if step.for_each and step.for_each not in step.parameter_mapping:
+                errors.append(
+                    f"{step.step_id} for_each parameter '{step.for_each}' is not mapped"
+                )
+
+        if errors:
+            raise ValueError(f"Invalid hunt {self.name}: {'; '.join(errors)}")
+
     def to_definition(self) -> dict:
         """Convert hunt to JSON definition for storage"""
         return {
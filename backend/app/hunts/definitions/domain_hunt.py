@@ -84,6 +84,13 @@ class DomainHunt(BaseHunt):
                 parameter_mapping={"domain": "initial.domain"},
                 timeout_seconds=120,
                 optional=True,
+                delta_ignore_fields=[
+                    "domain_age_days",
+                    "domain_age_years",
+                    "days_until_expiration",
+                    "expiration_warning",
+                    "cached",
+                ],
             ),
             HuntStepDefinition(
                 step_id="dns_records",
@@ -102,23 +109,37 @@ class DomainHunt(BaseHunt):
                 timeout_seconds=600,
                 optional=True,
             ),
-            # Investigate the main domain's IP address
+            # Investigate the main domain's IP addresses
             HuntStepDefinition(
                 step_id="ip_investigation_from_dns",
                 plugin_name="ShodanPlugin",
-                display_name="Investigate main domain IP",
-                description="Analyze the IP address of the main domain using Shodan",
+                display_name="Investigate main domain IPs",
+                description="Analyze each IP address of the main domain using Shodan",
                 parameter_mapping={
-                    # Extract first A record IP from DNS lookup results
-                    "query": "dns_records.results[0].results[0].records[0]"
+                    # Every A record IP from the DNS lookup results
+                    "query": "dns_records.results[*].results[?(@.type=='A')].records[*]"
                 },
                 static_parameters={"search_type": "ip", "limit": 10.0},
                 depends_on=["dns_records"],
                 timeout_seconds=90,
                 optional=True,
+                for_each="query",
+                for_each_concurrency=3,
+                for_each_max_items=10,
+            ),
+            # Investigate the IP addresses of resolved subdomains
+            HuntStepDefinition(
+                step_id="ip_investigation_from_subdomains",
+                plugin_name="ShodanPlugin",
+                display_name="Investigate subdomain IPs",
+                description="Analyze the IP addresses of discovered subdomains using Shodan",
+                parameter_mapping={"query": "subdomain_enum.results[*].ip"},
+                static_parameters={"search_type": "ip", "limit": 10.0},
+                depends_on=["subdomain_enum"],
+                timeout_seconds=300,
+                optional=True,
+                for_each="query",
+                for_each_concurrency=3,
+                for_each_max_items=25,
             ),
-            # Note: IPs discovered from subdomain enumeration are automatically
-            # processed by SubdomainEnumPlugin and saved as IP entities.
-            # For detailed investigation of those IPs, run individual Shodan
-            # queries manually from the case management interface.
         ]
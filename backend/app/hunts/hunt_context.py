@@ -5,6 +5,7 @@ Hunt context for managing data flow between hunt steps
 from typing import Any, Dict, List, Optional
 
 from .base_hunt import HuntStepDefinition
+from .mapping import compile_mapping
 
 
 class HuntContext:
@@ -49,6 +50,12 @@ class HuntContext:
         - "initial.param_key" - Get from initial parameters
         - "step_id.output_key" - Get from step output
         - "step_id.output.nested.key" - Get nested value from step output
+        - "step_id.results[0].key" - Index into a list
+        - "step_id.results[*].key" - Collect the value from every list item
+        - "step_id.results[?(@.type=='A')]" - Filter list items
+        - "step_id.results[0].key|default('value')" - Fallback value
+
+        See app.hunts.mapping for the full expression syntax.
         """
         resolved = step_def.static_parameters.copy()
 
@@ -64,35 +71,18 @@ class HuntContext:
         if not mapping_expr:
             return None
 
-        parts = mapping_expr.split(".")
+        # Compiled expressions are cached, so each is only parsed once
+        mapping = compile_mapping(mapping_expr)
 
-        if parts[0] == "initial":
+        if mapping.root == "initial":
             # Get from initial parameters
-            return self._get_nested_value(self.initial_parameters, parts[1:])
+            return mapping.evaluate(self.initial_parameters)
 
-        elif parts[0] in self.step_outputs:
+        elif mapping.root in self.step_outputs:
             # Get from step output
-            step_output = self.step_outputs[parts[0]]
-            if len(parts) == 1:
-                return step_output
-            else:
-                return self._get_nested_value(step_output, parts[1:])
-
-        return None
-
-    def _get_nested_value(self, data: Any, keys: List[str]) -> Optional[Any]:
-        """Get nested value from dict or object"""
-        current = data
-
-        for key in keys:
-            if isinstance(current, dict) and key in current:
-                current = current[key]
-            elif hasattr(current, key):
-                current = getattr(current, key)
-            else:
-                return None
-
-        return current
+            return mapping.evaluate(self.step_outputs[mapping.root])
+
+        return mapping.default
 
     def to_dict(self) -> dict:
         """Convert context to dictionary for storage"""
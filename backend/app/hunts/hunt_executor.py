@@ -2,18 +2,30 @@
 Hunt executor for orchestrating hunt workflows
 """
 
-from typing import List, Set
+import asyncio
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 from app.core.utils import get_utc_now
 from app.core.websocket_manager import websocket_manager
 from app.database.models import HuntExecution, HuntStep, User
 from app.services.plugin_service import PluginService
-from sqlmodel import Session
+from sqlmodel import Session, select
 
 from .base_hunt import HuntStepDefinition
 from .hunt_context import HuntContext
 
 
+def result_fingerprint(result: Dict[str, Any], ignore_fields: Iterable[str] = ()) -> str:
+    """Stable hash of a plugin result, used to spot results new since the last run"""
+    ignored = set(ignore_fields)
+    if ignored:
+        result = {key: value for key, value in result.items() if key not in ignored}
+    content = json.dumps(result, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
 class HuntExecutor:
     """Executes hunt workflows with state management"""
 
@@ -22,7 +34,11 @@ class HuntExecutor:
         self.plugin_service = PluginService(db)
 
     async def execute_hunt(
-        self, execution: HuntExecution, hunt_definition: dict, current_user: User
+        self,
+        execution: HuntExecution,
+        hunt_definition: dict,
+        current_user: User,
+        previous_execution: Optional[HuntExecution] = None,
     ):
         """
         Execute a hunt workflow
@@ -31,9 +47,16 @@ class HuntExecutor:
             execution: The HuntExecution database record
             hunt_definition: The hunt definition JSON
             current_user: The user executing the hunt
+            previous_execution: An earlier successful run of the same hunt. When
+                given, only results not seen in that run are saved as evidence
         """
         context = HuntContext(execution.initial_parameters)
         steps = [HuntStepDefinition(**step) for step in hunt_definition["steps"]]
+        baselines = (
+            self._load_delta_baselines(previous_execution, steps)
+            if previous_execution
+            else None
+        )
 
         try:
             # Update execution status
@@ -82,6 +105,11 @@ class HuntExecutor:
                             current_user,
                             completed_steps,
                             len(steps),
+                            known_results=(
+                                baselines.get(step_def.step_id, set())
+                                if baselines is not None
+                                else None
+                            ),
                         )
                         completed_steps.add(step_def.step_id)
 
@@ -172,6 +200,28 @@ class HuntExecutor:
 
         return executable
 
+    def _load_delta_baselines(
+        self, previous_execution: HuntExecution, steps: List[HuntStepDefinition]
+    ) -> Dict[str, Set[str]]:
+        """Fingerprint the results of each step completed in a previous execution"""
+        ignore_fields = {step.step_id: step.delta_ignore_fields for step in steps}
+        previous_steps = self.db.exec(
+            select(HuntStep).where(
+                HuntStep.execution_id == previous_execution.id,
+                HuntStep.status == "completed",
+            )
+        ).all()
+
+        baselines = {}
+        for step in previous_steps:
+            results = (step.output or {}).get("results", [])
+            baselines[step.step_id] = {
+                result_fingerprint(result, ignore_fields.get(step.step_id, ()))
+                for result in results
+                if isinstance(result, dict)
+            }
+        return baselines
+
     async def _execute_step(
         self,
         step_def: HuntStepDefinition,
@@ -181,8 +231,14 @@ class HuntExecutor:
         current_user: User,
         completed_steps: set,
         total_steps: int,
+        known_results: Optional[Set[str]] = None,
     ):
-        """Execute a single hunt step"""
+        """
+        Execute a single hunt step
+
+        known_results holds fingerprints from the previous run; when set, only
+        new results are saved and the output records how many were new.
+        """
         # Update step status
         step_record.status = "running"
         step_record.started_at = get_utc_now()
@@ -202,29 +258,222 @@ class HuntExecutor:
             execution.id, progress, step_def.step_id
         )
 
-        # Execute plugin
-        plugin = self.plugin_service.get_plugin(step_def.plugin_name)
+        if step_def.for_each:
+            output = await self._execute_for_each(
+                step_def, parameters, current_user, known_results
+            )
+        else:
+            results = await self._run_plugin(
+                step_def.plugin_name,
+                parameters,
+                current_user,
+                known_results,
+                step_def.delta_ignore_fields,
+            )
+            output = {
+                "results": results,
+                "result_count": len(results),
+                "plugin": step_def.plugin_name,
+            }
+
+        if known_results is not None:
+            output["delta"] = {
+                "new_count": sum(
+                    1
+                    for result in output["results"]
+                    if result_fingerprint(result, step_def.delta_ignore_fields)
+                    not in known_results
+                ),
+                "previous_count": len(known_results),
+            }
+
+        # Store output in context
+        context.set_step_output(step_def.step_id, output)
+
+        # Update step record
+        step_record.status = "completed"
+        step_record.output = output
+        step_record.completed_at = get_utc_now()
+        self.db.commit()
+
+    async def _run_plugin(
+        self,
+        plugin_name: str,
+        parameters: Dict[str, Any],
+        current_user: User,
+        known_results: Optional[Set[str]] = None,
+        ignore_fields: Iterable[str] = (),
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a plugin and collect its data results
+
+        With known_results, evidence and entities are only saved for results
+        whose fingerprint is not already known.
+        """
+        if known_results is None:
+            plugin, results = await self._collect_results(
+                plugin_name, parameters, current_user, save_to_case=True
+            )
+            return results
+
+        # Evidence is saved below, once the new results are known
+        plugin, results = await self._collect_results(
+            plugin_name, parameters, current_user, save_to_case=False
+        )
+        await self._save_results(
+            plugin, parameters, results, known_results, ignore_fields
+        )
+        return results
+
+    async def _collect_results(
+        self,
+        plugin_name: str,
+        parameters: Dict[str, Any],
+        current_user: User,
+        save_to_case: bool,
+    ):
+        """Run a plugin, saving evidence itself only if save_to_case is set"""
+        plugin = self.plugin_service.get_plugin(plugin_name)
         plugin._current_user = current_user
 
-        # Collect results
+        run_parameters = parameters
+        if not save_to_case:
+            run_parameters = {**parameters, "save_to_case": False}
+
         results = []
-        async for result in plugin.execute_with_evidence_collection(parameters):
+        async for result in plugin.execute_with_evidence_collection(run_parameters):
             if result.get("type") == "data":
                 results.append(result.get("data", {}))
+        return plugin, results
 
-        # Store output in context
-        output = {
+    async def _save_results(
+        self,
+        plugin,
+        parameters: Dict[str, Any],
+        results: List[Dict[str, Any]],
+        known_results: Optional[Set[str]] = None,
+        ignore_fields: Iterable[str] = (),
+    ) -> None:
+        """Save evidence and entities for results a plugin run did not save itself"""
+        if not parameters.get("save_to_case"):
+            return
+
+        if known_results is not None:
+            results = [
+                result
+                for result in results
+                if result_fingerprint(result, ignore_fields) not in known_results
+            ]
+        if results:
+            plugin._current_params = parameters
+            plugin._evidence_results = results
+            await plugin.save_collected_evidence()
+
+    async def _execute_for_each(
+        self,
+        step_def: HuntStepDefinition,
+        parameters: Dict[str, Any],
+        current_user: User,
+        known_results: Optional[Set[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run the step's plugin once per item of its for_each parameter
+
+        Items run concurrently up to the step's for_each_concurrency and their
+        results are aggregated into a single step output. The step only fails
+        if every item fails. Every plugin shares the executor's session, so
+        items only collect results; their evidence is saved one at a time
+        once all have finished.
+        """
+        items = parameters.get(step_def.for_each)
+        if items is None:
+            items = []
+        elif not isinstance(items, list):
+            items = [items]
+
+        # Drop duplicates so the same value is not investigated twice
+        unique_items = []
+        seen: Set[str] = set()
+        for item in items:
+            # Items may be dicts or lists, so compare them by their JSON form
+            item_key = json.dumps(item, sort_keys=True, default=str)
+            if item_key not in seen:
+                seen.add(item_key)
+                unique_items.append(item)
+        truncated = len(unique_items) > step_def.for_each_max_items
+        unique_items = unique_items[: step_def.for_each_max_items]
+
+        semaphore = asyncio.Semaphore(max(1, step_def.for_each_concurrency))
+
+        async def run_item(item: Any) -> Dict[str, Any]:
+            item_parameters = {**parameters, step_def.for_each: item}
+            async with semaphore:
+                try:
+                    plugin, results = await self._collect_results(
+                        step_def.plugin_name,
+                        item_parameters,
+                        current_user,
+                        save_to_case=False,
+                    )
+                    return {
+                        "item": item,
+                        "results": results,
+                        "plugin": plugin,
+                        "parameters": item_parameters,
+                    }
+                except Exception as e:
+                    return {"item": item, "results": [], "error": str(e)}
+
+        item_outputs = await asyncio.gather(*(run_item(item) for item in unique_items))
+
+        for item_output in item_outputs:
+            if "error" in item_output:
+                continue
+            try:
+                await self._save_results(
+                    item_output.pop("plugin"),
+                    item_output.pop("parameters"),
+                    item_output["results"],
+                    known_results,
+                    step_def.delta_ignore_fields,
+                )
+            except Exception as e:
+                # A failed write must not leave the session unusable for the rest
+                self.db.rollback()
+                item_output["error"] = f"Could not save results: {e}"
+
+        failed = [item_output for item_output in item_outputs if "error" in item_output]
+        if failed and len(failed) == len(item_outputs):
+            raise RuntimeError(
+                f"All {len(failed)} items failed, first error: {failed[0]['error']}"
+            )
+
+        results = [
+            result for item_output in item_outputs for result in item_output["results"]
+        ]
+        return {
             "results": results,
             "result_count": len(results),
             "plugin": step_def.plugin_name,
+            "for_each": {
+                "parameter": step_def.for_each,
+                "item_count": len(unique_items),
+                "failed_count": len(failed),
+                "truncated": truncated,
+                "items": [
+                    {
+                        "item": item_output["item"],
+                        "result_count": len(item_output["results"]),
+                        **(
+                            {"error": item_output["error"]}
+                            if "error" in item_output
+                            else {}
+                        ),
+                    }
+                    for item_output in item_outputs
+                ],
+            },
         }
-        context.set_step_output(step_def.step_id, output)
-
-        # Update step record
-        step_record.status = "completed"
-        step_record.output = output
-        step_record.completed_at = get_utc_now()
-        self.db.commit()
 
     async def cancel_execution(self, execution_id: int):
         """Cancel a running hunt execution"""
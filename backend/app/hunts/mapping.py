@@ -0,0 +1,208 @@
+"""
+Compiled parameter-mapping expressions for hunt steps
+
+Expressions are parsed once into a small accessor and cached, so resolving a
+mapping over a large step output is a plain walk with no string handling.
+
+Syntax:
+- "initial.domain" - Dotted keys, starting from "initial" or a step id
+- "step.results[0]" / "step.results[-1]" - List indexing
+- "step.results[*].ip" - Wildcard over a list, yielding a flat list of values
+- "step.results[?(@.type=='A')]" - Filter list items by a field (== or !=)
+- "step.results[?(@.ip)]" - Filter list items that have a field set
+- "step.results[0].ip|default('unknown')" - Fallback when nothing is found
+"""
+
+import ast
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple, Union
+
+_IDENTIFIER = re.compile(r"[A-Za-z0-9_-]+")
+_INDEX = re.compile(r"\[(-?\d+)\]")
+_WILDCARD = re.compile(r"\[\*\]")
+_FILTER = re.compile(r"\[\?\(\s*@((?:\.[A-Za-z0-9_-]+)+)\s*(?:(==|!=)\s*(.+?))?\s*\)\]")
+_DEFAULT = re.compile(r"\|\s*default\((.*)\)\s*$")
+
+
+class MappingExpressionError(ValueError):
+    """Raised when a mapping expression cannot be parsed"""
+
+
+@dataclass(frozen=True)
+class KeyStep:
+    key: str
+    expands = False
+
+    def apply(self, value: Any, out: List[Any]) -> None:
+        if isinstance(value, dict):
+            if self.key in value:
+                out.append(value[self.key])
+        elif hasattr(value, self.key):
+            out.append(getattr(value, self.key))
+
+
+@dataclass(frozen=True)
+class IndexStep:
+    index: int
+    expands = False
+
+    def apply(self, value: Any, out: List[Any]) -> None:
+        if isinstance(value, list) and -len(value) <= self.index < len(value):
+            out.append(value[self.index])
+
+
+@dataclass(frozen=True)
+class WildcardStep:
+    expands = True
+
+    def apply(self, value: Any, out: List[Any]) -> None:
+        if isinstance(value, list):
+            out.extend(value)
+
+
+@dataclass(frozen=True)
+class FilterStep:
+    field_path: Tuple[str, ...]
+    operator: Optional[str] = None
+    operand: Any = None
+    expands = True
+
+    def _matches(self, item: Any) -> bool:
+        current = item
+        for key in self.field_path:
+            found: List[Any] = []
+            KeyStep(key).apply(current, found)
+            if not found:
+                return False
+            current = found[0]
+
+        if self.operator == "==":
+            return current == self.operand
+        if self.operator == "!=":
+            return current != self.operand
+        return current is not None
+
+    def apply(self, value: Any, out: List[Any]) -> None:
+        if isinstance(value, list):
+            out.extend(item for item in value if self._matches(item))
+
+
+Step = Union[KeyStep, IndexStep, WildcardStep, FilterStep]
+
+
+@dataclass(frozen=True)
+class CompiledMapping:
+    """A parsed mapping expression that can be evaluated repeatedly"""
+
+    expression: str
+    root: str
+    steps: Tuple[Step, ...]
+    default: Any = None
+
+    @property
+    def first_key(self) -> Optional[str]:
+        """The first key after the root, if the path starts with one"""
+        if self.steps and isinstance(self.steps[0], KeyStep):
+            return self.steps[0].key
+        return None
+
+    def evaluate(self, root_value: Any) -> Any:
+        """
+        Walk the compiled path from the root value
+
+        Paths containing a wildcard or filter return a flat list of the values
+        found, skipping missing ones. The default is returned when nothing is
+        found.
+        """
+        values = [root_value]
+        multi = False
+
+        for step in self.steps:
+            next_values: List[Any] = []
+            for value in values:
+                if value is not None:
+                    step.apply(value, next_values)
+            multi = multi or step.expands
+            values = next_values
+            if not values:
+                break
+
+        if multi:
+            result = [value for value in values if value is not None]
+            return result if result else self.default
+
+        result = values[0] if values else None
+        return self.default if result is None else result
+
+
+def _parse_literal(text: str, expression: str) -> Any:
+    try:
+        return ast.literal_eval(text.strip())
+    except (ValueError, SyntaxError):
+        raise MappingExpressionError(
+            f"Invalid literal {text.strip()!r} in mapping '{expression}'"
+        )
+
+
+@lru_cache(maxsize=1024)
+def compile_mapping(expression: str) -> CompiledMapping:
+    """
+    Parse a mapping expression into a reusable accessor
+
+    Raises:
+        MappingExpressionError: If the expression is malformed
+    """
+    if not expression or not expression.strip():
+        raise MappingExpressionError("Mapping expression is empty")
+
+    path = expression.strip()
+    default = None
+
+    default_match = _DEFAULT.search(path)
+    if default_match:
+        default = _parse_literal(default_match.group(1), expression)
+        path = path[: default_match.start()].rstrip()
+
+    root_match = _IDENTIFIER.match(path)
+    if not root_match:
+        raise MappingExpressionError(
+            f"Mapping '{expression}' must start with 'initial' or a step id"
+        )
+
+    steps: List[Step] = []
+    pos = root_match.end()
+    while pos < len(path):
+        if path[pos] == ".":
+            key_match = _IDENTIFIER.match(path, pos + 1)
+            if not key_match:
+                raise MappingExpressionError(
+                    f"Expected a key at position {pos + 1} in mapping '{expression}'"
+                )
+            steps.append(KeyStep(key_match.group(0)))
+            pos = key_match.end()
+        elif match := _INDEX.match(path, pos):
+            steps.append(IndexStep(int(match.group(1))))
+            pos = match.end()
+        elif match := _WILDCARD.match(path, pos):
+            steps.append(WildcardStep())
+            pos = match.end()
+        elif match := _FILTER.match(path, pos):
+            field_path = tuple(match.group(1).lstrip(".").split("."))
+            operand = (
+                _parse_literal(match.group(3), expression) if match.group(2) else None
+            )
+            steps.append(FilterStep(field_path, match.group(2), operand))
+            pos = match.end()
+        else:
+            raise MappingExpressionError(
+                f"Unexpected '{path[pos:]}' at position {pos} in mapping '{expression}'"
+            )
+
+    return CompiledMapping(
+        expression=expression,
+        root=root_match.group(0),
+        steps=tuple(steps),
+        default=default,
+    )
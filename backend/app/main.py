@@ -9,20 +9,57 @@ Owlculus backend application.
 from contextlib import asynccontextmanager
 
 from app.api.router import api_router
-from app.core.config import settings
-from app.core.dependencies import get_client_ip, get_user_agent
+from app.core.config import hunt_scheduler_settings, search_settings, settings
+from app.core.dependencies import get_client_ip, get_db, get_user_agent
 from app.core.logging import client_ip_context, setup_logging, user_agent_context
+from app.services.hunt_schedule_service import hunt_scheduler
+from app.services.hunt_service import HuntService
+from app.services.plugin_run_service import fail_interrupted_runs
+from app.services.search_service import search_indexer
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from loguru import logger
 
 
+def sync_hunt_definitions():
+    """Discover hunt definitions and sync them to the database once at startup"""
+    db = next(get_db())
+    try:
+        HuntService(db)
+    except Exception as e:
+        # Hunts are synced lazily on first use if the database is not ready yet
+        logger.error(f"Failed to sync hunt definitions at startup: {e}")
+    finally:
+        db.close()
+
+
+def fail_orphaned_plugin_runs():
+    """Fail background plugin runs that were cut off by the last shutdown"""
+    db = next(get_db())
+    try:
+        count = fail_interrupted_runs(db)
+        if count:
+            logger.warning(f"Marked {count} interrupted plugin runs as failed")
+    except Exception as e:
+        logger.error(f"Failed to clean up interrupted plugin runs: {e}")
+    finally:
+        db.close()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     setup_logging()
     logger.info("Owlculus backend starting up")
+    sync_hunt_definitions()
+    fail_orphaned_plugin_runs()
+    if hunt_scheduler_settings.HUNT_SCHEDULER_ENABLED:
+        hunt_scheduler.start()
+    if search_settings.SEARCH_INDEXER_ENABLED:
+        search_indexer.start()
     yield
     logger.info("Owlculus backend shutting down")
+    await hunt_scheduler.stop()
+    await search_indexer.stop()
 
 
 app = FastAPI(
@@ -3,11 +3,13 @@ DNS lookup plugin for resolving domain names to IP addresses and performing reve
 """
 
 import asyncio
-import ipaddress
 import time
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, Iterator, List, Optional, Tuple
 
-import dns.asyncresolver
+from app.core.dependencies import get_db
+from app.core.dns_resolver import dns_resolver
+from app.core.file_storage import evidence_file_location
+from app.services.evidence_service import EvidenceService
 from dns.exception import DNSException
 from dns.rdatatype import RdataType
 from dns.reversename import from_address
@@ -15,6 +17,11 @@ from sqlmodel import Session
 
 from .base_plugin import BasePlugin
 
+BULK_MAX_TARGETS = 50000
+# Invalid bulk targets reported one by one; the rest are only counted
+BULK_MAX_TARGET_ERRORS = 20
+BULK_MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+
 
 class DnsLookup(BasePlugin):
     """DNS lookup plugin for resolving domain names to IP addresses and performing reverse DNS lookups"""
@@ -29,7 +36,7 @@ class DnsLookup(BasePlugin):
             "domain": {
                 "type": "string",
                 "description": "Domain name or IP address to resolve (or comma-separated list for bulk lookup)",
-                "required": True,
+                "required": False,
             },
             "lookup_mode": {
                 "type": "string",
@@ -54,31 +61,42 @@ class DnsLookup(BasePlugin):
                 "description": "Comma-separated custom DNS servers (e.g., 8.8.8.8,1.1.1.1)",
                 "required": False,
             },
+            "bulk_mode": {
+                "type": "boolean",
+                "description": "Resolve all targets concurrently and stream results as they complete",
+                "default": False,
+                "required": False,
+            },
+            "targets_evidence_id": {
+                "type": "float",
+                "description": "ID of a text file evidence with one target per line (enables bulk mode)",
+                "required": False,
+            },
+            "concurrency": {
+                "type": "float",
+                "description": "Maximum concurrent DNS queries in bulk mode",
+                "default": 50.0,
+                "required": False,
+            },
         }
 
     def parse_output(self, line: str) -> Optional[Dict[str, Any]]:
         """Not used as DNS queries are handled directly"""
         return None
 
-    def _is_ip_address(self, value: str) -> bool:
-        """Check if the given value is a valid IP address"""
-        try:
-            ipaddress.ip_address(value)
-            return True
-        except ValueError:
-            return False
-
     async def _perform_reverse_lookup(
         self,
-        resolver: dns.asyncresolver.Resolver,
         ip_address: str,
+        nameservers: Optional[List[str]] = None,
+        lifetime: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
         Perform reverse DNS lookup for an IP address
 
         Args:
-            resolver: DNS resolver instance
             ip_address: IP address to perform reverse lookup on
+            nameservers: Optional custom DNS servers
+            lifetime: Optional total query time limit in seconds
 
         Returns:
             Dictionary containing reverse lookup results or error
@@ -86,7 +104,9 @@ class DnsLookup(BasePlugin):
         try:
             # Create reverse DNS query name
             reverse_name = from_address(ip_address)
-            answers = await resolver.resolve(reverse_name, RdataType.PTR)
+            answers = await dns_resolver.resolve(
+                reverse_name, RdataType.PTR, nameservers, lifetime
+            )
 
             # Extract hostnames from PTR records
             records = [answer.to_text().rstrip(".") for answer in answers]
@@ -111,24 +131,28 @@ class DnsLookup(BasePlugin):
 
     async def _perform_single_lookup(
         self,
-        resolver: dns.asyncresolver.Resolver,
         domain: str,
         record_type: str,
+        nameservers: Optional[List[str]] = None,
+        lifetime: Optional[float] = None,
     ) -> Dict[str, Any]:
         """
         Perform a single DNS lookup for a specific record type
 
         Args:
-            resolver: DNS resolver instance
             domain: Domain name to query
             record_type: DNS record type (A, AAAA, MX, etc.)
+            nameservers: Optional custom DNS servers
+            lifetime: Optional total query time limit in seconds
 
         Returns:
             Dictionary containing query results or error
         """
         try:
             rdata_type = getattr(RdataType, record_type.upper())
-            answers = await resolver.resolve(domain, rdata_type)
+            answers = await dns_resolver.resolve(
+                domain, rdata_type, nameservers, lifetime
+            )
 
             # Format results based on record type
             if record_type.upper() == "MX":
@@ -160,28 +184,212 @@ class DnsLookup(BasePlugin):
 
     async def _perform_concurrent_lookups(
         self,
-        resolver: dns.asyncresolver.Resolver,
         domain: str,
         record_types: List[str],
+        nameservers: Optional[List[str]] = None,
+        lifetime: Optional[float] = None,
     ) -> List[Dict[str, Any]]:
         """
         Perform multiple DNS lookups concurrently for a single domain
 
         Args:
-            resolver: DNS resolver instance
             domain: Domain name to query
             record_types: List of DNS record types
+            nameservers: Optional custom DNS servers
+            lifetime: Optional total query time limit in seconds
 
         Returns:
             List of lookup results
         """
         tasks = []
         for record_type in record_types:
-            task = self._perform_single_lookup(resolver, domain, record_type)
+            task = self._perform_single_lookup(
+                domain, record_type, nameservers, lifetime
+            )
             tasks.append(task)
 
         return await asyncio.gather(*tasks)
 
+    def _parse_targets(self, raw_targets: str) -> List[str]:
+        """Split newline or comma separated targets, dropping blanks, comments and duplicates"""
+        targets = []
+        for line in raw_targets.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            targets.extend(t.strip() for t in line.split(",") if t.strip())
+        return list(dict.fromkeys(targets))
+
+    async def _load_targets_from_evidence(self, evidence_id: int) -> List[str]:
+        """Read targets from a text file evidence the current user can access"""
+        if not self._current_user:
+            raise ValueError("A user context is required to read targets from evidence")
+
+        # Use injected session if available, otherwise get a new one
+        if self._db_session:
+            db = self._db_session
+            close_session = False
+        else:
+            db = next(get_db())
+            close_session = True
+
+        try:
+            evidence = await EvidenceService(db).get_evidence(
+                evidence_id, current_user=self._current_user
+            )
+        finally:
+            if close_session:
+                db.close()
+
+        if evidence.is_folder or evidence.evidence_type != "file":
+            raise ValueError(f"Evidence {evidence_id} is not a file")
+
+        loop = asyncio.get_event_loop()
+        storage, key, info = await loop.run_in_executor(
+            self._executor, evidence_file_location, evidence
+        )
+        if info is None:
+            raise ValueError(f"File for evidence {evidence_id} not found")
+        if info.size > BULK_MAX_FILE_SIZE:
+            raise ValueError(
+                f"Targets file too large. Maximum size is {BULK_MAX_FILE_SIZE // (1024 * 1024)}MB"
+            )
+
+        raw_content = await loop.run_in_executor(
+            self._executor, storage.read_bytes, key
+        )
+        return self._parse_targets(raw_content.decode("utf-8", errors="replace"))
+
+    def _validate_target(self, target: str, lookup_mode: str) -> Optional[str]:
+        """Return an error message if the target does not suit the lookup mode"""
+        if lookup_mode == "reverse":
+            if not self._is_ip_address(target):
+                return f"'{target}' is not a valid IP address for reverse lookup"
+        elif self._is_ip_address(target):
+            return f"'{target}' appears to be an IP address. Use reverse lookup mode for IP addresses."
+        return None
+
+    def _summarize_latencies(
+        self, latencies: Dict[str, List[float]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Summarize query latencies per record type in milliseconds"""
+        summary = {}
+        for record_type, samples in sorted(latencies.items()):
+            ordered = sorted(samples)
+            summary[record_type] = {
+                "queries": len(ordered),
+                "avg_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 2),
+                "p95_ms": round(ordered[int(len(ordered) * 0.95) - 1] * 1000, 2)
+                if len(ordered) >= 20
+                else round(ordered[-1] * 1000, 2),
+                "max_ms": round(ordered[-1] * 1000, 2),
+            }
+        return summary
+
+    async def _run_bulk(
+        self,
+        targets: List[str],
+        lookup_mode: str,
+        record_types: List[str],
+        nameservers: Optional[List[str]],
+        lifetime: float,
+        concurrency: int,
+        invalid_targets: int = 0,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Resolve every target and record type through a bounded worker pool
+
+        Results are yielded as each query completes, followed by a summary with
+        throughput, per-record-type latency and the number of targets skipped
+        as invalid.
+        """
+        record_types = ["PTR"] if lookup_mode == "reverse" else record_types
+        target_type = "ip_address" if lookup_mode == "reverse" else "domain"
+        total_queries = len(targets) * len(record_types)
+
+        def iter_queries() -> Iterator[Tuple[str, str]]:
+            for target in targets:
+                for record_type in record_types:
+                    yield target, record_type
+
+        queries = iter_queries()
+        # Bounded so slow consumers apply backpressure to the workers
+        completed: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+        async def worker():
+            # Workers share one query iterator, so at most `concurrency` queries run at once
+            for target, record_type in queries:
+                started = time.perf_counter()
+                if record_type == "PTR":
+                    result = await self._perform_reverse_lookup(
+                        target, nameservers, lifetime
+                    )
+                else:
+                    result = await self._perform_single_lookup(
+                        target, record_type, nameservers, lifetime
+                    )
+                await completed.put((target, result, time.perf_counter() - started))
+            await completed.put(None)
+
+        started_at = time.perf_counter()
+        latencies: Dict[str, List[float]] = {}
+        failed_queries = 0
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(max(1, min(concurrency, total_queries)))
+        ]
+
+        try:
+            finished_workers = 0
+            while finished_workers < len(workers):
+                item = await completed.get()
+                if item is None:
+                    finished_workers += 1
+                    continue
+
+                target, result, elapsed = item
+                latencies.setdefault(result["type"], []).append(elapsed)
+                if "error" in result:
+                    failed_queries += 1
+
+                yield {
+                    "type": "data",
+                    "data": {
+                        "target": target,
+                        "target_type": target_type,
+                        "results": [result],
+                        "timestamp": time.time(),
+                    },
+                }
+        finally:
+            # Stop outstanding lookups if the consumer stops early
+            for task in workers:
+                if not task.done():
+                    task.cancel()
+
+        elapsed_seconds = time.perf_counter() - started_at
+        yield {
+            "type": "data",
+            "data": {
+                "status": "complete",
+                "phase": "summary",
+                "total_targets": len(targets),
+                "invalid_targets": invalid_targets,
+                "total_queries": total_queries,
+                "successful_queries": total_queries - failed_queries,
+                "failed_queries": failed_queries,
+                "elapsed_seconds": round(elapsed_seconds, 3),
+                "queries_per_second": (
+                    round(total_queries / elapsed_seconds, 2)
+                    if elapsed_seconds > 0
+                    else float(total_queries)
+                ),
+                "latency_by_record_type": self._summarize_latencies(latencies),
+                "cache": dns_resolver.get_stats(),
+            },
+        }
+
     async def run(
         self,
         params: Optional[Dict[str, Any]] = None,
@@ -195,13 +403,42 @@ class DnsLookup(BasePlugin):
         Yields:
             Dictionary containing DNS records or errors
         """
-        if not params or "domain" not in params:
+        if not params or not (params.get("domain") or params.get("targets_evidence_id")):
             yield {"type": "error", "data": {"message": "Domain parameter is required"}}
             return
 
         # Parse parameters
-        domains_param = params["domain"]
-        targets = [d.strip() for d in domains_param.split(",") if d.strip()]
+        targets = self._parse_targets(params.get("domain") or "")
+
+        bulk_mode = params.get("bulk_mode", False)
+        targets_evidence_id = params.get("targets_evidence_id")
+        if targets_evidence_id:
+            try:
+                evidence_targets = await self._load_targets_from_evidence(
+                    int(targets_evidence_id)
+                )
+            except Exception as e:
+                message = getattr(e, "detail", None) or str(e)
+                yield {
+                    "type": "error",
+                    "data": {"message": f"Could not load targets from evidence: {message}"},
+                }
+                return
+            targets = list(dict.fromkeys(targets + evidence_targets))
+            bulk_mode = True
+
+        if not targets:
+            yield {"type": "error", "data": {"message": "No targets to resolve"}}
+            return
+
+        if len(targets) > BULK_MAX_TARGETS:
+            yield {
+                "type": "error",
+                "data": {
+                    "message": f"Too many targets ({len(targets)}). Maximum is {BULK_MAX_TARGETS}"
+                },
+            }
+            return
 
         lookup_mode = params.get("lookup_mode", "forward")
 
@@ -211,34 +448,62 @@ class DnsLookup(BasePlugin):
         ]
 
         timeout = params.get("timeout", 5.0)
+        lifetime = timeout * 2
 
-        # Configure resolver
-        resolver = dns.asyncresolver.Resolver()
-        resolver.timeout = timeout
-        resolver.lifetime = timeout * 2
-
-        # Set custom nameservers if provided
+        # Custom nameservers if provided, otherwise the shared resolver defaults
+        nameservers = None
         if "nameservers" in params and params["nameservers"]:
             nameservers = [
                 ns.strip() for ns in params["nameservers"].split(",") if ns.strip()
             ]
-            resolver.nameservers = nameservers
+
+        if bulk_mode:
+            valid_targets = []
+            invalid_targets = 0
+            for target in targets:
+                error = self._validate_target(target, lookup_mode)
+                if not error:
+                    valid_targets.append(target)
+                    continue
+                invalid_targets += 1
+                if invalid_targets <= BULK_MAX_TARGET_ERRORS:
+                    yield {"type": "error", "data": {"message": error}}
+
+            if invalid_targets > BULK_MAX_TARGET_ERRORS:
+                yield {
+                    "type": "error",
+                    "data": {
+                        "message": f"{invalid_targets - BULK_MAX_TARGET_ERRORS} more "
+                        f"invalid targets skipped ({invalid_targets} in total)"
+                    },
+                }
+
+            if valid_targets:
+                concurrency = max(1, int(params.get("concurrency", 50)))
+                async for result in self._run_bulk(
+                    valid_targets,
+                    lookup_mode,
+                    record_types,
+                    nameservers,
+                    lifetime,
+                    concurrency,
+                    invalid_targets,
+                ):
+                    yield result
+            return
 
         # Process targets based on lookup mode
         for target in targets:
-            if lookup_mode == "reverse":
-                # Validate that target is an IP address for reverse lookup
-                if not self._is_ip_address(target):
-                    yield {
-                        "type": "error",
-                        "data": {
-                            "message": f"'{target}' is not a valid IP address for reverse lookup"
-                        },
-                    }
-                    continue
+            error = self._validate_target(target, lookup_mode)
+            if error:
+                yield {"type": "error", "data": {"message": error}}
+                continue
 
+            if lookup_mode == "reverse":
                 # Handle IP address - perform reverse DNS lookup
-                result = await self._perform_reverse_lookup(resolver, target)
+                result = await self._perform_reverse_lookup(
+                    target, nameservers, lifetime
+                )
 
                 yield {
                     "type": "data",
@@ -250,20 +515,10 @@ class DnsLookup(BasePlugin):
                     },
                 }
             else:
-                # Forward lookup mode - validate that target is not an IP
-                if self._is_ip_address(target):
-                    yield {
-                        "type": "error",
-                        "data": {
-                            "message": f"'{target}' appears to be an IP address. Use reverse lookup mode for IP addresses."
-                        },
-                    }
-                    continue
-
                 # Handle domain - perform forward DNS lookup
                 # Perform concurrent lookups for all record types
                 results = await self._perform_concurrent_lookups(
-                    resolver, target, record_types
+                    target, record_types, nameservers, lifetime
                 )
 
                 yield {
@@ -4,13 +4,75 @@ Holehe plugin for checking email account registrations across platforms
 
 import asyncio
 import importlib
-from typing import Any, AsyncGenerator, Dict, Optional
+import threading
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
 
 import httpx
 from sqlmodel import Session
 
 from .base_plugin import BasePlugin
 
+# Maximum concurrent checks against the same platform
+PER_PLATFORM_LIMIT = 2
+
+# Maximum number of emails accepted in a single bulk run
+BULK_MAX_EMAILS = 100
+
+# Holehe modules are discovered once per process
+_holehe_modules: Optional[List[Tuple[str, Callable]]] = None
+_holehe_modules_lock = threading.Lock()
+
+
+def _discover_holehe_modules() -> List[Tuple[str, Callable]]:
+    """Import all available holehe modules, caching the result for the process"""
+    global _holehe_modules
+
+    with _holehe_modules_lock:
+        if _holehe_modules is not None:
+            return _holehe_modules
+
+        try:
+            import pkgutil
+
+            import holehe
+        except ImportError:
+            return []
+
+        modules = []
+
+        # Walk through all holehe modules
+        for importer, modname, ispkg in pkgutil.walk_packages(
+            holehe.__path__, holehe.__name__ + "."
+        ):
+            if ispkg or modname.endswith(".__init__") or "core" in modname:
+                continue
+
+            try:
+                module = importlib.import_module(modname)
+
+                # Get the function name from the module name (last part)
+                func_name = modname.split(".")[-1]
+
+                # Check if the module has the expected function
+                if hasattr(module, func_name) and callable(getattr(module, func_name)):
+                    modules.append((func_name, getattr(module, func_name)))
+
+            except (ImportError, AttributeError):
+                # Skip modules that can't be imported or don't have the expected function
+                continue
+
+        _holehe_modules = modules
+        return _holehe_modules
+
 
 class HolehePlugin(BasePlugin):
     """Plugin to check if email addresses are registered on various platforms using Holehe"""
@@ -25,7 +87,12 @@ class HolehePlugin(BasePlugin):
             "email": {
                 "type": "string",
                 "description": "Email address to check for account registrations",
-                "required": True,
+                "required": False,
+            },
+            "emails": {
+                "type": "string",
+                "description": "Comma or newline separated email addresses to check in bulk",
+                "required": False,
             },
             "timeout": {
                 "type": "float",
@@ -33,48 +100,26 @@ class HolehePlugin(BasePlugin):
                 "default": 10.0,
                 "required": False,
             },
+            "concurrency": {
+                "type": "float",
+                "description": "Maximum number of platforms checked at once",
+                "default": 20.0,
+                "required": False,
+            },
         }
 
     def parse_output(self, line: str) -> Optional[Dict[str, Any]]:
         """Not used as holehe queries are handled directly"""
         return None
 
-    async def _get_holehe_modules(self):
-        """Dynamically import all available holehe modules"""
-        try:
-            import pkgutil
-
-            import holehe
-
-            modules = []
-
-            # Walk through all holehe modules
-            for importer, modname, ispkg in pkgutil.walk_packages(
-                holehe.__path__, holehe.__name__ + "."
-            ):
-                if ispkg or modname.endswith(".__init__") or "core" in modname:
-                    continue
-
-                try:
-                    module = importlib.import_module(modname)
-
-                    # Get the function name from the module name (last part)
-                    func_name = modname.split(".")[-1]
+    async def _get_holehe_modules(self) -> List[Tuple[str, Callable]]:
+        """Get the holehe modules, discovering them on first use"""
+        if _holehe_modules is not None:
+            return _holehe_modules
 
-                    # Check if the module has the expected function
-                    if hasattr(module, func_name) and callable(
-                        getattr(module, func_name)
-                    ):
-                        modules.append((func_name, getattr(module, func_name)))
-
-                except (ImportError, AttributeError):
-                    # Skip modules that can't be imported or don't have the expected function
-                    continue
-
-            return modules
-
-        except ImportError:
-            return []
+        # Walking packages imports every module, so keep it off the event loop
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, _discover_holehe_modules)
 
     async def _check_single_platform(
         self,
@@ -88,11 +133,8 @@ class HolehePlugin(BasePlugin):
         try:
             out = []
 
-            # Set timeout for this specific check
-            client.timeout = httpx.Timeout(timeout)
-
-            # Call the platform function
-            await platform_func(email, client, out)
+            # Bound the whole check rather than mutating the shared client's timeout
+            await asyncio.wait_for(platform_func(email, client, out), timeout)
 
             # Parse the result
             if out:
@@ -119,8 +161,7 @@ class HolehePlugin(BasePlugin):
             return {
                 "platform": platform_name,
                 "email": email,
-                "error": "Timeout",
-                "ratelimited": True,
+                "error": "timeout",
             }
         except Exception as e:
             return {
@@ -129,6 +170,63 @@ class HolehePlugin(BasePlugin):
                 "error": str(e),
             }
 
+    async def _check_platforms(
+        self,
+        checks: Iterable[Tuple[str, str, Callable]],
+        client: httpx.AsyncClient,
+        timeout: float,
+        concurrency: int,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Run (email, platform) checks on a bounded worker pool, yielding results as they complete
+
+        At most `concurrency` checks run at once, and at most PER_PLATFORM_LIMIT
+        of them target the same platform, so a single site never sees a burst
+        of requests.
+        """
+        checks = iter(checks)
+        platform_limits: Dict[str, asyncio.Semaphore] = {}
+        # Bounded so slow consumers apply backpressure to the workers
+        completed: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+
+        async def worker():
+            # Workers share one check iterator, so the pool size is the global cap
+            for email, platform_name, platform_func in checks:
+                platform_limit = platform_limits.setdefault(
+                    platform_name, asyncio.Semaphore(PER_PLATFORM_LIMIT)
+                )
+                async with platform_limit:
+                    result = await self._check_single_platform(
+                        platform_name, platform_func, email, client, timeout
+                    )
+                await completed.put(result)
+            await completed.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        try:
+            finished_workers = 0
+            while finished_workers < len(workers):
+                result = await completed.get()
+                if result is None:
+                    finished_workers += 1
+                    continue
+                yield result
+        finally:
+            # Cancel outstanding checks if the consumer stops early
+            for task in workers:
+                if not task.done():
+                    task.cancel()
+
+    def _parse_emails(self, raw_emails: str) -> List[str]:
+        """Split comma or newline separated emails, dropping blanks and duplicates"""
+        emails = [
+            email.strip()
+            for line in raw_emails.splitlines()
+            for email in line.split(",")
+            if email.strip()
+        ]
+        return list(dict.fromkeys(emails))
+
     async def run(
         self, params: Optional[Dict[str, Any]] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
@@ -141,12 +239,21 @@ class HolehePlugin(BasePlugin):
         Yields:
             Dictionary containing platform check results
         """
-        if not params or "email" not in params:
+        if not params or not (params.get("email") or params.get("emails")):
             yield {"type": "error", "data": {"message": "Email parameter is required"}}
             return
 
-        email = params["email"].strip()
         timeout = params.get("timeout", 10.0)
+        concurrency = max(1, int(params.get("concurrency", 20)))
+
+        if params.get("emails"):
+            async for result in self._run_bulk(
+                self._parse_emails(params["emails"]), timeout, concurrency
+            ):
+                yield result
+            return
+
+        email = params["email"].strip()
 
         if not email:
             yield {
@@ -161,13 +268,14 @@ class HolehePlugin(BasePlugin):
         if not modules:
             return
 
-        # Check each platform - only yield found accounts
-        async with httpx.AsyncClient() as client:
-            for platform_name, platform_func in modules:
-                result = await self._check_single_platform(
-                    platform_name, platform_func, email, client, timeout
-                )
-
+        # Check platforms concurrently - only yield found accounts
+        async with httpx.AsyncClient(timeout=httpx.Timeout(timeout)) as client:
+            async for result in self._check_platforms(
+                ((email, name, func) for name, func in modules),
+                client,
+                timeout,
+                concurrency,
+            ):
                 # Only yield results where account exists (found)
                 if result.get("exists"):
                     yield {
@@ -175,5 +283,90 @@ class HolehePlugin(BasePlugin):
                         "data": result,
                     }
 
-                # Small delay between requests to be respectful
-                await asyncio.sleep(0.1)
+    async def _run_bulk(
+        self, emails: List[str], timeout: float, concurrency: int
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Check many emails against every platform using one pooled client
+
+        Found accounts are streamed as they land, followed by a per-email summary.
+        """
+        if not emails:
+            yield {
+                "type": "error",
+                "data": {"message": "Email address cannot be empty"},
+            }
+            return
+
+        if len(emails) > BULK_MAX_EMAILS:
+            yield {
+                "type": "error",
+                "data": {
+                    "message": f"Too many emails ({len(emails)}). Maximum is {BULK_MAX_EMAILS}"
+                },
+            }
+            return
+
+        modules = await self._get_holehe_modules()
+
+        if not modules:
+            return
+
+        summary = {
+            email: {
+                "checked": 0,
+                "found": 0,
+                "ratelimited": 0,
+                "timeouts": 0,
+                "errors": 0,
+            }
+            for email in emails
+        }
+        # Email-major order spreads consecutive checks across different platforms
+        checks = ((email, name, func) for email in emails for name, func in modules)
+        limits = httpx.Limits(
+            max_connections=concurrency, max_keepalive_connections=concurrency
+        )
+
+        async with httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout), limits=limits
+        ) as client:
+            async for result in self._check_platforms(
+                checks, client, timeout, concurrency
+            ):
+                counts = summary[result["email"]]
+                counts["checked"] += 1
+                if result.get("ratelimited"):
+                    counts["ratelimited"] += 1
+                elif result.get("error") == "timeout":
+                    counts["timeouts"] += 1
+                elif result.get("error"):
+                    counts["errors"] += 1
+
+                if result.get("exists"):
+                    counts["found"] += 1
+                    yield {
+                        "type": "data",
+                        "data": result,
+                    }
+
+        totals = {
+            key: sum(counts[key] for counts in summary.values())
+            for key in ("found", "ratelimited", "timeouts", "errors")
+        }
+        yield {
+            "type": "status",
+            "data": {
+                "status": "complete",
+                "phase": "summary",
+                "message": (
+                    f"Checked {len(emails)} email(s) against {len(modules)} platforms: "
+                    f"{totals['found']} account(s) found, "
+                    f"{totals['ratelimited']} rate limited, "
+                    f"{totals['timeouts']} timed out, {totals['errors']} error(s)"
+                ),
+                "total_emails": len(emails),
+                "platforms_per_email": len(modules),
+                "emails": summary,
+            },
+        }
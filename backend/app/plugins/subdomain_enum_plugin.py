@@ -7,8 +7,9 @@ import json
 from typing import Any, AsyncGenerator, Dict, List, Optional, Set
 
 import aiohttp
-import dns.asyncresolver
+import dns.resolver
 from app.core.dependencies import get_db
+from app.core.dns_resolver import dns_resolver
 from app.schemas.entity_schema import (
 	DomainData,
 	EntityCreate,
@@ -116,12 +117,12 @@ class SubdomainEnumPlugin(BasePlugin):
             return set()
 
     async def resolve_subdomain(
-        self, resolver, semaphore, fqdn: str
+        self, semaphore, fqdn: str
     ) -> Optional[Dict[str, Any]]:
         """Resolve a subdomain and return its IP address if found."""
         try:
             async with semaphore:
-                answers = await resolver.resolve(fqdn, "A")
+                answers = await dns_resolver.resolve(fqdn, "A")
             ips = [rdata.to_text() for rdata in answers]
             return {"subdomain": fqdn, "ip": ips[0] if ips else None, "resolved": True}
         except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN, dns.exception.Timeout):
@@ -191,8 +192,7 @@ class SubdomainEnumPlugin(BasePlugin):
             }
             return
 
-        # Prepare DNS resolver
-        resolver = dns.asyncresolver.Resolver()
+        # Limit concurrent DNS queries for this run on top of the shared resolver limits
         semaphore = asyncio.Semaphore(concurrency)
 
         # Track sources for each subdomain
@@ -206,35 +206,41 @@ class SubdomainEnumPlugin(BasePlugin):
 
         # Resolve subdomains
 
-        # Create tasks for DNS resolution
+        # Create tasks for DNS resolution so they run concurrently
         tasks = []
         for subdomain in sorted(all_subdomains):
-            task = self.resolve_subdomain(resolver, semaphore, subdomain)
+            task = asyncio.create_task(self.resolve_subdomain(semaphore, subdomain))
             tasks.append((subdomain, task))
 
-        # Execute DNS resolutions and yield results as they complete
+        # Execute DNS resolutions and yield results in order as they complete
         resolved_count = 0
-        for subdomain, task in tasks:
-            result = await task
-            if result:
-                resolved_count += 1
-                result["source"] = ", ".join(
-                    subdomain_sources.get(subdomain, ["Unknown"])
-                )
-                yield {"type": "data", "data": result}
-            else:
-                # Yield unresolved subdomains too
-                yield {
-                    "type": "data",
-                    "data": {
-                        "subdomain": subdomain,
-                        "ip": None,
-                        "resolved": False,
-                        "source": ", ".join(
-                            subdomain_sources.get(subdomain, ["Unknown"])
-                        ),
-                    },
-                }
+        try:
+            for subdomain, task in tasks:
+                result = await task
+                if result:
+                    resolved_count += 1
+                    result["source"] = ", ".join(
+                        subdomain_sources.get(subdomain, ["Unknown"])
+                    )
+                    yield {"type": "data", "data": result}
+                else:
+                    # Yield unresolved subdomains too
+                    yield {
+                        "type": "data",
+                        "data": {
+                            "subdomain": subdomain,
+                            "ip": None,
+                            "resolved": False,
+                            "source": ", ".join(
+                                subdomain_sources.get(subdomain, ["Unknown"])
+                            ),
+                        },
+                    }
+        finally:
+            # Don't leave lookups running if the consumer stops early
+            for _, task in tasks:
+                if not task.done():
+                    task.cancel()
 
         # Final summary
         yield {
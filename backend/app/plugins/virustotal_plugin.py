@@ -3,18 +3,91 @@ Analyze files, URLs, domains, and IPs using VirusTotal threat intelligence
 """
 
 import asyncio
+import hashlib
 import ipaddress
 import re
 import time
-from typing import Any, AsyncGenerator, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 import vt
+from app.core.config import virustotal_settings
 from app.core.dependencies import get_db
 from app.services.system_config_service import SystemConfigService
 from sqlmodel import Session
 
 from .base_plugin import BasePlugin
 
+# Maximum number of targets accepted in a single bulk run
+BULK_MAX_TARGETS = 1000
+
+# Maximum number of requests in flight during a bulk run
+BULK_CONCURRENCY = 4
+
+CacheKey = Tuple[str, str, bool]
+
+
+class RequestPacer:
+    """Spaces requests evenly so a run stays within a requests-per-minute budget"""
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        """Wait for the next free request slot"""
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+# Quotas apply per API key, so pacers are shared by all runs using the same key
+_pacers: Dict[str, RequestPacer] = {}
+
+# Analysis results keyed by (analysis type, target, include details)
+_response_cache: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+
+def _get_pacer(api_key: str) -> RequestPacer:
+    """
+    Get the shared pacer for an API key. Its rate comes from configuration
+    rather than from any one run, since every run with the key shares it.
+    """
+    key_id = hashlib.sha256(api_key.encode()).hexdigest()
+    pacer = _pacers.get(key_id)
+    if pacer is None:
+        pacer = RequestPacer(virustotal_settings.VIRUSTOTAL_REQUESTS_PER_MINUTE)
+        _pacers[key_id] = pacer
+    return pacer
+
+
+def _get_cached_response(key: CacheKey) -> Optional[Dict[str, Any]]:
+    """Return a cached analysis result if it has not expired"""
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+
+    expires_at, result = entry
+    if expires_at <= time.monotonic():
+        del _response_cache[key]
+        return None
+
+    _response_cache.move_to_end(key)
+    return result
+
+
+def _store_response(key: CacheKey, result: Dict[str, Any]) -> None:
+    """Cache an analysis result, evicting the least recently used entries"""
+    _response_cache[key] = (
+        time.monotonic() + virustotal_settings.VIRUSTOTAL_CACHE_TTL,
+        result,
+    )
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > virustotal_settings.VIRUSTOTAL_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
 
 class VirustotalPlugin(BasePlugin):
     """Analyze files, URLs, domains, and IPs using VirusTotal threat intelligence"""
@@ -32,7 +105,12 @@ class VirustotalPlugin(BasePlugin):
             "target": {
                 "type": "string",
                 "description": "File hash (MD5/SHA1/SHA256), URL, domain, or IP address to analyze",
-                "required": True,
+                "required": False,
+            },
+            "targets": {
+                "type": "string",
+                "description": "Comma or newline separated targets to analyze in bulk (types are auto-detected)",
+                "required": False,
             },
             "analysis_type": {
                 "type": "string",
@@ -52,6 +130,12 @@ class VirustotalPlugin(BasePlugin):
                 "default": 30.0,
                 "required": False,
             },
+            "use_cache": {
+                "type": "boolean",
+                "description": "Reuse recent VirusTotal responses instead of querying again",
+                "default": True,
+                "required": False,
+            },
             # Note: save_to_case parameter is automatically added by BasePlugin
         }
 
@@ -140,6 +224,62 @@ class VirustotalPlugin(BasePlugin):
         else:
             return "Malicious"
 
+    def _parse_targets(self, raw_targets: str) -> List[str]:
+        """Split comma or newline separated targets, dropping blanks and duplicates"""
+        targets = [
+            target.strip()
+            for line in raw_targets.splitlines()
+            for target in line.split(",")
+            if target.strip()
+        ]
+        return list(dict.fromkeys(targets))
+
+    async def _analyze(
+        self,
+        client: vt.Client,
+        target: str,
+        analysis_type: str,
+        include_details: bool,
+        pacer: RequestPacer,
+        use_cache: bool,
+    ) -> Dict[str, Any]:
+        """
+        Analyze a single target, serving repeated lookups from the response cache
+
+        Raises:
+            ValueError: If the analysis type is invalid
+            vt.error.APIError: If the VirusTotal API returns an error
+        """
+        analyzers = {
+            "file": self._analyze_file,
+            "url": self._analyze_url,
+            "domain": self._analyze_domain,
+            "ip": self._analyze_ip,
+        }
+        if analysis_type not in analyzers:
+            raise ValueError(f"Invalid analysis type: {analysis_type}")
+
+        cache_key = (analysis_type, target, include_details)
+        if use_cache:
+            cached = _get_cached_response(cache_key)
+            if cached is not None:
+                return {**cached, "cached": True}
+
+        await pacer.wait()
+        async for result in analyzers[analysis_type](client, target, include_details):
+            _store_response(cache_key, result["data"])
+            return result["data"]
+
+    def _format_error(self, error: Exception, timeout: float) -> str:
+        """Turn an analysis exception into a user-facing message"""
+        if isinstance(error, vt.error.APIError):
+            return f"VirusTotal API error: {str(error)}"
+        if isinstance(error, asyncio.TimeoutError):
+            return f"Request timed out after {timeout} seconds"
+        if isinstance(error, ValueError):
+            return str(error)
+        return f"Unexpected error: {str(error)}"
+
     async def run(
         self, params: Optional[Dict[str, Any]] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
@@ -152,116 +292,167 @@ class VirustotalPlugin(BasePlugin):
         Yields:
             Structured data results
         """
-        if not params or "target" not in params:
+        if not params or not (params.get("target") or params.get("targets")):
             yield {"type": "error", "data": {"message": "Target parameter is required"}}
             return
 
         # Extract parameters
-        target = params["target"].strip()
+        target = (params.get("target") or "").strip()
+        bulk_targets = self._parse_targets(params.get("targets") or "")
         analysis_type = params.get("analysis_type", "auto")
         include_details = params.get("include_details", True)
         timeout = params.get("timeout", 30.0)
+        use_cache = params.get("use_cache", True)
+
+        if len(bulk_targets) > BULK_MAX_TARGETS:
+            yield {
+                "type": "error",
+                "data": {
+                    "message": f"Too many targets ({len(bulk_targets)}). Maximum is {BULK_MAX_TARGETS}"
+                },
+            }
+            return
 
-        # Get database session
-        db = next(get_db())
+        # Use injected session if available, otherwise get a new one
+        if self._db_session:
+            db = self._db_session
+            close_session = False
+        else:
+            db = next(get_db())
+            close_session = True
 
-        # Check API key requirements
-        if hasattr(self, "api_key_requirements") and self.api_key_requirements:
-            missing_keys = self.get_missing_api_keys(db)
-            if missing_keys:
+        try:
+            # Check API key requirements
+            if hasattr(self, "api_key_requirements") and self.api_key_requirements:
+                missing_keys = self.get_missing_api_keys(db)
+                if missing_keys:
+                    yield {
+                        "type": "error",
+                        "data": {
+                            "message": f"API key{'s' if len(missing_keys) > 1 else ''} required for: {', '.join(missing_keys)}. "
+                            "Please add them in Admin → Configuration → API Keys"
+                        },
+                    }
+                    return
+
+            # Retrieve API key
+            config_service = SystemConfigService(db)
+            api_key = config_service.get_api_key("virustotal")
+        finally:
+            if close_session:
+                db.close()
+
+        if not api_key:
+            yield {
+                "type": "error",
+                "data": {
+                    "message": "VirusTotal API key not configured. Please add it in Admin → Configuration → API Keys"
+                },
+            }
+            return
+
+        pacer = _get_pacer(api_key)
+
+        if bulk_targets:
+            if target and target not in bulk_targets:
+                bulk_targets.insert(0, target)
+            async for result in self._run_bulk(
+                api_key, bulk_targets, include_details, timeout, pacer, use_cache
+            ):
+                yield result
+            return
+
+        # Auto-detect target type if needed
+        if analysis_type == "auto":
+            detected_type = self._detect_target_type(target)
+            if detected_type == "unknown":
                 yield {
                     "type": "error",
                     "data": {
-                        "message": f"API key{'s' if len(missing_keys) > 1 else ''} required for: {', '.join(missing_keys)}. "
-                        "Please add them in Admin → Configuration → API Keys"
+                        "message": f"Could not auto-detect target type for '{target}'. Please specify analysis_type parameter."
                     },
                 }
-                db.close()
                 return
+            analysis_type = detected_type
 
-        try:
-            # Retrieve API key
-            config_service = SystemConfigService(db)
-            api_key = config_service.get_api_key("virustotal")
+        # Initialize VirusTotal client
+        async with vt.Client(api_key, timeout=timeout) as client:
+            try:
+                result = await self._analyze(
+                    client, target, analysis_type, include_details, pacer, use_cache
+                )
+                yield {"type": "data", "data": result}
+            except Exception as e:
+                yield {
+                    "type": "error",
+                    "data": {"message": self._format_error(e, timeout)},
+                }
 
-            if not api_key:
+    async def _run_bulk(
+        self,
+        api_key: str,
+        targets: List[str],
+        include_details: bool,
+        timeout: float,
+        pacer: RequestPacer,
+        use_cache: bool,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Analyze many targets with one client, streaming verdicts as they arrive
+
+        Each target's type is auto-detected. Requests are spaced by the shared
+        pacer so the run stays within the API key's quota.
+        """
+        typed_targets = []
+        for target in targets:
+            target_type = self._detect_target_type(target)
+            if target_type == "unknown":
                 yield {
                     "type": "error",
                     "data": {
-                        "message": "VirusTotal API key not configured. Please add it in Admin → Configuration → API Keys"
+                        "message": f"Could not auto-detect target type for '{target}'"
                     },
                 }
-                return
+            else:
+                typed_targets.append((target, target_type))
 
-            # Auto-detect target type if needed
-            if analysis_type == "auto":
-                detected_type = self._detect_target_type(target)
-                if detected_type == "unknown":
-                    yield {
-                        "type": "error",
-                        "data": {
-                            "message": f"Could not auto-detect target type for '{target}'. Please specify analysis_type parameter."
-                        },
-                    }
-                    return
-                analysis_type = detected_type
-
-            # Initialize VirusTotal client
-            async with vt.Client(api_key) as client:
-                try:
-                    # Set timeout
-                    client.timeout = timeout
-
-                    # Perform analysis based on type
-                    if analysis_type == "file":
-                        async for result in self._analyze_file(
-                            client, target, include_details
-                        ):
-                            yield result
-                    elif analysis_type == "url":
-                        async for result in self._analyze_url(
-                            client, target, include_details
-                        ):
-                            yield result
-                    elif analysis_type == "domain":
-                        async for result in self._analyze_domain(
-                            client, target, include_details
-                        ):
-                            yield result
-                    elif analysis_type == "ip":
-                        async for result in self._analyze_ip(
-                            client, target, include_details
-                        ):
-                            yield result
-                    else:
+        if not typed_targets:
+            return
+
+        semaphore = asyncio.Semaphore(BULK_CONCURRENCY)
+
+        async with vt.Client(api_key, timeout=timeout) as client:
+
+            async def analyze(target: str, target_type: str):
+                async with semaphore:
+                    try:
+                        return target, await self._analyze(
+                            client, target, target_type, include_details, pacer, use_cache
+                        ), None
+                    except Exception as e:
+                        return target, None, e
+
+            tasks = [
+                asyncio.create_task(analyze(target, target_type))
+                for target, target_type in typed_targets
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    target, result, error = await next_done
+                    if error:
                         yield {
                             "type": "error",
                             "data": {
-                                "message": f"Invalid analysis type: {analysis_type}"
+                                "message": f"{target}: {self._format_error(error, timeout)}"
                             },
                         }
-                        return
-
-                except vt.error.APIError as e:
-                    yield {
-                        "type": "error",
-                        "data": {"message": f"VirusTotal API error: {str(e)}"},
-                    }
-                except asyncio.TimeoutError:
-                    yield {
-                        "type": "error",
-                        "data": {
-                            "message": f"Request timed out after {timeout} seconds"
-                        },
-                    }
-                except Exception as e:
-                    yield {
-                        "type": "error",
-                        "data": {"message": f"Unexpected error: {str(e)}"},
-                    }
-
-        finally:
-            db.close()
+                    else:
+                        yield {"type": "data", "data": result}
+            finally:
+                # Cancel outstanding requests if the consumer stops early
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
 
     async def _analyze_file(
         self, client: vt.Client, file_hash: str, include_details: bool
@@ -451,7 +642,7 @@ class VirustotalPlugin(BasePlugin):
             "=" * 70,
             "",
             f"Analysis Date: {time.strftime('%Y-%m-%d %H:%M:%S UTC')}",
-            f"Target: {params.get('target', 'Unknown')}",
+            f"Target: {params.get('target') or ('Multiple targets' if params.get('targets') else 'Unknown')}",
             f"Analysis Type: {params.get('analysis_type', 'auto-detected')}",
             "",
         ]
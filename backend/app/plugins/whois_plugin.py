@@ -3,14 +3,57 @@ Query domain Whois information using python-whois library
 """
 
 import asyncio
-from datetime import datetime
-from typing import Any, AsyncGenerator, Dict, List, Optional
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 import whois
-from sqlmodel import Session
+from app.core.config import whois_settings
+from app.core.dependencies import get_db
+from app.core.logging import get_logger_with_context
+from app.core.utils import get_utc_now
+from app.database.models import WhoisRecord
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, select
 
 from .base_plugin import BasePlugin
 
+# Maximum number of domains accepted in a single bulk run
+BULK_MAX_DOMAINS = 500
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S UTC"
+
+logger = get_logger_with_context(module="whois_plugin")
+
+# Dialects with INSERT ... ON CONFLICT, for race-free cache writes
+UPSERT_DIALECTS = {"postgresql": postgresql, "sqlite": sqlite}
+
+# Shared across runs so bulk lookups cannot exhaust the default executor
+_whois_executor = ThreadPoolExecutor(
+    max_workers=whois_settings.WHOIS_MAX_WORKERS, thread_name_prefix="whois"
+)
+
+# Per-TLD limits are shared by all runs on the same event loop, since every
+# domain under a TLD is answered by the same registry WHOIS server
+_tld_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_tld_semaphore(domain: str) -> asyncio.Semaphore:
+    """Get the concurrency limiter for a domain's TLD on the running loop"""
+    loop = asyncio.get_running_loop()
+    semaphores = _tld_semaphores.get(loop)
+    if semaphores is None:
+        semaphores = {}
+        _tld_semaphores[loop] = semaphores
+
+    tld = domain.rsplit(".", 1)[-1]
+    if tld not in semaphores:
+        semaphores[tld] = asyncio.Semaphore(whois_settings.WHOIS_MAX_CONCURRENCY_PER_TLD)
+    return semaphores[tld]
+
 
 class WhoisPlugin(BasePlugin):
     """Query domain Whois information"""
@@ -25,7 +68,12 @@ class WhoisPlugin(BasePlugin):
             "domain": {
                 "type": "string",
                 "description": "Domain name to query (e.g., example.com)",
-                "required": True,
+                "required": False,
+            },
+            "domains": {
+                "type": "string",
+                "description": "Comma or newline separated domain names to query in bulk",
+                "required": False,
             },
             "timeout": {
                 "type": "float",
@@ -33,6 +81,12 @@ class WhoisPlugin(BasePlugin):
                 "default": 30.0,
                 "required": False,
             },
+            "use_cache": {
+                "type": "boolean",
+                "description": "Reuse stored whois records newer than the cache TTL",
+                "default": True,
+                "required": False,
+            },
         }
 
     def parse_output(self, line: str) -> Optional[Dict[str, Any]]:
@@ -48,7 +102,7 @@ class WhoisPlugin(BasePlugin):
             date_value = date_value[0] if date_value else None
 
         if isinstance(date_value, datetime):
-            return date_value.strftime("%Y-%m-%d %H:%M:%S UTC")
+            return date_value.strftime(DATE_FORMAT)
         elif isinstance(date_value, str):
             return date_value
         else:
@@ -64,6 +118,148 @@ class WhoisPlugin(BasePlugin):
         else:
             return [str(field_value).strip()]
 
+    def _normalize_domain(self, domain: str) -> str:
+        """Strip protocol and path from a domain"""
+        domain = domain.strip().lower()
+
+        # Remove protocol if present
+        if domain.startswith(("http://", "https://")):
+            domain = domain.split("://", 1)[1]
+
+        # Remove path if present
+        if "/" in domain:
+            domain = domain.split("/", 1)[0]
+
+        return domain
+
+    def _parse_whois_data(self, domain: str, whois_data) -> Dict[str, Any]:
+        """Extract the fields we keep from a python-whois result"""
+        result_data = {
+            "domain": domain,
+            "registrar": getattr(whois_data, "registrar", None),
+            "creation_date": self._format_date(
+                getattr(whois_data, "creation_date", None)
+            ),
+            "expiration_date": self._format_date(
+                getattr(whois_data, "expiration_date", None)
+            ),
+            "updated_date": self._format_date(getattr(whois_data, "updated_date", None)),
+            "name_servers": self._format_list_field(
+                getattr(whois_data, "name_servers", [])
+            ),
+            "status": self._format_list_field(getattr(whois_data, "status", [])),
+            "emails": self._format_list_field(getattr(whois_data, "emails", [])),
+            "org": getattr(whois_data, "org", None),
+            "registrant_name": getattr(whois_data, "name", None),
+            "registrant_country": getattr(whois_data, "country", None),
+            "admin_email": getattr(whois_data, "admin_email", None),
+            "tech_email": getattr(whois_data, "tech_email", None),
+            "whois_server": getattr(whois_data, "whois_server", None),
+            "dnssec": getattr(whois_data, "dnssec", None),
+        }
+
+        # Clean up None values and empty lists
+        return {k: v for k, v in result_data.items() if v is not None and v != []}
+
+    def _add_derived_fields(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Add domain age and expiration fields, which change daily and are not stored"""
+        result = dict(record)
+
+        # Calculate domain age if creation date is available
+        if result.get("creation_date"):
+            try:
+                creation = datetime.strptime(result["creation_date"], DATE_FORMAT)
+                age_days = (datetime.now() - creation).days
+                result["domain_age_days"] = age_days
+                result["domain_age_years"] = round(age_days / 365.25, 1)
+            except ValueError:
+                pass
+
+        # Calculate days until expiration
+        if result.get("expiration_date"):
+            try:
+                expiration = datetime.strptime(result["expiration_date"], DATE_FORMAT)
+                days_until_exp = (expiration - datetime.now()).days
+                result["days_until_expiration"] = days_until_exp
+                if days_until_exp < 30:
+                    result["expiration_warning"] = (
+                        f"Domain expires in {days_until_exp} days"
+                    )
+            except ValueError:
+                pass
+
+        return result
+
+    def _load_cached_records(
+        self, db: Session, domains: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Load stored whois records that are still within the cache TTL"""
+        cutoff = get_utc_now() - timedelta(days=whois_settings.WHOIS_CACHE_TTL_DAYS)
+        records = db.exec(
+            select(WhoisRecord).where(WhoisRecord.domain.in_(domains))
+        ).all()
+
+        cached = {}
+        for record in records:
+            fetched_at = record.fetched_at
+            if fetched_at.tzinfo is None:
+                fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+            if fetched_at >= cutoff:
+                cached[record.domain] = record.data
+        return cached
+
+    def _store_record(self, domain: str, data: Dict[str, Any]) -> None:
+        """
+        Insert or refresh the stored whois record for a domain.
+        Written through a session of its own, so the cache never commits the
+        caller's transaction, and as an upsert, so concurrent lookups of the
+        same domain do not collide.
+        """
+        if self._db_session is not None:
+            db = Session(self._db_session.get_bind())
+        else:
+            db = next(get_db())
+
+        try:
+            dialect = UPSERT_DIALECTS[db.get_bind().dialect.name]
+            now = get_utc_now()
+            db.exec(
+                dialect.insert(WhoisRecord)
+                .values(domain=domain, data=data, fetched_at=now)
+                .on_conflict_do_update(
+                    index_elements=[WhoisRecord.domain],
+                    set_={"data": data, "fetched_at": now},
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    async def _query_domain(
+        self, domain: str, timeout: float
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Query whois for a domain, returning the parsed record or an error message"""
+        try:
+            async with _get_tld_semaphore(domain):
+                # Run whois query in the shared executor to avoid blocking
+                loop = asyncio.get_event_loop()
+                whois_data = await asyncio.wait_for(
+                    loop.run_in_executor(_whois_executor, whois.whois, domain),
+                    timeout=timeout,
+                )
+        except asyncio.TimeoutError:
+            return None, f"Whois query timed out for {domain}"
+        except Exception as e:
+            error_msg = str(e)
+            if "No whois server" in error_msg or "not found" in error_msg.lower():
+                return None, f"Domain {domain} not found or invalid TLD"
+            return None, f"Whois query failed: {error_msg}"
+
+        if not whois_data:
+            return None, f"No whois data found for {domain}"
+
+        return self._parse_whois_data(domain, whois_data), None
+
     async def run(
         self, params: Optional[Dict[str, Any]] = None
     ) -> AsyncGenerator[Dict[str, Any], None]:
@@ -76,119 +272,80 @@ class WhoisPlugin(BasePlugin):
         Yields:
             Structured data results
         """
-        if not params or "domain" not in params:
+        if not params or not (params.get("domain") or params.get("domains")):
             yield {"type": "error", "data": {"message": "Domain parameter is required"}}
             return
 
-        domain = params["domain"].strip().lower()
+        raw_domains = [params.get("domain") or ""]
+        for line in (params.get("domains") or "").splitlines():
+            raw_domains.extend(line.split(","))
+        domains = list(
+            dict.fromkeys(
+                d for d in (self._normalize_domain(raw) for raw in raw_domains) if d
+            )
+        )
         timeout = params.get("timeout", 30.0)
+        use_cache = params.get("use_cache", True)
 
-        # Remove protocol if present
-        if domain.startswith(("http://", "https://")):
-            domain = domain.split("://", 1)[1]
-
-        # Remove path if present
-        if "/" in domain:
-            domain = domain.split("/", 1)[0]
-
-        if not domain:
+        if not domains:
             yield {"type": "error", "data": {"message": "Invalid domain format"}}
             return
 
-        try:
-            # Run whois query in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            whois_data = await asyncio.wait_for(
-                loop.run_in_executor(None, whois.whois, domain), timeout=timeout
-            )
-
-            if not whois_data:
-                yield {
-                    "type": "error",
-                    "data": {"message": f"No whois data found for {domain}"},
-                }
-                return
-
-            # Extract and format whois information
-            result_data = {
-                "domain": domain,
-                "registrar": getattr(whois_data, "registrar", None),
-                "creation_date": self._format_date(
-                    getattr(whois_data, "creation_date", None)
-                ),
-                "expiration_date": self._format_date(
-                    getattr(whois_data, "expiration_date", None)
-                ),
-                "updated_date": self._format_date(
-                    getattr(whois_data, "updated_date", None)
-                ),
-                "name_servers": self._format_list_field(
-                    getattr(whois_data, "name_servers", [])
-                ),
-                "status": self._format_list_field(getattr(whois_data, "status", [])),
-                "emails": self._format_list_field(getattr(whois_data, "emails", [])),
-                "org": getattr(whois_data, "org", None),
-                "registrant_name": getattr(whois_data, "name", None),
-                "registrant_country": getattr(whois_data, "country", None),
-                "admin_email": getattr(whois_data, "admin_email", None),
-                "tech_email": getattr(whois_data, "tech_email", None),
-                "whois_server": getattr(whois_data, "whois_server", None),
-                "dnssec": getattr(whois_data, "dnssec", None),
+        if len(domains) > BULK_MAX_DOMAINS:
+            yield {
+                "type": "error",
+                "data": {
+                    "message": f"Too many domains ({len(domains)}). Maximum is {BULK_MAX_DOMAINS}"
+                },
             }
+            return
 
-            # Clean up None values and empty lists
-            cleaned_data = {
-                k: v for k, v in result_data.items() if v is not None and v != []
-            }
+        # Use injected session if available, otherwise get a new one
+        if self._db_session:
+            db = self._db_session
+            close_session = False
+        else:
+            db = next(get_db())
+            close_session = True
 
-            # Calculate domain age if creation date is available
-            if cleaned_data.get("creation_date"):
-                try:
-                    creation = getattr(whois_data, "creation_date", None)
-                    if isinstance(creation, list):
-                        creation = creation[0]
-                    if isinstance(creation, datetime):
-                        age_days = (datetime.now() - creation).days
-                        cleaned_data["domain_age_days"] = age_days
-                        cleaned_data["domain_age_years"] = round(age_days / 365.25, 1)
-                except:
-                    pass
-
-            # Calculate days until expiration
-            if cleaned_data.get("expiration_date"):
-                try:
-                    expiration = getattr(whois_data, "expiration_date", None)
-                    if isinstance(expiration, list):
-                        expiration = expiration[0]
-                    if isinstance(expiration, datetime):
-                        days_until_exp = (expiration - datetime.now()).days
-                        cleaned_data["days_until_expiration"] = days_until_exp
-                        if days_until_exp < 30:
-                            cleaned_data["expiration_warning"] = (
-                                f"Domain expires in {days_until_exp} days"
-                            )
-                except:
-                    pass
-
-            yield {"type": "data", "data": cleaned_data}
+        tasks = []
+        try:
+            cached = self._load_cached_records(db, domains) if use_cache else {}
+
+            # Stored records are returned immediately, without touching WHOIS servers
+            for domain in domains:
+                if domain in cached:
+                    result = self._add_derived_fields(cached[domain])
+                    result["cached"] = True
+                    yield {"type": "data", "data": result}
+
+            async def query(domain: str):
+                return domain, await self._query_domain(domain, timeout)
+
+            tasks = [
+                asyncio.create_task(query(domain))
+                for domain in domains
+                if domain not in cached
+            ]
+            for next_done in asyncio.as_completed(tasks):
+                domain, (record, error) = await next_done
+                if error:
+                    yield {"type": "error", "data": {"message": error}}
+                    continue
 
-        except asyncio.TimeoutError:
-            yield {
-                "type": "error",
-                "data": {"message": f"Whois query timed out for {domain}"},
-            }
-        except Exception as e:
-            error_msg = str(e)
-            if "No whois server" in error_msg or "not found" in error_msg.lower():
-                yield {
-                    "type": "error",
-                    "data": {"message": f"Domain {domain} not found or invalid TLD"},
-                }
-            else:
-                yield {
-                    "type": "error",
-                    "data": {"message": f"Whois query failed: {error_msg}"},
-                }
+                try:
+                    await asyncio.to_thread(self._store_record, domain, record)
+                except Exception as e:
+                    # The lookup itself succeeded; only the cache missed out
+                    logger.warning(f"Could not cache whois record for {domain}: {e}")
+                yield {"type": "data", "data": self._add_derived_fields(record)}
+        finally:
+            # Cancel outstanding queries if the consumer stops early
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            if close_session:
+                db.close()
 
     def _format_evidence_content(
         self, results: List[Dict[str, Any]], params: Dict[str, Any]
@@ -197,17 +354,22 @@ class WhoisPlugin(BasePlugin):
         if not results:
             return f"Whois Lookup Results\n{'=' * 50}\n\nNo results found."
 
+        domain_label = params.get("domain") or ", ".join(
+            result["domain"] for result in results if "domain" in result
+        )
         content_lines = [
             "Whois Lookup Results",
             "=" * 50,
             "",
-            f"Domain: {params.get('domain', 'Unknown')}",
+            f"Domain: {domain_label or 'Unknown'}",
             f"Query time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S UTC')}",
             "",
         ]
 
         for result in results:
             if "domain" in result:
+                if len(results) > 1:
+                    content_lines.extend([f"[{result['domain']}]", ""])
                 content_lines.extend(
                     [
                         "Registration Information:",
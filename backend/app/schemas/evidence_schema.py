@@ -122,3 +122,101 @@ class Evidence(EvidenceBase):
     created_at: datetime
     updated_at: datetime
     created_by_id: int
+
+
+class BulkUploadItem(BaseModel):
+    """Schema for the outcome of one file in a bulk upload."""
+
+    filename: str
+    status: str  # "created" or "failed"
+    evidence: Optional[Evidence] = None
+    error: Optional[str] = None
+
+
+class BulkUploadResult(BaseModel):
+    """Schema for bulk upload responses."""
+
+    created: int
+    failed: int
+    results: List[BulkUploadItem]
+
+
+class UploadSessionCreate(BaseModel):
+    """Schema for starting a resumable chunked upload."""
+
+    case_id: int = Field(..., gt=0)
+    filename: str = Field(..., min_length=1, max_length=255)
+    total_size: int = Field(..., gt=0)
+    content_type: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    category: str = Field(default="Other")
+    folder_path: Optional[str] = Field(default=None, max_length=500)
+    parent_folder_id: Optional[int] = None
+
+    VALID_CATEGORIES: ClassVar[List[str]] = EvidenceCreate.VALID_CATEGORIES
+
+    @model_validator(mode="after")
+    def validate_category(self) -> "UploadSessionCreate":
+        if self.category.lower() not in [cat.lower() for cat in self.VALID_CATEGORIES]:
+            raise ValueError(
+                f"category must be one of: {', '.join(self.VALID_CATEGORIES)}"
+            )
+        self.category = next(
+            cat for cat in self.VALID_CATEGORIES if cat.lower() == self.category.lower()
+        )
+        return self
+
+
+class UploadSessionComplete(BaseModel):
+    """Schema for completing a chunked upload."""
+
+    sha256: str = Field(..., pattern=r"^[0-9a-fA-F]{64}$")
+
+
+class UploadSession(BaseModel):
+    """Schema for chunked upload responses."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    case_id: int
+    filename: str
+    total_size: int
+    received_size: int
+    status: str
+    evidence_id: Optional[int] = None
+    created_at: datetime
+    expires_at: datetime
+
+
+class EvidenceDownloadUrl(BaseModel):
+    """Schema for a direct, time-limited evidence download URL."""
+
+    url: str
+    expires_in: int
+
+
+class EvidenceThumbnail(BaseModel):
+    """Schema for an image evidence entry in a case's thumbnail gallery."""
+
+    evidence_id: int
+    title: str
+    folder_path: Optional[str] = None
+    thumbnail_url: str
+    preview_url: str
+    image_url: str
+
+
+class EvidenceSearchResult(BaseModel):
+    """Schema for a full-text search match."""
+
+    evidence_id: int
+    case_id: int
+    title: str
+    description: Optional[str] = None
+    evidence_type: str
+    folder_path: Optional[str] = None
+    # Matched text in context, with matches wrapped in **
+    snippet: Optional[str] = None
+    rank: float
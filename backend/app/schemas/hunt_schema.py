@@ -102,6 +102,49 @@ class HuntExecutionListResponse(BaseModel):
         orm_mode = True
 
 
+class HuntScheduleCreate(BaseModel):
+    """Request model for scheduling recurring hunt runs"""
+
+    case_id: int = Field(..., description="ID of the case to run the hunt for")
+    cron_expression: str = Field(
+        ..., description="Five-field cron expression in UTC, e.g. '0 6 * * *'"
+    )
+    parameters: Dict[str, Any] = Field(
+        default_factory=dict, description="Initial parameters for each run"
+    )
+
+
+class HuntScheduleUpdate(BaseModel):
+    """Request model for updating a hunt schedule"""
+
+    cron_expression: Optional[str] = None
+    parameters: Optional[Dict[str, Any]] = None
+    is_active: Optional[bool] = None
+
+
+class HuntScheduleResponse(BaseModel):
+    """Response model for hunt schedules"""
+
+    id: int
+    hunt_id: int
+    case_id: int
+    cron_expression: str
+    initial_parameters: Dict[str, Any]
+    is_active: bool
+    next_run_at: Optional[datetime] = None
+    last_run_at: Optional[datetime] = None
+    last_execution_id: Optional[int] = None
+    created_by_id: int
+    created_at: datetime
+    updated_at: datetime
+
+    # Basic hunt info
+    hunt_display_name: Optional[str] = None
+
+    class Config:
+        orm_mode = True
+
+
 class HuntProgressEvent(BaseModel):
     """WebSocket event for hunt progress updates"""
 
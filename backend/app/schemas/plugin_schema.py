@@ -2,9 +2,10 @@
 Plugin schemas for request/response validation
 """
 
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class PluginParameter(BaseModel):
@@ -41,3 +42,31 @@ class PluginOutput(BaseModel):
 
     type: str = "data"  # data, error, or status
     data: Dict[str, Any]  # Structured output data
+
+
+class PluginRunResponse(BaseModel):
+    """Schema for a detached plugin run"""
+
+    id: int
+    plugin_name: str
+    parameters: Dict[str, Any]
+    status: str
+    result_count: int
+    error: Optional[str] = None
+    created_by_id: int
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PluginRunResultsPage(BaseModel):
+    """Schema for a page of stored plugin run results"""
+
+    run_id: int
+    status: str
+    offset: int
+    next_offset: int
+    total: int
+    results: List[PluginOutput]
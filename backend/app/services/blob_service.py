@@ -0,0 +1,138 @@
+"""
+Reference counting for content-addressed evidence files.
+
+Every file evidence points at a blob named by its SHA-256, so identical files
+uploaded to several cases share one copy on disk. A blob is reclaimed only
+when the last evidence referencing it is deleted.
+"""
+
+from typing import Iterable, Optional
+
+from app.core.derivatives import delete_derivatives
+from app.core.file_storage import blob_key, delete_blob, get_storage
+from app.core.logging import get_security_logger
+from app.core.text_index import delete_text_index
+from app.core.utils import get_utc_now
+from app.database import models
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, delete, select, update
+
+# Dialects with INSERT ... ON CONFLICT, so concurrent references never collide
+UPSERT_DIALECTS = {"postgresql": postgresql, "sqlite": sqlite}
+
+
+class BlobService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_reference(self, evidence_id: int, file_hash: str) -> None:
+        """
+        Record that an evidence uses a blob; committed with the evidence.
+        Raises a 409 if the content was reclaimed before it could be referenced.
+        """
+        dialect = UPSERT_DIALECTS[self.db.get_bind().dialect.name]
+        ref_count = self.db.exec(
+            dialect.insert(models.Blob)
+            .values(sha256=file_hash, size=0, ref_count=1, created_at=get_utc_now())
+            .on_conflict_do_update(
+                index_elements=[models.Blob.sha256],
+                set_={"ref_count": models.Blob.ref_count + 1},
+            )
+            .returning(models.Blob.ref_count)
+        ).scalar_one()
+
+        # The row is held until commit, so reclaim_blobs() cannot take the
+        # content now; this catches it having been reclaimed just before
+        info = get_storage().stat(blob_key(file_hash))
+        if info is None:
+            raise HTTPException(
+                status_code=409,
+                detail="The file's content was removed while it was being stored. "
+                "Please upload it again.",
+            )
+        if ref_count == 1:
+            self.db.exec(
+                update(models.Blob)
+                .where(models.Blob.sha256 == file_hash)
+                .values(size=info.size)
+            )
+        self.db.add(models.EvidenceBlob(evidence_id=evidence_id, sha256=file_hash))
+        self.db.flush()
+
+    def release_reference(self, evidence_id: int) -> Optional[str]:
+        """
+        Drop an evidence's reference to its blob, before the evidence is deleted.
+        Returns the blob's hash if nothing references it any more, for
+        reclaim_blobs() to delete once the transaction has committed.
+        """
+        link = self.db.get(models.EvidenceBlob, evidence_id)
+        if not link:
+            return None
+
+        file_hash = link.sha256
+        self.db.delete(link)
+        self.db.exec(
+            update(models.Blob)
+            .where(models.Blob.sha256 == file_hash)
+            .values(ref_count=models.Blob.ref_count - 1)
+        )
+        self.db.flush()
+
+        blob = self.db.get(models.Blob, file_hash)
+        if blob is not None:
+            self.db.refresh(blob)
+            if blob.ref_count > 0:
+                return None
+        return file_hash
+
+    def is_blob_backed(self, evidence_id: int) -> bool:
+        """Whether an evidence's file is in the blob store rather than a case path"""
+        return self.db.get(models.EvidenceBlob, evidence_id) is not None
+
+    def reclaim_blobs(self, file_hashes: Iterable[str]) -> None:
+        """Delete blobs that are no longer referenced, after a commit"""
+        for file_hash in file_hashes:
+            # A concurrent upload may have re-referenced the content meanwhile,
+            # so the count is checked again by the delete that claims the blob.
+            # Its row stays locked until the content is gone. The savepoint
+            # undoes the claim if the file cannot be deleted, without touching
+            # anything else pending in the session.
+            with self.db.begin_nested():
+                claimed = self.db.exec(
+                    delete(models.Blob).where(
+                        models.Blob.sha256 == file_hash, models.Blob.ref_count <= 0
+                    )
+                ).rowcount
+                if claimed:
+                    delete_blob(file_hash)
+            if not claimed:
+                continue
+            self.db.commit()
+
+            delete_derivatives(file_hash)
+            delete_text_index(file_hash)
+            get_security_logger(event="blob_reclaimed", file_hash=file_hash).info(
+                f"Reclaimed unreferenced blob {file_hash}"
+            )
+
+    def discard_if_unreferenced(self, file_hash: str) -> None:
+        """Delete a just-stored blob whose evidence failed to be created"""
+        if self.db.get(models.Blob, file_hash) is None:
+            delete_blob(file_hash)
+        else:
+            self.reclaim_blobs([file_hash])
+
+    def get_case_usage(self, case_id: int) -> int:
+        """Total size of the distinct blobs a case's evidence references"""
+        referenced = (
+            select(models.EvidenceBlob.sha256)
+            .join(
+                models.Evidence, models.Evidence.id == models.EvidenceBlob.evidence_id
+            )
+            .where(models.Evidence.case_id == case_id)
+        )
+        sizes = self.db.exec(
+            select(models.Blob.size).where(models.Blob.sha256.in_(referenced))
+        ).all()
+        return sum(sizes)
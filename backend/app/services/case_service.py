@@ -34,7 +34,7 @@ class CaseService:
         self.config_service = SystemConfigService(db)
 
     async def _generate_case_number(self, current_time: datetime) -> str:
-        config = await self.config_service.get_configuration()
+        config = self.config_service.get_snapshot()
 
         year = str(current_time.year)[2:]
         month = str(current_time.month).zfill(2)
@@ -7,22 +7,76 @@ comprehensive evidence lifecycle management with file hashing, content viewing,
 template-based folder structures, and role-based access control for OSINT investigations.
 """
 
-from typing import List, Optional
-
+import asyncio
+import json
+from functools import partial
+from pathlib import Path
+from typing import Iterator, List, Mapping, Optional
+
+from app.core.archive import ARCHIVE_MEDIA_TYPES, ArchiveEntry, stream_archive
+from app.core.config import storage_settings, upload_settings
 from app.core.dependencies import check_case_access, no_analyst
+from app.core.derivatives import (
+    DERIVATIVE_SIZES,
+    RASTER_IMAGE_EXTENSIONS,
+    DerivativeError,
+    derivative_media_type,
+    get_derivative,
+    supports_derivatives,
+)
+from app.core.file_responses import stored_file_response
 from app.core.file_storage import (
 	create_folder,
 	delete_file,
 	delete_folder,
+	evidence_file_location,
+	logical_file_path,
 	normalize_folder_path,
 	save_upload_file,
+	store_upload_blob,
+	upload_file_size,
 )
 from app.core.logging import get_security_logger
+from app.core.storage import content_disposition
+from app.core.text_index import (
+    MAX_PAGE_BYTES,
+    MAX_PAGE_LINES,
+    get_text_index,
+    read_bytes,
+    read_lines,
+)
 from app.core.utils import get_utc_now
 from app.database import models
 from app.schemas import evidence_schema as schemas
 from fastapi import HTTPException, UploadFile
-from sqlmodel import Session, select
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlmodel import Session, col, or_, select
+from werkzeug.utils import secure_filename
+
+from .blob_service import BlobService
+from .search_service import SearchService, search_indexer
+from .upload_service import UploadService
+
+
+TEXT_VIEWABLE_EXTENSIONS = {
+    ".txt",
+    ".log",
+    ".csv",
+    ".json",
+    ".md",
+    ".yaml",
+    ".yml",
+    ".xml",
+    ".html",
+    ".css",
+    ".js",
+    ".py",
+    ".sql",
+    ".conf",
+    ".ini",
+    ".cfg",
+}
 
 
 class EvidenceService:
@@ -93,10 +147,21 @@ class EvidenceService:
                         detail="File is required for file-type evidence",
                     )
                 try:
+                    # Files are stored by content, so name clashes are resolved
+                    # against the case's existing evidence rather than the disk
+                    taken_paths = set(
+                        self.db.exec(
+                            select(models.Evidence.content).where(
+                                models.Evidence.case_id == evidence.case_id,
+                                models.Evidence.evidence_type == "file",
+                            )
+                        ).all()
+                    )
                     relative_path, file_hash = await save_upload_file(
                         upload_file=file,
                         case_id=evidence.case_id,
                         folder_path=evidence.folder_path,
+                        taken_paths=taken_paths,
                     )
                     evidence.content = relative_path
                     evidence.file_hash = file_hash
@@ -130,8 +195,13 @@ class EvidenceService:
             )
 
             self.db.add(db_evidence)
+            self.db.flush()
+            if db_evidence.file_hash and db_evidence.evidence_type == "file":
+                BlobService(self.db).add_reference(db_evidence.id, db_evidence.file_hash)
+            SearchService(self.db).queue_evidence(db_evidence)
             self.db.commit()
             self.db.refresh(db_evidence)
+            search_indexer.wake()
 
             evidence_logger.bind(
                 evidence_id=db_evidence.id,
@@ -145,10 +215,12 @@ class EvidenceService:
         except HTTPException:
             raise
         except Exception as e:
-            # Clean up uploaded file on database operation failure
-            if evidence.evidence_type == "file" and evidence.content:
+            # Clean up the stored blob on database operation failure, unless
+            # other evidence already shares the same content
+            self.db.rollback()
+            if evidence.evidence_type == "file" and evidence.file_hash:
                 try:
-                    await delete_file(evidence.content)
+                    BlobService(self.db).discard_if_unreferenced(evidence.file_hash)
                 except:
                     pass
             evidence_logger.bind(
@@ -158,6 +230,183 @@ class EvidenceService:
                 status_code=500, detail=f"Error creating evidence: {str(e)}"
             )
 
+    @no_analyst()
+    async def create_evidence_bulk(
+        self,
+        case_id: int,
+        category: str,
+        files: List[UploadFile],
+        current_user: models.User,
+        description: Optional[str] = None,
+        folder_path: Optional[str] = None,
+        parent_folder_id: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        Upload many files to a case in one request. Files are validated,
+        hashed and stored a few at a time in worker threads, then all their
+        evidence is created in a single transaction. Returns a result per
+        file, in upload order; a rejected file does not stop the others.
+        """
+        evidence_logger = get_security_logger(
+            user_id=current_user.id,
+            case_id=case_id,
+            action="create_evidence_bulk",
+            file_count=len(files),
+            event_type="evidence_bulk_upload_attempt",
+        )
+
+        if not files:
+            raise HTTPException(
+                status_code=400, detail="At least one file must be provided"
+            )
+        max_files = upload_settings.UPLOAD_BULK_MAX_FILES
+        if len(files) > max_files:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {max_files} files can be uploaded at once",
+            )
+        valid_categories = schemas.EvidenceCreate.VALID_CATEGORIES
+        category = next(
+            (cat for cat in valid_categories if cat.lower() == category.lower()),
+            None,
+        )
+        if category is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"category must be one of: {', '.join(valid_categories)}",
+            )
+
+        check_case_access(self.db, case_id, current_user)
+        existing_folders = self.db.exec(
+            select(models.Evidence).where(
+                models.Evidence.case_id == case_id,
+                models.Evidence.is_folder == True,
+            )
+        ).first()
+        if not existing_folders:
+            evidence_logger.bind(
+                event_type="evidence_creation_failed",
+                failure_reason="no_folders_exist",
+            ).warning("Bulk upload failed: no folders exist for file upload")
+            raise HTTPException(
+                status_code=400,
+                detail="Cannot upload files without any folders. Create a folder first to organize evidence.",
+            )
+
+        # Bulk uploads count against the same case quota as chunked ones
+        UploadService(self.db).check_quota(
+            case_id, sum(upload_file_size(file) for file in files)
+        )
+        folder_path = normalize_folder_path(folder_path or "") or None
+
+        semaphore = asyncio.Semaphore(max(1, upload_settings.UPLOAD_BULK_CONCURRENCY))
+
+        async def store(file: UploadFile) -> str:
+            async with semaphore:
+                return await run_in_threadpool(store_upload_blob, file)
+
+        outcomes = await asyncio.gather(
+            *(store(file) for file in files), return_exceptions=True
+        )
+
+        taken_paths = set(
+            self.db.exec(
+                select(models.Evidence.content).where(
+                    models.Evidence.case_id == case_id,
+                    models.Evidence.evidence_type == "file",
+                )
+            ).all()
+        )
+        results = []
+        created = []
+        stored_hashes = set()
+        for file, outcome in zip(files, outcomes):
+            try:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+                stored_hashes.add(outcome)
+                # Names are given out in upload order, so duplicates within
+                # the batch are numbered the same way as across uploads
+                relative_path = logical_file_path(
+                    case_id, folder_path, file.filename, taken_paths
+                )
+            except Exception as e:
+                detail = e.detail if isinstance(e, HTTPException) else str(e)
+                results.append(
+                    {
+                        "filename": file.filename or "",
+                        "status": "failed",
+                        "error": detail,
+                    }
+                )
+                continue
+
+            taken_paths.add(relative_path)
+            db_evidence = models.Evidence(
+                case_id=case_id,
+                title=relative_path.split("/")[-1],
+                description=description,
+                evidence_type="file",
+                category=category,
+                content=relative_path,
+                file_hash=outcome,
+                folder_path=folder_path,
+                is_folder=False,
+                parent_folder_id=parent_folder_id,
+                created_by_id=current_user.id,
+                created_at=get_utc_now(),
+                updated_at=get_utc_now(),
+            )
+            self.db.add(db_evidence)
+            created.append(db_evidence)
+            results.append(
+                {
+                    "filename": file.filename,
+                    "status": "created",
+                    "evidence": db_evidence,
+                }
+            )
+
+        blob_service = BlobService(self.db)
+        if created:
+            try:
+                self.db.flush()
+                search_service = SearchService(self.db)
+                for db_evidence in created:
+                    blob_service.add_reference(db_evidence.id, db_evidence.file_hash)
+                    search_service.queue_evidence(db_evidence)
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                for file_hash in stored_hashes:
+                    try:
+                        blob_service.discard_if_unreferenced(file_hash)
+                    except Exception:
+                        pass
+                evidence_logger.bind(
+                    event_type="evidence_creation_error", error_type="system_error"
+                ).error(f"Bulk evidence creation error: {str(e)}")
+                raise HTTPException(
+                    status_code=500, detail=f"Error creating evidence: {str(e)}"
+                )
+            for db_evidence in created:
+                self.db.refresh(db_evidence)
+            search_indexer.wake()
+
+        # Content stored for files that were then rejected is not kept
+        for file_hash in stored_hashes - {evidence.file_hash for evidence in created}:
+            try:
+                blob_service.discard_if_unreferenced(file_hash)
+            except Exception:
+                pass
+
+        evidence_logger.bind(
+            created_count=len(created),
+            failed_count=len(results) - len(created),
+            event_type="evidence_bulk_upload_complete",
+        ).info(f"Bulk upload created {len(created)} of {len(files)} evidence items")
+        return results
+
     async def get_case_evidence(
         self,
         case_id: int,
@@ -249,6 +498,7 @@ class EvidenceService:
             db_evidence.updated_at = get_utc_now()
 
             self.db.add(db_evidence)
+            SearchService(self.db).update_evidence(db_evidence)
             self.db.commit()
             self.db.refresh(db_evidence)
 
@@ -300,9 +550,14 @@ class EvidenceService:
                 ).warning("Evidence deletion failed: not authorized")
                 raise
 
+            blob_service = BlobService(self.db)
+            unreferenced = None
             if evidence.evidence_type == "file" and evidence.content:
                 try:
-                    await delete_file(evidence.content)
+                    if blob_service.is_blob_backed(evidence.id):
+                        unreferenced = blob_service.release_reference(evidence.id)
+                    else:
+                        await delete_file(evidence.content)
                 except Exception as e:
                     evidence_logger.bind(
                         event_type="evidence_deletion_failed",
@@ -314,8 +569,11 @@ class EvidenceService:
                         status_code=500, detail=f"Error deleting file: {str(e)}"
                     )
 
+            SearchService(self.db).remove_evidence([evidence.id])
             self.db.delete(evidence)
             self.db.commit()
+            if unreferenced:
+                blob_service.reclaim_blobs([unreferenced])
 
             evidence_logger.bind(
                 case_id=evidence.case_id,
@@ -341,6 +599,7 @@ class EvidenceService:
         self,
         evidence_id: int,
         current_user: models.User,
+        request_headers: Optional[Mapping[str, str]] = None,
     ) -> models.Evidence:
         evidence_logger = get_security_logger(
             user_id=current_user.id,
@@ -377,29 +636,34 @@ class EvidenceService:
 
             if evidence.evidence_type == "file":
 
-                from app.core.file_storage import UPLOAD_DIR
-                from fastapi.responses import FileResponse
-
-                file_path = UPLOAD_DIR / evidence.content
-                if not file_path.exists():
+                storage, key, info = await run_in_threadpool(
+                    evidence_file_location, evidence
+                )
+                filename = Path(evidence.content).name
+                if info is None:
                     evidence_logger.bind(
                         event_type="evidence_download_failed",
                         failure_reason="file_not_found",
-                        file_path=str(file_path),
-                    ).warning("Evidence download failed: file not found on disk")
+                        storage_key=key,
+                    ).warning("Evidence download failed: file not found in storage")
                     raise HTTPException(status_code=404, detail="File not found")
 
                 evidence_logger.bind(
                     case_id=evidence.case_id,
                     evidence_title=evidence.title,
-                    filename=file_path.name,
+                    filename=filename,
                     event_type="evidence_download_success",
                 ).info("Evidence downloaded successfully")
 
-                return FileResponse(
-                    path=str(file_path),
-                    filename=file_path.name,
+                return stored_file_response(
+                    request_headers,
+                    storage,
+                    key,
+                    size=info.size,
                     media_type="application/octet-stream",
+                    file_hash=evidence.file_hash,
+                    last_modified=evidence.created_at,
+                    headers={"Content-Disposition": content_disposition(filename)},
                 )
 
             evidence_logger.bind(
@@ -421,6 +685,249 @@ class EvidenceService:
             ).error(f"Evidence download error: {str(e)}")
             raise HTTPException(status_code=500, detail="Internal server error")
 
+    async def export_case_evidence(
+        self,
+        case_id: int,
+        current_user: models.User,
+        archive_format: str = "zip",
+        folder_id: Optional[int] = None,
+        category: Optional[str] = None,
+    ) -> StreamingResponse:
+        """
+        Stream a case's evidence tree as a zip or tar archive, optionally
+        limited to one folder's subtree or to one category. The archive ends
+        with manifest.json, listing every file with the SHA-256 computed
+        while it was written next to the hash recorded at upload.
+        """
+        evidence_logger = get_security_logger(
+            user_id=current_user.id,
+            case_id=case_id,
+            action="export_case_evidence",
+            archive_format=archive_format,
+            event_type="evidence_export_attempt",
+        )
+
+        if archive_format not in ARCHIVE_MEDIA_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Archive format must be one of: {', '.join(ARCHIVE_MEDIA_TYPES)}",
+            )
+        if category is not None:
+            valid_categories = schemas.EvidenceCreate.VALID_CATEGORIES
+            category = next(
+                (cat for cat in valid_categories if cat.lower() == category.lower()),
+                None,
+            )
+            if category is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"category must be one of: {', '.join(valid_categories)}",
+                )
+
+        case = check_case_access(self.db, case_id, current_user)
+
+        query = select(models.Evidence).where(models.Evidence.case_id == case_id)
+        folder = None
+        if folder_id is not None:
+            folder = self.db.get(models.Evidence, folder_id)
+            if not folder or not folder.is_folder or folder.case_id != case_id:
+                raise HTTPException(status_code=404, detail="Folder not found")
+            query = query.where(
+                or_(
+                    col(models.Evidence.folder_path) == folder.folder_path,
+                    col(models.Evidence.folder_path).startswith(
+                        f"{folder.folder_path}/", autoescape=True
+                    ),
+                )
+            )
+        if category is not None:
+            query = query.where(
+                or_(
+                    models.Evidence.is_folder == True,
+                    models.Evidence.category == category,
+                )
+            )
+        # Folders are listed before the files in them
+        items = list(
+            self.db.exec(
+                query.order_by(
+                    models.Evidence.folder_path,
+                    col(models.Evidence.is_folder).desc(),
+                    models.Evidence.id,
+                )
+            )
+        )
+
+        root = normalize_folder_path(case.case_number) or f"case_{case.id}"
+        manifest = {
+            "case_id": case.id,
+            "case_number": case.case_number,
+            "exported_at": get_utc_now().isoformat(),
+            "exported_by": current_user.username,
+            "folder": folder.folder_path if folder else None,
+            "category": category,
+        }
+        entries = self._export_entries(root, items, manifest)
+
+        def body() -> Iterator[bytes]:
+            try:
+                yield from stream_archive(entries, archive_format)
+            except Exception as e:
+                evidence_logger.bind(
+                    event_type="evidence_export_error", error_type="system_error"
+                ).error(f"Evidence export failed while streaming: {str(e)}")
+                raise
+            evidence_logger.bind(event_type="evidence_export_complete").info(
+                "Evidence export completed"
+            )
+
+        evidence_logger.bind(
+            item_count=len(items),
+            folder_id=folder_id,
+            category=category,
+            event_type="evidence_export_started",
+        ).info("Evidence export started")
+
+        return StreamingResponse(
+            body(),
+            media_type=ARCHIVE_MEDIA_TYPES[archive_format],
+            headers={
+                "Content-Disposition": content_disposition(
+                    f"{root.replace('/', '_')}-evidence.{archive_format}"
+                )
+            },
+        )
+
+    def _export_entries(
+        self, root: str, items: List[models.Evidence], manifest: dict
+    ) -> Iterator[ArchiveEntry]:
+        """
+        Archive entries for exported evidence, then the manifest. Each file's
+        hash is read back after the archive has written it, on the next step.
+        """
+        taken_paths = set()
+
+        def unique_path(path: str) -> str:
+            stem, dot, extension = path.rpartition(".")
+            if not stem or "/" in extension:
+                stem, dot, extension = path, "", ""
+            candidate = path
+            counter = 1
+            while candidate in taken_paths:
+                candidate = f"{stem}_{counter}{dot}{extension}"
+                counter += 1
+            taken_paths.add(candidate)
+            return candidate
+
+        files = []
+        missing = []
+        for evidence in items:
+            directory = "/".join(
+                part
+                for part in (root, normalize_folder_path(evidence.folder_path or ""))
+                if part
+            )
+            modified = evidence.updated_at or evidence.created_at
+            if evidence.is_folder:
+                if directory not in taken_paths:
+                    taken_paths.add(directory)
+                    yield ArchiveEntry(path=directory, modified=modified)
+                continue
+
+            if evidence.evidence_type == "file":
+                storage, key, info = evidence_file_location(evidence)
+                if info is None:
+                    missing.append(
+                        {
+                            "evidence_id": evidence.id,
+                            "title": evidence.title,
+                            "path": evidence.content,
+                            "file_hash": evidence.file_hash,
+                        }
+                    )
+                    continue
+                size = info.size
+                name = Path(evidence.content).name
+                chunks = partial(storage.open_read, key)
+            else:
+                content = (evidence.content or "").encode("utf-8")
+                size = len(content)
+                name = f"{secure_filename(evidence.title) or 'note'}.txt"
+                chunks = partial(iter, [content])
+
+            entry = ArchiveEntry(
+                path=unique_path(f"{directory}/{name}"),
+                modified=modified,
+                size=size,
+                chunks=chunks,
+            )
+            yield entry
+
+            files.append(
+                {
+                    "path": entry.path,
+                    "evidence_id": evidence.id,
+                    "title": evidence.title,
+                    "description": evidence.description,
+                    "evidence_type": evidence.evidence_type,
+                    "category": evidence.category,
+                    "folder_path": evidence.folder_path,
+                    "size": entry.size,
+                    "sha256": entry.sha256,
+                    "file_hash": evidence.file_hash,
+                    "hash_verified": (
+                        entry.sha256 == evidence.file_hash
+                        if evidence.file_hash
+                        else None
+                    ),
+                    "created_at": evidence.created_at.isoformat(),
+                    "created_by_id": evidence.created_by_id,
+                }
+            )
+
+        manifest = {**manifest, "files": files, "missing": missing}
+        content = json.dumps(manifest, indent=2).encode("utf-8")
+        yield ArchiveEntry(
+            path=unique_path(f"{root}/manifest.json"),
+            modified=get_utc_now(),
+            size=len(content),
+            chunks=partial(iter, [content]),
+        )
+
+    async def get_download_url(
+        self, evidence_id: int, current_user: models.User
+    ) -> dict:
+        """
+        A presigned URL to download a file evidence straight from object storage,
+        so large downloads do not pass through the API.
+        """
+        evidence = await self.get_evidence(evidence_id, current_user=current_user)
+        if evidence.is_folder or evidence.evidence_type != "file":
+            raise HTTPException(
+                status_code=400, detail="Evidence type does not support downloading"
+            )
+
+        storage, key, info = await run_in_threadpool(evidence_file_location, evidence)
+        if info is None:
+            raise HTTPException(status_code=404, detail="File not found")
+
+        expires_in = storage_settings.STORAGE_PRESIGNED_URL_SECONDS
+        url = storage.presigned_url(key, Path(evidence.content).name, expires_in)
+        if not url:
+            raise HTTPException(
+                status_code=400,
+                detail="Direct download URLs are not supported by the storage backend",
+            )
+
+        get_security_logger(
+            user_id=current_user.id,
+            evidence_id=evidence_id,
+            case_id=evidence.case_id,
+            action="get_download_url",
+            event_type="evidence_download_url_issued",
+        ).info("Evidence download URL issued")
+        return {"url": url, "expires_in": expires_in}
+
     async def get_evidence_content(
         self,
         evidence_id: int,
@@ -457,20 +964,32 @@ class EvidenceService:
                     detail="Evidence type does not support content viewing",
                 )
 
-            import chardet
-            from app.core.file_storage import UPLOAD_DIR
+            file_extension = Path(evidence.content).suffix.lower()
 
-            file_path = UPLOAD_DIR / evidence.content
-            if not file_path.exists():
+            if file_extension not in TEXT_VIEWABLE_EXTENSIONS:
+                evidence_logger.bind(
+                    event_type="evidence_content_view_failed",
+                    failure_reason="unsupported_file_type",
+                    file_extension=file_extension,
+                ).warning("Evidence content view failed: unsupported file type")
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File type '{file_extension}' is not supported for text viewing",
+                )
+
+            storage, key, info = await run_in_threadpool(
+                evidence_file_location, evidence
+            )
+            if info is None:
                 evidence_logger.bind(
                     event_type="evidence_content_view_failed",
                     failure_reason="file_not_found",
-                    file_path=str(file_path),
-                ).warning("Evidence content view failed: file not found on disk")
+                    storage_key=key,
+                ).warning("Evidence content view failed: file not found in storage")
                 raise HTTPException(status_code=404, detail="File not found")
 
             # Limit file size to prevent memory issues with large files
-            file_size = file_path.stat().st_size
+            file_size = info.size
             max_size = 1024 * 1024
             if file_size > max_size:
                 evidence_logger.bind(
@@ -484,51 +1003,22 @@ class EvidenceService:
                     detail=f"File too large for viewing. Maximum size: {max_size // 1024}KB",
                 )
 
-            viewable_extensions = {
-                ".txt",
-                ".log",
-                ".csv",
-                ".json",
-                ".md",
-                ".yaml",
-                ".yml",
-                ".xml",
-                ".html",
-                ".css",
-                ".js",
-                ".py",
-                ".sql",
-                ".conf",
-                ".ini",
-                ".cfg",
-            }
-            file_extension = file_path.suffix.lower()
-
-            if file_extension not in viewable_extensions:
-                evidence_logger.bind(
-                    event_type="evidence_content_view_failed",
-                    failure_reason="unsupported_file_type",
-                    file_extension=file_extension,
-                ).warning("Evidence content view failed: unsupported file type")
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"File type '{file_extension}' is not supported for text viewing",
-                )
-
             try:
-                with open(file_path, "rb") as f:
-                    raw_content = f.read()
+                raw_content = await run_in_threadpool(storage.read_bytes, key)
 
-                encoding_result = chardet.detect(raw_content)
-                encoding = encoding_result.get("encoding", "utf-8")
-                confidence = encoding_result.get("confidence", 0)
+                # The encoding is detected from a sample and cached per file
+                text_index = await run_in_threadpool(
+                    get_text_index, storage, key, evidence.file_hash
+                )
+                encoding = text_index.encoding
+                confidence = text_index.confidence
 
-                # Decode with detected encoding, fallback to utf-8 with error replacement
+                # Bytes past the sample may not fit the detected encoding
                 try:
-                    content = raw_content.decode(encoding)
+                    content = raw_content[text_index.bom_length :].decode(encoding)
                 except UnicodeDecodeError:
-                    content = raw_content.decode("utf-8", errors="replace")
-                    encoding = "utf-8 (with errors replaced)"
+                    content = text_index.decode(raw_content[text_index.bom_length :])
+                    encoding = f"{encoding} (with errors replaced)"
                     confidence = 0
 
                 evidence_logger.bind(
@@ -549,7 +1039,7 @@ class EvidenceService:
                         "file_size": file_size,
                         "encoding": encoding,
                         "encoding_confidence": confidence,
-                        "line_count": len(content.splitlines()),
+                        "line_count": text_index.line_count,
                         "char_count": len(content),
                     },
                 }
@@ -571,10 +1061,125 @@ class EvidenceService:
             ).error(f"Evidence content view error: {str(e)}")
             raise HTTPException(status_code=500, detail="Internal server error")
 
+    async def get_evidence_text_page(
+        self,
+        evidence_id: int,
+        current_user: models.User,
+        line: Optional[int] = None,
+        offset: Optional[int] = None,
+        lines: int = 500,
+        max_bytes: int = MAX_PAGE_BYTES,
+    ) -> dict:
+        """
+        Get one page of a text evidence file, from a line number or a byte
+        offset, without reading the rest of the file.
+        """
+        evidence_logger = get_security_logger(
+            user_id=current_user.id,
+            evidence_id=evidence_id,
+            action="get_evidence_text_page",
+            event_type="evidence_text_page_view_attempt",
+        )
+
+        if line is not None and offset is not None:
+            raise HTTPException(
+                status_code=400, detail="Page from either a line or an offset"
+            )
+        if (line or 0) < 0 or (offset or 0) < 0 or lines < 1 or max_bytes < 1:
+            raise HTTPException(status_code=400, detail="Invalid page range")
+
+        try:
+            evidence = await self.get_evidence(evidence_id, current_user)
+
+            if evidence.is_folder or evidence.evidence_type != "file":
+                evidence_logger.bind(
+                    event_type="evidence_text_page_view_failed",
+                    failure_reason="not_file_type",
+                ).warning("Evidence text page view failed: evidence is not a file")
+                raise HTTPException(
+                    status_code=400,
+                    detail="Evidence type does not support content viewing",
+                )
+
+            file_extension = Path(evidence.content).suffix.lower()
+            if file_extension not in TEXT_VIEWABLE_EXTENSIONS:
+                evidence_logger.bind(
+                    event_type="evidence_text_page_view_failed",
+                    failure_reason="unsupported_file_type",
+                    file_extension=file_extension,
+                ).warning("Evidence text page view failed: unsupported file type")
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File type '{file_extension}' is not supported for text viewing",
+                )
+
+            storage, key, info = await run_in_threadpool(
+                evidence_file_location, evidence
+            )
+            if info is None:
+                evidence_logger.bind(
+                    event_type="evidence_text_page_view_failed",
+                    failure_reason="file_not_found",
+                    storage_key=key,
+                ).warning("Evidence text page view failed: file not found in storage")
+                raise HTTPException(status_code=404, detail="File not found")
+
+            text_index = await run_in_threadpool(
+                get_text_index, storage, key, evidence.file_hash
+            )
+            if offset is not None:
+                page = await run_in_threadpool(
+                    read_bytes, storage, key, text_index, offset, max_bytes
+                )
+            else:
+                page = await run_in_threadpool(
+                    read_lines,
+                    storage,
+                    key,
+                    text_index,
+                    line or 0,
+                    min(lines, MAX_PAGE_LINES),
+                )
+
+            has_more = page.end_offset < text_index.size
+            return {
+                "content": page.content,
+                "start_line": page.start_line,
+                "line_count": page.line_count,
+                "start_offset": page.start_offset,
+                "end_offset": page.end_offset,
+                "truncated": page.truncated,
+                "has_more": has_more,
+                # A line cut short is continued from its byte offset
+                "next_line": (
+                    page.start_line + page.line_count
+                    if has_more and offset is None and not page.truncated
+                    else None
+                ),
+                "next_offset": page.end_offset if has_more else None,
+                "file_info": {
+                    "filename": evidence.title,
+                    "file_extension": file_extension,
+                    "file_size": text_index.size,
+                    "encoding": text_index.encoding,
+                    "encoding_confidence": text_index.confidence,
+                    "line_count": text_index.line_count,
+                },
+            }
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            evidence_logger.bind(
+                event_type="evidence_text_page_view_error", error_type="system_error"
+            ).error(f"Evidence text page view error: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+
     async def get_evidence_image(
         self,
         evidence_id: int,
         current_user: models.User,
+        request_headers: Optional[Mapping[str, str]] = None,
     ):
         """Get image file for viewing."""
         evidence_logger = get_security_logger(
@@ -607,18 +1212,6 @@ class EvidenceService:
                     detail="Evidence type does not support image viewing",
                 )
 
-            from app.core.file_storage import UPLOAD_DIR
-            from fastapi.responses import FileResponse
-
-            file_path = UPLOAD_DIR / evidence.content
-            if not file_path.exists():
-                evidence_logger.bind(
-                    event_type="evidence_image_view_failed",
-                    failure_reason="file_not_found",
-                    file_path=str(file_path),
-                ).warning("Evidence image view failed: file not found on disk")
-                raise HTTPException(status_code=404, detail="File not found")
-
             viewable_extensions = {
                 ".jpg",
                 ".jpeg",
@@ -628,7 +1221,7 @@ class EvidenceService:
                 ".webp",
                 ".svg",
             }
-            file_extension = file_path.suffix.lower()
+            file_extension = Path(evidence.content).suffix.lower()
 
             if file_extension not in viewable_extensions:
                 evidence_logger.bind(
@@ -641,8 +1234,19 @@ class EvidenceService:
                     detail=f"File type '{file_extension}' is not supported for image viewing",
                 )
 
+            storage, key, info = await run_in_threadpool(
+                evidence_file_location, evidence
+            )
+            if info is None:
+                evidence_logger.bind(
+                    event_type="evidence_image_view_failed",
+                    failure_reason="file_not_found",
+                    storage_key=key,
+                ).warning("Evidence image view failed: file not found in storage")
+                raise HTTPException(status_code=404, detail="File not found")
+
             # Limit image size to prevent excessive memory usage
-            file_size = file_path.stat().st_size
+            file_size = info.size
             max_size = 10 * 1024 * 1024
             if file_size > max_size:
                 evidence_logger.bind(
@@ -670,17 +1274,19 @@ class EvidenceService:
             evidence_logger.bind(
                 case_id=evidence.case_id,
                 evidence_title=evidence.title,
-                filename=file_path.name,
+                filename=Path(evidence.content).name,
                 event_type="evidence_image_view_success",
             ).info("Evidence image viewed successfully")
 
-            return FileResponse(
-                path=str(file_path),
+            return stored_file_response(
+                request_headers,
+                storage,
+                key,
+                size=file_size,
                 media_type=media_type,
-                headers={
-                    "Cache-Control": "max-age=3600",
-                    "X-Content-Type-Options": "nosniff",
-                },
+                file_hash=evidence.file_hash,
+                last_modified=evidence.created_at,
+                headers={"X-Content-Type-Options": "nosniff"},
             )
 
         except HTTPException:
@@ -691,6 +1297,144 @@ class EvidenceService:
             ).error(f"Evidence image view error: {str(e)}")
             raise HTTPException(status_code=500, detail="Internal server error")
 
+    async def get_evidence_derivative(
+        self,
+        evidence_id: int,
+        size: str,
+        current_user: models.User,
+        request_headers: Optional[Mapping[str, str]] = None,
+    ):
+        """Get a downscaled copy of an image, rendering it on first request."""
+        evidence_logger = get_security_logger(
+            user_id=current_user.id,
+            evidence_id=evidence_id,
+            action="get_evidence_derivative",
+            derivative_size=size,
+            event_type="evidence_derivative_view_attempt",
+        )
+
+        if size not in DERIVATIVE_SIZES:
+            raise HTTPException(status_code=404, detail="Unknown image size")
+
+        try:
+            evidence = await self.get_evidence(evidence_id, current_user)
+
+            if evidence.is_folder or evidence.evidence_type != "file":
+                evidence_logger.bind(
+                    event_type="evidence_derivative_view_failed",
+                    failure_reason="not_file_type",
+                ).warning("Evidence derivative view failed: evidence is not a file")
+                raise HTTPException(
+                    status_code=400,
+                    detail="Evidence type does not support image viewing",
+                )
+
+            file_extension = Path(evidence.content).suffix.lower()
+            if not supports_derivatives(evidence.content) or not evidence.file_hash:
+                evidence_logger.bind(
+                    event_type="evidence_derivative_view_failed",
+                    failure_reason="unsupported_file_type",
+                    file_extension=file_extension,
+                ).warning("Evidence derivative view failed: unsupported file type")
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"File type '{file_extension}' does not support {size} images",
+                )
+
+            try:
+                storage, key, info = await get_derivative(evidence, size)
+            except FileNotFoundError:
+                evidence_logger.bind(
+                    event_type="evidence_derivative_view_failed",
+                    failure_reason="file_not_found",
+                ).warning("Evidence derivative view failed: file not found in storage")
+                raise HTTPException(status_code=404, detail="File not found")
+            except DerivativeError as e:
+                evidence_logger.bind(
+                    event_type="evidence_derivative_view_failed",
+                    failure_reason="render_failed",
+                    error=str(e),
+                ).warning("Evidence derivative view failed: image could not be rendered")
+                raise HTTPException(
+                    status_code=422, detail="Image could not be rendered"
+                )
+            except ImportError:
+                evidence_logger.bind(
+                    event_type="evidence_derivative_view_failed",
+                    failure_reason="renderer_unavailable",
+                ).error("Evidence derivative view failed: Pillow is not installed")
+                raise HTTPException(
+                    status_code=503, detail="Image rendering is not available"
+                )
+
+            evidence_logger.bind(
+                case_id=evidence.case_id,
+                event_type="evidence_derivative_view_success",
+            ).info("Evidence derivative viewed successfully")
+
+            # Derivatives of one blob differ by size and format, so does their ETag
+            return stored_file_response(
+                request_headers,
+                storage,
+                key,
+                size=info.size,
+                media_type=derivative_media_type(),
+                file_hash=Path(key).name,
+                last_modified=evidence.created_at,
+                headers={"X-Content-Type-Options": "nosniff"},
+            )
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            evidence_logger.bind(
+                event_type="evidence_derivative_view_error", error_type="system_error"
+            ).error(f"Evidence derivative view error: {str(e)}")
+            raise HTTPException(status_code=500, detail="Internal server error")
+
+    async def list_image_thumbnails(
+        self,
+        case_id: int,
+        current_user: models.User,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[dict]:
+        """List a case's image evidence with links to its thumbnails."""
+        check_case_access(self.db, case_id, current_user)
+
+        query = (
+            select(models.Evidence)
+            .where(
+                models.Evidence.case_id == case_id,
+                models.Evidence.evidence_type == "file",
+                models.Evidence.is_folder == False,  # noqa: E712
+                or_(
+                    *(
+                        col(models.Evidence.content).ilike(f"%{extension}")
+                        for extension in sorted(RASTER_IMAGE_EXTENSIONS)
+                    )
+                ),
+            )
+            .order_by(models.Evidence.id)
+            .offset(skip)
+            .limit(limit)
+        )
+
+        thumbnails = []
+        for evidence in self.db.exec(query):
+            base_url = f"/api/evidence/{evidence.id}"
+            thumbnails.append(
+                {
+                    "evidence_id": evidence.id,
+                    "title": evidence.title,
+                    "folder_path": evidence.folder_path,
+                    "thumbnail_url": f"{base_url}/derivatives/thumbnail",
+                    "preview_url": f"{base_url}/derivatives/preview",
+                    "image_url": f"{base_url}/image",
+                }
+            )
+        return thumbnails
+
     @no_analyst()
     async def create_folder(
         self,
@@ -943,11 +1687,25 @@ class EvidenceService:
                 )
             ).all()
 
+            # Files stored by content are released here; blobs still shared
+            # with other evidence are kept
+            blob_service = BlobService(self.db)
+            unreferenced = []
+            for evidence in subfolder_evidence:
+                if evidence.evidence_type == "file":
+                    file_hash = blob_service.release_reference(evidence.id)
+                    if file_hash:
+                        unreferenced.append(file_hash)
+
+            SearchService(self.db).remove_evidence(
+                evidence.id for evidence in subfolder_evidence
+            )
             for evidence in subfolder_evidence:
                 self.db.delete(evidence)
 
             self.db.delete(db_folder)
             self.db.commit()
+            blob_service.reclaim_blobs(unreferenced)
 
             folder_logger.bind(
                 case_id=db_folder.case_id,
@@ -1002,8 +1760,8 @@ class EvidenceService:
 
             from app.services.system_config_service import SystemConfigService
 
-            config_service = SystemConfigService(self.db)
-            templates = await config_service.get_evidence_folder_templates()
+            config = SystemConfigService(self.db).get_snapshot()
+            templates = config.evidence_folder_templates
 
             if template_name not in templates:
                 template_logger.bind(
@@ -471,6 +471,10 @@ class ExifToolService:
         except (FileNotFoundError, ValueError):
             return False
 
+    def supports_extension(self, filename: str) -> bool:
+        """Check a file type by name alone, before the file is fetched"""
+        return Path(filename).suffix.lower() in FileType.get_all_extensions()
+
     def _result_to_dict(self, result: MetadataResult) -> Dict[str, Any]:
         return {
             "success": result.success,
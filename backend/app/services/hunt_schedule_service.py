@@ -0,0 +1,322 @@
+"""
+Recurring hunt schedules for Owlculus monitoring cases.
+
+This module stores cron-style schedules for running a hunt against a case and
+starts due runs from an in-process background loop. Each scheduled run is
+diffed against the previous successful execution of the same hunt, case and
+parameters, so only new results are saved as evidence and entities.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from app.core.config import hunt_scheduler_settings
+from app.core.cron import CronSchedule
+from app.core.dependencies import check_case_access, get_db, no_analyst
+from app.core.exceptions import AuthorizationException, ResourceNotFoundException
+from app.core.logging import get_security_logger
+from app.core.utils import get_utc_now
+from app.database.models import Hunt, HuntExecution, HuntSchedule, User
+from app.schemas.hunt_schema import HuntScheduleUpdate
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from .hunt_service import HuntService
+
+security_logger = get_security_logger
+
+ACTIVE_EXECUTION_STATUSES = ("pending", "running")
+# Responses meaning the owner can no longer run the hunt on the case
+PERMANENT_FAILURE_STATUSES = (401, 403, 404)
+
+
+class HuntScheduleService:
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @no_analyst()
+    async def create_schedule(
+        self,
+        hunt_id: int,
+        case_id: int,
+        cron_expression: str,
+        initial_parameters: Dict[str, Any],
+        *,
+        current_user: User,
+    ) -> HuntSchedule:
+        hunt = self.db.get(Hunt, hunt_id)
+        if not hunt or not hunt.is_active:
+            raise ValueError("Hunt not found or inactive")
+
+        check_case_access(self.db, case_id, current_user)
+        validated_params = HuntService(self.db).validate_initial_parameters(
+            hunt, initial_parameters
+        )
+
+        now = get_utc_now()
+        schedule = HuntSchedule(
+            hunt_id=hunt_id,
+            case_id=case_id,
+            cron_expression=cron_expression.strip(),
+            initial_parameters=validated_params,
+            next_run_at=CronSchedule(cron_expression).next_run(now),
+            created_by_id=current_user.id,
+        )
+        self.db.add(schedule)
+        self.db.commit()
+        self.db.refresh(schedule)
+
+        security_logger(
+            action="hunt_schedule_created",
+            schedule_id=schedule.id,
+            hunt_id=hunt_id,
+            case_id=case_id,
+            user_id=current_user.id,
+        ).info(f"Hunt {hunt.name} scheduled for case {case_id}: {cron_expression}")
+        return schedule
+
+    async def list_case_schedules(
+        self, case_id: int, *, current_user: User
+    ) -> List[HuntSchedule]:
+        check_case_access(self.db, case_id, current_user)
+
+        schedules = self.db.exec(
+            select(HuntSchedule)
+            .where(HuntSchedule.case_id == case_id)
+            .order_by(HuntSchedule.created_at)
+        ).all()
+        return list(schedules)
+
+    def _get_schedule(self, schedule_id: int, current_user: User) -> HuntSchedule:
+        schedule = self.db.get(HuntSchedule, schedule_id)
+        if not schedule:
+            raise ValueError("Hunt schedule not found")
+
+        check_case_access(self.db, schedule.case_id, current_user)
+        return schedule
+
+    @no_analyst()
+    async def update_schedule(
+        self,
+        schedule_id: int,
+        schedule_update: HuntScheduleUpdate,
+        *,
+        current_user: User,
+    ) -> HuntSchedule:
+        schedule = self._get_schedule(schedule_id, current_user)
+
+        if schedule_update.cron_expression is not None:
+            schedule.cron_expression = schedule_update.cron_expression.strip()
+        if schedule_update.parameters is not None:
+            hunt = self.db.get(Hunt, schedule.hunt_id)
+            schedule.initial_parameters = (
+                HuntService(self.db).validate_initial_parameters(
+                    hunt, schedule_update.parameters
+                )
+                if hunt
+                else schedule_update.parameters
+            )
+        if schedule_update.is_active is not None:
+            schedule.is_active = schedule_update.is_active
+
+        # Recompute from now so a re-enabled schedule does not fire for missed runs
+        schedule.next_run_at = CronSchedule(schedule.cron_expression).next_run(
+            get_utc_now()
+        )
+        schedule.updated_at = get_utc_now()
+        self.db.add(schedule)
+        self.db.commit()
+        self.db.refresh(schedule)
+        return schedule
+
+    @no_analyst()
+    async def delete_schedule(self, schedule_id: int, *, current_user: User) -> None:
+        schedule = self._get_schedule(schedule_id, current_user)
+        self.db.delete(schedule)
+        self.db.commit()
+
+        security_logger(
+            action="hunt_schedule_deleted",
+            schedule_id=schedule_id,
+            user_id=current_user.id,
+        ).info(f"Hunt schedule {schedule_id} deleted")
+
+    def _claim(self, schedule: HuntSchedule, now: datetime) -> bool:
+        """
+        Advance the schedule's next run, returning False if another process did so first
+
+        The conditional update lets several backend processes poll the same
+        database without starting a run twice.
+        """
+        next_run_at = CronSchedule(schedule.cron_expression).next_run(now)
+        result = self.db.exec(
+            update(HuntSchedule)
+            .where(
+                HuntSchedule.id == schedule.id,
+                HuntSchedule.next_run_at == schedule.next_run_at,
+            )
+            .values(next_run_at=next_run_at, last_run_at=now)
+        )
+        self.db.commit()
+        self.db.refresh(schedule)
+        return result.rowcount == 1
+
+    def _deactivate(self, schedule: HuntSchedule, reason: str) -> None:
+        schedule.is_active = False
+        schedule.updated_at = get_utc_now()
+        self.db.add(schedule)
+        self.db.commit()
+
+        security_logger(
+            action="hunt_schedule_deactivated",
+            schedule_id=schedule.id,
+            reason=reason,
+        ).error(f"Hunt schedule {schedule.id} deactivated: {reason}")
+
+    def _log_run_failure(self, schedule: HuntSchedule, error: str) -> None:
+        security_logger(
+            action="hunt_schedule_run_failed",
+            schedule_id=schedule.id,
+            error=error,
+        ).error(f"Hunt schedule {schedule.id} could not start a run: {error}")
+
+    def _previous_successful_execution(
+        self, schedule: HuntSchedule
+    ) -> Optional[HuntExecution]:
+        """
+        The latest completed run of the schedule's hunt on its case with the
+        schedule's parameters. Runs with other parameters, from another schedule
+        or started by hand, found different things and are not a baseline.
+        Parameters the schedule does not set, such as defaults added to the hunt
+        later, are ignored.
+        """
+        executions = self.db.exec(
+            select(HuntExecution)
+            .where(
+                HuntExecution.hunt_id == schedule.hunt_id,
+                HuntExecution.case_id == schedule.case_id,
+                HuntExecution.status == "completed",
+            )
+            .order_by(HuntExecution.completed_at.desc())
+        )
+        for execution in executions:
+            parameters = execution.initial_parameters or {}
+            if all(
+                parameters.get(name) == value
+                for name, value in schedule.initial_parameters.items()
+            ):
+                return execution
+        return None
+
+    async def run_due_schedules(self) -> List[int]:
+        """Start every active schedule whose next run is due, returning the execution ids"""
+        now = get_utc_now()
+        due = self.db.exec(
+            select(HuntSchedule).where(
+                HuntSchedule.is_active == True,
+                HuntSchedule.next_run_at <= now,
+            )
+        ).all()
+
+        started = []
+        for schedule in due:
+            try:
+                if not self._claim(schedule, now):
+                    continue
+            except ValueError as e:
+                self._deactivate(schedule, str(e))
+                continue
+
+            # Skip this run rather than pile up behind one that is still going
+            if schedule.last_execution_id:
+                last_execution = self.db.get(HuntExecution, schedule.last_execution_id)
+                if (
+                    last_execution
+                    and last_execution.status in ACTIVE_EXECUTION_STATUSES
+                ):
+                    continue
+
+            user = self.db.get(User, schedule.created_by_id)
+            if not user or not user.is_active:
+                self._deactivate(schedule, "schedule owner is no longer active")
+                continue
+
+            previous = self._previous_successful_execution(schedule)
+            try:
+                execution = await HuntService(self.db).create_execution(
+                    hunt_id=schedule.hunt_id,
+                    case_id=schedule.case_id,
+                    initial_parameters=schedule.initial_parameters,
+                    current_user=user,
+                    previous_execution_id=previous.id if previous else None,
+                )
+            except (
+                ValueError,
+                ResourceNotFoundException,
+                AuthorizationException,
+            ) as e:
+                # The hunt, case or owner's access is gone, so later runs would fail too
+                self._deactivate(schedule, str(e))
+                continue
+            except HTTPException as e:
+                if e.status_code in PERMANENT_FAILURE_STATUSES:
+                    self._deactivate(schedule, e.detail)
+                else:
+                    self._log_run_failure(schedule, e.detail)
+                continue
+            except Exception as e:
+                # Database or network trouble may pass, so the schedule stays active
+                self._log_run_failure(schedule, str(e))
+                continue
+
+            schedule.last_execution_id = execution.id
+            self.db.add(schedule)
+            self.db.commit()
+            started.append(execution.id)
+
+        return started
+
+
+class HuntScheduler:
+    """Background loop that polls for due hunt schedules"""
+
+    def __init__(self, poll_seconds: int):
+        self.poll_seconds = poll_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_once(self) -> List[int]:
+        db = next(get_db())
+        try:
+            return await HuntScheduleService(db).run_due_schedules()
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                security_logger(action="hunt_scheduler_failed", error=str(e)).error(
+                    f"Hunt scheduler poll failed: {e}"
+                )
+            await asyncio.sleep(self.poll_seconds)
+
+
+hunt_scheduler = HuntScheduler(hunt_scheduler_settings.HUNT_SCHEDULER_POLL_SECONDS)
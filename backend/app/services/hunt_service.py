@@ -8,9 +8,13 @@ validation, progress tracking, and real-time status updates.
 """
 
 import asyncio
+import hashlib
 import importlib
 import inspect
+import json
 import os
+import sys
+import threading
 from typing import Any, Dict, List, Optional, Type
 
 from app.core.dependencies import check_case_access, no_analyst
@@ -22,16 +26,67 @@ from sqlmodel import Session, select
 
 security_logger = get_security_logger
 
+# Hunt classes are discovered once per process and shared by every service instance.
+# A reload builds a new registry and swaps it in, so readers never see it half built.
+_hunt_classes: Dict[str, Type[BaseHunt]] = {}
+_hunts_loaded = False
+_hunts_synced = False
+_hunt_registry_lock = threading.Lock()
+
+
+def invalidate_hunt_definitions():
+    """Mark stored hunt definitions stale so they are re-synced on next use"""
+    global _hunts_synced
+    _hunts_synced = False
+
+
+def _definition_hash(
+    display_name: str, description: str, category: str, version: str, definition: dict
+) -> str:
+    """Hash the stored fields of a hunt so unchanged hunts are not rewritten"""
+    content = json.dumps(
+        [display_name, description, category, version, definition],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
 
 class HuntService:
 
     def __init__(self, db: Session):
         self.db = db
-        self._hunt_classes: Dict[str, Type[BaseHunt]] = {}
-        self._load_hunt_definitions()
-        self._sync_hunts_to_db()
-
-    def _load_hunt_definitions(self):
+        self._hunt_classes = _hunt_classes
+        if not _hunts_synced:
+            self.reload_hunts()
+
+    def reload_hunts(self, rediscover: bool = False) -> Dict[str, List[str]]:
+        """
+        Discover hunt definitions if needed and sync them to the database
+
+        Runs once at startup and again after invalidate_hunt_definitions or an
+        explicit reload. With rediscover, definition modules are re-imported so
+        edited or newly added hunts are picked up.
+
+        Returns the names of the hunts now loaded and of those rejected as invalid.
+        """
+        global _hunt_classes, _hunts_loaded, _hunts_synced
+
+        with _hunt_registry_lock:
+            if rediscover or not _hunts_loaded:
+                self._hunt_classes = self._load_hunt_definitions(reimport=rediscover)
+                _hunts_loaded = True
+            else:
+                self._hunt_classes = _hunt_classes
+            invalid_hunts = self._sync_hunts_to_db()
+            _hunt_classes = self._hunt_classes
+            _hunts_synced = True
+            return {"loaded": sorted(self._hunt_classes), "invalid": invalid_hunts}
+
+    def _load_hunt_definitions(
+        self, reimport: bool = False
+    ) -> Dict[str, Type[BaseHunt]]:
+        hunt_classes: Dict[str, Type[BaseHunt]] = {}
         definitions_dir = os.path.join(
             os.path.dirname(os.path.dirname(__file__)), "hunts", "definitions"
         )
@@ -39,10 +94,12 @@ class HuntService:
         for filename in os.listdir(definitions_dir):
             if filename.endswith("_hunt.py") and filename != "__init__.py":
                 module_name = filename[:-3]
+                module_path = f"app.hunts.definitions.{module_name}"
                 try:
-                    module = importlib.import_module(
-                        f"app.hunts.definitions.{module_name}"
-                    )
+                    if reimport and module_path in sys.modules:
+                        module = importlib.reload(sys.modules[module_path])
+                    else:
+                        module = importlib.import_module(module_path)
 
                     for name, obj in inspect.getmembers(module):
                         if (
@@ -50,7 +107,7 @@ class HuntService:
                             and issubclass(obj, BaseHunt)
                             and obj != BaseHunt
                         ):
-                            self._hunt_classes[obj.__name__] = obj
+                            hunt_classes[obj.__name__] = obj
                 except Exception as e:
                     security_logger(
                         action="hunt_definition_load_failed",
@@ -58,7 +115,18 @@ class HuntService:
                         error=str(e),
                     ).error(f"Failed to load hunt {module_name}: {e}")
 
-    def _sync_hunts_to_db(self):
+        return hunt_classes
+
+    def _sync_hunts_to_db(self) -> List[str]:
+        existing_hunts = {
+            hunt.name: hunt
+            for hunt in self.db.exec(
+                select(Hunt).where(Hunt.name.in_(list(self._hunt_classes)))
+            ).all()
+        }
+        invalid_hunts = []
+        changed = False
+
         for hunt_name, hunt_class in self._hunt_classes.items():
             # Pass database session to hunt constructor for dynamic parameter configuration
             try:
@@ -67,16 +135,55 @@ class HuntService:
                 # Fallback for hunts that don't accept db_session parameter
                 hunt_instance = hunt_class()
 
-            existing_hunt = self.db.exec(
-                select(Hunt).where(Hunt.name == hunt_name)
-            ).first()
+            # Reject hunts with broken step wiring or mapping typos at load time
+            try:
+                hunt_instance.validate_definition()
+            except ValueError as e:
+                security_logger(
+                    action="hunt_definition_invalid",
+                    hunt=hunt_name,
+                    error=str(e),
+                ).error(f"Skipping invalid hunt {hunt_name}: {e}")
+                invalid_hunts.append(hunt_name)
+                # A previously valid version must stop being offered to users
+                existing_hunt = existing_hunts.get(hunt_name)
+                if existing_hunt and existing_hunt.is_active:
+                    existing_hunt.is_active = False
+                    existing_hunt.updated_at = get_utc_now()
+                    self.db.add(existing_hunt)
+                    changed = True
+                continue
+
+            definition = hunt_instance.to_definition()
+            new_hash = _definition_hash(
+                hunt_instance.display_name,
+                hunt_instance.description,
+                hunt_instance.category,
+                hunt_instance.version,
+                definition,
+            )
+
+            existing_hunt = existing_hunts.get(hunt_name)
 
             if existing_hunt:
+                existing_hash = _definition_hash(
+                    existing_hunt.display_name,
+                    existing_hunt.description,
+                    existing_hunt.category,
+                    existing_hunt.version,
+                    existing_hunt.definition_json,
+                )
+                if existing_hash == new_hash and existing_hunt.is_active:
+                    continue
+
                 existing_hunt.display_name = hunt_instance.display_name
                 existing_hunt.description = hunt_instance.description
                 existing_hunt.category = hunt_instance.category
                 existing_hunt.version = hunt_instance.version
-                existing_hunt.definition_json = hunt_instance.to_definition()
+                existing_hunt.definition_json = definition
+                existing_hunt.is_active = True
+                existing_hunt.updated_at = get_utc_now()
+                self.db.add(existing_hunt)
             else:
                 new_hunt = Hunt(
                     name=hunt_name,
@@ -84,12 +191,25 @@ class HuntService:
                     description=hunt_instance.description,
                     category=hunt_instance.category,
                     version=hunt_instance.version,
-                    definition_json=hunt_instance.to_definition(),
+                    definition_json=definition,
                     is_active=True,
                 )
                 self.db.add(new_hunt)
+            changed = True
 
-        self.db.commit()
+        if invalid_hunts:
+            # A copy, as the registry may be shared with running requests
+            self._hunt_classes = {
+                name: hunt_class
+                for name, hunt_class in self._hunt_classes.items()
+                if name not in invalid_hunts
+            }
+
+        # Only write when a hunt was added, changed or deactivated
+        if changed:
+            self.db.commit()
+
+        return invalid_hunts
 
     async def list_hunts(self, *, current_user: User) -> List[Hunt]:
         hunts = self.db.exec(
@@ -102,6 +222,21 @@ class HuntService:
     async def get_hunt(self, hunt_id: int, *, current_user: User) -> Optional[Hunt]:
         return self.db.get(Hunt, hunt_id)
 
+    def validate_initial_parameters(
+        self, hunt: Hunt, initial_parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Validate parameters against the hunt class, if it is available"""
+        if hunt.name not in self._hunt_classes:
+            return initial_parameters
+
+        # Pass database session to hunt constructor for dynamic parameter configuration
+        try:
+            hunt_instance = self._hunt_classes[hunt.name](db_session=self.db)
+        except TypeError:
+            # Fallback for hunts that don't accept db_session parameter
+            hunt_instance = self._hunt_classes[hunt.name]()
+        return hunt_instance.validate_parameters(initial_parameters)
+
     @no_analyst()
     async def create_execution(
         self,
@@ -110,24 +245,21 @@ class HuntService:
         initial_parameters: Dict[str, Any],
         *,
         current_user: User,
+        previous_execution_id: Optional[int] = None,
     ) -> HuntExecution:
+        """
+        Create an execution and run it in the background
+
+        previous_execution_id names an earlier run to diff against, so only
+        new results are saved as evidence (used by scheduled hunts).
+        """
         hunt = self.db.get(Hunt, hunt_id)
         if not hunt or not hunt.is_active:
             raise ValueError("Hunt not found or inactive")
 
         check_case_access(self.db, case_id, current_user)
 
-        # Validate parameters if hunt class is available
-        if hunt.name in self._hunt_classes:
-            # Pass database session to hunt constructor for dynamic parameter configuration
-            try:
-                hunt_instance = self._hunt_classes[hunt.name](db_session=self.db)
-            except TypeError:
-                # Fallback for hunts that don't accept db_session parameter
-                hunt_instance = self._hunt_classes[hunt.name]()
-            validated_params = hunt_instance.validate_parameters(initial_parameters)
-        else:
-            validated_params = initial_parameters
+        validated_params = self.validate_initial_parameters(hunt, initial_parameters)
 
         execution = HuntExecution(
             hunt_id=hunt_id,
@@ -140,11 +272,18 @@ class HuntService:
         self.db.commit()
         self.db.refresh(execution)
 
-        asyncio.create_task(self._run_hunt_async(execution.id, current_user.id))
+        asyncio.create_task(
+            self._run_hunt_async(execution.id, current_user.id, previous_execution_id)
+        )
 
         return execution
 
-    async def _run_hunt_async(self, execution_id: int, user_id: int):
+    async def _run_hunt_async(
+        self,
+        execution_id: int,
+        user_id: int,
+        previous_execution_id: Optional[int] = None,
+    ):
         execution = None
         db = None
         try:
@@ -170,8 +309,16 @@ class HuntService:
                 ).error(f"Hunt {execution.hunt_id} not found")
                 return
 
+            previous_execution = (
+                db.get(HuntExecution, previous_execution_id)
+                if previous_execution_id
+                else None
+            )
+
             executor = HuntExecutor(db)
-            await executor.execute_hunt(execution, hunt.definition_json, user)
+            await executor.execute_hunt(
+                execution, hunt.definition_json, user, previous_execution
+            )
 
         except Exception as e:
             security_logger(
@@ -0,0 +1,320 @@
+"""
+Detached plugin runs for Owlculus.
+
+A detached run executes a plugin in the background, independent of the HTTP
+request that started it. Results are persisted in batches as they arrive, so a
+client can close the page, re-attach to the live stream from any offset, or
+page through the results of a finished run without re-running the plugin.
+"""
+
+import asyncio
+from contextlib import suppress
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.core.config import plugin_run_settings
+from app.core.dependencies import get_db, no_analyst
+from app.core.exceptions import (
+    AuthorizationException,
+    ResourceNotFoundException,
+    ValidationException,
+)
+from app.core.logging import get_security_logger
+from app.core.roles import UserRole
+from app.core.utils import get_utc_now
+from app.database.models import PluginRun, PluginRunResult, User
+from sqlmodel import Session, func, select
+
+from .plugin_service import PluginService
+
+security_logger = get_security_logger
+
+ACTIVE_STATUSES = ("pending", "running")
+
+# Background tasks and change notifications for runs owned by this process
+_active_runs: Dict[int, asyncio.Task] = {}
+_run_updates: Dict[int, asyncio.Event] = {}
+
+
+def _notify(run_id: int) -> None:
+    """Wake everyone following a run; they re-read from the database"""
+    event = _run_updates.pop(run_id, None)
+    if event:
+        event.set()
+
+
+def fail_interrupted_runs(db: Session) -> int:
+    """
+    Mark runs left active by a previous process as failed, at startup.
+    Their tasks died with that process, so they would otherwise stay active
+    forever. Returns how many runs were marked.
+    """
+    runs = db.exec(select(PluginRun).where(PluginRun.status.in_(ACTIVE_STATUSES))).all()
+    for run in runs:
+        run.status = "failed"
+        run.error = "Interrupted by a server restart"
+        run.completed_at = get_utc_now()
+        db.add(run)
+    db.commit()
+    return len(runs)
+
+
+class PluginRunService:
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @no_analyst()
+    async def start_run(
+        self, plugin_name: str, params: Dict[str, Any], *, current_user: User
+    ) -> PluginRun:
+        # Fails early with ResourceNotFoundException for unknown plugins
+        PluginService(self.db).get_plugin(plugin_name)
+
+        active_count = self.db.exec(
+            select(func.count())
+            .select_from(PluginRun)
+            .where(
+                PluginRun.created_by_id == current_user.id,
+                PluginRun.status.in_(ACTIVE_STATUSES),
+            )
+        ).one()
+        if active_count >= plugin_run_settings.PLUGIN_RUN_MAX_ACTIVE_PER_USER:
+            raise ValidationException(
+                f"At most {plugin_run_settings.PLUGIN_RUN_MAX_ACTIVE_PER_USER} "
+                "background plugin runs can be active at once"
+            )
+
+        run = PluginRun(
+            plugin_name=plugin_name,
+            parameters=params or {},
+            created_by_id=current_user.id,
+        )
+        self.db.add(run)
+        self.db.commit()
+        self.db.refresh(run)
+
+        task = asyncio.create_task(self._execute_run(run.id, current_user.id))
+        _active_runs[run.id] = task
+        task.add_done_callback(lambda _: _active_runs.pop(run.id, None))
+
+        security_logger(
+            action="plugin_run_started",
+            run_id=run.id,
+            plugin_name=plugin_name,
+            user_id=current_user.id,
+        ).info(f"Background run {run.id} of {plugin_name} started")
+        return run
+
+    async def _execute_run(self, run_id: int, user_id: int) -> None:
+        db = next(get_db())
+        run = None
+        buffer: List[PluginRunResult] = []
+        status, error = "failed", None
+
+        def flush() -> None:
+            if buffer:
+                # A savepoint, so results that cannot be stored are dropped
+                # without losing the run's state or the results already stored
+                with db.begin_nested():
+                    db.add_all(buffer)
+                run.result_count += len(buffer)
+                buffer.clear()
+            db.commit()
+            _notify(run_id)
+
+        def finish(final_status: str, final_error: Optional[str]) -> None:
+            run.status = final_status
+            run.error = final_error
+            run.completed_at = get_utc_now()
+            flush()
+
+        try:
+            run = db.get(PluginRun, run_id)
+            user = db.get(User, user_id)
+            if not run or not user:
+                return
+
+            run.status = "running"
+            run.started_at = get_utc_now()
+            db.commit()
+
+            results = await PluginService(db).execute_plugin(
+                run.plugin_name, run.parameters, current_user=user
+            )
+
+            # Persist in batches so a chatty plugin does not commit per result
+            loop = asyncio.get_running_loop()
+            last_flush = loop.time()
+            async for item in results:
+                buffer.append(
+                    PluginRunResult(
+                        run_id=run_id,
+                        seq=run.result_count + len(buffer),
+                        type=item.get("type", "data"),
+                        data=item.get("data", {}),
+                    )
+                )
+                if (
+                    len(buffer) >= plugin_run_settings.PLUGIN_RUN_FLUSH_ITEMS
+                    or loop.time() - last_flush
+                    >= plugin_run_settings.PLUGIN_RUN_FLUSH_SECONDS
+                ):
+                    flush()
+                    last_flush = loop.time()
+
+            status = "completed"
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except Exception as e:
+            security_logger(
+                action="plugin_run_failed", run_id=run_id, error=str(e)
+            ).error(f"Background plugin run {run_id} failed: {e}")
+            error = str(e)
+        finally:
+            if run:
+                try:
+                    finish(status, error)
+                except Exception as e:
+                    # Results that cannot be stored must not leave the run active
+                    buffer.clear()
+                    with suppress(Exception):
+                        finish("failed", f"Could not store results: {e}")
+            _notify(run_id)
+            db.close()
+
+    def _get_run(self, run_id: int, current_user: User) -> PluginRun:
+        run = self.db.get(PluginRun, run_id)
+        if not run:
+            raise ResourceNotFoundException("Plugin run not found")
+        if (
+            run.created_by_id != current_user.id
+            and current_user.role != UserRole.ADMIN.value
+        ):
+            raise AuthorizationException("Not authorized to access this plugin run")
+        return run
+
+    async def get_run(self, run_id: int, *, current_user: User) -> PluginRun:
+        return self._get_run(run_id, current_user)
+
+    async def list_runs(
+        self, skip: int = 0, limit: int = 50, *, current_user: User
+    ) -> List[PluginRun]:
+        runs = self.db.exec(
+            select(PluginRun)
+            .where(PluginRun.created_by_id == current_user.id)
+            .order_by(PluginRun.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        ).all()
+        return list(runs)
+
+    def _read_results(
+        self, run_id: int, offset: int, limit: int
+    ) -> List[PluginRunResult]:
+        return list(
+            self.db.exec(
+                select(PluginRunResult)
+                .where(PluginRunResult.run_id == run_id, PluginRunResult.seq >= offset)
+                .order_by(PluginRunResult.seq)
+                .limit(limit)
+            ).all()
+        )
+
+    async def get_results(
+        self, run_id: int, offset: int = 0, limit: int = 100, *, current_user: User
+    ) -> List[PluginRunResult]:
+        self._get_run(run_id, current_user)
+        return self._read_results(run_id, max(0, offset), limit)
+
+    async def follow_results(
+        self,
+        run_id: int,
+        offset: int = 0,
+        poll_interval: float = 1.0,
+        *,
+        current_user: User,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield results from the offset onwards, following the run until it ends
+
+        Each result carries its offset so a client can re-attach where it left
+        off. The final item reports the run's status. Runs owned by another
+        process are picked up by polling every poll_interval seconds. Each poll
+        uses its own short-lived session, so a long follow does not hold on to
+        a pooled connection while it waits.
+        """
+        self._get_run(run_id, current_user)
+        # Release the request's connection for the rest of the follow
+        self.db.close()
+        offset = max(0, offset)
+        page_size = plugin_run_settings.PLUGIN_RUN_PAGE_SIZE
+
+        while True:
+            # Take the event before reading so a flush in between is not missed
+            updated = _run_updates.setdefault(run_id, asyncio.Event())
+            db = next(get_db())
+            try:
+                rows = [
+                    {"type": row.type, "data": row.data, "offset": row.seq}
+                    for row in PluginRunService(db)._read_results(
+                        run_id, offset, page_size
+                    )
+                ]
+                run = db.get(PluginRun, run_id) if not rows else None
+                if run is not None:
+                    status, result_count, error = (
+                        run.status,
+                        run.result_count,
+                        run.error,
+                    )
+            finally:
+                db.close()
+
+            for row in rows:
+                yield row
+            if rows:
+                offset = rows[-1]["offset"] + 1
+                continue
+
+            if run is None:
+                return
+            if status not in ACTIVE_STATUSES and offset >= result_count:
+                yield {
+                    "type": "run_complete",
+                    "data": {
+                        "run_id": run_id,
+                        "status": status,
+                        "result_count": result_count,
+                        "error": error,
+                    },
+                    "offset": result_count,
+                }
+                return
+
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(updated.wait(), poll_interval)
+
+    @no_analyst()
+    async def cancel_run(self, run_id: int, *, current_user: User) -> PluginRun:
+        run = self._get_run(run_id, current_user)
+        if run.status not in ACTIVE_STATUSES:
+            raise ValidationException(
+                "Only pending or running plugin runs can be cancelled"
+            )
+
+        task = _active_runs.get(run_id)
+        if task:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        else:
+            # Orphaned by a restart, or owned by another process
+            run.status = "cancelled"
+            run.completed_at = get_utc_now()
+            self.db.add(run)
+            self.db.commit()
+            _notify(run_id)
+
+        self.db.refresh(run)
+        return run
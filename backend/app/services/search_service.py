@@ -0,0 +1,392 @@
+"""
+Full-text search over evidence for Owlculus.
+
+Every evidence item has a search document with its title, description and the
+text extracted from its file. Documents are queued as pending in the same
+transaction that creates the evidence, and a background indexer extracts the
+text outside the request. PostgreSQL ranks matches with a weighted tsvector
+behind a GIN index; SQLite, used in development and tests, mirrors documents
+into an FTS5 table. Results are always limited to cases the user can access.
+"""
+
+import asyncio
+from typing import Iterable, List, Optional
+
+from app.core.config import search_settings
+from app.core.dependencies import check_case_access, get_db
+from app.core.logging import get_security_logger
+from app.core.roles import UserRole
+from app.core.text_extraction import (
+    UnsupportedFormat,
+    extract_text,
+    supports_extraction,
+)
+from app.core.utils import get_utc_now
+from app.database import models
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import cast, column, literal_column, table, true
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlmodel import Session, delete, exists, func, insert, select, update
+
+security_logger = get_security_logger
+
+SearchDocument = models.EvidenceSearchDocument
+
+# Matches are marked in snippets like Markdown bold, never as HTML
+SNIPPET_MARK = "**"
+
+_fts = table(
+    "evidence_search_fts",
+    column("rowid"),
+    column("title_text"),
+    column("content_text"),
+)
+_fts_table = literal_column("evidence_search_fts")
+
+
+def _title_text(evidence: models.Evidence) -> str:
+    return "\n".join(part for part in (evidence.title, evidence.description) if part)
+
+
+def _fts_query(query: str) -> str:
+    """Quote each term, so FTS5 matches them all and never parses operators"""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+class SearchService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    @property
+    def _uses_postgres(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def queue_evidence(self, evidence: models.Evidence) -> None:
+        """Queue new evidence for indexing; committed with the evidence"""
+        if evidence.is_folder:
+            return
+        self.db.add(
+            SearchDocument(
+                evidence_id=evidence.id,
+                case_id=evidence.case_id,
+                title_text=_title_text(evidence),
+            )
+        )
+
+    def queue_unindexed_evidence(self) -> None:
+        """Queue evidence created before it was indexed for search"""
+        title_text = (
+            models.Evidence.title
+            + "\n"
+            + func.coalesce(models.Evidence.description, "")
+        )
+        self.db.exec(
+            insert(SearchDocument).from_select(
+                ["evidence_id", "case_id", "title_text"],
+                select(models.Evidence.id, models.Evidence.case_id, title_text).where(
+                    models.Evidence.is_folder == False,  # noqa: E712
+                    ~exists().where(SearchDocument.evidence_id == models.Evidence.id),
+                ),
+            )
+        )
+        self.db.commit()
+
+    def update_evidence(self, evidence: models.Evidence) -> None:
+        """Refresh an edited evidence's document; committed with the edit"""
+        document = self.db.get(SearchDocument, evidence.id)
+        if document is None:
+            return
+        document.title_text = _title_text(evidence)
+        if evidence.evidence_type != "file":
+            document.content_text = evidence.content[
+                : search_settings.SEARCH_MAX_TEXT_CHARS
+            ]
+        self.db.add(document)
+        # Pending documents are written by the indexer
+        if document.status != "pending":
+            self._write_index(document)
+
+    def remove_evidence(self, evidence_ids: Iterable[int]) -> None:
+        """Drop evidence from the index, before the evidence is deleted"""
+        evidence_ids = list(evidence_ids)
+        if not evidence_ids:
+            return
+        if not self._uses_postgres:
+            self.db.exec(delete(_fts).where(_fts.c.rowid.in_(evidence_ids)))
+        self.db.exec(
+            delete(SearchDocument).where(SearchDocument.evidence_id.in_(evidence_ids))
+        )
+
+    def _write_index(self, document: SearchDocument) -> None:
+        self.db.flush()
+        if self._uses_postgres:
+            config = cast(search_settings.SEARCH_TEXT_CONFIG, REGCONFIG)
+            title_vector = func.setweight(
+                func.to_tsvector(config, SearchDocument.title_text),
+                literal_column("'A'"),
+            )
+            content_vector = func.setweight(
+                func.to_tsvector(
+                    config, func.coalesce(SearchDocument.content_text, "")
+                ),
+                literal_column("'B'"),
+            )
+            self.db.exec(
+                update(SearchDocument)
+                .where(SearchDocument.evidence_id == document.evidence_id)
+                .values(search_vector=title_vector.op("||")(content_vector))
+            )
+        else:
+            self.db.exec(delete(_fts).where(_fts.c.rowid == document.evidence_id))
+            self.db.exec(
+                insert(_fts).values(
+                    rowid=document.evidence_id,
+                    title_text=document.title_text,
+                    content_text=document.content_text or "",
+                )
+            )
+
+    async def _index_document(self, document: SearchDocument) -> None:
+        evidence = self.db.get(models.Evidence, document.evidence_id)
+        if evidence is None:
+            self.db.delete(document)
+            self.db.commit()
+            return
+
+        max_chars = search_settings.SEARCH_MAX_TEXT_CHARS
+        status, content, error = "indexed", None, None
+        try:
+            if evidence.evidence_type != "file":
+                content = evidence.content[:max_chars]
+            elif not supports_extraction(evidence.content):
+                status = "unsupported"
+            else:
+                content = await run_in_threadpool(extract_text, evidence, max_chars)
+        except UnsupportedFormat as e:
+            status, error = "unsupported", str(e)
+        except Exception as e:
+            status, error = "failed", str(e)
+
+        # Titles and descriptions are searchable even without the content
+        document.title_text = _title_text(evidence)
+        document.content_text = content
+        document.status = status
+        document.error = error
+        document.indexed_at = get_utc_now()
+        self.db.add(document)
+        self._write_index(document)
+        self.db.commit()
+
+        security_logger(
+            action="evidence_indexed",
+            evidence_id=document.evidence_id,
+            status=status,
+            error=error,
+        ).info(f"Indexed evidence {document.evidence_id} for search: {status}")
+
+    def _mark_failed(self, evidence_id: int, error: str) -> None:
+        document = self.db.get(SearchDocument, evidence_id)
+        if document is None:
+            return
+        document.status = "failed"
+        document.error = error
+        document.content_text = None
+        document.indexed_at = get_utc_now()
+        self.db.add(document)
+        self._write_index(document)
+        self.db.commit()
+
+    async def index_pending(self, limit: int) -> int:
+        """Extract and index up to limit queued documents; returns how many"""
+        indexed = 0
+        while indexed < limit:
+            # Other workers skip a document while it is being indexed
+            document = self.db.exec(
+                select(SearchDocument)
+                .where(SearchDocument.status == "pending")
+                .order_by(SearchDocument.evidence_id)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).first()
+            if document is None:
+                break
+
+            evidence_id = document.evidence_id
+            try:
+                await self._index_document(document)
+            except Exception as e:
+                self.db.rollback()
+                security_logger(
+                    action="evidence_index_failed",
+                    evidence_id=evidence_id,
+                    error=str(e),
+                ).error(f"Indexing evidence {evidence_id} for search failed: {e}")
+                self._mark_failed(evidence_id, str(e))
+            indexed += 1
+        return indexed
+
+    async def search(
+        self,
+        query: str,
+        current_user: models.User,
+        case_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 20,
+    ) -> List[dict]:
+        """Evidence matching a query, best match first"""
+        if not query.strip():
+            raise HTTPException(status_code=400, detail="Search query is empty")
+
+        if case_id is not None:
+            check_case_access(self.db, case_id, current_user)
+            scope = SearchDocument.case_id == case_id
+        elif current_user.role != UserRole.ADMIN.value:
+            scope = SearchDocument.case_id.in_(
+                select(models.CaseUserLink.case_id).where(
+                    models.CaseUserLink.user_id == current_user.id
+                )
+            )
+        else:
+            scope = true()
+
+        if self._uses_postgres:
+            config = cast(search_settings.SEARCH_TEXT_CONFIG, REGCONFIG)
+            ts_query = func.websearch_to_tsquery(config, query)
+            rank = func.ts_rank_cd(SearchDocument.search_vector, ts_query)
+            snippet = func.ts_headline(
+                config,
+                func.coalesce(
+                    func.nullif(SearchDocument.content_text, ""),
+                    SearchDocument.title_text,
+                ),
+                ts_query,
+                f"StartSel={SNIPPET_MARK}, StopSel={SNIPPET_MARK}, "
+                "MaxFragments=2, MaxWords=20, MinWords=5",
+            )
+            statement = (
+                select(
+                    SearchDocument.evidence_id,
+                    rank.label("rank"),
+                    snippet.label("snippet"),
+                )
+                .where(SearchDocument.search_vector.op("@@")(ts_query), scope)
+                .order_by(rank.desc(), SearchDocument.evidence_id)
+            )
+        else:
+            # bm25() is lower for better matches; titles weigh ten times more
+            rank = -func.bm25(_fts_table, 10.0, 1.0)
+            snippet = func.snippet(_fts_table, -1, SNIPPET_MARK, SNIPPET_MARK, "…", 16)
+            statement = (
+                select(_fts.c.rowid, rank.label("rank"), snippet.label("snippet"))
+                .select_from(
+                    _fts.join(
+                        SearchDocument, SearchDocument.evidence_id == _fts.c.rowid
+                    )
+                )
+                .where(_fts_table.op("MATCH")(_fts_query(query)), scope)
+                .order_by(rank.desc(), _fts.c.rowid)
+            )
+
+        matches = self.db.exec(statement.offset(skip).limit(limit)).all()
+        evidence_ids = [evidence_id for evidence_id, _, _ in matches]
+        evidence_by_id = {
+            evidence.id: evidence
+            for evidence in self.db.exec(
+                select(models.Evidence).where(models.Evidence.id.in_(evidence_ids))
+            )
+        }
+
+        results = []
+        for evidence_id, rank_value, snippet_text in matches:
+            evidence = evidence_by_id.get(evidence_id)
+            if evidence is None:
+                continue
+            results.append(
+                {
+                    "evidence_id": evidence.id,
+                    "case_id": evidence.case_id,
+                    "title": evidence.title,
+                    "description": evidence.description,
+                    "evidence_type": evidence.evidence_type,
+                    "folder_path": evidence.folder_path,
+                    "snippet": snippet_text,
+                    "rank": float(rank_value or 0),
+                }
+            )
+        return results
+
+
+class SearchIndexer:
+    """Background loop that indexes queued evidence"""
+
+    def __init__(self, poll_seconds: int, batch_size: int):
+        self.poll_seconds = poll_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def wake(self) -> None:
+        """Index newly queued evidence now rather than at the next poll"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run_once(self) -> int:
+        db = next(get_db())
+        try:
+            return await SearchService(db).index_pending(self.batch_size)
+        finally:
+            db.close()
+
+    async def _queue_unindexed(self) -> None:
+        db = next(get_db())
+        try:
+            SearchService(db).queue_unindexed_evidence()
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        try:
+            await self._queue_unindexed()
+        except Exception as e:
+            security_logger(action="search_backfill_failed", error=str(e)).error(
+                f"Queueing existing evidence for search failed: {e}"
+            )
+
+        while True:
+            try:
+                indexed = await self.run_once()
+            except Exception as e:
+                indexed = 0
+                security_logger(action="search_indexer_failed", error=str(e)).error(
+                    f"Search indexer run failed: {e}"
+                )
+            # A full batch means more is probably waiting
+            if indexed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+
+search_indexer = SearchIndexer(
+    search_settings.SEARCH_INDEXER_POLL_SECONDS,
+    search_settings.SEARCH_INDEXER_BATCH_SIZE,
+)
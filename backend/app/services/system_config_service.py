@@ -7,10 +7,16 @@ administrative system configuration functionality.
 """
 
 import os
-from typing import Dict, List, Optional, Tuple
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 from sqlmodel import Session, select
 
+from ..core.config import config_cache_settings
 from ..core.dependencies import admin_only
 from ..core.evidence_templates import DEFAULT_TEMPLATES
 from ..core.logging import get_security_logger
@@ -57,6 +63,56 @@ class EvidenceTemplateError(SystemConfigError):
     pass
 
 
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Read-only view of the system configuration, shared across services"""
+
+    version: Optional[datetime]
+    case_number_template: str
+    case_number_prefix: Optional[str]
+    evidence_folder_templates: Mapping[str, Any]
+    api_keys: Mapping[str, Optional[str]]
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts and lists into read-only equivalents"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class _ConfigCache:
+    """
+    The current ConfigSnapshot, shared by every SystemConfigService in the process
+
+    Writes in this process drop the snapshot straight away. Writes made by other
+    workers are noticed by comparing the configuration row's updated_at, which
+    is checked at most once every CONFIG_CACHE_CHECK_SECONDS.
+    """
+
+    def __init__(self) -> None:
+        self.snapshot: Optional[ConfigSnapshot] = None
+        self.checked_at = 0.0
+        # Bumped on every invalidation, so a snapshot read before it is discarded
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        with self.lock:
+            self.snapshot = None
+            self.generation += 1
+
+
+_config_cache = _ConfigCache()
+
+
+def invalidate_config_cache() -> None:
+    """Force the next snapshot read to re-read the configuration"""
+    _config_cache.invalidate()
+
+
 class SystemConfigValidator:
     """Handles validation logic for system configuration"""
 
@@ -152,6 +208,7 @@ class SystemConfigService:
         self.db.add(config)
         self.db.commit()
         self.db.refresh(config)
+        invalidate_config_cache()
         return config
 
     @admin_only()
@@ -274,6 +331,13 @@ class SystemConfigService:
         current_keys[provider] = self._create_api_key_data(api_key, name)
         return current_keys
 
+    def _on_api_keys_changed(self) -> None:
+        """Drop the cached snapshot, and re-sync hunts as their parameters depend on keys"""
+        from .hunt_service import invalidate_hunt_definitions
+
+        invalidate_config_cache()
+        invalidate_hunt_definitions()
+
     @admin_only()
     async def set_api_key(
         self,
@@ -309,6 +373,7 @@ class SystemConfigService:
 
             config.api_keys = current_keys
             config = self._save_configuration(config)
+            self._on_api_keys_changed()
             config_logger.bind(event_type=f"api_key_{operation_type}_success").info(
                 f"API key {operation_type}d successfully for provider: {provider}"
             )
@@ -360,6 +425,7 @@ class SystemConfigService:
                 self.db.add(config)
                 self.db.commit()
                 self.db.refresh(config)
+                self._on_api_keys_changed()
 
                 config_logger.bind(
                     removed_key_name=removed_key_data.get("name"),
@@ -389,24 +455,83 @@ class SystemConfigService:
         env_var = f"{provider.upper()}_API_KEY"
         return os.environ.get(env_var)
 
-    def get_api_key(self, provider: str) -> Optional[str]:
-        """Get decrypted API key for a provider"""
-        try:
-            stmt = select(models.SystemConfiguration)
-            config = self.db.exec(stmt).first()
-
-            if not config or not config.api_keys or provider not in config.api_keys:
-                return self._get_env_api_key(provider)
+    def _build_snapshot(
+        self, config: Optional[models.SystemConfiguration]
+    ) -> ConfigSnapshot:
+        if not config:
+            return ConfigSnapshot(
+                version=None,
+                case_number_template=CASE_NUMBER_TEMPLATE_MONTHLY,
+                case_number_prefix=None,
+                evidence_folder_templates=_freeze(self._get_default_templates()),
+                api_keys=MappingProxyType({}),
+            )
 
-            encrypted_key = config.api_keys[provider].get("api_key")
-            if encrypted_key:
-                return decrypt_api_key(encrypted_key)
+        api_keys = {}
+        for provider, key_data in (config.api_keys or {}).items():
+            # An unreadable key is left out, so only its provider falls back
+            # to the environment
+            try:
+                encrypted_key = key_data.get("api_key")
+                api_keys[provider] = (
+                    decrypt_api_key(encrypted_key) if encrypted_key else None
+                )
+            except Exception as e:
+                get_security_logger(
+                    action="api_key_decrypt_failed", provider=provider, error=str(e)
+                ).warning(f"Could not read the stored API key for {provider}: {e}")
+
+        return ConfigSnapshot(
+            version=config.updated_at,
+            case_number_template=config.case_number_template,
+            case_number_prefix=config.case_number_prefix,
+            evidence_folder_templates=_freeze(
+                config.evidence_folder_templates or self._get_default_templates()
+            ),
+            api_keys=MappingProxyType(api_keys),
+        )
 
-            return None
+    def get_snapshot(self) -> ConfigSnapshot:
+        """
+        Return the current configuration, served from a process-wide cache
+
+        Hot paths should read this instead of the SystemConfiguration row.
+        A missing row reads as the defaults without being created.
+        """
+        cache = _config_cache
+        now = time.monotonic()
+        snapshot = cache.snapshot
+        if (
+            snapshot is not None
+            and now - cache.checked_at < config_cache_settings.CONFIG_CACHE_CHECK_SECONDS
+        ):
+            return snapshot
+
+        # Database reads happen outside the lock, so a slow query never holds
+        # up threads that only need the cached snapshot
+        generation = cache.generation
+        version = self.db.exec(select(models.SystemConfiguration.updated_at)).first()
+        if snapshot is None or version != snapshot.version:
+            config = self.db.exec(select(models.SystemConfiguration)).first()
+            snapshot = self._build_snapshot(config)
+
+        with cache.lock:
+            if cache.generation == generation:
+                cache.snapshot = snapshot
+                cache.checked_at = now
+        return snapshot
 
+    def get_api_key(self, provider: str) -> Optional[str]:
+        """Get decrypted API key for a provider"""
+        try:
+            api_keys = self.get_snapshot().api_keys
         except Exception:
             return self._get_env_api_key(provider)
 
+        if provider not in api_keys:
+            return self._get_env_api_key(provider)
+        return api_keys[provider]
+
     @admin_only()
     async def list_api_keys(self, current_user: models.User) -> Dict[str, dict]:
         """List all configured API keys (admin only)"""
@@ -0,0 +1,338 @@
+"""
+Resumable chunked uploads for large evidence files.
+
+A client opens an upload session declaring the file's size, sends the bytes in
+chunks at explicit offsets, and completes the session with the file's SHA-256.
+Chunks are streamed straight to disk, so an upload of any size never has to
+fit in an API worker's memory, and an interrupted upload resumes from the
+offset the server reports instead of starting over.
+"""
+
+import uuid
+from datetime import timedelta
+from typing import AsyncIterator, Optional
+
+from app.core.config import upload_settings
+from app.core.dependencies import check_case_access, no_analyst
+from app.core.file_storage import (
+    discard_partial_upload,
+    get_case_storage_usage,
+    inspect_partial_upload,
+    logical_file_path,
+    normalize_folder_path,
+    store_partial_upload,
+    write_upload_chunk,
+)
+from app.core.logging import get_security_logger
+from app.core.utils import get_utc_now
+from app.database import models
+from app.schemas import evidence_schema as schemas
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session, func, select
+
+from .blob_service import BlobService
+from .search_service import SearchService, search_indexer
+
+MB = 1024 * 1024
+
+
+class UploadService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _get_session(
+        self, upload_id: str, current_user: models.User
+    ) -> models.UploadSession:
+        upload = self.db.get(models.UploadSession, upload_id)
+        if not upload or upload.created_by_id != current_user.id:
+            raise HTTPException(status_code=404, detail="Upload not found")
+        return upload
+
+    def _get_active_session(
+        self, upload_id: str, current_user: models.User
+    ) -> models.UploadSession:
+        upload = self._get_session(upload_id, current_user)
+        if upload.status == "uploading" and upload.expires_at.replace(
+            tzinfo=None
+        ) < get_utc_now().replace(tzinfo=None):
+            self._expire(upload)
+        if upload.status != "uploading":
+            raise HTTPException(
+                status_code=409, detail=f"Upload is {upload.status}, not in progress"
+            )
+        return upload
+
+    def _expire(self, upload: models.UploadSession) -> None:
+        discard_partial_upload(upload.id)
+        upload.status = "expired"
+        upload.updated_at = get_utc_now()
+        self.db.add(upload)
+        self.db.commit()
+
+    def _purge_expired(self) -> None:
+        expired = self.db.exec(
+            select(models.UploadSession).where(
+                models.UploadSession.status == "uploading",
+                models.UploadSession.expires_at < get_utc_now(),
+            )
+        ).all()
+        for upload in expired:
+            self._expire(upload)
+
+    def check_quota(
+        self, case_id: int, size: int, exclude_upload_id: Optional[str] = None
+    ) -> None:
+        quota = upload_settings.UPLOAD_CASE_QUOTA_MB * MB
+        if not quota:
+            return
+
+        # Space promised to uploads still in flight counts against the quota
+        in_flight = [
+            models.UploadSession.case_id == case_id,
+            models.UploadSession.status == "uploading",
+        ]
+        if exclude_upload_id:
+            in_flight.append(models.UploadSession.id != exclude_upload_id)
+        reserved = self.db.exec(
+            select(func.coalesce(func.sum(models.UploadSession.total_size), 0)).where(
+                *in_flight
+            )
+        ).one()
+        # Files stored by content count once per case however often they recur
+        used = get_case_storage_usage(case_id) + BlobService(self.db).get_case_usage(
+            case_id
+        )
+        if used + reserved + size > quota:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Upload would exceed the case storage quota of "
+                f"{upload_settings.UPLOAD_CASE_QUOTA_MB}MB",
+            )
+
+    @no_analyst()
+    async def create_upload(
+        self, upload: schemas.UploadSessionCreate, current_user: models.User
+    ) -> models.UploadSession:
+        check_case_access(self.db, upload.case_id, current_user)
+
+        if upload.total_size > upload_settings.UPLOAD_MAX_FILE_SIZE_MB * MB:
+            raise HTTPException(
+                status_code=413,
+                detail=f"File too large. Maximum size is "
+                f"{upload_settings.UPLOAD_MAX_FILE_SIZE_MB}MB",
+            )
+
+        has_folders = self.db.exec(
+            select(models.Evidence).where(
+                models.Evidence.case_id == upload.case_id,
+                models.Evidence.is_folder == True,
+            )
+        ).first()
+        if not has_folders:
+            raise HTTPException(
+                status_code=400,
+                detail="Cannot upload files without any folders. Create a folder first to organize evidence.",
+            )
+
+        self._purge_expired()
+        self.check_quota(upload.case_id, upload.total_size)
+
+        now = get_utc_now()
+        db_upload = models.UploadSession(
+            id=uuid.uuid4().hex,
+            case_id=upload.case_id,
+            filename=upload.filename,
+            content_type=upload.content_type,
+            title=upload.title,
+            description=upload.description,
+            category=upload.category,
+            folder_path=upload.folder_path,
+            parent_folder_id=upload.parent_folder_id,
+            total_size=upload.total_size,
+            created_by_id=current_user.id,
+            created_at=now,
+            updated_at=now,
+            expires_at=now + timedelta(hours=upload_settings.UPLOAD_SESSION_TTL_HOURS),
+        )
+        self.db.add(db_upload)
+        self.db.commit()
+        self.db.refresh(db_upload)
+
+        get_security_logger(
+            user_id=current_user.id,
+            case_id=upload.case_id,
+            action="create_upload",
+            upload_id=db_upload.id,
+            total_size=upload.total_size,
+            event_type="chunked_upload_started",
+        ).info(f"Chunked upload started: {upload.filename}")
+        return db_upload
+
+    async def get_upload(
+        self, upload_id: str, current_user: models.User
+    ) -> models.UploadSession:
+        return self._get_session(upload_id, current_user)
+
+    @no_analyst()
+    async def upload_chunk(
+        self,
+        upload_id: str,
+        offset: int,
+        chunks: AsyncIterator[bytes],
+        current_user: models.User,
+    ) -> models.UploadSession:
+        upload = self._get_active_session(upload_id, current_user)
+
+        # Resending already received bytes is allowed; skipping ahead is not
+        if offset < 0 or offset > upload.received_size:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Expected a chunk at offset {upload.received_size}",
+            )
+
+        max_chunk = upload_settings.UPLOAD_MAX_CHUNK_SIZE_MB * MB
+        limit = min(upload.total_size, offset + max_chunk)
+        try:
+            size = await write_upload_chunk(upload.id, offset, chunks, limit)
+        except HTTPException:
+            # The partial file was truncated back to the offset
+            upload.received_size = offset
+            self.db.add(upload)
+            self.db.commit()
+            raise
+
+        now = get_utc_now()
+        upload.received_size = size
+        upload.updated_at = now
+        upload.expires_at = now + timedelta(
+            hours=upload_settings.UPLOAD_SESSION_TTL_HOURS
+        )
+        self.db.add(upload)
+        self.db.commit()
+        self.db.refresh(upload)
+        return upload
+
+    @no_analyst()
+    async def complete_upload(
+        self, upload_id: str, sha256: str, current_user: models.User
+    ) -> models.Evidence:
+        upload = self._get_active_session(upload_id, current_user)
+        upload_logger = get_security_logger(
+            user_id=current_user.id,
+            case_id=upload.case_id,
+            action="complete_upload",
+            upload_id=upload.id,
+            event_type="chunked_upload_complete_attempt",
+        )
+
+        if upload.received_size != upload.total_size:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Upload incomplete: received {upload.received_size} "
+                f"of {upload.total_size} bytes",
+            )
+
+        # Other uploads may have been stored since this one was opened
+        try:
+            self.check_quota(
+                upload.case_id, upload.total_size, exclude_upload_id=upload.id
+            )
+        except HTTPException:
+            upload_logger.bind(
+                event_type="chunked_upload_failed", failure_reason="quota_exceeded"
+            ).warning(f"Chunked upload over case quota: {upload.filename}")
+            self._fail(upload)
+            raise
+
+        try:
+            file_hash, _ = await run_in_threadpool(
+                inspect_partial_upload,
+                upload.id,
+                upload.filename,
+                upload.content_type,
+                upload_settings.UPLOAD_MAX_FILE_SIZE_MB * MB,
+            )
+        except HTTPException:
+            upload_logger.bind(
+                event_type="chunked_upload_failed", failure_reason="validation_error"
+            ).warning(f"Chunked upload rejected: {upload.filename}")
+            self._fail(upload)
+            raise
+
+        if file_hash != sha256.lower():
+            upload_logger.bind(
+                event_type="chunked_upload_failed", failure_reason="hash_mismatch"
+            ).warning(f"Chunked upload hash mismatch: {upload.filename}")
+            self._fail(upload)
+            raise HTTPException(
+                status_code=422, detail="File hash does not match the uploaded data"
+            )
+
+        taken_paths = set(
+            self.db.exec(
+                select(models.Evidence.content).where(
+                    models.Evidence.case_id == upload.case_id,
+                    models.Evidence.evidence_type == "file",
+                )
+            ).all()
+        )
+        relative_path = logical_file_path(
+            upload.case_id, upload.folder_path, upload.filename, taken_paths
+        )
+        is_new_blob = await run_in_threadpool(
+            store_partial_upload, upload.id, file_hash
+        )
+
+        now = get_utc_now()
+        evidence = models.Evidence(
+            case_id=upload.case_id,
+            title=relative_path.split("/")[-1],
+            description=upload.description,
+            evidence_type="file",
+            category=upload.category,
+            content=relative_path,
+            file_hash=file_hash,
+            folder_path=normalize_folder_path(upload.folder_path or "") or None,
+            parent_folder_id=upload.parent_folder_id,
+            created_by_id=current_user.id,
+            created_at=now,
+            updated_at=now,
+        )
+        self.db.add(evidence)
+        self.db.flush()
+        BlobService(self.db).add_reference(evidence.id, file_hash)
+        SearchService(self.db).queue_evidence(evidence)
+
+        upload.status = "completed"
+        upload.evidence_id = evidence.id
+        upload.updated_at = now
+        self.db.add(upload)
+        self.db.commit()
+        self.db.refresh(evidence)
+        search_indexer.wake()
+
+        upload_logger.bind(
+            evidence_id=evidence.id,
+            file_hash=file_hash,
+            relative_path=relative_path,
+            deduplicated=not is_new_blob,
+            event_type="chunked_upload_complete_success",
+        ).info(f"Chunked upload completed: {upload.filename}")
+        return evidence
+
+    def _fail(self, upload: models.UploadSession) -> None:
+        discard_partial_upload(upload.id)
+        upload.status = "failed"
+        upload.updated_at = get_utc_now()
+        self.db.add(upload)
+        self.db.commit()
+
+    @no_analyst()
+    async def abort_upload(self, upload_id: str, current_user: models.User) -> None:
+        upload = self._get_active_session(upload_id, current_user)
+        discard_partial_upload(upload.id)
+        upload.status = "aborted"
+        upload.updated_at = get_utc_now()
+        self.db.add(upload)
+        self.db.commit()
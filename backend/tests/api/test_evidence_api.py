@@ -470,6 +470,47 @@ class TestEvidenceAPI:
         finally:
             app.dependency_overrides.clear()
 
+    def test_bulk_upload_reports_each_file(
+        self,
+        session: Session,
+        test_admin: User,
+        test_case: Case,
+        test_folder: Evidence,
+        tmp_path,
+    ):
+        """Test a bulk upload returns a result for every file"""
+        app.dependency_overrides[get_current_user] = override_get_current_user_factory(
+            test_admin
+        )
+        app.dependency_overrides[get_db] = override_get_db_factory(session)
+
+        try:
+            with patch("app.core.file_storage.UPLOAD_DIR", tmp_path):
+                response = client.post(
+                    "/api/evidence/bulk",
+                    data={"case_id": test_case.id, "category": "Documents"},
+                    files=[
+                        ("files", ("page.html", b"<p>capture</p>", "text/html")),
+                        ("files", ("blob.bin", b"\x00\xff" * 200, "text/plain")),
+                    ],
+                )
+                assert response.status_code == status.HTTP_201_CREATED
+                data = response.json()
+                assert data["created"] == 1
+                assert data["failed"] == 1
+                assert data["results"][0]["evidence"]["title"] == "page.html"
+                assert data["results"][1]["status"] == "failed"
+
+                response = client.post(
+                    "/api/evidence/bulk",
+                    data={"case_id": test_case.id},
+                    files=[("files", ("blob.bin", b"\x00\xff" * 200, "text/plain"))],
+                )
+                assert response.status_code == status.HTTP_400_BAD_REQUEST
+                assert response.json()["created"] == 0
+        finally:
+            app.dependency_overrides.clear()
+
     # Folder management tests
 
     def test_create_folder_success(
@@ -237,7 +237,7 @@ class TestPluginsAPI:
                     "/api/plugins/DnsLookupPlugin/execute", json=plugin_params
                 )
                 assert response.status_code == status.HTTP_200_OK
-                assert response.headers["content-type"] == "application/json"
+                assert response.headers["content-type"] == "application/x-ndjson"
 
                 # Check streaming response content
                 content = response.content.decode()
@@ -454,6 +454,42 @@ class TestPluginsAPI:
         finally:
             app.dependency_overrides.clear()
 
+    def test_execute_plugin_sse_transport(self, session: Session, test_user: User):
+        """Test plugin execution streamed as server-sent events"""
+        app.dependency_overrides[get_current_user] = override_get_current_user_factory(
+            test_user
+        )
+        app.dependency_overrides[get_db] = override_get_db_factory(session)
+
+        async def mock_execution_result():
+            yield {"type": "status", "data": {"message": "Starting scan"}}
+            yield {"type": "data", "data": {"platform": "twitter", "found": True}}
+
+        try:
+            with patch(
+                "app.services.plugin_service.PluginService.execute_plugin"
+            ) as mock_execute:
+                mock_execute.return_value = mock_execution_result()
+
+                response = client.post(
+                    "/api/plugins/HolehePlugin/execute?transport=sse",
+                    json={"email": "test@example.com"},
+                )
+                assert response.status_code == status.HTTP_200_OK
+                assert response.headers["content-type"].startswith(
+                    "text/event-stream"
+                )
+
+                events = [
+                    event for event in response.content.decode().split("\n\n") if event
+                ]
+                assert events[0].startswith("event: status\ndata: ")
+                assert json.loads(events[1].split("data: ", 1)[1])["data"][
+                    "platform"
+                ] == "twitter"
+        finally:
+            app.dependency_overrides.clear()
+
     # Edge cases and validation tests
 
     def test_execute_plugin_invalid_json_params(
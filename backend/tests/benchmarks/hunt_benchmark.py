@@ -0,0 +1,330 @@
+"""
+Benchmark harness for hunt orchestration overhead
+
+Hunts of different DAG shapes are run through HuntExecutor.execute_hunt with
+synthetic plugins against an in-memory SQLite database, so the numbers reflect
+the executor itself rather than network latency.
+
+Usage (from the backend directory):
+    python -m tests.benchmarks.hunt_benchmark --shape all --size 20
+    python -m tests.benchmarks.hunt_benchmark --shape diamond --latency 0.01 \
+        --output-items 50 --failure-rate 0.1 --repeat 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# The app reads these at import time; the benchmark never connects to Postgres
+os.environ.setdefault("SECRET_KEY", "benchmark_secret_key")
+os.environ.setdefault("POSTGRES_USER", "benchmark")
+os.environ.setdefault("POSTGRES_PASSWORD", "benchmark")
+os.environ.setdefault("POSTGRES_HOST", "localhost")
+os.environ.setdefault("POSTGRES_PORT", "5432")
+os.environ.setdefault("POSTGRES_DB", "benchmark")
+
+from app.core.websocket_manager import websocket_manager
+from app.database.models import Hunt, HuntExecution, User
+from app.hunts.hunt_executor import HuntExecutor
+from app.plugins.base_plugin import BasePlugin
+from sqlalchemy import event
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+SYNTHETIC_PLUGIN = "SyntheticPlugin"
+
+
+@dataclass
+class SyntheticPluginSpec:
+    """Behaviour of the synthetic plugin used for every step"""
+
+    latency: float = 0.0
+    output_items: int = 1
+    item_size: int = 64
+    failure_rate: float = 0.0
+
+
+class SyntheticPlugin(BasePlugin):
+    """Plugin that sleeps, then yields a configurable amount of data"""
+
+    def __init__(
+        self,
+        spec: SyntheticPluginSpec,
+        rng: random.Random,
+        db_session: Optional[Session] = None,
+    ):
+        super().__init__(display_name="Synthetic", db_session=db_session)
+        self.spec = spec
+        self.rng = rng
+
+    def parse_output(self, line: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    async def run(self, params: Optional[Dict[str, Any]] = None):
+        params = params or {}
+        if self.spec.latency:
+            await asyncio.sleep(self.spec.latency)
+
+        if self.rng.random() < self.spec.failure_rate:
+            raise RuntimeError(f"Synthetic failure for {params.get('target')}")
+
+        payload = "x" * self.spec.item_size
+        for index in range(self.spec.output_items):
+            yield {
+                "type": "data",
+                "data": {
+                    "value": f"{params.get('target')}-{index}",
+                    "payload": payload,
+                },
+            }
+
+
+class SyntheticPluginService:
+    """Stands in for PluginService, handing out synthetic plugins"""
+
+    def __init__(self, spec: SyntheticPluginSpec, db: Session, seed: int = 0):
+        self.spec = spec
+        self.db = db
+        self.rng = random.Random(seed)
+
+    def get_plugin(self, name: str) -> BasePlugin:
+        return SyntheticPlugin(self.spec, self.rng, db_session=self.db)
+
+
+def _step(step_id: str, depends_on: List[str], source: str) -> Dict[str, Any]:
+    return {
+        "step_id": step_id,
+        "plugin_name": SYNTHETIC_PLUGIN,
+        "display_name": step_id,
+        "description": f"Synthetic step {step_id}",
+        "depends_on": depends_on,
+        "parameter_mapping": {"target": source},
+        "save_to_case": False,
+    }
+
+
+def chain_hunt(size: int) -> Dict[str, Any]:
+    """Steps run one after another, each consuming the previous output"""
+    steps = [_step("step_0", [], "initial.target")]
+    for index in range(1, size):
+        previous = f"step_{index - 1}"
+        steps.append(_step(f"step_{index}", [previous], f"{previous}.results[0].value"))
+    return {"steps": steps}
+
+
+def fan_out_hunt(size: int) -> Dict[str, Any]:
+    """One root step feeding many independent branches"""
+    steps = [_step("root", [], "initial.target")]
+    for index in range(size):
+        steps.append(_step(f"branch_{index}", ["root"], "root.results[0].value"))
+    return {"steps": steps}
+
+
+def diamond_hunt(size: int) -> Dict[str, Any]:
+    """A root fanning out to branches that all join into one final step"""
+    definition = fan_out_hunt(size)
+    branches = [step["step_id"] for step in definition["steps"][1:]]
+    definition["steps"].append(_step("join", branches, "root.results[0].value"))
+    return definition
+
+
+HUNT_SHAPES: Dict[str, Callable[[int], Dict[str, Any]]] = {
+    "chain": chain_hunt,
+    "fan_out": fan_out_hunt,
+    "diamond": diamond_hunt,
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurements for a single hunt execution"""
+
+    shape: str
+    step_count: int
+    status: str
+    wall_time: float
+    db_commits: int
+    websocket_messages: int
+    peak_memory_bytes: int
+    failed_steps: int = 0
+    message_types: Dict[str, int] = field(default_factory=dict)
+
+
+class _CountingWebSocket:
+    """Fake client connection that counts the messages it receives"""
+
+    def __init__(self):
+        self.message_types: Dict[str, int] = {}
+
+    @property
+    def message_count(self) -> int:
+        return sum(self.message_types.values())
+
+    async def send_json(self, message: Dict[str, Any]) -> None:
+        event_type = message.get("event_type", "unknown")
+        self.message_types[event_type] = self.message_types.get(event_type, 0) + 1
+
+
+def _create_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+async def run_hunt_benchmark(
+    shape: str,
+    size: int,
+    spec: Optional[SyntheticPluginSpec] = None,
+    seed: int = 0,
+    measure_memory: bool = True,
+) -> BenchmarkResult:
+    """
+    Execute one synthetic hunt and measure the executor's overhead
+
+    Memory tracing slows execution down, so pass measure_memory=False when
+    only wall time matters.
+    """
+    spec = spec or SyntheticPluginSpec()
+    definition = HUNT_SHAPES[shape](size)
+    engine = _create_engine()
+
+    with Session(engine) as session:
+        user = User(
+            username="benchmark",
+            email="benchmark@example.com",
+            password_hash="unused",
+            role="Admin",
+        )
+        hunt = Hunt(
+            name=f"benchmark_{shape}",
+            display_name=f"Benchmark {shape}",
+            description="Synthetic benchmark hunt",
+            category="benchmark",
+            definition_json=definition,
+        )
+        session.add(user)
+        session.add(hunt)
+        session.commit()
+
+        execution = HuntExecution(
+            hunt_id=hunt.id,
+            case_id=1,
+            initial_parameters={"target": "example.com"},
+            created_by_id=user.id,
+        )
+        session.add(execution)
+        session.commit()
+        session.refresh(execution)
+
+        executor = HuntExecutor(session)
+        executor.plugin_service = SyntheticPluginService(spec, session, seed)
+
+        commits = 0
+
+        def count_commit(_session):
+            nonlocal commits
+            commits += 1
+
+        websocket = _CountingWebSocket()
+        websocket_manager.connections.setdefault(execution.id, set()).add(websocket)
+        event.listen(session, "after_commit", count_commit)
+
+        if measure_memory:
+            tracemalloc.start()
+        try:
+            started = time.perf_counter()
+            await executor.execute_hunt(execution, definition, user)
+            wall_time = time.perf_counter() - started
+            peak_memory = tracemalloc.get_traced_memory()[1] if measure_memory else 0
+        finally:
+            if measure_memory:
+                tracemalloc.stop()
+            event.remove(session, "after_commit", count_commit)
+            websocket_manager.disconnect(execution.id, websocket)
+
+        failed_steps = sum(1 for step in execution.steps if step.status == "failed")
+        result = BenchmarkResult(
+            shape=shape,
+            step_count=len(definition["steps"]),
+            status=execution.status,
+            wall_time=wall_time,
+            db_commits=commits,
+            websocket_messages=websocket.message_count,
+            peak_memory_bytes=peak_memory,
+            failed_steps=failed_steps,
+            message_types=dict(websocket.message_types),
+        )
+
+    engine.dispose()
+    return result
+
+
+def _format_row(results: List[BenchmarkResult]) -> str:
+    first = results[0]
+    wall_times = [result.wall_time * 1000 for result in results]
+    peak = max(result.peak_memory_bytes for result in results) / 1024
+    return (
+        f"{first.shape:<8} {first.step_count:>6} "
+        f"{statistics.median(wall_times):>10.2f} {max(wall_times):>10.2f} "
+        f"{first.db_commits:>8} {first.websocket_messages:>8} {peak:>10.1f} "
+        f"{statistics.mean(result.failed_steps for result in results):>7.1f}"
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    spec = SyntheticPluginSpec(
+        latency=args.latency,
+        output_items=args.output_items,
+        item_size=args.item_size,
+        failure_rate=args.failure_rate,
+    )
+    shapes = list(HUNT_SHAPES) if args.shape == "all" else [args.shape]
+
+    print(
+        f"{'shape':<8} {'steps':>6} {'median ms':>10} {'max ms':>10} "
+        f"{'commits':>8} {'ws msgs':>8} {'peak KiB':>10} {'failed':>7}"
+    )
+    for shape in shapes:
+        results = [
+            await run_hunt_benchmark(
+                shape,
+                args.size,
+                spec,
+                seed=args.seed + run,
+                measure_memory=not args.no_memory,
+            )
+            for run in range(args.repeat)
+        ]
+        print(_format_row(results))
+        if args.verbose:
+            for result in results:
+                print(f"  {asdict(result)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark hunt orchestration")
+    parser.add_argument("--shape", choices=["all", *HUNT_SHAPES], default="all")
+    parser.add_argument("--size", type=int, default=20, help="Steps or branches")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per run")
+    parser.add_argument("--output-items", type=int, default=1)
+    parser.add_argument("--item-size", type=int, default=64, help="Bytes per item")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc")
+    parser.add_argument("--verbose", action="store_true")
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
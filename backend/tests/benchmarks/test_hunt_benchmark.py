@@ -0,0 +1,93 @@
+"""
+Smoke tests for the hunt benchmark harness
+
+These run tiny hunts so the suite stays fast, and pin the number of commits
+and WebSocket messages per execution so orchestration regressions show up.
+"""
+
+import pytest
+
+from tests.benchmarks.hunt_benchmark import (
+    HUNT_SHAPES,
+    SyntheticPluginSpec,
+    chain_hunt,
+    diamond_hunt,
+    fan_out_hunt,
+    run_hunt_benchmark,
+)
+
+
+class TestHuntShapes:
+    """Test the generated hunt DAGs"""
+
+    def test_chain_depends_on_previous_step(self):
+        steps = chain_hunt(3)["steps"]
+
+        assert [step["depends_on"] for step in steps] == [[], ["step_0"], ["step_1"]]
+        assert steps[2]["parameter_mapping"] == {"target": "step_1.results[0].value"}
+
+    def test_fan_out_branches_depend_on_root(self):
+        steps = fan_out_hunt(4)["steps"]
+
+        assert len(steps) == 5
+        assert all(step["depends_on"] == ["root"] for step in steps[1:])
+
+    def test_diamond_joins_all_branches(self):
+        steps = diamond_hunt(3)["steps"]
+
+        assert steps[-1]["step_id"] == "join"
+        assert steps[-1]["depends_on"] == ["branch_0", "branch_1", "branch_2"]
+
+
+class TestRunHuntBenchmark:
+    """Test measuring hunt executions"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("shape", list(HUNT_SHAPES))
+    async def test_shapes_complete(self, shape):
+        result = await run_hunt_benchmark(shape, 3, measure_memory=False)
+
+        assert result.status == "completed"
+        assert result.failed_steps == 0
+        assert result.wall_time > 0
+
+    @pytest.mark.asyncio
+    async def test_chain_counts(self):
+        result = await run_hunt_benchmark("chain", 4, measure_memory=False)
+
+        # Start, step records and finish, plus three commits per step
+        assert result.db_commits == 3 + 4 * 3
+        # Start, completion and progress per step, plus the final message
+        assert result.websocket_messages == 4 * 3 + 1
+        assert result.message_types == {
+            "progress": 8,
+            "step_complete": 4,
+            "complete": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_fan_out_counts(self):
+        result = await run_hunt_benchmark("fan_out", 5, measure_memory=False)
+
+        # The root and the branches run in two scheduling rounds
+        assert result.step_count == 6
+        assert result.db_commits == 3 + 6 * 2 + 2
+        assert result.websocket_messages == 6 * 2 + 2 + 1
+
+    @pytest.mark.asyncio
+    async def test_failures_mark_execution_partial(self):
+        spec = SyntheticPluginSpec(failure_rate=1.0)
+
+        result = await run_hunt_benchmark("diamond", 3, spec, measure_memory=False)
+
+        assert result.status == "partial"
+        assert result.failed_steps == 1
+        assert result.message_types["step_failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_measures_peak_memory(self):
+        spec = SyntheticPluginSpec(output_items=20, item_size=1024)
+
+        result = await run_hunt_benchmark("chain", 2, spec)
+
+        assert result.peak_memory_bytes > 20 * 1024
@@ -33,6 +33,8 @@ from app.core.security import (
 )
 from app.database import models
 from app.main import app
+from app.services.hunt_service import invalidate_hunt_definitions
+from app.services.system_config_service import invalidate_config_cache
 
 # Use an in-memory SQLite database for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
@@ -48,6 +50,14 @@ def engine_fixture():
     SQLModel.metadata.drop_all(engine)
 
 
+@pytest.fixture(autouse=True)
+def reset_hunt_sync():
+    """Each test gets a fresh database, so hunts must be synced into it again"""
+    invalidate_hunt_definitions()
+    invalidate_config_cache()
+    yield
+
+
 @pytest.fixture(name="session")
 def session_fixture(engine):
     connection = engine.connect()
@@ -0,0 +1,104 @@
+"""
+Tests for streaming evidence archives.
+"""
+
+import hashlib
+import io
+import tarfile
+import zipfile
+from datetime import datetime
+
+import pytest
+from app.core.archive import ArchiveEntry, ArchiveError, stream_archive
+
+MODIFIED = datetime(2024, 5, 1, 12, 30)
+
+
+def file_entry(path, chunks):
+    return ArchiveEntry(
+        path=path,
+        modified=MODIFIED,
+        size=sum(len(chunk) for chunk in chunks),
+        chunks=lambda: iter(chunks),
+    )
+
+
+def sample_entries():
+    return [
+        ArchiveEntry(path="case/Photos", modified=MODIFIED),
+        file_entry("case/Photos/notes.txt", [b"first part, ", b"second part"]),
+        file_entry("case/Photos/photo.png", [b"\x89PNG" + b"\x00" * 100]),
+    ]
+
+
+def test_zip_round_trip():
+    entries = sample_entries()
+
+    data = b"".join(stream_archive(iter(entries), "zip"))
+
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.testzip() is None
+    assert archive.namelist() == [
+        "case/Photos/",
+        "case/Photos/notes.txt",
+        "case/Photos/photo.png",
+    ]
+    assert archive.read("case/Photos/notes.txt") == b"first part, second part"
+    assert (
+        archive.getinfo("case/Photos/notes.txt").compress_type == zipfile.ZIP_DEFLATED
+    )
+    assert archive.getinfo("case/Photos/photo.png").compress_type == zipfile.ZIP_STORED
+    assert archive.getinfo("case/Photos/notes.txt").date_time == (2024, 5, 1, 12, 30, 0)
+
+
+def test_tar_round_trip():
+    entries = sample_entries()
+
+    data = b"".join(stream_archive(iter(entries), "tar"))
+
+    assert len(data) % tarfile.RECORDSIZE == 0
+    archive = tarfile.open(fileobj=io.BytesIO(data))
+    assert archive.getmember("case/Photos").isdir()
+    assert (
+        archive.extractfile("case/Photos/notes.txt").read()
+        == b"first part, second part"
+    )
+
+
+@pytest.mark.parametrize("archive_format", ["zip", "tar"])
+def test_entries_are_hashed_as_written(archive_format):
+    entries = sample_entries()
+    seen = []
+
+    def produce():
+        for entry in entries:
+            yield entry
+            # The archive has written the entry before asking for the next
+            seen.append(entry.sha256)
+
+    for _ in stream_archive(produce(), archive_format):
+        pass
+
+    assert seen == [
+        None,
+        hashlib.sha256(b"first part, second part").hexdigest(),
+        hashlib.sha256(b"\x89PNG" + b"\x00" * 100).hexdigest(),
+    ]
+
+
+def test_archive_is_streamed_per_chunk():
+    chunks = [bytes([n]) * 1024 for n in range(8)]
+    entry = file_entry("case/big.bin", chunks)
+
+    pieces = list(stream_archive(iter([entry]), "tar"))
+
+    assert max(len(piece) for piece in pieces) < tarfile.RECORDSIZE
+
+
+def test_tar_rejects_a_file_of_the_wrong_size():
+    entry = ArchiveEntry(
+        path="case/short.txt", modified=MODIFIED, size=10, chunks=lambda: [b"abc"]
+    )
+
+    with pytest.raises(ArchiveError):
+        b"".join(stream_archive(iter([entry]), "tar"))
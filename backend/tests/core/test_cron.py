@@ -0,0 +1,81 @@
+"""
+Tests for cron expression parsing
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from app.core.cron import CronSchedule
+
+START = datetime(2025, 1, 15, 10, 30, 45, tzinfo=timezone.utc)  # A Wednesday
+
+
+class TestCronSchedule:
+    """Test parsing cron expressions and computing run times"""
+
+    def test_every_minute(self):
+        assert CronSchedule("* * * * *").next_run(START) == datetime(
+            2025, 1, 15, 10, 31, tzinfo=timezone.utc
+        )
+
+    def test_daily_at_time(self):
+        schedule = CronSchedule("0 6 * * *")
+
+        assert schedule.next_run(START) == datetime(
+            2025, 1, 16, 6, 0, tzinfo=timezone.utc
+        )
+
+    def test_next_run_is_strictly_after(self):
+        schedule = CronSchedule("30 10 * * *")
+
+        assert schedule.next_run(START) == datetime(
+            2025, 1, 16, 10, 30, tzinfo=timezone.utc
+        )
+
+    def test_steps_lists_and_ranges(self):
+        assert CronSchedule("*/15 * * * *").next_run(START).minute == 45
+        assert CronSchedule("5,50 * * * *").next_run(START).minute == 50
+        assert CronSchedule("0 9-17/4 * * *").next_run(START).hour == 13
+
+    def test_aliases(self):
+        assert CronSchedule("@daily").next_run(START) == datetime(
+            2025, 1, 16, 0, 0, tzinfo=timezone.utc
+        )
+        assert CronSchedule("@monthly").next_run(START) == datetime(
+            2025, 2, 1, 0, 0, tzinfo=timezone.utc
+        )
+
+    def test_weekday_uses_sunday_as_zero(self):
+        assert CronSchedule("0 0 * * 0").next_run(START).day == 19
+        assert CronSchedule("0 0 * * 7").next_run(START).day == 19
+        assert CronSchedule("0 0 * * 1-5").next_run(START).day == 16
+
+    def test_day_of_month_or_weekday(self):
+        # Either the 1st of the month or a Friday, whichever comes first
+        assert CronSchedule("0 0 1 * 5").next_run(START).day == 17
+
+    def test_month_rollover(self):
+        assert CronSchedule("0 0 1 3 *").next_run(START) == datetime(
+            2025, 3, 1, 0, 0, tzinfo=timezone.utc
+        )
+        assert CronSchedule("0 0 1 1 *").next_run(START).year == 2026
+
+    @pytest.mark.parametrize(
+        "expression",
+        [
+            "",
+            "* * * *",
+            "60 * * * *",
+            "* 24 * * *",
+            "*/0 * * * *",
+            "a * * * *",
+            "5-1 * * * *",
+        ],
+    )
+    def test_invalid_expressions(self, expression):
+        with pytest.raises(ValueError):
+            CronSchedule(expression)
+
+    def test_never_matching_expression(self):
+        with pytest.raises(ValueError, match="never matches"):
+            CronSchedule("0 0 31 2 *").next_run(START)
@@ -0,0 +1,106 @@
+"""
+Tests for image thumbnails and previews.
+"""
+
+import hashlib
+import io
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from app.core import derivatives
+from app.core.derivatives import (
+    DerivativeError,
+    delete_derivatives,
+    derivative_key,
+    get_derivative,
+    supports_derivatives,
+)
+from app.core.file_storage import blob_key
+from PIL import Image
+
+
+@pytest.fixture
+def upload_dir(tmp_path):
+    # Render in a thread rather than a worker process to keep the tests light
+    with patch("app.core.file_storage.UPLOAD_DIR", tmp_path), patch(
+        "app.core.derivatives._get_executor", return_value=None
+    ):
+        yield tmp_path
+
+
+def store_image(upload_dir, size=(1000, 500), image_format="PNG"):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 30, 30)).save(buffer, format=image_format)
+    content = buffer.getvalue()
+    file_hash = hashlib.sha256(content).hexdigest()
+
+    path = upload_dir / blob_key(file_hash)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(content)
+    return SimpleNamespace(id=1, file_hash=file_hash, content="case_1/photo.png")
+
+
+class TestDerivatives:
+    """Test rendering and storing downscaled images."""
+
+    @pytest.mark.asyncio
+    async def test_thumbnail_is_rendered_and_stored(self, upload_dir):
+        evidence = store_image(upload_dir)
+
+        storage, key, _ = await get_derivative(evidence, "thumbnail")
+
+        assert key == derivative_key(evidence.file_hash, "thumbnail")
+        with Image.open(io.BytesIO(storage.read_bytes(key))) as image:
+            assert image.format == "WEBP"
+            assert image.size == (256, 128)
+
+    @pytest.mark.asyncio
+    async def test_stored_derivative_is_reused(self, upload_dir):
+        evidence = store_image(upload_dir)
+        await get_derivative(evidence, "preview")
+
+        with patch.object(derivatives, "render_derivative") as render:
+            await get_derivative(evidence, "preview")
+
+        render.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_small_images_are_not_upscaled(self, upload_dir):
+        evidence = store_image(upload_dir, size=(100, 80))
+
+        storage, key, _ = await get_derivative(evidence, "preview")
+
+        with Image.open(io.BytesIO(storage.read_bytes(key))) as image:
+            assert image.size == (100, 80)
+
+    @pytest.mark.asyncio
+    async def test_undecodable_image(self, upload_dir):
+        evidence = store_image(upload_dir)
+        (upload_dir / blob_key(evidence.file_hash)).write_bytes(b"not an image")
+
+        with pytest.raises(DerivativeError):
+            await get_derivative(evidence, "thumbnail")
+
+    @pytest.mark.asyncio
+    async def test_missing_original(self, upload_dir):
+        evidence = SimpleNamespace(id=1, file_hash="a" * 64, content="case_1/gone.png")
+
+        with pytest.raises(FileNotFoundError):
+            await get_derivative(evidence, "thumbnail")
+
+    @pytest.mark.asyncio
+    async def test_delete_derivatives(self, upload_dir):
+        evidence = store_image(upload_dir)
+        storage, key, _ = await get_derivative(evidence, "thumbnail")
+
+        delete_derivatives(evidence.file_hash)
+
+        assert not storage.exists(key)
+        assert not (upload_dir / "derivatives").exists()
+
+
+def test_supports_derivatives():
+    assert supports_derivatives("case_1/photo.JPG")
+    assert not supports_derivatives("case_1/logo.svg")
+    assert not supports_derivatives("case_1/report.pdf")
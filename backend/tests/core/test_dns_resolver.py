@@ -0,0 +1,253 @@
+"""
+Tests for the shared cached DNS resolver
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import dns.name
+import dns.resolver
+import pytest
+from app.core.dns_resolver import DnsResolver
+
+
+def make_answer(records, ttl=300):
+    """Create a fake dnspython answer"""
+    answer = MagicMock()
+    answer.rrset.ttl = ttl
+    rdatas = []
+    for record in records:
+        rdata = MagicMock()
+        rdata.to_text.return_value = record
+        rdatas.append(rdata)
+    answer.__iter__.return_value = iter(rdatas)
+    return answer
+
+
+@pytest.fixture
+def mock_resolver_class():
+    """Patch dnspython's async resolver"""
+    with patch("dns.asyncresolver.Resolver") as resolver_class:
+        instance = MagicMock()
+        instance.resolve = AsyncMock()
+        resolver_class.return_value = instance
+        yield resolver_class
+
+
+class TestDnsResolver:
+    """Test cases for DnsResolver"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_served_from_cache(self, mock_resolver_class):
+        resolver = DnsResolver(default_nameservers=[])
+        answer = make_answer(["93.184.216.34"])
+        mock_resolver_class.return_value.resolve.return_value = answer
+
+        first = await resolver.resolve("Example.com", "A")
+        second = await resolver.resolve("example.com.", "A")
+
+        assert first is answer
+        assert second is answer
+        assert mock_resolver_class.return_value.resolve.await_count == 1
+        stats = resolver.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_record_types_cached_separately(self, mock_resolver_class):
+        resolver = DnsResolver(default_nameservers=[])
+        mock_resolver_class.return_value.resolve.return_value = make_answer(["x"])
+
+        await resolver.resolve("example.com", "A")
+        await resolver.resolve("example.com", "MX")
+
+        assert mock_resolver_class.return_value.resolve.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_zero_ttl_not_cached(self, mock_resolver_class):
+        resolver = DnsResolver(default_nameservers=[])
+        mock_resolver_class.return_value.resolve.return_value = make_answer(
+            ["x"], ttl=0
+        )
+
+        await resolver.resolve("example.com", "A")
+        await resolver.resolve("example.com", "A")
+
+        assert mock_resolver_class.return_value.resolve.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_nxdomain_negative_cached(self, mock_resolver_class):
+        resolver = DnsResolver(default_nameservers=[], negative_ttl=60)
+        mock_resolver_class.return_value.resolve.side_effect = dns.resolver.NXDOMAIN()
+
+        with pytest.raises(dns.resolver.NXDOMAIN):
+            await resolver.resolve("missing.example.com", "A")
+        with pytest.raises(dns.resolver.NXDOMAIN):
+            await resolver.resolve("missing.example.com", "A")
+
+        assert mock_resolver_class.return_value.resolve.await_count == 1
+        assert resolver.get_stats()["negative_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeouts_not_cached(self, mock_resolver_class):
+        resolver = DnsResolver(default_nameservers=[])
+        mock_resolver_class.return_value.resolve.side_effect = (
+            dns.resolver.LifetimeTimeout(timeout=1.0, errors=[])
+        )
+
+        for _ in range(2):
+            with pytest.raises(dns.exception.Timeout):
+                await resolver.resolve("slow.example.com", "A")
+
+        assert mock_resolver_class.return_value.resolve.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_negative_hits_raise_fresh_exceptions(self, mock_resolver_class):
+        resolver = DnsResolver(default_nameservers=[], negative_ttl=60)
+        qname = dns.name.from_text("missing.example.com")
+        mock_resolver_class.return_value.resolve.side_effect = dns.resolver.NXDOMAIN(
+            qnames=[qname]
+        )
+
+        errors = []
+        for _ in range(2):
+            with pytest.raises(dns.resolver.NXDOMAIN) as exc_info:
+                await resolver.resolve("missing.example.com", "A")
+            errors.append(exc_info.value)
+
+        assert errors[0] is not errors[1]
+        assert errors[1].qnames() == [qname]
+        assert str(errors[1]) == str(errors[0])
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_query(self, mock_resolver_class):
+        resolver = DnsResolver(default_nameservers=[])
+        answer = make_answer(["93.184.216.34"])
+        release = asyncio.Event()
+
+        async def slow_resolve(qname, rdtype, lifetime=None):
+            await release.wait()
+            return answer
+
+        mock_resolver_class.return_value.resolve.side_effect = slow_resolve
+
+        lookups = asyncio.gather(
+            *(resolver.resolve("example.com", "A") for _ in range(5))
+        )
+        await asyncio.sleep(0)
+        release.set()
+        results = await lookups
+
+        assert all(result is answer for result in results)
+        assert mock_resolver_class.return_value.resolve.await_count == 1
+        stats = resolver.get_stats()
+        assert stats["misses"] == 1
+        assert stats["coalesced"] == 4
+
+    @pytest.mark.asyncio
+    async def test_concurrent_failures_raise_separate_exceptions(
+        self, mock_resolver_class
+    ):
+        resolver = DnsResolver(default_nameservers=[])
+        release = asyncio.Event()
+
+        async def slow_timeout(qname, rdtype, lifetime=None):
+            await release.wait()
+            raise dns.resolver.LifetimeTimeout(timeout=1.0, errors=[])
+
+        mock_resolver_class.return_value.resolve.side_effect = slow_timeout
+
+        lookups = asyncio.gather(
+            *(resolver.resolve("slow.example.com", "A") for _ in range(3)),
+            return_exceptions=True,
+        )
+        await asyncio.sleep(0)
+        release.set()
+        errors = await lookups
+
+        assert all(isinstance(error, dns.exception.Timeout) for error in errors)
+        assert len({id(error) for error in errors}) == 3
+        assert mock_resolver_class.return_value.resolve.await_count == 1
+        # Timeouts are shared while in flight but still not cached
+        assert resolver.get_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_query_lets_waiters_retry(self, mock_resolver_class):
+        resolver = DnsResolver(default_nameservers=[])
+        answer = make_answer(["x"])
+        first_call = asyncio.Event()
+        calls = []
+
+        async def fake_resolve(qname, rdtype, lifetime=None):
+            calls.append(qname)
+            if len(calls) == 1:
+                first_call.set()
+                await asyncio.Event().wait()
+            return answer
+
+        mock_resolver_class.return_value.resolve.side_effect = fake_resolve
+
+        leader = asyncio.create_task(resolver.resolve("example.com", "A"))
+        await first_call.wait()
+        follower = asyncio.create_task(resolver.resolve("example.com", "A"))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower is answer
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, mock_resolver_class):
+        resolver = DnsResolver(default_nameservers=[], max_entries=2)
+        mock_resolver_class.return_value.resolve.return_value = make_answer(["x"])
+
+        await resolver.resolve("a.example.com", "A")
+        await resolver.resolve("b.example.com", "A")
+        await resolver.resolve("a.example.com", "A")
+        await resolver.resolve("c.example.com", "A")
+
+        stats = resolver.get_stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+
+        # "b" was least recently used and has been evicted
+        await resolver.resolve("b.example.com", "A")
+        assert mock_resolver_class.return_value.resolve.await_count == 4
+
+    @pytest.mark.asyncio
+    async def test_custom_nameservers_use_separate_resolver(self, mock_resolver_class):
+        resolver = DnsResolver(default_nameservers=[])
+        mock_resolver_class.return_value.resolve.return_value = make_answer(["x"])
+
+        await resolver.resolve("example.com", "A")
+        await resolver.resolve("example.com", "A", nameservers=["8.8.8.8"])
+
+        assert mock_resolver_class.call_count == 2
+        assert mock_resolver_class.return_value.nameservers == ["8.8.8.8"]
+        assert mock_resolver_class.return_value.resolve.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_resolve_ips_skips_failed_record_types(self, mock_resolver_class):
+        resolver = DnsResolver(default_nameservers=[])
+
+        async def fake_resolve(qname, rdtype, lifetime=None):
+            if dns.rdatatype.to_text(rdtype) == "AAAA":
+                raise dns.resolver.NoAnswer()
+            return make_answer(["93.184.216.34"])
+
+        mock_resolver_class.return_value.resolve.side_effect = fake_resolve
+
+        ips = await resolver.resolve_ips("example.com")
+
+        assert ips == ["93.184.216.34"]
+
+    def test_clear_resets_cache_and_stats(self):
+        resolver = DnsResolver(default_nameservers=[])
+        resolver._store(("example.com", "A", ()), make_answer(["x"]), 60)
+        resolver._stats["hits"] = 3
+
+        resolver.clear()
+
+        assert resolver.get_stats()["entries"] == 0
+        assert resolver.get_stats()["hits"] == 0
@@ -0,0 +1,153 @@
+"""
+Tests for conditional and ranged responses for stored evidence files.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from app.core.file_responses import (
+    RangeNotSatisfiable,
+    parse_range,
+    stored_file_response,
+)
+from app.core.storage import LocalStorageBackend
+
+CONTENT = b"0123456789"
+FILE_HASH = "a" * 64
+UPLOADED_AT = datetime(2025, 3, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def storage(tmp_path):
+    (tmp_path / "object").write_bytes(CONTENT)
+    return LocalStorageBackend(tmp_path)
+
+
+def respond(storage, headers=None, file_hash=FILE_HASH):
+    return stored_file_response(
+        headers,
+        storage,
+        "object",
+        media_type="video/mp4",
+        file_hash=file_hash,
+        last_modified=UPLOADED_AT,
+    )
+
+
+async def read_body(response):
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+class TestParseRange:
+    """Test Range header parsing."""
+
+    @pytest.mark.parametrize(
+        "header, expected",
+        [
+            ("bytes=0-4", (0, 5)),
+            ("bytes=5-", (5, 10)),
+            ("bytes=-3", (7, 10)),
+            ("bytes=-30", (0, 10)),
+            ("bytes=8-100", (8, 10)),
+            ("bytes=0-1,4-5", None),
+            ("items=0-4", None),
+            ("bytes=4-2", None),
+            ("bytes=abc", None),
+        ],
+    )
+    def test_parse_range(self, header, expected):
+        assert parse_range(header, 10) == expected
+
+    @pytest.mark.parametrize("header", ["bytes=10-", "bytes=-0"])
+    def test_unsatisfiable_range(self, header):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range(header, 10)
+
+
+class TestStoredFileResponse:
+    """Test serving stored files over HTTP."""
+
+    @pytest.mark.asyncio
+    async def test_full_response_is_cacheable(self, storage):
+        response = respond(storage)
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == f'"{FILE_HASH}"'
+        assert response.headers["accept-ranges"] == "bytes"
+        assert "immutable" in response.headers["cache-control"]
+        assert response.headers["last-modified"] == "Sat, 01 Mar 2025 12:00:00 GMT"
+        assert await read_body(response) == CONTENT
+
+    @pytest.mark.asyncio
+    async def test_range_returns_partial_content(self, storage):
+        response = respond(storage, {"Range": "bytes=2-5"})
+
+        assert response.status_code == 206
+        assert response.headers["content-range"] == "bytes 2-5/10"
+        assert response.headers["content-length"] == "4"
+        assert await read_body(response) == b"2345"
+
+    def test_unsatisfiable_range(self, storage):
+        response = respond(storage, {"Range": "bytes=20-"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == "bytes */10"
+
+    @pytest.mark.asyncio
+    async def test_stale_if_range_serves_whole_file(self, storage):
+        response = respond(
+            storage, {"Range": "bytes=2-5", "If-Range": '"' + "b" * 64 + '"'}
+        )
+
+        assert response.status_code == 200
+        assert await read_body(response) == CONTENT
+
+    def test_matching_if_range_serves_range(self, storage):
+        response = respond(
+            storage, {"Range": "bytes=2-5", "If-Range": f'"{FILE_HASH}"'}
+        )
+
+        assert response.status_code == 206
+
+    @pytest.mark.parametrize(
+        "if_none_match",
+        [f'"{FILE_HASH}"', f'W/"{FILE_HASH}"', f'"other", "{FILE_HASH}"', "*"],
+    )
+    def test_if_none_match_returns_not_modified(self, storage, if_none_match):
+        response = respond(storage, {"If-None-Match": if_none_match})
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == f'"{FILE_HASH}"'
+
+    def test_if_none_match_mismatch_serves_file(self, storage):
+        response = respond(storage, {"If-None-Match": '"other"'})
+
+        assert response.status_code == 200
+
+    def test_if_modified_since(self, storage):
+        not_modified = respond(
+            storage, {"If-Modified-Since": "Sat, 01 Mar 2025 12:00:00 GMT"}
+        )
+        modified = respond(
+            storage, {"If-Modified-Since": "Fri, 28 Feb 2025 12:00:00 GMT"}
+        )
+
+        assert not_modified.status_code == 304
+        assert modified.status_code == 200
+
+    def test_if_none_match_takes_precedence(self, storage):
+        response = respond(
+            storage,
+            {
+                "If-None-Match": '"other"',
+                "If-Modified-Since": "Sat, 01 Mar 2025 12:00:00 GMT",
+            },
+        )
+
+        assert response.status_code == 200
+
+    def test_without_hash_content_is_revalidated(self, storage):
+        response = respond(storage, file_hash=None)
+
+        assert "etag" not in response.headers
+        assert response.headers["cache-control"] == "private, no-cache"
@@ -28,7 +28,8 @@ def sample_upload_file():
 
     mock_file = Mock(spec=UploadFile)
     mock_file.filename = "test_file.txt"
-    mock_file.read = AsyncMock(return_value=b"test content")
+    mock_file.content_type = "text/plain"
+    mock_file.read = AsyncMock(side_effect=[b"test content", b""])
     return mock_file
 
 
@@ -279,13 +280,7 @@ class TestSaveUploadFile:
         self, temp_upload_dir, case_id, sample_upload_file
     ):
         """Test saving upload file with valid case ID."""
-        with patch(
-            "app.core.file_storage.validate_file_security"
-        ) as mock_validate, patch(
-            "app.core.file_storage.secure_filename_with_path"
-        ) as mock_secure:
-
-            mock_validate.return_value = None  # No exception
+        with patch("app.core.file_storage.secure_filename_with_path") as mock_secure:
             mock_secure.return_value = "test_file.txt"
 
             result = await file_storage.save_upload_file(sample_upload_file, case_id)
@@ -294,23 +289,17 @@ class TestSaveUploadFile:
             assert relative_path == f"{case_id}/test_file.txt"
             assert file_hash == hashlib.sha256(b"test content").hexdigest()
 
-            # Verify file was created
-            file_path = temp_upload_dir / relative_path
-            assert file_path.exists()
+            # The bytes are stored by content, not at the logical path
+            file_path = temp_upload_dir / file_storage.blob_key(file_hash)
             assert file_path.read_bytes() == b"test content"
+            assert not (temp_upload_dir / relative_path).exists()
 
     @pytest.mark.asyncio
     async def test_save_upload_file_with_folder_path(
         self, temp_upload_dir, case_id, sample_upload_file
     ):
         """Test saving upload file with folder path."""
-        with patch(
-            "app.core.file_storage.validate_file_security"
-        ) as mock_validate, patch(
-            "app.core.file_storage.secure_filename_with_path"
-        ) as mock_secure:
-
-            mock_validate.return_value = None
+        with patch("app.core.file_storage.secure_filename_with_path") as mock_secure:
             mock_secure.return_value = "test_file.txt"
             folder_path = "evidence/documents"
 
@@ -321,9 +310,8 @@ class TestSaveUploadFile:
             relative_path, file_hash = result
             assert relative_path == f"{case_id}/evidence/documents/test_file.txt"
 
-            # Verify file was created in correct location
-            file_path = temp_upload_dir / relative_path
-            assert file_path.exists()
+            # Verify the content was stored
+            assert (temp_upload_dir / file_storage.blob_key(file_hash)).exists()
 
     @pytest.mark.asyncio
     async def test_save_upload_file_none_case_id(
@@ -361,7 +349,7 @@ class TestSaveUploadFile:
         self, temp_upload_dir, case_id, sample_upload_file
     ):
         """Test that file validation failure is propagated."""
-        with patch("app.core.file_storage.validate_file_security") as mock_validate:
+        with patch("app.core.file_storage.FileSecurityValidator") as mock_validate:
             mock_validate.side_effect = HTTPException(
                 status_code=400, detail="File not allowed"
             )
@@ -377,13 +365,7 @@ class TestSaveUploadFile:
         self, temp_upload_dir, case_id, sample_upload_file
     ):
         """Test that generic exceptions are handled properly."""
-        with patch(
-            "app.core.file_storage.validate_file_security"
-        ) as mock_validate, patch(
-            "app.core.file_storage.secure_filename_with_path"
-        ) as mock_secure:
-
-            mock_validate.return_value = None
+        with patch("app.core.file_storage.secure_filename_with_path") as mock_secure:
             mock_secure.side_effect = Exception("Unexpected error")
 
             with pytest.raises(HTTPException) as exc_info:
@@ -393,6 +375,185 @@ class TestSaveUploadFile:
             assert "Could not save file" in exc_info.value.detail
 
 
+    @pytest.mark.asyncio
+    async def test_save_upload_file_streams_chunks(self, temp_upload_dir, case_id):
+        """Test a multi-chunk upload is hashed and written in one pass."""
+        from unittest.mock import AsyncMock
+
+        chunks = [b"a" * 1000, "é".encode()[:1], "é".encode()[1:] + b"end"]
+        upload = Mock(spec=UploadFile)
+        upload.filename = "notes.txt"
+        upload.content_type = "text/plain"
+        upload.read = AsyncMock(side_effect=chunks + [b""])
+
+        relative_path, file_hash = await file_storage.save_upload_file(
+            upload, case_id
+        )
+
+        content = b"".join(chunks)
+        assert file_hash == hashlib.sha256(content).hexdigest()
+        assert (temp_upload_dir / file_storage.blob_key(file_hash)).read_bytes() == content
+        assert upload.read.await_count == len(chunks) + 1
+
+    @pytest.mark.asyncio
+    async def test_save_upload_file_rejected_leaves_no_file(
+        self, temp_upload_dir, case_id
+    ):
+        """Test a rejected upload leaves neither the file nor a partial temp file."""
+        from unittest.mock import AsyncMock
+
+        upload = Mock(spec=UploadFile)
+        upload.filename = "payload.txt"
+        upload.content_type = "text/plain"
+        upload.read = AsyncMock(side_effect=[b"\xff\xfe\x00binary", b""])
+
+        with pytest.raises(HTTPException) as exc_info:
+            await file_storage.save_upload_file(upload, case_id, "docs")
+
+        assert exc_info.value.detail == "File type not allowed"
+        assert not (temp_upload_dir / str(case_id) / "docs").exists()
+        assert not any((temp_upload_dir / "blobs" / ".tmp").iterdir())
+
+    @pytest.mark.asyncio
+    async def test_save_upload_file_stops_reading_when_too_large(
+        self, temp_upload_dir, case_id
+    ):
+        """Test oversized uploads are rejected without reading the rest."""
+        from unittest.mock import AsyncMock
+
+        from app.core.security import MAX_FILE_SIZE, UPLOAD_CHUNK_SIZE
+
+        chunk_count = MAX_FILE_SIZE // UPLOAD_CHUNK_SIZE + 5
+        upload = Mock(spec=UploadFile)
+        upload.filename = "big.txt"
+        upload.content_type = "text/plain"
+        upload.read = AsyncMock(
+            side_effect=[b"a" * UPLOAD_CHUNK_SIZE] * chunk_count + [b""]
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await file_storage.save_upload_file(upload, case_id)
+
+        assert "File too large" in exc_info.value.detail
+        assert upload.read.await_count < chunk_count
+        assert not any((temp_upload_dir / str(case_id)).glob("*"))
+
+
+class TestFileSecurityValidator:
+    """Test incremental upload validation."""
+
+    def test_detects_type_from_leading_bytes(self):
+        from app.core.security import FileSecurityValidator
+
+        png_header = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+        validator = FileSecurityValidator("image.png", "image/png")
+        validator.update(png_header)
+        validator.update(b"\xff" * 10000)
+        validator.finish()
+
+    def test_rejects_disallowed_type_early(self):
+        from app.core.security import FILETYPE_HEAD_SIZE, FileSecurityValidator
+
+        validator = FileSecurityValidator("tool.exe", "application/octet-stream")
+        with pytest.raises(HTTPException) as exc_info:
+            validator.update(b"MZ" + b"\x00" * FILETYPE_HEAD_SIZE)
+
+        assert exc_info.value.detail == "File type not allowed"
+
+    def test_requires_filename(self):
+        from app.core.security import FileSecurityValidator
+
+        with pytest.raises(HTTPException) as exc_info:
+            FileSecurityValidator("", "text/plain")
+
+        assert exc_info.value.detail == "No file name provided"
+
+
+class TestBlobStore:
+    """Test content-addressed file storage."""
+
+    @pytest.mark.asyncio
+    async def test_identical_uploads_share_one_blob(self, temp_upload_dir, case_id):
+        """Test the same content uploaded twice is stored once."""
+        from unittest.mock import AsyncMock
+
+        paths = []
+        for folder in ("a", "b"):
+            upload = Mock(spec=UploadFile)
+            upload.filename = "report.txt"
+            upload.content_type = "text/plain"
+            upload.read = AsyncMock(side_effect=[b"same content", b""])
+            paths.append(
+                await file_storage.save_upload_file(upload, case_id, folder)
+            )
+
+        (path_a, hash_a), (path_b, hash_b) = paths
+        assert path_a == f"{case_id}/a/report.txt"
+        assert path_b == f"{case_id}/b/report.txt"
+        assert hash_a == hash_b
+        blobs = [p for p in (temp_upload_dir / "blobs").rglob("*") if p.is_file()]
+        assert blobs == [temp_upload_dir / file_storage.blob_key(hash_a)]
+
+    def test_logical_file_path_avoids_taken_names(self, temp_upload_dir, case_id):
+        """Test duplicate names get a counter, as on-disk names did."""
+        taken = {f"{case_id}/docs/report.txt", f"{case_id}/docs/report_1.txt"}
+
+        result = file_storage.logical_file_path(case_id, "docs", "report.txt", taken)
+
+        assert result == f"{case_id}/docs/report_2.txt"
+
+    def test_blob_key_rejects_invalid_hash(self, temp_upload_dir):
+        """Test a hash cannot be used to address paths outside the store."""
+        with pytest.raises(HTTPException) as exc_info:
+            file_storage.blob_key("../" + "a" * 61)
+
+        assert exc_info.value.status_code == 400
+
+    def test_delete_blob_prunes_empty_directories(self, temp_upload_dir):
+        """Test deleting a blob removes its fan-out directories."""
+        file_hash = hashlib.sha256(b"data").hexdigest()
+        temp_path = temp_upload_dir / "data.part"
+        temp_path.write_bytes(b"data")
+        assert file_storage.store_blob(temp_path, file_hash)
+
+        file_storage.delete_blob(file_hash)
+
+        assert not (temp_upload_dir / "blobs" / file_hash[:2]).exists()
+
+    def test_evidence_file_location_falls_back_to_legacy_path(self, temp_upload_dir):
+        """Test files stored before the blob store are still found."""
+        legacy = temp_upload_dir / "1" / "old.txt"
+        legacy.parent.mkdir()
+        legacy.write_bytes(b"old")
+        evidence = Mock(
+            content="1/old.txt", file_hash=hashlib.sha256(b"old").hexdigest()
+        )
+
+        storage, key, info = file_storage.evidence_file_location(evidence)
+        assert storage.local_path(key) == legacy
+        assert info.size == 3
+
+    def test_evidence_file_location_reports_missing_file(self, temp_upload_dir):
+        """Test a missing file is reported by the location lookup itself."""
+        evidence = Mock(content="1/gone.txt", file_hash="a" * 64)
+
+        location = file_storage.evidence_file_location(evidence)
+        assert location.info is None
+
+    @pytest.mark.asyncio
+    async def test_named_evidence_file_keeps_extension(self, temp_upload_dir):
+        """Test blobs can be opened under their original file name."""
+        file_hash = hashlib.sha256(b"image").hexdigest()
+        temp_path = temp_upload_dir / "image.part"
+        temp_path.write_bytes(b"image")
+        file_storage.store_blob(temp_path, file_hash)
+        evidence = Mock(content="1/photos/shot.jpg", file_hash=file_hash)
+
+        async with file_storage.named_evidence_file(evidence) as path:
+            assert path.name == "shot.jpg"
+            assert path.read_bytes() == b"image"
+
+
 class TestDeleteFile:
     """Test the delete_file function with security focus."""
 
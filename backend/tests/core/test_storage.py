@@ -0,0 +1,173 @@
+"""
+Tests for the evidence storage backends.
+"""
+
+import io
+from unittest.mock import Mock, patch
+
+import pytest
+from app.core import file_storage
+from app.core.config import storage_settings
+from app.core.storage import (
+    LocalStorageBackend,
+    ObjectInfo,
+    S3StorageBackend,
+    content_disposition,
+)
+
+
+class NotFound(Exception):
+    response = {"Error": {"Code": "404"}}
+
+
+class FakeBody(io.BytesIO):
+    def iter_chunks(self, chunk_size):
+        while chunk := self.read(chunk_size):
+            yield chunk
+
+
+@pytest.fixture
+def local_backend(tmp_path):
+    return LocalStorageBackend(tmp_path)
+
+
+@pytest.fixture
+def s3_client():
+    return Mock()
+
+
+@pytest.fixture
+def s3_backend(s3_client):
+    return S3StorageBackend(bucket="evidence", prefix="owlculus", client=s3_client)
+
+
+class TestLocalStorageBackend:
+    """Test storing objects on the local filesystem."""
+
+    def test_put_and_read(self, local_backend, tmp_path):
+        source = tmp_path / "incoming.part"
+        source.write_bytes(b"0123456789")
+
+        local_backend.put_file(source, "blobs/ab/cd/object")
+
+        assert not source.exists()
+        assert local_backend.exists("blobs/ab/cd/object")
+        assert local_backend.size("blobs/ab/cd/object") == 10
+        assert local_backend.read_bytes("blobs/ab/cd/object") == b"0123456789"
+
+    def test_ranged_read(self, local_backend, tmp_path):
+        (tmp_path / "object").write_bytes(b"0123456789")
+
+        assert b"".join(local_backend.open_read("object", 2, 5)) == b"234"
+        assert b"".join(local_backend.open_read("object", 7)) == b"789"
+        assert b"".join(local_backend.open_read("object", 4, 4)) == b""
+
+    def test_missing_object(self, local_backend):
+        assert not local_backend.exists("missing")
+        with pytest.raises(FileNotFoundError):
+            local_backend.open_read("missing")
+
+    def test_delete_prunes_empty_directories(self, local_backend, tmp_path):
+        source = tmp_path / "incoming.part"
+        source.write_bytes(b"data")
+        local_backend.put_file(source, "blobs/ab/cd/object")
+
+        local_backend.delete("blobs/ab/cd/object")
+        local_backend.delete("blobs/ab/cd/object")
+
+        assert not (tmp_path / "blobs").exists()
+
+    def test_rejects_keys_outside_root(self, local_backend):
+        with pytest.raises(ValueError):
+            local_backend.exists("../outside")
+
+
+class TestS3StorageBackend:
+    """Test storing objects in an S3-compatible bucket."""
+
+    def test_ranged_read_uses_range_header(self, s3_backend, s3_client):
+        s3_client.get_object.return_value = {"Body": FakeBody(b"234")}
+
+        data = b"".join(s3_backend.open_read("blobs/object", 2, 5))
+
+        assert data == b"234"
+        s3_client.get_object.assert_called_once_with(
+            Bucket="evidence", Key="owlculus/blobs/object", Range="bytes=2-4"
+        )
+
+    def test_full_read_has_no_range(self, s3_backend, s3_client):
+        s3_client.get_object.return_value = {"Body": FakeBody(b"data")}
+
+        assert s3_backend.read_bytes("blobs/object") == b"data"
+        s3_client.get_object.assert_called_once_with(
+            Bucket="evidence", Key="owlculus/blobs/object"
+        )
+
+    def test_missing_object(self, s3_backend, s3_client):
+        s3_client.head_object.side_effect = NotFound()
+        s3_client.get_object.side_effect = NotFound()
+
+        assert not s3_backend.exists("blobs/object")
+        with pytest.raises(FileNotFoundError):
+            s3_backend.size("blobs/object")
+        with pytest.raises(FileNotFoundError):
+            s3_backend.open_read("blobs/object")
+
+    def test_stat_reads_size_and_etag_from_one_head(self, s3_backend, s3_client):
+        s3_client.head_object.return_value = {"ContentLength": 10, "ETag": '"abc"'}
+
+        info = s3_backend.stat("blobs/object")
+
+        assert info == ObjectInfo(size=10, etag="abc")
+        s3_client.head_object.assert_called_once_with(
+            Bucket="evidence", Key="owlculus/blobs/object"
+        )
+
+    def test_put_file_uploads_and_consumes(self, s3_backend, s3_client, tmp_path):
+        source = tmp_path / "incoming.part"
+        source.write_bytes(b"data")
+
+        s3_backend.put_file(source, "blobs/object")
+
+        s3_client.upload_file.assert_called_once_with(
+            str(source), "evidence", "owlculus/blobs/object"
+        )
+        assert not source.exists()
+
+    def test_presigned_url_names_the_file(self, s3_backend, s3_client):
+        s3_client.generate_presigned_url.return_value = "https://minio/signed"
+
+        url = s3_backend.presigned_url("blobs/object", "report 1.pdf", 60)
+
+        assert url == "https://minio/signed"
+        s3_client.generate_presigned_url.assert_called_once_with(
+            "get_object",
+            Params={
+                "Bucket": "evidence",
+                "Key": "owlculus/blobs/object",
+                "ResponseContentDisposition": content_disposition("report 1.pdf"),
+            },
+            ExpiresIn=60,
+        )
+
+    def test_blob_store_uses_configured_backend(self, s3_backend, s3_client, tmp_path):
+        file_hash = "a" * 64
+        source = tmp_path / "incoming.part"
+        source.write_bytes(b"data")
+        s3_client.head_object.side_effect = NotFound()
+
+        with patch.object(storage_settings, "STORAGE_BACKEND", "s3"), patch(
+            "app.core.file_storage.get_s3_backend", return_value=s3_backend
+        ):
+            assert file_storage.store_blob(source, file_hash)
+
+        s3_client.upload_file.assert_called_once_with(
+            str(source), "evidence", f"owlculus/blobs/aa/aa/{file_hash}"
+        )
+
+
+def test_content_disposition_encodes_non_ascii_names():
+    assert content_disposition("report.pdf") == 'attachment; filename="report.pdf"'
+    assert content_disposition("résumé.pdf") == (
+        "attachment; filename*=utf-8''r%C3%A9sum%C3%A9.pdf"
+    )
@@ -0,0 +1,153 @@
+"""
+Tests for streaming plugin results to clients
+"""
+
+import asyncio
+import json
+
+import pytest
+from app.core.streaming import format_frame, heartbeat_frame, stream_results
+
+
+async def collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def parse_ndjson(chunks):
+    return [json.loads(line) for line in "".join(chunks).splitlines()]
+
+
+class TestFrames:
+    """Test frame formatting"""
+
+    def test_ndjson_frame(self):
+        assert format_frame({"type": "data", "data": {"a": 1}}) == (
+            '{"type": "data", "data": {"a": 1}}\n'
+        )
+
+    def test_sse_frame(self):
+        frame = format_frame({"type": "status", "data": {}}, "sse")
+
+        assert frame == 'event: status\ndata: {"type": "status", "data": {}}\n\n'
+
+    def test_heartbeat_frames(self):
+        assert json.loads(heartbeat_frame()) == {"type": "heartbeat"}
+        assert heartbeat_frame("sse").startswith(":")
+
+
+class TestStreamResults:
+    """Test batching, keepalives and cancellation"""
+
+    @pytest.mark.asyncio
+    async def test_batches_results_arriving_together(self):
+        async def results():
+            for index in range(10):
+                yield {"type": "data", "data": {"index": index}}
+
+        chunks = await collect(
+            stream_results(results(), batch_window=0.5, heartbeat_interval=5)
+        )
+
+        assert len(chunks) == 1
+        assert [item["data"]["index"] for item in parse_ndjson(chunks)] == list(
+            range(10)
+        )
+
+    @pytest.mark.asyncio
+    async def test_batch_size_is_capped(self):
+        async def results():
+            for index in range(10):
+                yield {"type": "data", "data": {"index": index}}
+
+        chunks = await collect(
+            stream_results(results(), batch_window=0.5, batch_max_items=4)
+        )
+
+        assert len(chunks) == 3
+        assert len(parse_ndjson(chunks)) == 10
+
+    @pytest.mark.asyncio
+    async def test_sends_heartbeat_while_idle(self):
+        async def results():
+            await asyncio.sleep(0.15)
+            yield {"type": "data", "data": {}}
+
+        chunks = await collect(
+            stream_results(results(), batch_window=0, heartbeat_interval=0.05)
+        )
+
+        types = [item["type"] for item in parse_ndjson(chunks)]
+        assert types.count("heartbeat") >= 1
+        assert types[-1] == "data"
+
+    @pytest.mark.asyncio
+    async def test_reraises_plugin_errors_after_results(self):
+        async def results():
+            yield {"type": "data", "data": {}}
+            raise RuntimeError("boom")
+
+        stream = stream_results(results(), batch_window=0)
+        first = await stream.__anext__()
+
+        assert json.loads(first)["type"] == "data"
+        with pytest.raises(RuntimeError, match="boom"):
+            await stream.__anext__()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_plugin(self):
+        cancelled = asyncio.Event()
+
+        async def results():
+            try:
+                for index in range(1000):
+                    yield {"type": "data", "data": {"index": index}}
+                    await asyncio.sleep(0.01)
+            finally:
+                cancelled.set()
+
+        async def is_disconnected():
+            return True
+
+        chunks = await collect(
+            stream_results(results(), batch_window=0, is_disconnected=is_disconnected)
+        )
+
+        assert len(chunks) == 1
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_closing_stream_cancels_plugin(self):
+        cancelled = asyncio.Event()
+
+        async def results():
+            try:
+                while True:
+                    yield {"type": "data", "data": {}}
+                    await asyncio.sleep(0.01)
+            finally:
+                cancelled.set()
+
+        stream = stream_results(results(), batch_window=0)
+        await stream.__anext__()
+        await stream.aclose()
+
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_slow_client_pauses_plugin(self):
+        produced = []
+
+        async def results():
+            for index in range(100):
+                produced.append(index)
+                yield {"type": "data", "data": {}}
+
+        stream = stream_results(
+            results(), batch_window=0, batch_max_items=1, queue_size=5
+        )
+        await stream.__anext__()
+        await asyncio.sleep(0.05)
+
+        # Only the queue's worth of results is read ahead of the client
+        assert len(produced) < 10
+        await stream.aclose()
@@ -0,0 +1,148 @@
+"""
+Tests for paged viewing of text evidence.
+"""
+
+import codecs
+import hashlib
+from unittest.mock import patch
+
+import pytest
+from app.core import text_index
+from app.core.storage import LocalStorageBackend
+from app.core.text_index import (
+    build_text_index,
+    delete_text_index,
+    detect_encoding,
+    get_text_index,
+    read_bytes,
+    read_lines,
+    text_index_key,
+)
+
+LINES = [f"line {number}\n" for number in range(25)]
+
+
+class RemoteStorageBackend(LocalStorageBackend):
+    """A backend without local paths, read in small chunks"""
+
+    def local_path(self, key):
+        return None
+
+    def open_read(self, key, start=0, end=None):
+        data = b"".join(super().open_read(key, start, end))
+        return iter([data[i : i + 7] for i in range(0, len(data), 7)])
+
+
+@pytest.fixture(params=[LocalStorageBackend, RemoteStorageBackend])
+def storage(request, tmp_path):
+    return request.param(tmp_path)
+
+
+def store_text(storage, text, encoding="utf-8", key="case_1/server.log"):
+    path = storage.root / key
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(text.encode(encoding))
+    return key
+
+
+class TestTextIndex:
+    """Test indexing and paging through text files."""
+
+    def test_index_records_every_nth_line(self, storage):
+        key = store_text(storage, "".join(LINES))
+
+        index = build_text_index(storage, key, interval=10)
+
+        assert index.line_count == 25
+        assert index.checkpoints == [
+            0,
+            len("".join(LINES[:10])),
+            len("".join(LINES[:20])),
+        ]
+
+    def test_read_lines_from_any_line(self, storage):
+        key = store_text(storage, "".join(LINES))
+        index = build_text_index(storage, key, interval=10)
+
+        page = read_lines(storage, key, index, 12, 5)
+
+        assert page.content == "".join(LINES[12:17])
+        assert page.line_count == 5
+        assert page.start_offset == len("".join(LINES[:12]))
+
+    def test_last_line_without_newline(self, storage):
+        key = store_text(storage, "first\nsecond")
+        index = build_text_index(storage, key, interval=10)
+
+        page = read_lines(storage, key, index, 1)
+
+        assert index.line_count == 2
+        assert page.content == "second"
+        assert page.end_offset == index.size
+
+    def test_read_past_the_end(self, storage):
+        key = store_text(storage, "".join(LINES))
+        index = build_text_index(storage, key, interval=10)
+
+        page = read_lines(storage, key, index, 40)
+
+        assert page.content == ""
+        assert page.start_offset == index.size
+
+    def test_read_bytes_ends_on_a_line(self, storage):
+        key = store_text(storage, "".join(LINES))
+        index = build_text_index(storage, key, interval=10)
+        start = len("".join(LINES[:11]))
+
+        page = read_bytes(storage, key, index, start, 20)
+
+        assert page.content == "".join(LINES[11:13])
+        assert page.start_line == 11
+        assert page.line_count == 2
+        assert page.end_offset == start + len("".join(LINES[11:13]))
+
+    def test_long_line_is_truncated(self, storage):
+        key = store_text(storage, "x" * 50 + "\nshort\n")
+        index = build_text_index(storage, key, interval=10)
+
+        with patch.object(text_index, "MAX_PAGE_BYTES", 20):
+            page = read_lines(storage, key, index, 0)
+
+        assert page.truncated
+        assert page.content == "x" * 20
+
+    def test_utf16_file(self, storage):
+        text = "".join(LINES) + "ünïcode\n"
+        key = store_text(storage, text, encoding="utf-16")
+
+        index = build_text_index(storage, key, interval=10)
+        page = read_lines(storage, key, index, 20, 10)
+
+        assert index.unit == 2
+        assert index.line_count == 26
+        assert page.content == "".join(LINES[20:]) + "ünïcode\n"
+
+
+def test_detect_encoding_from_a_sample():
+    assert detect_encoding(b"plain text")[0] == "utf-8"
+    assert detect_encoding(codecs.BOM_UTF8 + b"bom")[:3] == ("utf-8", 1.0, 3)
+    assert detect_encoding("x".encode("utf-32"))[3] == 4
+
+
+def test_index_is_stored_per_hash(tmp_path):
+    storage = LocalStorageBackend(tmp_path)
+    key = store_text(storage, "".join(LINES))
+    file_hash = hashlib.sha256("".join(LINES).encode()).hexdigest()
+
+    with patch("app.core.file_storage.UPLOAD_DIR", tmp_path), patch.dict(
+        text_index._cache, clear=True
+    ):
+        index = get_text_index(storage, key, file_hash)
+        text_index._cache.clear()
+
+        with patch.object(text_index, "build_text_index") as build:
+            assert get_text_index(storage, key, file_hash) == index
+        build.assert_not_called()
+
+        delete_text_index(file_hash)
+        assert not storage.exists(text_index_key(file_hash))
@@ -0,0 +1,152 @@
+"""
+Tests for DNS Lookup plugin
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import dns.resolver
+import pytest
+from app.plugins.dnslookup_plugin import BULK_MAX_TARGET_ERRORS, DnsLookup
+
+
+def make_answer(records, ttl=300):
+    """Create a fake dnspython answer"""
+    answer = MagicMock()
+    answer.rrset.ttl = ttl
+    rdatas = []
+    for record in records:
+        rdata = MagicMock()
+        rdata.to_text.return_value = record
+        rdatas.append(rdata)
+    answer.__iter__.side_effect = lambda: iter(rdatas)
+    return answer
+
+
+async def collect(plugin, params):
+    return [result async for result in plugin.run(params)]
+
+
+class TestDnsLookup:
+    """Test cases for DnsLookup"""
+
+    @pytest.fixture
+    def plugin(self):
+        """Create plugin instance for testing"""
+        return DnsLookup()
+
+    def test_bulk_parameters(self, plugin):
+        """Test bulk mode parameters are defined"""
+        assert plugin.parameters["domain"]["required"] is False
+        assert plugin.parameters["bulk_mode"]["type"] == "boolean"
+        assert plugin.parameters["targets_evidence_id"]["type"] == "float"
+        assert plugin.parameters["concurrency"]["default"] == 50.0
+
+    @pytest.mark.asyncio
+    async def test_run_missing_params(self, plugin):
+        """Test plugin requires a domain or targets evidence"""
+        results = await collect(plugin, {})
+
+        assert len(results) == 1
+        assert results[0]["type"] == "error"
+        assert "required" in results[0]["data"]["message"].lower()
+
+    def test_parse_targets(self, plugin):
+        """Test targets are split, deduplicated and comments skipped"""
+        raw = "# targets\nexample.com, example.org\n\nexample.com\n  test.com  \n"
+
+        assert plugin._parse_targets(raw) == ["example.com", "example.org", "test.com"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_run_streams_results_and_summary(self, plugin):
+        """Test bulk mode resolves every target and record type"""
+
+        async def fake_resolve(qname, rdtype, nameservers=None, lifetime=None):
+            if qname == "missing.com":
+                raise dns.resolver.NXDOMAIN()
+            return make_answer(["93.184.216.34"])
+
+        with patch(
+            "app.plugins.dnslookup_plugin.dns_resolver.resolve",
+            AsyncMock(side_effect=fake_resolve),
+        ) as mock_resolve:
+            results = await collect(
+                plugin,
+                {
+                    "domain": "example.com,missing.com,8.8.8.8",
+                    "record_types": "A,MX",
+                    "bulk_mode": True,
+                    "concurrency": 2,
+                },
+            )
+
+        errors = [r for r in results if r["type"] == "error"]
+        data = [r["data"] for r in results if r["type"] == "data"]
+        summary = data[-1]
+
+        assert len(errors) == 1
+        assert "8.8.8.8" in errors[0]["data"]["message"]
+        assert mock_resolve.await_count == 4
+        assert len(data) == 5
+        assert summary["phase"] == "summary"
+        assert summary["total_targets"] == 2
+        assert summary["invalid_targets"] == 1
+        assert summary["total_queries"] == 4
+        assert summary["failed_queries"] == 2
+        assert set(summary["latency_by_record_type"]) == {"A", "MX"}
+        assert summary["latency_by_record_type"]["A"]["queries"] == 2
+
+    @pytest.mark.asyncio
+    async def test_bulk_run_caps_invalid_target_errors(self, plugin):
+        """Test many invalid targets are counted rather than each reported"""
+        targets = ",".join(
+            [f"10.0.0.{i}" for i in range(BULK_MAX_TARGET_ERRORS + 5)] + ["example.com"]
+        )
+
+        with patch(
+            "app.plugins.dnslookup_plugin.dns_resolver.resolve",
+            AsyncMock(return_value=make_answer(["93.184.216.34"])),
+        ):
+            results = await collect(plugin, {"domain": targets, "bulk_mode": True})
+
+        errors = [r["data"]["message"] for r in results if r["type"] == "error"]
+        assert len(errors) == BULK_MAX_TARGET_ERRORS + 1
+        assert errors[-1] == (
+            f"5 more invalid targets skipped ({BULK_MAX_TARGET_ERRORS + 5} in total)"
+        )
+        assert results[-1]["data"]["invalid_targets"] == BULK_MAX_TARGET_ERRORS + 5
+
+    @pytest.mark.asyncio
+    async def test_bulk_run_bounds_concurrency(self, plugin):
+        """Test bulk mode never exceeds the requested concurrency"""
+        in_flight = 0
+        peak = 0
+
+        async def fake_resolve(qname, rdtype, nameservers=None, lifetime=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return make_answer(["1.2.3.4"])
+
+        targets = ",".join(f"host{i}.example.com" for i in range(30))
+        with patch(
+            "app.plugins.dnslookup_plugin.dns_resolver.resolve",
+            AsyncMock(side_effect=fake_resolve),
+        ):
+            results = await collect(
+                plugin, {"domain": targets, "bulk_mode": True, "concurrency": 5}
+            )
+
+        assert peak <= 5
+        assert results[-1]["data"]["successful_queries"] == 30
+
+    @pytest.mark.asyncio
+    async def test_targets_evidence_requires_user(self, plugin):
+        """Test loading targets from evidence needs a user context"""
+        results = await collect(plugin, {"targets_evidence_id": 1})
+
+        assert len(results) == 1
+        assert results[0]["type"] == "error"
+        assert "user context" in results[0]["data"]["message"]
@@ -0,0 +1,185 @@
+"""
+Tests for Holehe plugin
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from app.plugins import holehe_plugin
+from app.plugins.holehe_plugin import HolehePlugin
+
+
+def make_module(name, exists=False, delay=0.0, tracker=None):
+    """Create a fake holehe module function"""
+
+    async def check(email, client, out):
+        if tracker is not None:
+            tracker["in_flight"] += 1
+            tracker["peak"] = max(tracker["peak"], tracker["in_flight"])
+        await asyncio.sleep(delay)
+        if tracker is not None:
+            tracker["in_flight"] -= 1
+        out.append({"name": name, "domain": f"{name}.com", "exists": exists})
+
+    return (name, check)
+
+
+async def collect(plugin, params):
+    return [result async for result in plugin.run(params)]
+
+
+class TestHolehePlugin:
+    """Test cases for HolehePlugin"""
+
+    @pytest.fixture
+    def plugin(self):
+        """Create plugin instance for testing"""
+        return HolehePlugin()
+
+    @pytest.mark.asyncio
+    async def test_run_missing_params(self, plugin):
+        """Test plugin requires an email"""
+        results = await collect(plugin, None)
+
+        assert len(results) == 1
+        assert results[0]["type"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_run_yields_only_found_accounts(self, plugin):
+        """Test only platforms reporting an account are yielded"""
+        modules = [
+            make_module("twitter", exists=True),
+            make_module("github"),
+            make_module("spotify", exists=True),
+        ]
+
+        with patch.object(
+            plugin, "_get_holehe_modules", AsyncMock(return_value=modules)
+        ):
+            results = await collect(plugin, {"email": "test@example.com"})
+
+        platforms = sorted(r["data"]["platform"] for r in results)
+        assert platforms == ["spotify", "twitter"]
+        assert all(r["data"]["email"] == "test@example.com" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_run_bounds_concurrency(self, plugin):
+        """Test checks run concurrently up to the configured cap"""
+        tracker = {"in_flight": 0, "peak": 0}
+        modules = [
+            make_module(f"site{i}", delay=0.01, tracker=tracker) for i in range(12)
+        ]
+
+        with patch.object(
+            plugin, "_get_holehe_modules", AsyncMock(return_value=modules)
+        ):
+            await collect(plugin, {"email": "test@example.com", "concurrency": 4})
+
+        assert 1 < tracker["peak"] <= 4
+
+    @pytest.mark.asyncio
+    async def test_check_timeout_does_not_block_other_platforms(self, plugin):
+        """Test a slow platform times out without delaying the others"""
+        modules = [
+            make_module("slow", exists=True, delay=5),
+            make_module("fast", exists=True),
+        ]
+
+        with patch.object(
+            plugin, "_get_holehe_modules", AsyncMock(return_value=modules)
+        ):
+            results = await collect(
+                plugin, {"email": "test@example.com", "timeout": 0.05}
+            )
+
+        assert [r["data"]["platform"] for r in results] == ["fast"]
+
+    @pytest.mark.asyncio
+    async def test_module_discovery_cached(self, plugin):
+        """Test holehe modules are only discovered once per process"""
+        cached = [make_module("cached")]
+
+        with patch.object(holehe_plugin, "_holehe_modules", cached):
+            assert await plugin._get_holehe_modules() is cached
+
+    def test_parse_emails(self, plugin):
+        """Test bulk emails are split and deduplicated"""
+        raw = "a@example.com, b@example.com\n\na@example.com\n c@example.com "
+
+        assert plugin._parse_emails(raw) == [
+            "a@example.com",
+            "b@example.com",
+            "c@example.com",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_bulk_run_streams_hits_and_summarises(self, plugin):
+        """Test bulk mode checks every email and summarises per email"""
+        modules = [make_module("twitter", exists=True), make_module("github")]
+
+        with patch.object(
+            plugin, "_get_holehe_modules", AsyncMock(return_value=modules)
+        ), patch("app.plugins.holehe_plugin.httpx.AsyncClient") as client_class:
+            client_class.return_value.__aenter__ = AsyncMock()
+            client_class.return_value.__aexit__ = AsyncMock(return_value=False)
+            results = await collect(
+                plugin, {"emails": "a@example.com\nb@example.com", "concurrency": 3}
+            )
+
+        hits = [r["data"] for r in results if r["type"] == "data"]
+        summary = results[-1]["data"]
+
+        assert client_class.call_count == 1
+        assert sorted(hit["email"] for hit in hits) == [
+            "a@example.com",
+            "b@example.com",
+        ]
+        assert all(hit["platform"] == "twitter" for hit in hits)
+        assert results[-1]["type"] == "status"
+        assert summary["total_emails"] == 2
+        assert summary["message"] == (
+            "Checked 2 email(s) against 2 platforms: "
+            "2 account(s) found, 0 rate limited, 0 timed out, 0 error(s)"
+        )
+        assert summary["emails"]["a@example.com"] == {
+            "checked": 2,
+            "found": 1,
+            "ratelimited": 0,
+            "timeouts": 0,
+            "errors": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_bulk_run_counts_timeouts_apart_from_rate_limits(self, plugin):
+        """Test a platform timeout is reported as an error, not a rate limit"""
+        modules = [make_module("slow", exists=True, delay=5), make_module("github")]
+
+        with patch.object(
+            plugin, "_get_holehe_modules", AsyncMock(return_value=modules)
+        ), patch("app.plugins.holehe_plugin.httpx.AsyncClient") as client_class:
+            client_class.return_value.__aenter__ = AsyncMock()
+            client_class.return_value.__aexit__ = AsyncMock(return_value=False)
+            results = await collect(
+                plugin, {"emails": "a@example.com", "timeout": 0.05}
+            )
+
+        assert results[-1]["data"]["emails"]["a@example.com"] == {
+            "checked": 2,
+            "found": 0,
+            "ratelimited": 0,
+            "timeouts": 1,
+            "errors": 0,
+        }
+
+    @pytest.mark.asyncio
+    async def test_bulk_run_rejects_too_many_emails(self, plugin):
+        """Test bulk mode enforces the email limit"""
+        emails = ",".join(
+            f"user{i}@example.com" for i in range(holehe_plugin.BULK_MAX_EMAILS + 1)
+        )
+
+        results = await collect(plugin, {"emails": emails})
+
+        assert len(results) == 1
+        assert "Too many emails" in results[0]["data"]["message"]
@@ -0,0 +1,145 @@
+"""
+Tests for VirusTotal plugin
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.plugins import virustotal_plugin
+from app.plugins.virustotal_plugin import RequestPacer, VirustotalPlugin
+
+SHA256 = "a" * 64
+
+
+def make_vt_object():
+    """Create a fake VirusTotal API object"""
+    return SimpleNamespace(
+        last_analysis_stats={"malicious": 1, "harmless": 9},
+        last_analysis_results={},
+        last_analysis_date=0,
+        sha256=SHA256,
+        sha1="b" * 40,
+        md5="c" * 32,
+        size=10,
+        type_description="Text",
+    )
+
+
+async def collect(plugin, params):
+    return [result async for result in plugin.run(params)]
+
+
+class TestVirustotalPlugin:
+    """Test cases for VirustotalPlugin"""
+
+    @pytest.fixture
+    def plugin(self, session):
+        """Create plugin instance with the test database session"""
+        plugin = VirustotalPlugin(db_session=session)
+        plugin.get_missing_api_keys = MagicMock(return_value=[])
+        return plugin
+
+    @pytest.fixture(autouse=True)
+    def clear_shared_state(self):
+        """Reset the module-level response cache and pacers, and disable pacing"""
+        virustotal_plugin._response_cache.clear()
+        virustotal_plugin._pacers.clear()
+        with patch.object(
+            virustotal_plugin.virustotal_settings, "VIRUSTOTAL_REQUESTS_PER_MINUTE", 0
+        ):
+            yield
+        virustotal_plugin._response_cache.clear()
+        virustotal_plugin._pacers.clear()
+
+    @pytest.fixture
+    def mock_client(self):
+        """Patch the VirusTotal client and API key lookup"""
+        client = MagicMock()
+        client.get_object_async = AsyncMock(return_value=make_vt_object())
+        with patch("app.plugins.virustotal_plugin.vt.Client") as client_class, patch(
+            "app.plugins.virustotal_plugin.SystemConfigService.get_api_key",
+            return_value="test-key",
+        ):
+            client_class.return_value.__aenter__ = AsyncMock(return_value=client)
+            client_class.return_value.__aexit__ = AsyncMock(return_value=False)
+            yield client_class, client
+
+    @pytest.mark.asyncio
+    async def test_run_missing_params(self, plugin):
+        """Test plugin requires a target"""
+        results = await collect(plugin, {})
+
+        assert len(results) == 1
+        assert results[0]["type"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_single_target(self, plugin, mock_client):
+        """Test a single target is analyzed"""
+        _, client = mock_client
+
+        results = await collect(plugin, {"target": SHA256})
+
+        client.get_object_async.assert_awaited_once_with(f"/files/{SHA256}")
+        assert results[0]["type"] == "data"
+        assert results[0]["data"]["target_type"] == "file"
+        assert results[0]["data"]["detection_ratio"] == "1/10"
+
+    @pytest.mark.asyncio
+    async def test_repeated_target_served_from_cache(self, plugin, mock_client):
+        """Test repeated lookups reuse the cached response"""
+        _, client = mock_client
+        params = {"target": SHA256}
+
+        await collect(plugin, params)
+        results = await collect(plugin, params)
+
+        assert client.get_object_async.await_count == 1
+        assert results[0]["data"]["cached"] is True
+
+    @pytest.mark.asyncio
+    async def test_bulk_targets_share_one_client(self, plugin, mock_client):
+        """Test bulk mode classifies targets and reuses one client"""
+        client_class, client = mock_client
+
+        results = await collect(
+            plugin,
+            {
+                "targets": f"{SHA256}\nexample.com, 8.8.8.8\nnot a target\nexample.com",
+            },
+        )
+
+        data = [r["data"] for r in results if r["type"] == "data"]
+        errors = [r["data"]["message"] for r in results if r["type"] == "error"]
+        assert client_class.call_count == 1
+        assert client.get_object_async.await_count == 3
+        assert sorted(d["target_type"] for d in data) == [
+            "domain",
+            "file",
+            "ip_address",
+        ]
+        assert errors == ["Could not auto-detect target type for 'not a target'"]
+
+    def test_pacer_rate_comes_from_configuration(self):
+        """Test runs sharing an API key share one pacer at the configured rate"""
+        with patch.object(
+            virustotal_plugin.virustotal_settings, "VIRUSTOTAL_REQUESTS_PER_MINUTE", 4
+        ):
+            pacer = virustotal_plugin._get_pacer("test-key")
+
+        assert pacer.interval == 15.0
+        assert virustotal_plugin._get_pacer("test-key") is pacer
+        assert pacer.interval == 15.0
+
+    @pytest.mark.asyncio
+    async def test_pacer_spaces_requests(self):
+        """Test the pacer enforces the requests-per-minute budget"""
+        pacer = RequestPacer(requests_per_minute=60 * 50)  # 20ms apart
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        for _ in range(4):
+            await pacer.wait()
+
+        assert loop.time() - start >= 0.055
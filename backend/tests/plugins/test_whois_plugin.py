@@ -0,0 +1,130 @@
+"""
+Tests for Whois plugin
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from app.core.utils import get_utc_now
+from app.database.models import WhoisRecord
+from app.plugins.whois_plugin import WhoisPlugin
+
+
+def make_whois_data(registrar="Example Registrar"):
+    """Create a fake python-whois result"""
+    return SimpleNamespace(
+        registrar=registrar,
+        creation_date=datetime(2000, 1, 1),
+        expiration_date=datetime.now() + timedelta(days=400),
+        name_servers=["ns1.example.com", "ns2.example.com"],
+    )
+
+
+async def collect(plugin, params):
+    return [result async for result in plugin.run(params)]
+
+
+class TestWhoisPlugin:
+    """Test cases for WhoisPlugin"""
+
+    @pytest.fixture
+    def plugin(self, session):
+        """Create plugin instance with the test database session"""
+        return WhoisPlugin(db_session=session)
+
+    @pytest.mark.asyncio
+    async def test_run_missing_params(self, plugin):
+        """Test plugin requires a domain"""
+        results = await collect(plugin, {})
+
+        assert len(results) == 1
+        assert results[0]["type"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_run_queries_and_stores_record(self, plugin, session):
+        """Test a whois lookup is parsed and stored for reuse"""
+        with patch(
+            "app.plugins.whois_plugin.whois.whois", return_value=make_whois_data()
+        ) as mock_whois:
+            results = await collect(plugin, {"domain": "https://Example.com/path"})
+
+        mock_whois.assert_called_once_with("example.com")
+        data = results[0]["data"]
+        assert data["domain"] == "example.com"
+        assert data["registrar"] == "Example Registrar"
+        assert data["domain_age_years"] > 20
+        assert "cached" not in data
+
+        stored = session.get(WhoisRecord, "example.com")
+        assert stored.data["registrar"] == "Example Registrar"
+        assert "domain_age_days" not in stored.data
+
+    @pytest.mark.asyncio
+    async def test_repeated_lookup_served_from_cache(self, plugin):
+        """Test a stored record is returned without querying whois again"""
+        with patch(
+            "app.plugins.whois_plugin.whois.whois", return_value=make_whois_data()
+        ) as mock_whois:
+            await collect(plugin, {"domain": "example.com"})
+            results = await collect(plugin, {"domain": "example.com"})
+
+        assert mock_whois.call_count == 1
+        assert results[0]["data"]["cached"] is True
+        assert results[0]["data"]["domain_age_years"] > 20
+
+    @pytest.mark.asyncio
+    async def test_expired_cache_entry_refreshed(self, plugin, session):
+        """Test records older than the TTL are queried again"""
+        session.add(
+            WhoisRecord(
+                domain="example.com",
+                data={"domain": "example.com", "registrar": "Old Registrar"},
+                fetched_at=get_utc_now() - timedelta(days=365),
+            )
+        )
+        session.commit()
+
+        with patch(
+            "app.plugins.whois_plugin.whois.whois",
+            return_value=make_whois_data("New Registrar"),
+        ):
+            results = await collect(plugin, {"domain": "example.com"})
+
+        assert results[0]["data"]["registrar"] == "New Registrar"
+        session.expire_all()
+        assert (
+            session.get(WhoisRecord, "example.com").data["registrar"] == "New Registrar"
+        )
+
+    @pytest.mark.asyncio
+    async def test_cache_write_leaves_caller_transaction_alone(self, plugin, session):
+        """Test storing a record does not commit the caller's session"""
+        with patch(
+            "app.plugins.whois_plugin.whois.whois", return_value=make_whois_data()
+        ), patch.object(session, "commit") as caller_commit:
+            await collect(plugin, {"domain": "example.com"})
+
+        caller_commit.assert_not_called()
+        assert session.get(WhoisRecord, "example.com") is not None
+
+    @pytest.mark.asyncio
+    async def test_bulk_domains(self, plugin):
+        """Test bulk mode returns a result or error per domain"""
+
+        def fake_whois(domain):
+            if domain == "missing.test":
+                raise Exception("No whois server is known for this kind of object.")
+            return make_whois_data()
+
+        with patch("app.plugins.whois_plugin.whois.whois", side_effect=fake_whois):
+            results = await collect(
+                plugin,
+                {"domains": "example.com, example.org\nmissing.test\nexample.com"},
+            )
+
+        data = sorted(r["data"]["domain"] for r in results if r["type"] == "data")
+        errors = [r["data"]["message"] for r in results if r["type"] == "error"]
+        assert data == ["example.com", "example.org"]
+        assert errors == ["Domain missing.test not found or invalid TLD"]
@@ -0,0 +1,137 @@
+"""
+Tests for reference counting of content-addressed evidence files
+"""
+
+import hashlib
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from app.core import file_storage
+from app.database import models
+from app.services.blob_service import BlobService
+from fastapi import HTTPException
+from sqlmodel import Session
+
+CONTENT = b"shared evidence content"
+FILE_HASH = hashlib.sha256(CONTENT).hexdigest()
+
+
+@pytest.fixture(name="upload_dir")
+def upload_dir_fixture():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with patch.object(file_storage, "UPLOAD_DIR", Path(temp_dir)):
+            yield Path(temp_dir)
+
+
+@pytest.fixture(name="stored_blob")
+def stored_blob_fixture(upload_dir):
+    temp_path = upload_dir / "content.part"
+    temp_path.write_bytes(CONTENT)
+    file_storage.store_blob(temp_path, FILE_HASH)
+    return upload_dir / file_storage.blob_key(FILE_HASH)
+
+
+def add_file_evidence(session, case, user, name):
+    evidence = models.Evidence(
+        case_id=case.id,
+        title=name,
+        evidence_type="file",
+        content=f"{case.id}/{name}",
+        file_hash=FILE_HASH,
+        created_by_id=user.id,
+    )
+    session.add(evidence)
+    session.flush()
+    BlobService(session).add_reference(evidence.id, FILE_HASH)
+    session.commit()
+    return evidence
+
+
+class TestBlobService:
+    """Test blob reference counting"""
+
+    def test_references_are_counted(
+        self, session: Session, stored_blob, test_case, test_admin
+    ):
+        add_file_evidence(session, test_case, test_admin, "a.txt")
+        add_file_evidence(session, test_case, test_admin, "b.txt")
+
+        blob = session.get(models.Blob, FILE_HASH)
+        assert blob.ref_count == 2
+        assert blob.size == len(CONTENT)
+        assert BlobService(session).get_case_usage(test_case.id) == len(CONTENT)
+
+    def test_blob_reclaimed_after_last_reference(
+        self, session: Session, stored_blob, test_case, test_admin
+    ):
+        first = add_file_evidence(session, test_case, test_admin, "a.txt")
+        second = add_file_evidence(session, test_case, test_admin, "b.txt")
+        blob_service = BlobService(session)
+
+        assert blob_service.release_reference(first.id) is None
+        session.delete(first)
+        session.commit()
+        assert stored_blob.exists()
+
+        assert blob_service.release_reference(second.id) == FILE_HASH
+        session.delete(second)
+        session.commit()
+        blob_service.reclaim_blobs([FILE_HASH])
+
+        assert session.get(models.Blob, FILE_HASH) is None
+        assert not stored_blob.exists()
+
+    def test_reclaim_skips_blob_referenced_again(
+        self, session: Session, stored_blob, test_case, test_admin
+    ):
+        first = add_file_evidence(session, test_case, test_admin, "a.txt")
+        blob_service = BlobService(session)
+
+        assert blob_service.release_reference(first.id) == FILE_HASH
+        session.delete(first)
+        session.commit()
+        # The same content is uploaded again before the blob is reclaimed
+        add_file_evidence(session, test_case, test_admin, "b.txt")
+        blob_service.reclaim_blobs([FILE_HASH])
+
+        assert session.get(models.Blob, FILE_HASH).ref_count == 1
+        assert stored_blob.exists()
+
+    def test_reference_to_reclaimed_content_is_refused(
+        self, session: Session, stored_blob, test_case, test_admin
+    ):
+        stored_blob.unlink()
+
+        with pytest.raises(HTTPException) as exc_info:
+            add_file_evidence(session, test_case, test_admin, "a.txt")
+
+        assert exc_info.value.status_code == 409
+
+    def test_legacy_evidence_has_no_reference(
+        self, session: Session, upload_dir, test_case, test_admin
+    ):
+        evidence = models.Evidence(
+            case_id=test_case.id,
+            title="old.txt",
+            evidence_type="file",
+            content=f"{test_case.id}/old.txt",
+            file_hash=FILE_HASH,
+            created_by_id=test_admin.id,
+        )
+        session.add(evidence)
+        session.commit()
+        blob_service = BlobService(session)
+
+        assert not blob_service.is_blob_backed(evidence.id)
+        assert blob_service.release_reference(evidence.id) is None
+
+    def test_discard_keeps_referenced_blob(
+        self, session: Session, stored_blob, test_case, test_admin
+    ):
+        add_file_evidence(session, test_case, test_admin, "a.txt")
+
+        BlobService(session).discard_if_unreferenced(FILE_HASH)
+
+        assert stored_blob.exists()
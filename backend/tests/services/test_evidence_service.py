@@ -6,6 +6,11 @@ folder operations, validation, and security functionality within the
 evidence service layer.
 """
 
+import hashlib
+import io
+import json
+import tarfile
+import zipfile
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -16,6 +21,7 @@ from app.schemas import evidence_schema as schemas
 from app.services import evidence_service
 from fastapi import HTTPException, UploadFile
 from sqlmodel import Session
+from starlette.datastructures import Headers
 
 
 @pytest.fixture(name="evidence_service_instance")
@@ -238,6 +244,135 @@ async def test_create_evidence_file_save_error_cleanup(
         mock_delete_file.assert_called_once()
 
 
+def make_upload(filename: str, content: bytes, content_type: str) -> UploadFile:
+    return UploadFile(
+        file=io.BytesIO(content),
+        filename=filename,
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_evidence_bulk(
+    evidence_service_instance: evidence_service.EvidenceService,
+    sample_case: models.Case,
+    sample_folder: models.Evidence,
+    test_admin: models.User,
+    tmp_path,
+):
+    files = [
+        make_upload("notes.txt", b"first capture", "text/plain"),
+        make_upload("notes.txt", b"first capture", "text/plain"),
+        make_upload("tool.exe", b"MZ\x90\x00" + b"\x00" * 300, "application/octet-stream"),
+        make_upload("other.txt", b"second capture", "text/plain"),
+    ]
+
+    with patch("app.core.file_storage.UPLOAD_DIR", tmp_path):
+        results = await evidence_service_instance.create_evidence_bulk(
+            case_id=sample_case.id,
+            category="documents",
+            files=files,
+            current_user=test_admin,
+            folder_path="test_folder",
+        )
+
+    assert [result["status"] for result in results] == [
+        "created",
+        "created",
+        "failed",
+        "created",
+    ]
+    assert results[2]["error"] == "File type not allowed"
+    titles = [results[i]["evidence"].title for i in (0, 1, 3)]
+    assert titles == ["notes.txt", "notes_1.txt", "other.txt"]
+    assert all(results[i]["evidence"].category == "Documents" for i in (0, 1, 3))
+
+    # Identical files share one blob, referenced twice
+    file_hash = hashlib.sha256(b"first capture").hexdigest()
+    blob = evidence_service_instance.db.get(models.Blob, file_hash)
+    assert blob.ref_count == 2
+    assert (tmp_path / "blobs" / file_hash[:2] / file_hash[2:4] / file_hash).exists()
+    assert evidence_service_instance.db.get(
+        models.EvidenceSearchDocument, results[3]["evidence"].id
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_evidence_bulk_normalizes_folder_and_enforces_quota(
+    evidence_service_instance: evidence_service.EvidenceService,
+    sample_case: models.Case,
+    sample_folder: models.Evidence,
+    test_admin: models.User,
+    tmp_path,
+):
+    with patch("app.core.file_storage.UPLOAD_DIR", tmp_path):
+        results = await evidence_service_instance.create_evidence_bulk(
+            case_id=sample_case.id,
+            category="Other",
+            files=[make_upload("a.txt", b"a", "text/plain")],
+            current_user=test_admin,
+            folder_path="/test_folder/",
+        )
+        assert results[0]["evidence"].folder_path == "test_folder"
+
+        with patch.object(
+            evidence_service.upload_settings, "UPLOAD_CASE_QUOTA_MB", 1
+        ), pytest.raises(HTTPException) as excinfo:
+            await evidence_service_instance.create_evidence_bulk(
+                case_id=sample_case.id,
+                category="Other",
+                files=[
+                    make_upload(f"{i}.txt", bytes([i]) * 600 * 1024, "text/plain")
+                    for i in range(2)
+                ],
+                current_user=test_admin,
+            )
+
+    assert excinfo.value.status_code == 413
+    # Nothing was stored for the rejected batch
+    assert len(list((tmp_path / "blobs").rglob("*.part"))) == 0
+    assert len([p for p in (tmp_path / "blobs").rglob("*") if p.is_file()]) == 1
+
+
+@pytest.mark.asyncio
+async def test_create_evidence_bulk_checks_once_for_the_batch(
+    evidence_service_instance: evidence_service.EvidenceService,
+    sample_case: models.Case,
+    sample_folder: models.Evidence,
+    test_admin: models.User,
+    test_analyst: models.User,
+    tmp_path,
+):
+    with pytest.raises(HTTPException) as excinfo:
+        await evidence_service_instance.create_evidence_bulk(
+            case_id=sample_case.id,
+            category="Other",
+            files=[make_upload("a.txt", b"a", "text/plain")],
+            current_user=test_analyst,
+        )
+    assert excinfo.value.status_code == 403
+
+    with pytest.raises(HTTPException) as excinfo:
+        await evidence_service_instance.create_evidence_bulk(
+            case_id=sample_case.id,
+            category="Unknown",
+            files=[make_upload("a.txt", b"a", "text/plain")],
+            current_user=test_admin,
+        )
+    assert excinfo.value.status_code == 400
+
+    with patch.object(
+        evidence_service.upload_settings, "UPLOAD_BULK_MAX_FILES", 1
+    ), pytest.raises(HTTPException) as excinfo:
+        await evidence_service_instance.create_evidence_bulk(
+            case_id=sample_case.id,
+            category="Other",
+            files=[make_upload(f"{i}.txt", b"a", "text/plain") for i in range(2)],
+            current_user=test_admin,
+        )
+    assert excinfo.value.status_code == 400
+
+
 # Test get_case_evidence method
 @pytest.mark.asyncio
 async def test_get_case_evidence(
@@ -759,23 +894,17 @@ async def test_delete_folder_with_contents(
 
 # Test download_evidence method
 @pytest.mark.asyncio
-@patch("fastapi.responses.FileResponse")
-@patch("app.core.file_storage.UPLOAD_DIR")
 async def test_download_evidence_file(
-    mock_upload_dir: Mock,
-    mock_file_response: Mock,
     evidence_service_instance: evidence_service.EvidenceService,
     sample_case: models.Case,
     sample_folder: models.Evidence,
     test_admin: models.User,
+    tmp_path,
 ):
-    # Mock the path object with exists method
-    mock_path = Mock()
-    mock_path.exists.return_value = True
-    mock_path.name = "test_file.txt"
-    mock_upload_dir.__truediv__ = Mock(return_value=mock_path)
-
-    mock_file_response.return_value = Mock()
+    # A file stored at its case path, as before the blob store
+    (tmp_path / "uploads").mkdir()
+    (tmp_path / "uploads" / "test_file.txt").write_bytes(b"test content")
+    file_hash = hashlib.sha256(b"test content").hexdigest()
 
     evidence = models.Evidence(
         case_id=sample_case.id,
@@ -784,6 +913,7 @@ async def test_download_evidence_file(
         evidence_type="file",
         category="Other",
         content="uploads/test_file.txt",
+        file_hash=file_hash,
         created_by_id=test_admin.id,
         created_at=get_utc_now(),
         updated_at=get_utc_now(),
@@ -792,9 +922,211 @@ async def test_download_evidence_file(
     evidence_service_instance.db.commit()
     evidence_service_instance.db.refresh(evidence)
 
-    result = await evidence_service_instance.download_evidence(evidence.id, test_admin)
+    with patch("app.core.file_storage.UPLOAD_DIR", tmp_path):
+        result = await evidence_service_instance.download_evidence(
+            evidence.id, test_admin
+        )
+        repeat = await evidence_service_instance.download_evidence(
+            evidence.id, test_admin, request_headers={"If-None-Match": f'"{file_hash}"'}
+        )
+
+    assert result.status_code == 200
+    assert result.headers["content-disposition"] == 'attachment; filename="test_file.txt"'
+    assert result.headers["etag"] == f'"{file_hash}"'
+    assert repeat.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_get_evidence_text_page(
+    evidence_service_instance: evidence_service.EvidenceService,
+    sample_case: models.Case,
+    test_admin: models.User,
+    tmp_path,
+):
+    (tmp_path / "uploads").mkdir()
+    (tmp_path / "uploads" / "server.log").write_bytes(
+        b"".join(b"entry %d\n" % number for number in range(3000))
+    )
+    evidence = models.Evidence(
+        case_id=sample_case.id,
+        title="Server log",
+        evidence_type="file",
+        content="uploads/server.log",
+        created_by_id=test_admin.id,
+    )
+    evidence_service_instance.db.add(evidence)
+    evidence_service_instance.db.commit()
+
+    with patch("app.core.file_storage.UPLOAD_DIR", tmp_path):
+        page = await evidence_service_instance.get_evidence_text_page(
+            evidence.id, test_admin, line=2500, lines=2
+        )
+
+    assert page["content"] == "entry 2500\nentry 2501\n"
+    assert page["next_line"] == 2502
+    assert page["has_more"]
+    assert page["file_info"]["line_count"] == 3000
+
+
+@pytest.mark.asyncio
+async def test_export_case_evidence(
+    evidence_service_instance: evidence_service.EvidenceService,
+    sample_case: models.Case,
+    sample_folder: models.Evidence,
+    test_admin: models.User,
+    tmp_path,
+):
+    db = evidence_service_instance.db
+    file_hash = hashlib.sha256(b"captured page").hexdigest()
+    blob = tmp_path / "blobs" / file_hash[:2] / file_hash[2:4] / file_hash
+    blob.parent.mkdir(parents=True)
+    blob.write_bytes(b"captured page")
+    db.add_all(
+        [
+            models.Evidence(
+                case_id=sample_case.id,
+                title="page.html",
+                evidence_type="file",
+                category="Documents",
+                content=f"{sample_case.id}/test_folder/page.html",
+                file_hash=file_hash,
+                folder_path="test_folder",
+                created_by_id=test_admin.id,
+            ),
+            models.Evidence(
+                case_id=sample_case.id,
+                title="Lead",
+                evidence_type="text",
+                category="Other",
+                content="Call back on Monday",
+                folder_path="test_folder",
+                created_by_id=test_admin.id,
+            ),
+            models.Evidence(
+                case_id=sample_case.id,
+                title="gone.txt",
+                evidence_type="file",
+                category="Documents",
+                content=f"{sample_case.id}/test_folder/gone.txt",
+                folder_path="test_folder",
+                created_by_id=test_admin.id,
+            ),
+            models.Evidence(
+                case_id=sample_case.id,
+                title="elsewhere.txt",
+                evidence_type="text",
+                category="Documents",
+                content="outside the folder",
+                folder_path="other_folder",
+                created_by_id=test_admin.id,
+            ),
+        ]
+    )
+    db.commit()
+
+    with patch("app.core.file_storage.UPLOAD_DIR", tmp_path):
+        response = await evidence_service_instance.export_case_evidence(
+            sample_case.id, test_admin, folder_id=sample_folder.id
+        )
+        data = b"".join([chunk async for chunk in response.body_iterator])
+
+    assert response.media_type == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.namelist() == [
+        "2301-01/test_folder/",
+        "2301-01/test_folder/page.html",
+        "2301-01/test_folder/Lead.txt",
+        "2301-01/manifest.json",
+    ]
+    assert archive.read("2301-01/test_folder/Lead.txt") == b"Call back on Monday"
+
+    manifest = json.loads(archive.read("2301-01/manifest.json"))
+    assert manifest["folder"] == "test_folder"
+    assert manifest["files"][0]["sha256"] == file_hash
+    assert manifest["files"][0]["hash_verified"] is True
+    assert [item["title"] for item in manifest["missing"]] == ["gone.txt"]
+
+    with patch("app.core.file_storage.UPLOAD_DIR", tmp_path):
+        response = await evidence_service_instance.export_case_evidence(
+            sample_case.id, test_admin, archive_format="tar", category="other"
+        )
+        data = b"".join([chunk async for chunk in response.body_iterator])
+
+    archive = tarfile.open(fileobj=io.BytesIO(data))
+    files = [member.name for member in archive.getmembers() if member.isfile()]
+    assert files == [
+        "2301-01/test_folder/Lead.txt",
+        "2301-01/manifest.json",
+    ]
+
+    with pytest.raises(HTTPException) as excinfo:
+        await evidence_service_instance.export_case_evidence(
+            sample_case.id, test_admin, archive_format="rar"
+        )
+    assert excinfo.value.status_code == 400
 
-    mock_file_response.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_list_image_thumbnails(
+    evidence_service_instance: evidence_service.EvidenceService,
+    sample_case: models.Case,
+    test_admin: models.User,
+):
+    for title, content in [
+        ("Photo", "case/photo.JPG"),
+        ("Logo", "case/logo.svg"),
+        ("Report", "case/report.pdf"),
+    ]:
+        evidence_service_instance.db.add(
+            models.Evidence(
+                case_id=sample_case.id,
+                title=title,
+                evidence_type="file",
+                content=content,
+                created_by_id=test_admin.id,
+            )
+        )
+    evidence_service_instance.db.commit()
+
+    thumbnails = await evidence_service_instance.list_image_thumbnails(
+        sample_case.id, test_admin
+    )
+
+    assert [thumbnail["title"] for thumbnail in thumbnails] == ["Photo"]
+    evidence_id = thumbnails[0]["evidence_id"]
+    assert thumbnails[0]["thumbnail_url"] == (
+        f"/api/evidence/{evidence_id}/derivatives/thumbnail"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_evidence_derivative_unsupported_type(
+    evidence_service_instance: evidence_service.EvidenceService,
+    sample_case: models.Case,
+    test_admin: models.User,
+):
+    evidence = models.Evidence(
+        case_id=sample_case.id,
+        title="Logo",
+        evidence_type="file",
+        content="case/logo.svg",
+        file_hash="a" * 64,
+        created_by_id=test_admin.id,
+    )
+    evidence_service_instance.db.add(evidence)
+    evidence_service_instance.db.commit()
+
+    with pytest.raises(HTTPException) as exc_info:
+        await evidence_service_instance.get_evidence_derivative(
+            evidence.id, "thumbnail", test_admin
+        )
+    assert exc_info.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc_info:
+        await evidence_service_instance.get_evidence_derivative(
+            evidence.id, "poster", test_admin
+        )
+    assert exc_info.value.status_code == 404
 
 
 @pytest.mark.asyncio
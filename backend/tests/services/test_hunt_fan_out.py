@@ -0,0 +1,281 @@
+"""
+Tests for hunt mapping expressions and for_each fan-out steps
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.core.websocket_manager import websocket_manager
+from app.database.models import HuntExecution, User
+from app.hunts.base_hunt import HuntStepDefinition
+from app.hunts.hunt_context import HuntContext
+from app.hunts.hunt_executor import HuntExecutor
+
+DNS_OUTPUT = {
+    "results": [
+        {
+            "target": "example.com",
+            "results": [
+                {"type": "A", "records": ["1.1.1.1", "2.2.2.2"]},
+                {"type": "MX", "records": ["10 mail.example.com."]},
+            ],
+        }
+    ],
+    "result_count": 1,
+}
+
+
+def make_step(**kwargs) -> HuntStepDefinition:
+    return HuntStepDefinition(
+        step_id=kwargs.pop("step_id", "step"),
+        plugin_name=kwargs.pop("plugin_name", "test_plugin"),
+        display_name="Step",
+        description="Test step",
+        **kwargs,
+    )
+
+
+class TestHuntContextMapping:
+    """Test mapping expression resolution"""
+
+    @pytest.fixture
+    def context(self):
+        context = HuntContext({"domain": "example.com"})
+        context.set_step_output("dns", DNS_OUTPUT)
+        return context
+
+    def test_dotted_path(self, context):
+        assert context._resolve_mapping("initial.domain") == "example.com"
+        assert context._resolve_mapping("dns.result_count") == 1
+
+    def test_list_indexing(self, context):
+        assert (
+            context._resolve_mapping("dns.results[0].results[0].records[0]")
+            == "1.1.1.1"
+        )
+        assert context._resolve_mapping("dns.results[0].results[-1].type") == "MX"
+        assert context._resolve_mapping("dns.results[5].target") is None
+
+    def test_wildcards_flatten(self, context):
+        assert context._resolve_mapping("dns.results[*].results[*].records[*]") == [
+            "1.1.1.1",
+            "2.2.2.2",
+            "10 mail.example.com.",
+        ]
+        assert context._resolve_mapping("dns.results[0].results[*].type") == [
+            "A",
+            "MX",
+        ]
+
+    def test_wildcard_skips_missing_values(self):
+        context = HuntContext({})
+        context.set_step_output(
+            "subs", {"results": [{"ip": "1.1.1.1"}, {"ip": None}, {"status": "done"}]}
+        )
+
+        assert context._resolve_mapping("subs.results[*].ip") == ["1.1.1.1"]
+
+
+class TestHuntExecutorFanOut:
+    """Test for_each steps in the hunt executor"""
+
+    @pytest.fixture
+    def executor(self, db_session):
+        db_session.add = MagicMock()
+        db_session.commit = MagicMock()
+        return HuntExecutor(db_session)
+
+    @pytest.fixture
+    def user(self):
+        return User(
+            id=1,
+            username="test",
+            email="test@test.com",
+            password_hash="hash",
+            role="Admin",
+        )
+
+    def make_plugin(self, calls, fail_on=()):
+        plugin = MagicMock()
+
+        async def execute(params):
+            calls.append(params["query"])
+            if params["query"] in fail_on:
+                raise Exception(f"lookup failed for {params['query']}")
+            yield {"type": "data", "data": {"ip": params["query"]}}
+
+        plugin.execute_with_evidence_collection = execute
+        plugin.save_collected_evidence = AsyncMock()
+        return plugin
+
+    @pytest.mark.asyncio
+    async def test_for_each_runs_plugin_per_unique_item(self, executor, user):
+        calls = []
+        executor.plugin_service.get_plugin = MagicMock(
+            return_value=self.make_plugin(calls)
+        )
+        step = make_step(
+            parameter_mapping={"query": "initial.ips"},
+            for_each="query",
+            for_each_concurrency=2,
+        )
+
+        output = await executor._execute_for_each(
+            step, {"query": ["1.1.1.1", "2.2.2.2", "1.1.1.1"], "case_id": 1}, user
+        )
+
+        assert sorted(calls) == ["1.1.1.1", "2.2.2.2"]
+        assert output["result_count"] == 2
+        assert output["for_each"]["item_count"] == 2
+        assert output["for_each"]["failed_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_for_each_dedupes_unhashable_items(self, executor, user):
+        calls = []
+        plugin = self.make_plugin(calls)
+
+        async def execute(params):
+            calls.append(params["query"])
+            yield {"type": "data", "data": params["query"]}
+
+        plugin.execute_with_evidence_collection = execute
+        executor.plugin_service.get_plugin = MagicMock(return_value=plugin)
+        step = make_step(for_each="query")
+
+        output = await executor._execute_for_each(
+            step,
+            {"query": [{"ip": "1.1.1.1", "port": 80}, {"port": 80, "ip": "1.1.1.1"}]},
+            user,
+        )
+
+        assert calls == [{"ip": "1.1.1.1", "port": 80}]
+        assert output["for_each"]["item_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_for_each_caps_items(self, executor, user):
+        calls = []
+        executor.plugin_service.get_plugin = MagicMock(
+            return_value=self.make_plugin(calls)
+        )
+        step = make_step(for_each="query", for_each_max_items=2)
+
+        output = await executor._execute_for_each(
+            step, {"query": ["a", "b", "c"]}, user
+        )
+
+        assert calls == ["a", "b"]
+        assert output["for_each"]["truncated"] is True
+
+    @pytest.mark.asyncio
+    async def test_for_each_records_item_errors(self, executor, user):
+        calls = []
+        executor.plugin_service.get_plugin = MagicMock(
+            return_value=self.make_plugin(calls, fail_on=("b",))
+        )
+        step = make_step(for_each="query")
+
+        output = await executor._execute_for_each(step, {"query": ["a", "b"]}, user)
+
+        assert output["result_count"] == 1
+        assert output["for_each"]["failed_count"] == 1
+        failed_item = output["for_each"]["items"][1]
+        assert failed_item["item"] == "b"
+        assert "lookup failed" in failed_item["error"]
+
+    @pytest.mark.asyncio
+    async def test_for_each_saves_evidence_after_items_finish(self, executor, user):
+        events = []
+        plugins = []
+
+        def get_plugin(name):
+            plugin = MagicMock()
+
+            async def execute(params):
+                events.append(("run", params["query"], params["save_to_case"]))
+                yield {"type": "data", "data": {"ip": params["query"]}}
+
+            async def save():
+                events.append(("save", plugin._current_params["query"]))
+
+            plugin.execute_with_evidence_collection = execute
+            plugin.save_collected_evidence = save
+            plugins.append(plugin)
+            return plugin
+
+        executor.plugin_service.get_plugin = MagicMock(side_effect=get_plugin)
+        step = make_step(for_each="query", for_each_concurrency=2)
+
+        await executor._execute_for_each(
+            step, {"query": ["a", "b"], "save_to_case": True, "case_id": 1}, user
+        )
+
+        # Items never write to the shared session while others are running
+        assert sorted(events[:2]) == [("run", "a", False), ("run", "b", False)]
+        assert events[2:] == [("save", "a"), ("save", "b")]
+        assert [plugin._evidence_results for plugin in plugins] == [
+            [{"ip": "a"}],
+            [{"ip": "b"}],
+        ]
+
+    @pytest.mark.asyncio
+    async def test_for_each_fails_when_all_items_fail(self, executor, user):
+        calls = []
+        executor.plugin_service.get_plugin = MagicMock(
+            return_value=self.make_plugin(calls, fail_on=("a",))
+        )
+        step = make_step(for_each="query")
+
+        with pytest.raises(RuntimeError):
+            await executor._execute_for_each(step, {"query": "a"}, user)
+
+    @pytest.mark.asyncio
+    async def test_hunt_fans_out_over_previous_step_output(self, executor, user):
+        calls = []
+        executor.plugin_service.get_plugin = MagicMock(
+            return_value=self.make_plugin(calls)
+        )
+
+        async def dns_execute(params):
+            yield {"type": "data", "data": DNS_OUTPUT["results"][0]}
+
+        dns_plugin = MagicMock()
+        dns_plugin.execute_with_evidence_collection = dns_execute
+        shodan_plugin = self.make_plugin(calls)
+        executor.plugin_service.get_plugin = MagicMock(
+            side_effect=lambda name: dns_plugin if name == "dns" else shodan_plugin
+        )
+
+        execution = HuntExecution(
+            id=1,
+            hunt_id=1,
+            case_id=1,
+            initial_parameters={},
+            created_by_id=1,
+        )
+        hunt_definition = {
+            "steps": [
+                make_step(step_id="dns_records", plugin_name="dns").dict(),
+                make_step(
+                    step_id="ips",
+                    plugin_name="shodan",
+                    depends_on=["dns_records"],
+                    parameter_mapping={
+                        "query": "dns_records.results[*].results[0].records[*]"
+                    },
+                    for_each="query",
+                ).dict(),
+            ]
+        }
+
+        with patch.object(
+            websocket_manager, "send_progress_update", new_callable=AsyncMock
+        ), patch.object(
+            websocket_manager, "send_step_complete", new_callable=AsyncMock
+        ), patch.object(
+            websocket_manager, "send_execution_complete", new_callable=AsyncMock
+        ):
+            await executor.execute_hunt(execution, hunt_definition, user)
+
+        assert execution.status == "completed"
+        assert sorted(calls) == ["1.1.1.1", "2.2.2.2"]
+        assert execution.context_data["step_outputs"]["ips"]["result_count"] == 2
@@ -0,0 +1,129 @@
+"""
+Tests for compiled hunt mapping expressions and hunt definition validation
+"""
+
+import pytest
+from app.hunts.base_hunt import BaseHunt, HuntStepDefinition
+from app.hunts.definitions.domain_hunt import DomainHunt
+from app.hunts.mapping import MappingExpressionError, compile_mapping
+
+OUTPUT = {
+    "results": [
+        {"type": "A", "records": ["1.1.1.1", "2.2.2.2"]},
+        {"type": "MX", "records": ["10 mail.example.com."]},
+        {"type": "A", "records": ["3.3.3.3"], "ttl": 60},
+    ]
+}
+
+
+class TestCompileMapping:
+    """Test parsing and evaluating mapping expressions"""
+
+    def test_compiled_once(self):
+        assert compile_mapping("step.results[0]") is compile_mapping("step.results[0]")
+
+    def test_root_and_keys(self):
+        mapping = compile_mapping("initial.domain")
+
+        assert mapping.root == "initial"
+        assert mapping.first_key == "domain"
+        assert mapping.evaluate({"domain": "example.com"}) == "example.com"
+
+    def test_filter_by_value(self):
+        mapping = compile_mapping("step.results[?(@.type=='A')].records[*]")
+
+        assert mapping.evaluate(OUTPUT) == ["1.1.1.1", "2.2.2.2", "3.3.3.3"]
+
+    def test_filter_not_equal_and_existence(self):
+        assert compile_mapping("s.results[?(@.type != 'A')].type").evaluate(OUTPUT) == [
+            "MX"
+        ]
+        assert compile_mapping("s.results[?(@.ttl)].records[0]").evaluate(OUTPUT) == [
+            "3.3.3.3"
+        ]
+
+    def test_default(self):
+        assert (
+            compile_mapping("s.results[9].type|default('none')").evaluate(OUTPUT)
+            == "none"
+        )
+        assert compile_mapping("s.missing[*]|default([])").evaluate(OUTPUT) == []
+        assert (
+            compile_mapping("s.results[0].type|default('none')").evaluate(OUTPUT) == "A"
+        )
+
+    @pytest.mark.parametrize(
+        "expression",
+        [
+            "",
+            ".results",
+            "step..results",
+            "step.results[",
+            "step.results[abc]",
+            "step.results[?(@.type=='A'",
+            "step.results|default(unquoted)",
+        ],
+    )
+    def test_malformed_expressions_rejected(self, expression):
+        with pytest.raises(MappingExpressionError):
+            compile_mapping(expression)
+
+
+class TestHuntDefinitionValidation:
+    """Test hunt definitions are validated before they are synced"""
+
+    def make_hunt(self, steps):
+        class TestHunt(BaseHunt):
+            def __init__(self):
+                super().__init__()
+                self.initial_parameters = {"domain": {"type": "string"}}
+
+            def get_steps(self):
+                return steps
+
+        return TestHunt()
+
+    def make_step(self, step_id, **kwargs):
+        return HuntStepDefinition(
+            step_id=step_id,
+            plugin_name="TestPlugin",
+            display_name=step_id,
+            description=step_id,
+            **kwargs,
+        )
+
+    def test_builtin_hunts_are_valid(self):
+        DomainHunt().validate_definition()
+
+    def test_valid_definition(self):
+        hunt = self.make_hunt(
+            [
+                self.make_step("first", parameter_mapping={"domain": "initial.domain"}),
+                self.make_step(
+                    "second",
+                    depends_on=["first"],
+                    parameter_mapping={"query": "first.results[*].ip"},
+                    for_each="query",
+                ),
+            ]
+        )
+
+        hunt.validate_definition()
+
+    @pytest.mark.parametrize(
+        "step_kwargs, message",
+        [
+            ({"parameter_mapping": {"domain": "initial.domian"}}, "domian"),
+            ({"parameter_mapping": {"domain": "initial.domain["}}, "Unexpected"),
+            ({"parameter_mapping": {"q": "first.results"}}, "not in depends_on"),
+            ({"depends_on": ["missing"]}, "unknown step"),
+            ({"for_each": "query"}, "is not mapped"),
+        ],
+    )
+    def test_invalid_definitions_rejected(self, step_kwargs, message):
+        hunt = self.make_hunt(
+            [self.make_step("first"), self.make_step("second", **step_kwargs)]
+        )
+
+        with pytest.raises(ValueError, match=message):
+            hunt.validate_definition()
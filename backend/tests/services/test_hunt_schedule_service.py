@@ -0,0 +1,395 @@
+"""
+Tests for HuntScheduleService and delta detection in scheduled hunt runs
+"""
+
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from app.core.utils import get_utc_now
+from app.database.models import (
+    Case,
+    CaseUserLink,
+    Client,
+    Hunt,
+    HuntExecution,
+    HuntSchedule,
+    HuntStep,
+    User,
+)
+from app.hunts.hunt_executor import HuntExecutor, result_fingerprint
+from app.schemas.hunt_schema import HuntScheduleUpdate
+from app.services.hunt_schedule_service import HuntScheduleService
+from fastapi import HTTPException
+from sqlmodel import Session, delete
+
+
+@pytest.fixture(name="schedule_service")
+def schedule_service_fixture(session: Session):
+    return HuntScheduleService(session)
+
+
+@pytest.fixture(name="test_user")
+def test_user_fixture(session: Session):
+    user = User(
+        username="testuser",
+        email="test@example.com",
+        password_hash="hashed_password",
+        role="Investigator",
+        is_active=True,
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+@pytest.fixture(name="test_case")
+def test_case_fixture(session: Session, test_user: User):
+    client = Client(name="Test Client", contact_email="client@example.com")
+    session.add(client)
+    session.commit()
+
+    case = Case(
+        client_id=client.id,
+        case_number="TEST-001",
+        title="Test Case",
+        status="Open",
+        notes="Test case description",
+    )
+    session.add(case)
+    session.commit()
+    session.refresh(case)
+
+    session.add(CaseUserLink(case_id=case.id, user_id=test_user.id))
+    session.commit()
+    return case
+
+
+@pytest.fixture(name="test_hunt")
+def test_hunt_fixture(session: Session):
+    hunt = Hunt(
+        name="test_hunt",
+        display_name="Test Hunt",
+        description="Test Hunt Description",
+        category="test",
+        definition_json={"steps": []},
+    )
+    session.add(hunt)
+    session.commit()
+    session.refresh(hunt)
+    return hunt
+
+
+@pytest.fixture(name="due_schedule")
+def due_schedule_fixture(
+    session: Session, test_hunt: Hunt, test_case: Case, test_user: User
+):
+    schedule = HuntSchedule(
+        hunt_id=test_hunt.id,
+        case_id=test_case.id,
+        cron_expression="0 6 * * *",
+        initial_parameters={"domain": "example.com"},
+        next_run_at=get_utc_now() - timedelta(minutes=1),
+        created_by_id=test_user.id,
+    )
+    session.add(schedule)
+    session.commit()
+    session.refresh(schedule)
+    return schedule
+
+
+class TestHuntScheduleService:
+    """Test creating and running hunt schedules"""
+
+    @pytest.mark.asyncio
+    async def test_create_schedule(
+        self, schedule_service, test_hunt, test_case, test_user
+    ):
+        schedule = await schedule_service.create_schedule(
+            test_hunt.id,
+            test_case.id,
+            "0 6 * * *",
+            {"domain": "example.com"},
+            current_user=test_user,
+        )
+
+        assert schedule.id is not None
+        assert schedule.is_active
+        assert schedule.next_run_at.hour == 6
+        assert schedule.initial_parameters == {"domain": "example.com"}
+
+    @pytest.mark.asyncio
+    async def test_create_schedule_rejects_invalid_cron(
+        self, schedule_service, test_hunt, test_case, test_user
+    ):
+        with pytest.raises(ValueError):
+            await schedule_service.create_schedule(
+                test_hunt.id, test_case.id, "every day", {}, current_user=test_user
+            )
+
+    @pytest.mark.asyncio
+    async def test_analyst_cannot_create_schedule(
+        self, session, schedule_service, test_hunt, test_case
+    ):
+        analyst = User(
+            username="analyst",
+            email="analyst@example.com",
+            password_hash="hashed_password",
+            role="Analyst",
+        )
+        session.add(analyst)
+        session.commit()
+
+        with pytest.raises(HTTPException):
+            await schedule_service.create_schedule(
+                test_hunt.id, test_case.id, "@daily", {}, current_user=analyst
+            )
+
+    @pytest.mark.asyncio
+    async def test_update_schedule_pauses(
+        self, schedule_service, due_schedule, test_user
+    ):
+        schedule = await schedule_service.update_schedule(
+            due_schedule.id,
+            HuntScheduleUpdate(is_active=False, cron_expression="@hourly"),
+            current_user=test_user,
+        )
+
+        assert not schedule.is_active
+        assert schedule.cron_expression == "@hourly"
+        assert schedule.next_run_at.minute == 0
+
+    @pytest.mark.asyncio
+    @patch("app.services.hunt_service.HuntService._run_hunt_async")
+    async def test_run_due_schedules_starts_execution(
+        self, mock_run, session, schedule_service, due_schedule, test_user
+    ):
+        previous = HuntExecution(
+            hunt_id=due_schedule.hunt_id,
+            case_id=due_schedule.case_id,
+            initial_parameters={"domain": "example.com"},
+            status="completed",
+            completed_at=get_utc_now(),
+            created_by_id=test_user.id,
+        )
+        session.add(previous)
+        session.commit()
+
+        started = await schedule_service.run_due_schedules()
+
+        assert len(started) == 1
+        execution = session.get(HuntExecution, started[0])
+        assert execution.initial_parameters == {"domain": "example.com"}
+        mock_run.assert_called_once_with(execution.id, test_user.id, previous.id)
+
+        session.refresh(due_schedule)
+        assert due_schedule.last_execution_id == execution.id
+        assert due_schedule.next_run_at.replace(tzinfo=None) > get_utc_now().replace(
+            tzinfo=None
+        )
+
+    def test_baseline_ignores_runs_with_other_parameters(
+        self, session, schedule_service, due_schedule, test_user
+    ):
+        now = get_utc_now()
+        for domain, minutes_ago in (("example.com", 10), ("example.org", 1)):
+            session.add(
+                HuntExecution(
+                    hunt_id=due_schedule.hunt_id,
+                    case_id=due_schedule.case_id,
+                    initial_parameters={"domain": domain},
+                    status="completed",
+                    completed_at=now - timedelta(minutes=minutes_ago),
+                    created_by_id=test_user.id,
+                )
+            )
+        session.commit()
+
+        previous = schedule_service._previous_successful_execution(due_schedule)
+
+        assert previous.initial_parameters == {"domain": "example.com"}
+
+    @pytest.mark.asyncio
+    @patch("app.services.hunt_service.HuntService._run_hunt_async")
+    async def test_run_due_schedules_runs_once_per_slot(
+        self, mock_run, schedule_service, due_schedule
+    ):
+        assert len(await schedule_service.run_due_schedules()) == 1
+        assert await schedule_service.run_due_schedules() == []
+
+    @pytest.mark.asyncio
+    @patch("app.services.hunt_service.HuntService._run_hunt_async")
+    async def test_skips_while_previous_run_active(
+        self, mock_run, session, schedule_service, due_schedule, test_user
+    ):
+        running = HuntExecution(
+            hunt_id=due_schedule.hunt_id,
+            case_id=due_schedule.case_id,
+            initial_parameters={},
+            status="running",
+            created_by_id=test_user.id,
+        )
+        session.add(running)
+        session.commit()
+        due_schedule.last_execution_id = running.id
+        session.add(due_schedule)
+        session.commit()
+
+        assert await schedule_service.run_due_schedules() == []
+        mock_run.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_deactivates_when_owner_inactive(
+        self, session, schedule_service, due_schedule, test_user
+    ):
+        test_user.is_active = False
+        session.add(test_user)
+        session.commit()
+
+        assert await schedule_service.run_due_schedules() == []
+
+        session.refresh(due_schedule)
+        assert not due_schedule.is_active
+
+    @pytest.mark.asyncio
+    async def test_deactivates_when_case_access_lost(
+        self, session, schedule_service, due_schedule, test_user
+    ):
+        session.exec(delete(CaseUserLink).where(CaseUserLink.user_id == test_user.id))
+        session.commit()
+
+        assert await schedule_service.run_due_schedules() == []
+
+        session.refresh(due_schedule)
+        assert not due_schedule.is_active
+
+    @pytest.mark.asyncio
+    async def test_stays_active_after_transient_error(
+        self, session, schedule_service, due_schedule
+    ):
+        with patch(
+            "app.services.hunt_schedule_service.HuntService.create_execution",
+            AsyncMock(side_effect=RuntimeError("database is locked")),
+        ):
+            assert await schedule_service.run_due_schedules() == []
+
+        session.refresh(due_schedule)
+        assert due_schedule.is_active
+
+
+class TestHuntExecutorDelta:
+    """Test diffing step results against a previous execution"""
+
+    @pytest.fixture
+    def executor(self, session):
+        return HuntExecutor(session)
+
+    def make_plugin(self, results):
+        plugin = MagicMock()
+        plugin.save_collected_evidence = AsyncMock()
+        plugin.seen_params = []
+
+        async def execute(params):
+            plugin.seen_params.append(params)
+            for result in results:
+                yield {"type": "data", "data": result}
+
+        plugin.execute_with_evidence_collection = execute
+        return plugin
+
+    def test_fingerprint_ignores_fields(self):
+        first = {"domain": "example.com", "domain_age_days": 100}
+        second = {"domain": "example.com", "domain_age_days": 101}
+
+        assert result_fingerprint(first) != result_fingerprint(second)
+        assert result_fingerprint(first, ["domain_age_days"]) == result_fingerprint(
+            second, ["domain_age_days"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_run_plugin_saves_only_new_results(self, executor):
+        old, new = {"ip": "1.1.1.1"}, {"ip": "2.2.2.2"}
+        plugin = self.make_plugin([old, new])
+        executor.plugin_service.get_plugin = MagicMock(return_value=plugin)
+
+        results = await executor._run_plugin(
+            "TestPlugin",
+            {"query": "example.com", "save_to_case": True, "case_id": 1},
+            None,
+            known_results={result_fingerprint(old)},
+        )
+
+        assert results == [old, new]
+        assert plugin.seen_params[0]["save_to_case"] is False
+        assert plugin._evidence_results == [new]
+        assert plugin._current_params["save_to_case"] is True
+        plugin.save_collected_evidence.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_run_plugin_saves_nothing_when_unchanged(self, executor):
+        old = {"ip": "1.1.1.1"}
+        plugin = self.make_plugin([old])
+        executor.plugin_service.get_plugin = MagicMock(return_value=plugin)
+
+        await executor._run_plugin(
+            "TestPlugin",
+            {"save_to_case": True, "case_id": 1},
+            None,
+            known_results={result_fingerprint(old)},
+        )
+
+        plugin.save_collected_evidence.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_execute_hunt_records_delta(
+        self, session, executor, test_hunt, test_case, test_user
+    ):
+        previous = HuntExecution(
+            hunt_id=test_hunt.id,
+            case_id=test_case.id,
+            initial_parameters={},
+            status="completed",
+            created_by_id=test_user.id,
+        )
+        session.add(previous)
+        session.commit()
+        session.add(
+            HuntStep(
+                execution_id=previous.id,
+                step_id="lookup",
+                plugin_name="TestPlugin",
+                status="completed",
+                parameters={},
+                output={"results": [{"ip": "1.1.1.1"}]},
+            )
+        )
+        execution = HuntExecution(
+            hunt_id=test_hunt.id,
+            case_id=test_case.id,
+            initial_parameters={"domain": "example.com"},
+            created_by_id=test_user.id,
+        )
+        session.add(execution)
+        session.commit()
+
+        plugin = self.make_plugin([{"ip": "1.1.1.1"}, {"ip": "3.3.3.3"}])
+        executor.plugin_service.get_plugin = MagicMock(return_value=plugin)
+        definition = {
+            "steps": [
+                {
+                    "step_id": "lookup",
+                    "plugin_name": "TestPlugin",
+                    "display_name": "Lookup",
+                    "description": "Lookup",
+                    "parameter_mapping": {"domain": "initial.domain"},
+                }
+            ]
+        }
+
+        await executor.execute_hunt(execution, definition, test_user, previous)
+
+        step = next(step for step in execution.steps if step.step_id == "lookup")
+        assert step.output["result_count"] == 2
+        assert step.output["delta"] == {"new_count": 1, "previous_count": 1}
+        assert plugin._evidence_results == [{"ip": "3.3.3.3"}]
@@ -7,8 +7,8 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 from app.database.models import Case, Client, Hunt, HuntExecution, HuntStep, User
-from app.hunts import BaseHunt
-from app.services.hunt_service import HuntService
+from app.hunts import BaseHunt, HuntStepDefinition
+from app.services.hunt_service import HuntService, invalidate_hunt_definitions
 from sqlmodel import Session, select
 
 
@@ -142,13 +142,58 @@ def test_hunt_execution_fixture(
 class TestHuntService:
     """Test suite for HuntService."""
 
-    @patch("app.services.hunt_service.HuntService._load_hunt_definitions")
-    def test_init(self, mock_load_definitions, session: Session):
+    @patch("app.services.hunt_service.HuntService._sync_hunts_to_db")
+    def test_init(self, mock_sync, session: Session):
         """Test HuntService initialization."""
         service = HuntService(session)
-        mock_load_definitions.assert_called_once()
+        mock_sync.assert_called_once()
         assert service.db is session
 
+    @patch("app.services.hunt_service.HuntService._sync_hunts_to_db")
+    @patch("app.services.hunt_service.HuntService._load_hunt_definitions")
+    def test_init_syncs_only_once(self, mock_load, mock_sync, session: Session):
+        """Test hunts are only discovered and synced on first construction."""
+        HuntService(session)
+        HuntService(session)
+
+        assert mock_sync.call_count == 1
+        assert mock_load.call_count <= 1
+
+    @patch("app.services.hunt_service.HuntService._sync_hunts_to_db")
+    def test_invalidate_triggers_resync(self, mock_sync, session: Session):
+        """Test invalidating hunt definitions re-syncs on next construction."""
+        HuntService(session)
+        invalidate_hunt_definitions()
+        HuntService(session)
+
+        assert mock_sync.call_count == 2
+
+    def test_sync_skips_unchanged_hunts(
+        self, hunt_service: HuntService, session: Session
+    ):
+        """Test re-syncing unchanged hunts does not rewrite them."""
+        hunt = session.exec(select(Hunt).where(Hunt.name == "DomainHunt")).first()
+        assert hunt is not None
+
+        with patch.object(session, "commit") as mock_commit:
+            hunt_service._sync_hunts_to_db()
+
+        mock_commit.assert_not_called()
+
+    def test_sync_updates_changed_hunts(
+        self, hunt_service: HuntService, session: Session
+    ):
+        """Test a hunt whose stored definition differs is rewritten."""
+        hunt = session.exec(select(Hunt).where(Hunt.name == "DomainHunt")).first()
+        hunt.description = "Outdated description"
+        session.add(hunt)
+        session.commit()
+
+        hunt_service._sync_hunts_to_db()
+
+        session.refresh(hunt)
+        assert hunt.description != "Outdated description"
+
     def test_load_hunt_definitions(self, hunt_service: HuntService, session: Session):
         """Test loading hunt definitions from modules."""
         # Verify that hunt definitions were loaded during service initialization
@@ -194,6 +239,100 @@ class TestHuntService:
         assert hunt.display_name == "Mock Hunt"
         assert hunt.is_active is True
 
+    def test_sync_skips_invalid_hunts(self, hunt_service: HuntService):
+        """Test hunts with broken mappings are not synced."""
+
+        class BrokenHunt(BaseHunt):
+            def get_steps(self):
+                return [
+                    HuntStepDefinition(
+                        step_id="step1",
+                        plugin_name="TestPlugin",
+                        display_name="Step 1",
+                        description="Step with a typo in its mapping",
+                        parameter_mapping={"domain": "initial.domain["},
+                    )
+                ]
+
+        hunt_service._hunt_classes = {"BrokenHunt": BrokenHunt}
+
+        hunt_service._sync_hunts_to_db()
+
+        hunt = hunt_service.db.exec(
+            select(Hunt).where(Hunt.name == "BrokenHunt")
+        ).first()
+        assert hunt is None
+        assert "BrokenHunt" not in hunt_service._hunt_classes
+
+    def test_sync_deactivates_hunts_that_became_invalid(
+        self, hunt_service: HuntService, session: Session
+    ):
+        """Test a stored hunt whose definition no longer validates is deactivated."""
+
+        class BrokenHunt(BaseHunt):
+            def get_steps(self):
+                return [
+                    HuntStepDefinition(
+                        step_id="step1",
+                        plugin_name="TestPlugin",
+                        display_name="Step 1",
+                        description="Step with a typo in its mapping",
+                        parameter_mapping={"domain": "initial.domain["},
+                    )
+                ]
+
+        session.add(
+            Hunt(
+                name="BrokenHunt",
+                display_name="Broken Hunt",
+                description="Valid before its last edit",
+                category="test",
+                version="1.0",
+                definition_json={"steps": []},
+                is_active=True,
+            )
+        )
+        session.commit()
+        hunt_service._hunt_classes = {"BrokenHunt": BrokenHunt}
+
+        invalid_hunts = hunt_service._sync_hunts_to_db()
+
+        hunt = session.exec(select(Hunt).where(Hunt.name == "BrokenHunt")).first()
+        assert invalid_hunts == ["BrokenHunt"]
+        assert hunt.is_active is False
+
+    def test_sync_reactivates_fixed_hunts(
+        self, hunt_service: HuntService, session: Session
+    ):
+        """Test a deactivated hunt is offered again once its definition is valid."""
+        hunt = session.exec(select(Hunt).where(Hunt.name == "DomainHunt")).first()
+        hunt.is_active = False
+        session.add(hunt)
+        session.commit()
+
+        assert hunt_service._sync_hunts_to_db() == []
+
+        session.refresh(hunt)
+        assert hunt.is_active is True
+
+    def test_rediscover_swaps_in_a_new_registry(self, hunt_service: HuntService):
+        """Test a reload never empties the registry other requests are reading."""
+        registry = hunt_service._hunt_classes
+        loaded = dict(registry)
+
+        hunt_service.reload_hunts(rediscover=True)
+
+        assert registry == loaded
+        assert hunt_service._hunt_classes is not registry
+        assert HuntService(hunt_service.db)._hunt_classes is hunt_service._hunt_classes
+
+    def test_reload_hunts_reports_loaded_and_invalid(self, hunt_service: HuntService):
+        """Test reloading returns the loaded hunt names and the rejected ones."""
+        result = hunt_service.reload_hunts()
+
+        assert "DomainHunt" in result["loaded"]
+        assert result["invalid"] == []
+
     @pytest.mark.asyncio
     async def test_list_hunts(
         self, hunt_service: HuntService, test_hunt: Hunt, test_user: User
@@ -0,0 +1,227 @@
+"""
+Tests for PluginRunService detached plugin runs
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from app.core.config import plugin_run_settings
+from app.core.exceptions import AuthorizationException, ValidationException
+from app.database.models import PluginRun, User
+from app.services.plugin_run_service import (
+    PluginRunService,
+    _active_runs,
+    fail_interrupted_runs,
+)
+from sqlmodel import Session, select
+
+
+@pytest.fixture(name="test_user")
+def test_user_fixture(session: Session):
+    user = User(
+        username="testuser",
+        email="test@example.com",
+        password_hash="hashed_password",
+        role="Investigator",
+    )
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+@pytest.fixture(name="run_service")
+def run_service_fixture(session: Session):
+    with patch("app.services.plugin_run_service.get_db") as mock_get_db, patch(
+        "app.services.plugin_run_service.PluginService.get_plugin"
+    ):
+        # Background runs get their own session, on the test's connection
+        mock_get_db.side_effect = lambda: iter([Session(bind=session.bind)])
+        yield PluginRunService(session)
+
+
+def mock_results(count, fail=False, delay=0.0):
+    async def results():
+        for index in range(count):
+            if delay:
+                await asyncio.sleep(delay)
+            yield {"type": "data", "data": {"index": index}}
+        if fail:
+            raise RuntimeError("plugin crashed")
+
+    return results()
+
+
+async def wait_for_run(run_id):
+    task = _active_runs.get(run_id)
+    if task:
+        await asyncio.wait_for(asyncio.shield(task), 5)
+
+
+class TestPluginRunService:
+    """Test running plugins in the background"""
+
+    @pytest.mark.asyncio
+    @patch("app.services.plugin_run_service.PluginService.execute_plugin")
+    async def test_run_persists_results(
+        self, mock_execute, session, run_service, test_user
+    ):
+        mock_execute.return_value = mock_results(5)
+
+        run = await run_service.start_run(
+            "TestPlugin", {"domain": "example.com"}, current_user=test_user
+        )
+        await wait_for_run(run.id)
+
+        run = session.get(PluginRun, run.id)
+        session.refresh(run)
+        assert run.status == "completed"
+        assert run.result_count == 5
+        assert run.completed_at is not None
+
+        page = await run_service.get_results(run.id, 2, 2, current_user=test_user)
+        assert [result.seq for result in page] == [2, 3]
+        assert page[0].data == {"index": 2}
+
+    @pytest.mark.asyncio
+    @patch("app.services.plugin_run_service.PluginService.execute_plugin")
+    async def test_follow_results_from_offset(
+        self, mock_execute, run_service, test_user
+    ):
+        mock_execute.return_value = mock_results(4)
+        run = await run_service.start_run("TestPlugin", {}, current_user=test_user)
+        await wait_for_run(run.id)
+
+        items = [
+            item
+            async for item in run_service.follow_results(
+                run.id, 2, current_user=test_user
+            )
+        ]
+
+        assert [item["offset"] for item in items] == [2, 3, 4]
+        assert items[-1]["type"] == "run_complete"
+        assert items[-1]["data"]["status"] == "completed"
+
+    @pytest.mark.asyncio
+    @patch("app.services.plugin_run_service.PluginService.execute_plugin")
+    async def test_follow_results_while_running(
+        self, mock_execute, run_service, test_user
+    ):
+        mock_execute.return_value = mock_results(3, delay=0.02)
+
+        with patch.object(plugin_run_settings, "PLUGIN_RUN_FLUSH_ITEMS", 1):
+            run = await run_service.start_run("TestPlugin", {}, current_user=test_user)
+            items = [
+                item
+                async for item in run_service.follow_results(
+                    run.id, current_user=test_user
+                )
+            ]
+
+        assert [item["data"].get("index") for item in items[:3]] == [0, 1, 2]
+        assert items[-1]["type"] == "run_complete"
+
+    @pytest.mark.asyncio
+    @patch("app.services.plugin_run_service.PluginService.execute_plugin")
+    async def test_failed_run_keeps_partial_results(
+        self, mock_execute, session, run_service, test_user
+    ):
+        mock_execute.return_value = mock_results(2, fail=True)
+
+        run = await run_service.start_run("TestPlugin", {}, current_user=test_user)
+        await wait_for_run(run.id)
+
+        run = session.get(PluginRun, run.id)
+        session.refresh(run)
+        assert run.status == "failed"
+        assert run.error == "plugin crashed"
+        assert run.result_count == 2
+
+    @pytest.mark.asyncio
+    @patch("app.services.plugin_run_service.PluginService.execute_plugin")
+    async def test_unstorable_result_fails_run(
+        self, mock_execute, session, run_service, test_user
+    ):
+        async def results():
+            yield {"type": "data", "data": {"value": object()}}
+
+        mock_execute.return_value = results()
+
+        run = await run_service.start_run("TestPlugin", {}, current_user=test_user)
+        await wait_for_run(run.id)
+
+        run = session.get(PluginRun, run.id)
+        session.refresh(run)
+        assert run.status == "failed"
+        assert run.error
+        assert run.completed_at is not None
+
+    def test_interrupted_runs_fail_at_startup(self, session, test_user):
+        for status in ("pending", "running", "completed"):
+            session.add(
+                PluginRun(
+                    plugin_name="TestPlugin",
+                    parameters={},
+                    status=status,
+                    created_by_id=test_user.id,
+                )
+            )
+        session.commit()
+
+        assert fail_interrupted_runs(session) == 2
+        statuses = session.exec(select(PluginRun.status)).all()
+        assert sorted(statuses) == ["completed", "failed", "failed"]
+
+    @pytest.mark.asyncio
+    @patch("app.services.plugin_run_service.PluginService.execute_plugin")
+    async def test_cancel_run(self, mock_execute, run_service, test_user):
+        mock_execute.return_value = mock_results(1000, delay=0.01)
+
+        run = await run_service.start_run("TestPlugin", {}, current_user=test_user)
+        await asyncio.sleep(0.05)
+        run = await run_service.cancel_run(run.id, current_user=test_user)
+
+        assert run.status == "cancelled"
+        assert run.result_count < 1000
+
+        with pytest.raises(ValidationException):
+            await run_service.cancel_run(run.id, current_user=test_user)
+
+    @pytest.mark.asyncio
+    async def test_active_run_limit(self, session, run_service, test_user):
+        for _ in range(plugin_run_settings.PLUGIN_RUN_MAX_ACTIVE_PER_USER):
+            session.add(
+                PluginRun(
+                    plugin_name="TestPlugin",
+                    parameters={},
+                    status="running",
+                    created_by_id=test_user.id,
+                )
+            )
+        session.commit()
+
+        with pytest.raises(ValidationException):
+            await run_service.start_run("TestPlugin", {}, current_user=test_user)
+
+    @pytest.mark.asyncio
+    async def test_other_users_cannot_read_run(self, session, run_service, test_user):
+        run = PluginRun(
+            plugin_name="TestPlugin",
+            parameters={},
+            status="completed",
+            created_by_id=test_user.id,
+        )
+        other = User(
+            username="other",
+            email="other@example.com",
+            password_hash="hashed_password",
+            role="Investigator",
+        )
+        session.add(run)
+        session.add(other)
+        session.commit()
+
+        with pytest.raises(AuthorizationException):
+            await run_service.get_results(run.id, current_user=other)
@@ -0,0 +1,191 @@
+"""
+Tests for full-text search over evidence
+"""
+
+from unittest.mock import patch
+
+import pytest
+from app.core.exceptions import AuthorizationException
+from app.database import models
+from app.services.search_service import SearchService
+from sqlmodel import Session
+
+
+@pytest.fixture(name="upload_dir")
+def upload_dir_fixture(tmp_path):
+    with patch("app.core.file_storage.UPLOAD_DIR", tmp_path):
+        yield tmp_path
+
+
+@pytest.fixture(name="other_case")
+def other_case_fixture(session: Session, test_client, test_admin):
+    case = models.Case(
+        case_number="TEST-002",
+        case_name="Unassigned Case",
+        client_id=test_client.id,
+        created_by_id=test_admin.id,
+    )
+    session.add(case)
+    session.commit()
+    session.refresh(case)
+    return case
+
+
+def add_evidence(session, case, user, title, content, evidence_type="file", **kwargs):
+    evidence = models.Evidence(
+        case_id=case.id,
+        title=title,
+        evidence_type=evidence_type,
+        content=content,
+        created_by_id=user.id,
+        **kwargs,
+    )
+    session.add(evidence)
+    session.flush()
+    SearchService(session).queue_evidence(evidence)
+    session.commit()
+    return evidence
+
+
+def store_file(upload_dir, path, content: bytes):
+    (upload_dir / path).parent.mkdir(parents=True, exist_ok=True)
+    (upload_dir / path).write_bytes(content)
+
+
+@pytest.mark.asyncio
+async def test_indexes_and_ranks_file_content(
+    session: Session, upload_dir, test_case, test_admin
+):
+    store_file(upload_dir, "case/notes.txt", b"Contact alice@example.com today")
+    store_file(
+        upload_dir,
+        "case/profile.html",
+        b"<html><script>var x = 'bob';</script><p>Profile of bob_handle</p></html>",
+    )
+    notes = add_evidence(session, test_case, test_admin, "notes.txt", "case/notes.txt")
+    profile = add_evidence(
+        session, test_case, test_admin, "profile.html", "case/profile.html"
+    )
+    service = SearchService(session)
+
+    assert await service.index_pending(10) == 2
+
+    results = await service.search("alice@example.com", test_admin)
+    assert [result["evidence_id"] for result in results] == [notes.id]
+    assert "**" in results[0]["snippet"]
+
+    results = await service.search("bob_handle", test_admin)
+    assert [result["evidence_id"] for result in results] == [profile.id]
+    # Script contents are not part of the visible text
+    assert await service.search("var", test_admin) == []
+
+
+@pytest.mark.asyncio
+async def test_title_matches_rank_first(session: Session, test_case, test_admin):
+    in_content = add_evidence(
+        session, test_case, test_admin, "Note", "seen at the harbour", "text"
+    )
+    in_title = add_evidence(
+        session, test_case, test_admin, "Harbour", "nothing", "text"
+    )
+    service = SearchService(session)
+    await service.index_pending(10)
+
+    results = await service.search("harbour", test_admin)
+
+    assert [result["evidence_id"] for result in results] == [in_title.id, in_content.id]
+
+
+@pytest.mark.asyncio
+async def test_unsupported_files_are_found_by_title(
+    session: Session, upload_dir, test_case, test_admin
+):
+    evidence = add_evidence(
+        session,
+        test_case,
+        test_admin,
+        "photo.png",
+        "case/photo.png",
+        description="Suspect vehicle",
+    )
+    service = SearchService(session)
+    await service.index_pending(10)
+
+    document = session.get(models.EvidenceSearchDocument, evidence.id)
+    assert document.status == "unsupported"
+    results = await service.search("vehicle", test_admin)
+    assert [result["evidence_id"] for result in results] == [evidence.id]
+
+
+@pytest.mark.asyncio
+async def test_missing_file_is_marked_failed(
+    session: Session, upload_dir, test_case, test_admin
+):
+    evidence = add_evidence(session, test_case, test_admin, "gone.txt", "case/gone.txt")
+
+    await SearchService(session).index_pending(10)
+
+    document = session.get(models.EvidenceSearchDocument, evidence.id)
+    assert document.status == "failed"
+    assert await SearchService(session).index_pending(10) == 0
+
+
+@pytest.mark.asyncio
+async def test_search_is_scoped_to_accessible_cases(
+    session: Session, test_case, other_case, test_admin, test_user
+):
+    session.add(models.CaseUserLink(case_id=test_case.id, user_id=test_user.id))
+    session.commit()
+    visible = add_evidence(
+        session, test_case, test_admin, "Lead", "shared term", "text"
+    )
+    add_evidence(session, other_case, test_admin, "Lead", "shared term", "text")
+    service = SearchService(session)
+    await service.index_pending(10)
+
+    results = await service.search("shared", test_user)
+    assert [result["evidence_id"] for result in results] == [visible.id]
+    assert len(await service.search("shared", test_admin)) == 2
+
+    with pytest.raises(AuthorizationException):
+        await service.search("shared", test_user, case_id=other_case.id)
+
+
+@pytest.mark.asyncio
+async def test_edits_and_deletions_update_the_index(
+    session: Session, test_case, test_admin
+):
+    evidence = add_evidence(session, test_case, test_admin, "Draft", "body", "text")
+    service = SearchService(session)
+    await service.index_pending(10)
+
+    evidence.title = "Renamed"
+    service.update_evidence(evidence)
+    session.commit()
+    assert len(await service.search("renamed", test_admin)) == 1
+
+    service.remove_evidence([evidence.id])
+    session.delete(evidence)
+    session.commit()
+    assert await service.search("renamed", test_admin) == []
+
+
+@pytest.mark.asyncio
+async def test_existing_evidence_is_queued(session: Session, test_case, test_admin):
+    evidence = models.Evidence(
+        case_id=test_case.id,
+        title="Old note",
+        evidence_type="text",
+        content="from before search",
+        created_by_id=test_admin.id,
+    )
+    session.add(evidence)
+    session.commit()
+    service = SearchService(session)
+
+    service.queue_unindexed_evidence()
+    await service.index_pending(10)
+
+    document = session.get(models.EvidenceSearchDocument, evidence.id)
+    assert document.status == "indexed"
+    assert len(await service.search("before", test_admin)) == 1
@@ -35,6 +35,7 @@ from app.services.system_config_service import (
     # Classes
     SystemConfigService,
     SystemConfigValidator,
+    invalidate_config_cache,
 )
 from sqlmodel import Session, select
 
@@ -913,6 +914,167 @@ class TestGenericAPIKeyManagement:
 
 
 # New tests for refactored functionality
+class TestConfigSnapshot:
+    def _add_config(self, session: Session, api_key: str):
+        from app.core.security import encrypt_api_key
+
+        config = models.SystemConfiguration(
+            case_number_template="YYMM-NN",
+            api_keys={"openai": {"api_key": encrypt_api_key(api_key), "name": "OpenAI"}},
+        )
+        session.add(config)
+        session.commit()
+        return config
+
+    def test_snapshot_defaults_without_configuration(
+        self, config_service: SystemConfigService, session: Session
+    ):
+        """Test a missing row reads as the defaults and is not created"""
+        snapshot = config_service.get_snapshot()
+
+        assert snapshot.case_number_template == CASE_NUMBER_TEMPLATE_MONTHLY
+        assert snapshot.case_number_prefix is None
+        assert "ThreatIntel" in snapshot.evidence_folder_templates
+        assert session.exec(select(models.SystemConfiguration)).first() is None
+
+    def test_snapshot_is_read_only(self, config_service: SystemConfigService):
+        """Test callers cannot mutate the shared snapshot"""
+        snapshot = config_service.get_snapshot()
+
+        with pytest.raises(Exception):
+            snapshot.case_number_prefix = "ABC"
+        with pytest.raises(TypeError):
+            snapshot.evidence_folder_templates["ThreatIntel"]["name"] = "changed"
+        assert isinstance(
+            snapshot.evidence_folder_templates["ThreatIntel"]["folders"], tuple
+        )
+
+    @pytest.mark.asyncio
+    async def test_update_configuration_refreshes_snapshot(
+        self,
+        config_service: SystemConfigService,
+        sample_config: models.SystemConfiguration,
+        admin_user: models.User,
+    ):
+        """Test a configuration change is visible to the next snapshot"""
+        assert config_service.get_snapshot().case_number_prefix is None
+
+        await config_service.update_configuration(
+            CASE_NUMBER_TEMPLATE_PREFIX,
+            current_user=admin_user,
+            case_number_prefix="ACME",
+        )
+
+        snapshot = config_service.get_snapshot()
+        assert snapshot.case_number_template == CASE_NUMBER_TEMPLATE_PREFIX
+        assert snapshot.case_number_prefix == "ACME"
+
+    def test_repeated_lookups_decrypt_once(
+        self, config_service: SystemConfigService, session: Session
+    ):
+        """Test keys are decrypted once and then served from the cache"""
+        from app.core.security import decrypt_api_key
+
+        self._add_config(session, "sk-cached")
+
+        with patch(
+            "app.services.system_config_service.decrypt_api_key",
+            side_effect=decrypt_api_key,
+        ) as mock_decrypt:
+            for _ in range(5):
+                assert config_service.get_api_key("openai") == "sk-cached"
+                assert config_service.is_provider_configured("openai") is True
+
+        assert mock_decrypt.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_set_api_key_invalidates_cache(
+        self,
+        config_service: SystemConfigService,
+        session: Session,
+        admin_user: models.User,
+    ):
+        """Test changing a key is visible to the next lookup"""
+        self._add_config(session, "sk-old")
+        assert config_service.get_api_key("openai") == "sk-old"
+
+        await config_service.set_api_key(
+            "openai", "sk-new", "OpenAI", current_user=admin_user
+        )
+        assert config_service.get_api_key("openai") == "sk-new"
+
+        await config_service.remove_api_key("openai", current_user=admin_user)
+        with patch.dict(os.environ, {}, clear=True):
+            assert config_service.get_api_key("openai") is None
+
+    def test_change_by_another_worker_is_picked_up(
+        self, config_service: SystemConfigService, session: Session
+    ):
+        """Test a write that bypassed this process is noticed after the check interval"""
+        from app.core.security import encrypt_api_key
+        from app.core.utils import get_utc_now
+
+        config = self._add_config(session, "sk-old")
+        assert config_service.get_api_key("openai") == "sk-old"
+
+        # Simulate another worker updating the row directly
+        config.api_keys = {"openai": {"api_key": encrypt_api_key("sk-new")}}
+        config.updated_at = get_utc_now() + timedelta(seconds=1)
+        session.add(config)
+        session.commit()
+
+        assert config_service.get_api_key("openai") == "sk-old"
+        with patch(
+            "app.services.system_config_service.config_cache_settings"
+            ".CONFIG_CACHE_CHECK_SECONDS",
+            0,
+        ):
+            assert config_service.get_api_key("openai") == "sk-new"
+
+    def test_unreadable_key_only_affects_its_provider(
+        self, config_service: SystemConfigService, session: Session
+    ):
+        """Test a key that cannot be decrypted does not hide the other keys"""
+        from app.core.security import decrypt_api_key, encrypt_api_key
+
+        broken = encrypt_api_key("sk-broken")
+        session.add(
+            models.SystemConfiguration(
+                case_number_template="YYMM-NN",
+                api_keys={
+                    "openai": {"api_key": encrypt_api_key("sk-openai")},
+                    "shodan": {"api_key": broken},
+                },
+            )
+        )
+        session.commit()
+
+        def decrypt(encrypted_key):
+            if encrypted_key == broken:
+                raise ValueError("bad key")
+            return decrypt_api_key(encrypted_key)
+
+        with patch(
+            "app.services.system_config_service.decrypt_api_key", side_effect=decrypt
+        ), patch.dict(os.environ, {"SHODAN_API_KEY": "sk-env"}):
+            assert config_service.get_api_key("openai") == "sk-openai"
+            assert config_service.get_api_key("shodan") == "sk-env"
+
+    def test_invalidate_config_cache(
+        self, config_service: SystemConfigService, session: Session
+    ):
+        """Test explicit invalidation forces a re-read"""
+        config = self._add_config(session, "sk-old")
+        assert config_service.get_api_key("openai") == "sk-old"
+
+        session.delete(config)
+        session.commit()
+        invalidate_config_cache()
+
+        with patch.dict(os.environ, {"OPENAI_API_KEY": "sk-env"}):
+            assert config_service.get_api_key("openai") == "sk-env"
+
+
 class TestRefactoredHelperMethods:
     """Test newly refactored helper methods"""
 
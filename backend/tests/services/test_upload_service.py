@@ -0,0 +1,310 @@
+"""
+Tests for resumable chunked evidence uploads
+"""
+
+import hashlib
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from app.core import file_storage
+from app.core.config import upload_settings
+from app.core.utils import get_utc_now
+from app.database import models
+from app.schemas import evidence_schema as schemas
+from app.services.upload_service import UploadService
+from fastapi import HTTPException
+from sqlmodel import Session
+
+CONTENT = b"line of scraped text\n" * 1000
+
+
+@pytest.fixture(name="upload_dir")
+def upload_dir_fixture():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with patch.object(file_storage, "UPLOAD_DIR", Path(temp_dir)):
+            yield Path(temp_dir)
+
+
+@pytest.fixture(name="upload_service")
+def upload_service_fixture(session: Session, upload_dir):
+    return UploadService(session)
+
+
+@pytest.fixture(name="case_folder")
+def case_folder_fixture(session: Session, test_case, test_admin):
+    folder = models.Evidence(
+        case_id=test_case.id,
+        title="Captures",
+        evidence_type="folder",
+        content="",
+        folder_path="captures",
+        is_folder=True,
+        created_by_id=test_admin.id,
+    )
+    session.add(folder)
+    session.commit()
+    session.refresh(folder)
+    return folder
+
+
+async def body(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def start_upload(upload_service, case, user, size=len(CONTENT)):
+    return await upload_service.create_upload(
+        upload=schemas.UploadSessionCreate(
+            case_id=case.id,
+            filename="dataset.txt",
+            total_size=size,
+            content_type="text/plain",
+            folder_path="captures",
+        ),
+        current_user=user,
+    )
+
+
+class TestUploadService:
+    """Test chunked upload sessions"""
+
+    @pytest.mark.asyncio
+    async def test_upload_in_chunks_creates_evidence(
+        self, upload_service, upload_dir, test_case, test_admin, case_folder
+    ):
+        upload = await start_upload(upload_service, test_case, test_admin)
+
+        half = len(CONTENT) // 2
+        upload = await upload_service.upload_chunk(
+            upload_id=upload.id,
+            offset=0,
+            chunks=body(CONTENT[:half]),
+            current_user=test_admin,
+        )
+        assert upload.received_size == half
+
+        await upload_service.upload_chunk(
+            upload_id=upload.id,
+            offset=half,
+            chunks=body(CONTENT[half : half + 100], CONTENT[half + 100 :]),
+            current_user=test_admin,
+        )
+        evidence = await upload_service.complete_upload(
+            upload_id=upload.id,
+            sha256=hashlib.sha256(CONTENT).hexdigest(),
+            current_user=test_admin,
+        )
+
+        assert evidence.content == f"{test_case.id}/captures/dataset.txt"
+        assert evidence.file_hash == hashlib.sha256(CONTENT).hexdigest()
+        storage, key, _ = file_storage.evidence_file_location(evidence)
+        assert key == file_storage.blob_key(evidence.file_hash)
+        assert storage.read_bytes(key) == CONTENT
+        assert not any((upload_dir / ".incoming").iterdir())
+
+        upload = await upload_service.get_upload(upload.id, current_user=test_admin)
+        assert upload.status == "completed"
+        assert upload.evidence_id == evidence.id
+
+    @pytest.mark.asyncio
+    async def test_repeated_upload_shares_blob(
+        self, upload_service, session, test_case, test_admin, case_folder
+    ):
+        evidence_ids = []
+        for _ in range(2):
+            upload = await start_upload(upload_service, test_case, test_admin)
+            await upload_service.upload_chunk(
+                upload_id=upload.id,
+                offset=0,
+                chunks=body(CONTENT),
+                current_user=test_admin,
+            )
+            evidence = await upload_service.complete_upload(
+                upload_id=upload.id,
+                sha256=hashlib.sha256(CONTENT).hexdigest(),
+                current_user=test_admin,
+            )
+            evidence_ids.append(evidence.id)
+
+        first, second = (session.get(models.Evidence, i) for i in evidence_ids)
+        assert first.content == f"{test_case.id}/captures/dataset.txt"
+        assert second.content == f"{test_case.id}/captures/dataset_1.txt"
+        assert session.get(models.Blob, first.file_hash).ref_count == 2
+
+    @pytest.mark.asyncio
+    async def test_resend_and_resume(
+        self, upload_service, test_case, test_admin, case_folder
+    ):
+        upload = await start_upload(upload_service, test_case, test_admin)
+        await upload_service.upload_chunk(
+            upload_id=upload.id,
+            offset=0,
+            chunks=body(CONTENT[:500]),
+            current_user=test_admin,
+        )
+
+        # Skipping ahead of what was received is refused
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_service.upload_chunk(
+                upload_id=upload.id,
+                offset=600,
+                chunks=body(CONTENT[600:]),
+                current_user=test_admin,
+            )
+        assert exc_info.value.status_code == 409
+
+        # Resending an earlier chunk overwrites from its offset
+        upload = await upload_service.upload_chunk(
+            upload_id=upload.id,
+            offset=200,
+            chunks=body(CONTENT[200:]),
+            current_user=test_admin,
+        )
+        assert upload.received_size == len(CONTENT)
+
+        evidence = await upload_service.complete_upload(
+            upload_id=upload.id,
+            sha256=hashlib.sha256(CONTENT).hexdigest(),
+            current_user=test_admin,
+        )
+        assert evidence.file_hash == hashlib.sha256(CONTENT).hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_hash_mismatch_discards_upload(
+        self, upload_service, upload_dir, test_case, test_admin, case_folder
+    ):
+        upload = await start_upload(upload_service, test_case, test_admin)
+        await upload_service.upload_chunk(
+            upload_id=upload.id,
+            offset=0,
+            chunks=body(CONTENT),
+            current_user=test_admin,
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_service.complete_upload(
+                upload_id=upload.id, sha256="0" * 64, current_user=test_admin
+            )
+
+        assert exc_info.value.status_code == 422
+        upload = await upload_service.get_upload(upload.id, current_user=test_admin)
+        assert upload.status == "failed"
+        assert not (upload_dir / ".incoming" / f"{upload.id}.part").exists()
+
+    @pytest.mark.asyncio
+    async def test_incomplete_upload_cannot_complete(
+        self, upload_service, test_case, test_admin, case_folder
+    ):
+        upload = await start_upload(upload_service, test_case, test_admin)
+        await upload_service.upload_chunk(
+            upload_id=upload.id,
+            offset=0,
+            chunks=body(CONTENT[:10]),
+            current_user=test_admin,
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_service.complete_upload(
+                upload_id=upload.id,
+                sha256=hashlib.sha256(CONTENT).hexdigest(),
+                current_user=test_admin,
+            )
+        assert exc_info.value.status_code == 409
+
+    @pytest.mark.asyncio
+    async def test_chunk_past_declared_size_is_rejected(
+        self, upload_service, test_case, test_admin, case_folder
+    ):
+        upload = await start_upload(upload_service, test_case, test_admin, size=10)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_service.upload_chunk(
+                upload_id=upload.id,
+                offset=0,
+                chunks=body(b"x" * 8, b"x" * 8),
+                current_user=test_admin,
+            )
+
+        assert exc_info.value.status_code == 413
+        upload = await upload_service.get_upload(upload.id, current_user=test_admin)
+        assert upload.received_size == 0
+
+    @pytest.mark.asyncio
+    async def test_case_quota(
+        self, upload_service, upload_dir, test_case, test_admin, case_folder
+    ):
+        case_dir = upload_dir / str(test_case.id)
+        case_dir.mkdir()
+        (case_dir / "existing.bin").write_bytes(b"x" * 600 * 1024)
+
+        with patch.object(upload_settings, "UPLOAD_CASE_QUOTA_MB", 1):
+            # In-flight uploads reserve their declared size
+            await start_upload(upload_service, test_case, test_admin, size=300 * 1024)
+            with pytest.raises(HTTPException) as exc_info:
+                await start_upload(
+                    upload_service, test_case, test_admin, size=200 * 1024
+                )
+
+        assert exc_info.value.status_code == 413
+
+    @pytest.mark.asyncio
+    async def test_case_quota_rechecked_on_complete(
+        self, upload_service, upload_dir, test_case, test_admin, case_folder
+    ):
+        with patch.object(upload_settings, "UPLOAD_CASE_QUOTA_MB", 1):
+            upload = await start_upload(upload_service, test_case, test_admin)
+            await upload_service.upload_chunk(
+                upload_id=upload.id,
+                offset=0,
+                chunks=body(CONTENT),
+                current_user=test_admin,
+            )
+
+            # Space used up by another upload while this one was in flight
+            case_dir = upload_dir / str(test_case.id)
+            case_dir.mkdir()
+            (case_dir / "existing.bin").write_bytes(b"x" * 1020 * 1024)
+
+            with pytest.raises(HTTPException) as exc_info:
+                await upload_service.complete_upload(
+                    upload_id=upload.id,
+                    sha256=hashlib.sha256(CONTENT).hexdigest(),
+                    current_user=test_admin,
+                )
+
+        assert exc_info.value.status_code == 413
+        upload = await upload_service.get_upload(upload.id, current_user=test_admin)
+        assert upload.status == "failed"
+
+    @pytest.mark.asyncio
+    async def test_expired_upload_is_refused(
+        self, upload_service, session, test_case, test_admin, case_folder
+    ):
+        upload = await start_upload(upload_service, test_case, test_admin)
+        upload.expires_at = get_utc_now().replace(year=2000)
+        session.add(upload)
+        session.commit()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_service.upload_chunk(
+                upload_id=upload.id,
+                offset=0,
+                chunks=body(CONTENT),
+                current_user=test_admin,
+            )
+
+        assert exc_info.value.status_code == 409
+        upload = await upload_service.get_upload(upload.id, current_user=test_admin)
+        assert upload.status == "expired"
+
+    @pytest.mark.asyncio
+    async def test_other_users_cannot_see_upload(
+        self, upload_service, test_case, test_admin, test_user, case_folder
+    ):
+        upload = await start_upload(upload_service, test_case, test_admin)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await upload_service.get_upload(upload.id, current_user=test_user)
+        assert exc_info.value.status_code == 404
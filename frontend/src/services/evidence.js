@@ -7,16 +7,13 @@ export const evidenceService = {
   },
 
   async createEvidence({ description, category, caseId, files, folderPath, parentFolderId }) {
+    // One request for the whole batch; the response has a result per file
     const formData = new FormData()
     files.forEach((file) => {
       formData.append('files', file)
     })
-
-    const queryParams = new URLSearchParams({
-      title: 'Multiple Files', // This will be overridden by filenames in backend
-      case_id: caseId,
-      category,
-    })
+    formData.append('case_id', caseId)
+    formData.append('category', category)
     if (description) {
       formData.append('description', description)
     }
@@ -27,7 +24,7 @@ export const evidenceService = {
       formData.append('parent_folder_id', parentFolderId)
     }
 
-    const response = await api.post(`/api/evidence?${queryParams}`, formData, {
+    const response = await api.post('/api/evidence/bulk', formData, {
       headers: {
         'Content-Type': 'multipart/form-data',
       },
@@ -35,6 +32,44 @@ export const evidenceService = {
     return response.data
   },
 
+  async createUpload({ caseId, file, category, description, folderPath, parentFolderId }) {
+    const response = await api.post('/api/evidence/uploads', {
+      case_id: caseId,
+      filename: file.name,
+      total_size: file.size,
+      content_type: file.type || null,
+      category,
+      description,
+      folder_path: folderPath,
+      parent_folder_id: parentFolderId,
+    })
+    return response.data
+  },
+
+  async getUpload(uploadId) {
+    const response = await api.get(`/api/evidence/uploads/${uploadId}`)
+    return response.data
+  },
+
+  async uploadChunk(uploadId, offset, chunk) {
+    const response = await api.put(`/api/evidence/uploads/${uploadId}`, chunk, {
+      params: { offset },
+      headers: {
+        'Content-Type': 'application/octet-stream',
+      },
+    })
+    return response.data
+  },
+
+  async completeUpload(uploadId, sha256) {
+    const response = await api.post(`/api/evidence/uploads/${uploadId}/complete`, { sha256 })
+    return response.data
+  },
+
+  async abortUpload(uploadId) {
+    await api.delete(`/api/evidence/uploads/${uploadId}`)
+  },
+
   async downloadEvidence(evidenceId) {
     const response = await api.get(`/api/evidence/${evidenceId}/download`, {
       responseType: 'blob',
@@ -42,6 +77,32 @@ export const evidenceService = {
     return response.data
   },
 
+  async getDownloadUrl(evidenceId) {
+    const response = await api.get(`/api/evidence/${evidenceId}/download-url`)
+    return response.data
+  },
+
+  async searchEvidence(query, params = {}) {
+    const response = await api.get('/api/evidence/search', {
+      params: { q: query, ...params },
+    })
+    return response.data
+  },
+
+  async getCaseThumbnails(caseId, skip = 0, limit = 100) {
+    const response = await api.get(`/api/evidence/case/${caseId}/thumbnails`, {
+      params: { skip, limit },
+    })
+    return response.data
+  },
+
+  async getDerivative(evidenceId, size = 'thumbnail') {
+    const response = await api.get(`/api/evidence/${evidenceId}/derivatives/${size}`, {
+      responseType: 'blob',
+    })
+    return response.data
+  },
+
   async deleteEvidence(evidenceId) {
     await api.delete(`/api/evidence/${evidenceId}`)
   },
@@ -95,6 +156,11 @@ export const evidenceService = {
     return response.data
   },
 
+  async getEvidenceTextPage(evidenceId, params = {}) {
+    const response = await api.get(`/api/evidence/${evidenceId}/content/page`, { params })
+    return response.data
+  },
+
   async applyFolderTemplate(caseId, templateName) {
     const response = await api.post(`/api/evidence/case/${caseId}/apply-template`, null, {
       params: { template_name: templateName },
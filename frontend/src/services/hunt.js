@@ -71,6 +71,54 @@ export const huntService = {
     return response.data
   },
 
+  /**
+   * Schedule a hunt to re-run against a case
+   * @param {number} huntId - Hunt ID to schedule
+   * @param {number} caseId - Case ID to run hunt for
+   * @param {string} cronExpression - Five-field cron expression in UTC
+   * @param {Object} parameters - Hunt parameters for each run
+   * @returns {Promise<Object>} Hunt schedule details
+   */
+  async createSchedule(huntId, caseId, cronExpression, parameters) {
+    const response = await api.post(`/api/hunts/${huntId}/schedules`, {
+      case_id: caseId,
+      cron_expression: cronExpression,
+      parameters: parameters || {},
+    })
+    return response.data
+  },
+
+  /**
+   * Get all hunt schedules for a case
+   * @param {number} caseId - Case ID
+   * @returns {Promise<Array>} List of hunt schedules
+   */
+  async getCaseSchedules(caseId) {
+    const response = await api.get(`/api/hunts/cases/${caseId}/schedules`)
+    return response.data
+  },
+
+  /**
+   * Update a hunt schedule
+   * @param {number} scheduleId - Hunt schedule ID
+   * @param {Object} updates - cron_expression, parameters and/or is_active
+   * @returns {Promise<Object>} Updated hunt schedule
+   */
+  async updateSchedule(scheduleId, updates) {
+    const response = await api.patch(`/api/hunts/schedules/${scheduleId}`, updates)
+    return response.data
+  },
+
+  /**
+   * Delete a hunt schedule
+   * @param {number} scheduleId - Hunt schedule ID
+   * @returns {Promise<Object>} Deletion result
+   */
+  async deleteSchedule(scheduleId) {
+    const response = await api.delete(`/api/hunts/schedules/${scheduleId}`)
+    return response.data
+  },
+
   /**
    * Create WebSocket connection for real-time hunt execution updates
    * @param {number} executionId - Hunt execution ID
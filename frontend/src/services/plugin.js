@@ -30,10 +30,38 @@ export const pluginService = {
           }
         })
         .filter(Boolean) // Remove any null results from failed parsing
+        .filter((result) => result.type !== 'heartbeat') // Drop keepalive frames
 
       return results
     }
   },
+
+  async startRun(name, params = {}) {
+    const response = await api.post(`/api/plugins/${name}/runs`, params)
+    return response.data
+  },
+
+  async listRuns(skip = 0, limit = 50) {
+    const response = await api.get('/api/plugins/runs', { params: { skip, limit } })
+    return response.data
+  },
+
+  async getRun(runId) {
+    const response = await api.get(`/api/plugins/runs/${runId}`)
+    return response.data
+  },
+
+  async getRunResults(runId, offset = 0, limit = 100) {
+    const response = await api.get(`/api/plugins/runs/${runId}/results`, {
+      params: { offset, limit },
+    })
+    return response.data
+  },
+
+  async cancelRun(runId) {
+    const response = await api.delete(`/api/plugins/runs/${runId}`)
+    return response.data
+  },
 }
 
 export default pluginService